@@ -0,0 +1,100 @@
+#******************************************************************************************************************************************
+# TITLE     : PCB_DATA_ASSOCIATION
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : single entry point with lazily imported matchers
+# 2026-10-18        | CONTRIBUTORS        | CompactMatchResult
+# 2026-10-18        | CONTRIBUTORS        | run_batch_job
+# 2026-10-18        | CONTRIBUTORS        | MatchingService, MatchingClient
+# 2026-10-18        | CONTRIBUTORS        | WeightFunction, register_weighting, get_weighting
+# 2026-10-18        | CONTRIBUTORS        | StationEventIndex
+#******************************************************************************************************************************************
+
+#Entry point of the PCB Data Association
+#
+#    import pcb_data_association as pda
+#    ldr_spr_matched_df = pda.rev_ldrspr_matching_algo(pcb_level_dfldr,pcb_level_dfspr)
+#
+#Importing this module imports nothing else : every name is resolved on first access (module __getattr__) by importing
+#the routine_* module that defines it. A pool worker or a short job pays only for the matchers it uses.
+
+import importlib
+
+#Public name -> defining module
+PUBLIC_NAMES = {
+    #LDR-SPR
+    'rev_ldrspr_matching_algo'      : 'routine_ldrspr_matching_algo',
+    'get_ldrspr_match_indx'         : 'routine_ldrspr_matching_algo',
+    'get_ldrspr_hist_mode'          : 'routine_ldrspr_matching_algo',
+    #SPR-PP1
+    'fwd_sprpp1_matching_algo'      : 'routine_sprpp1_matching_algo',
+    'rev_sprpp1_matching_algo'      : 'routine_sprpp1_matching_algo',
+    'bidirectional_sprpp1_matching' : 'routine_sprpp1_matching_algo',
+    'get_sprpp1_match_indx'         : 'routine_sprpp1_matching_algo',
+    #PP1-PP2
+    'fwd_pp1pp2_matching_algo'      : 'routine_pp1pp2_matching_algo',
+    'rev_pp1pp2_matching_algo'      : 'routine_pp1pp2_matching_algo',
+    'bidirectional_pp1pp2_matching' : 'routine_pp1pp2_matching_algo',
+    'get_pp1pp2_match_indx'         : 'routine_pp1pp2_matching_algo',
+    #Pipeline, chunked, parallel and streaming execution
+    'TraceabilityPipeline'          : 'routine_traceability_pipeline',
+    'chunked_ldrspr_matching'       : 'routine_chunked_execution',
+    'chunked_sprpp1_matching'       : 'routine_chunked_execution',
+    'chunked_pp1pp2_matching'       : 'routine_chunked_execution',
+    'parallel_matching'             : 'routine_parallel_execution',
+    'run_batch_job'                 : 'routine_batch_runner',
+    'LdrSprStreamingMatcher'        : 'routine_streaming_matcher',
+    'SprPp1StreamingMatcher'        : 'routine_streaming_matcher',
+    'Pp1Pp2StreamingMatcher'        : 'routine_streaming_matcher',
+    'MatchingService'               : 'routine_matching_service',
+    'MatchingClient'                : 'routine_matching_service',
+    #Support
+    'CompactMatchResult'            : 'routine_match_result',
+    'StationEventIndex'             : 'routine_station_index',
+    'DelayHistogram'                : 'routine_delay_histogram',
+    'WeightFunction'                : 'routine_weighting_functions',
+    'register_weighting'            : 'routine_weighting_functions',
+    'get_weighting'                 : 'routine_weighting_functions',
+    'WeightMatrixCache'             : 'routine_weight_cache',
+    'set_weight_cache'              : 'routine_weight_cache',
+    'MatchMetrics'                  : 'routine_instrumentation',
+    'collect_metrics'               : 'routine_instrumentation',
+    'read_event_table'              : 'routine_event_io',
+    'write_event_table'             : 'routine_event_io',
+    'gen_synthetic_line'            : 'routine_synthetic_line',
+    }
+
+__all__ = sorted(PUBLIC_NAMES)
+
+
+def __getattr__(name):
+    """
+    Purpose : Import the module defining a public name on first access
+    """
+
+    if (name not in PUBLIC_NAMES):
+        raise AttributeError('module %r has no attribute %r' % (__name__,name))
+    #end-if
+
+    value = getattr(importlib.import_module(PUBLIC_NAMES[name]),name)
+    globals()[name] = value
+
+    return value
+#end-proc
+
+
+def __dir__():
+    """
+    Purpose : Module attributes including the lazily imported public names
+    """
+    return sorted(set(globals()) | set(PUBLIC_NAMES))
+#end-proc
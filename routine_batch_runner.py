@@ -0,0 +1,479 @@
+#******************************************************************************************************************************************
+# TITLE     : ROUTINE_BATCH_RUNNER
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : headless line-wide association job with checkpoint / resume
+# 2026-10-18        | CONTRIBUTORS        | SPR-PP1 / PP1-PP2 weighting functions (--sprpp1-weighting, --pp1pp2-weighting)
+# 2026-10-18        | CONTRIBUTORS        | LDR-SPR chunk without a guard SPR event keeps the loader events before the first SPR
+#******************************************************************************************************************************************
+
+#Batch runner of the line-wide PCB Data Association (nightly jobs)
+#
+#    python routine_batch_runner.py --ldr ldr.parquet --spr spr.parquet --pp1 pp1.parquet --pp2 pp2.parquet \
+#        --start 2019-05-01 --end 2019-05-02 --direction both --sprpp1-max-transit 600 --pp1pp2-max-transit 600 \
+#        --output-dir out --chunk-seconds 21600 --workers 4 [--resume]
+#
+#Inputs are Parquet / Arrow IPC event tables (routine_event_io) or CSV files with arvl_tmstmp, dptr_tmstmp and
+#weightage columns, sorted by departure. The events departing in [start - margin, end + margin) are read; margin
+#(--margin-seconds) must exceed the longest transit plus cycle time of the line.
+#
+#The date range [start, end) is split into checkpoint chunks of --chunk-seconds. A chunk owns the SPR events departing
+#in it (LDR-SPR), the departures from the first station in it (forward SPR-PP1 / PP1-PP2) or the arrivals at the second
+#station in it (reverse). Every chunk is matched on its events plus the margin, with routine_chunked_execution
+#(--workers 1) or routine_parallel_execution (--unit-seconds work units); the owned rows are kept, so the outputs
+#do not depend on the chunking. The LDR-SPR modal delay is estimated once over the whole range and checkpointed.
+#--sprpp1-weighting / --pp1pp2-weighting select a registered weighting function (routine_weighting_functions); they are
+#part of the job configuration, so a checkpoint is resumed only with the same weightings.
+#
+#Outputs in --output-dir :
+#    <stage>_<direction>/<chunk>.<ext> - Matched table of every completed chunk
+#    <stage>_<direction>.<ext>         - Matched table of the date range (concatenated chunks)
+#    checkpoint.json                   - Job configuration and completed chunks (--resume skips them)
+#    metrics.json                      - Status, chunk rows and timings, phase timings and counters (routine_instrumentation)
+#
+#Index columns are the row numbers of the events in the input files (event_indx of routine_event_io, or the CSV row).
+#The exit code is 0 on success, 1 if the job failed (the completed chunks are kept) and 2 on invalid arguments.
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy  as np
+import pandas as pd
+
+import routine_event_io
+import routine_weight_kernel
+import routine_instrumentation
+import routine_chunked_execution
+import routine_weighting_functions
+import routine_parallel_execution
+import routine_ldrspr_matching_algo
+
+STAGES     = ('ldrspr','sprpp1','pp1pp2')
+DIRECTIONS = ('fwd','rev')
+
+#Default length of a checkpoint chunk and of a work unit within it [s]
+CHUNK_SECONDS = 6 * 3600
+UNIT_SECONDS  = 3600
+
+#Default margin read around the date range and around every chunk [s]
+MARGIN_SECONDS = 3600
+
+CHECKPOINT_FILE = 'checkpoint.json'
+METRICS_FILE    = 'metrics.json'
+
+#Stage -> (first station, second station, owned timestamp column by direction, index column of each station)
+STAGE_SPECS = {
+    'ldrspr' : ('ldr','spr',{'rev' : 'spr_dptr'},(None,'spr_indx')),
+    'sprpp1' : ('spr','pp1',{'fwd' : 'spr_dptr','rev' : 'pp1_arvl'},('spr_indx','pp1_indx')),
+    'pp1pp2' : ('pp1','pp2',{'fwd' : 'pp1_dptr','rev' : 'pp2_arvl'},('pp1_indx','pp2_indx')),
+    }
+
+
+def read_input_df(path,str_tmstmp,end_tmstmp):
+    """
+    Purpose : Read the events of an input file departing in [str_tmstmp, end_tmstmp)
+    Inputs  : path         - Parquet / Arrow IPC (routine_event_io) or CSV file
+              str_tmstmp   - Start of the departure range (inclusive)
+              end_tmstmp   - End of the departure range (exclusive)
+    Output  : pcb_level_df - Events of the range; index = row number in the file
+    """
+
+    if (os.path.splitext(str(path))[1].lower() != '.csv'):
+        return routine_event_io.read_event_table(path,str_tmstmp=str_tmstmp,end_tmstmp=end_tmstmp)
+    #end-if
+
+    pcb_level_df = pd.read_csv(path)
+    for column in ('arvl_tmstmp','dptr_tmstmp'):
+        if (column in pcb_level_df.columns):
+            pcb_level_df[column] = pd.to_datetime(pcb_level_df[column]).astype('datetime64[ns]')
+        #end-if
+    #end-for
+
+    dptr_tmstmp = pcb_level_df.dptr_tmstmp
+    in_range    = (dptr_tmstmp >= pd.Timestamp(str_tmstmp)) & (dptr_tmstmp < pd.Timestamp(end_tmstmp))
+
+    return pcb_level_df[in_range.to_numpy()]
+#end-proc
+
+
+def get_range_pos(tmstmp_ns,str_ns,end_ns):
+    """
+    Purpose : Positions of the timestamps in [str_ns, end_ns) (NaT excluded)
+    """
+    return np.flatnonzero((tmstmp_ns >= str_ns) & (tmstmp_ns < end_ns) & (tmstmp_ns != routine_weight_kernel.NAT_NS))
+#end-proc
+
+
+def get_chunk_slices(stage,direction,pcb_level_dfa,pcb_level_dfb,chunk_str_ns,chunk_end_ns,margin_ns):
+    """
+    Purpose : Positions of the events of both stations needed to match the events owned by a chunk
+    Inputs  : stage          - 'ldrspr', 'sprpp1' or 'pp1pp2'
+              direction      - 'fwd' or 'rev'
+              pcb_level_dfa  - Events of the first station of the stage
+              pcb_level_dfb  - Events of the second station of the stage
+              chunk_str_ns   - int64 ns start of the chunk
+              chunk_end_ns   - int64 ns end of the chunk (exclusive)
+              margin_ns      - int64 ns margin (longest transit)
+    Output  : a_pos, b_pos   - Positions in pcb_level_dfa and pcb_level_dfb
+    """
+
+    if (stage == 'ldrspr'):
+        #SPR events of the chunk and the preceding one (guard : bounds the first interval), loader events from the guard
+        #on; without a guard (first SPR event of the range in the chunk) every loader event before the chunk end
+        spr_dptr_ns = routine_weight_kernel.get_tmstmp_ns(pcb_level_dfb.dptr_tmstmp)
+        spr_lo      = int(np.searchsorted(spr_dptr_ns,chunk_str_ns,side='left'))
+        spr_hi      = int(np.searchsorted(spr_dptr_ns,chunk_end_ns,side='left'))
+
+        if (spr_lo > 0):
+            spr_lo     = spr_lo - 1
+            ldr_str_ns = spr_dptr_ns[spr_lo]
+        else:
+            ldr_str_ns = routine_weight_kernel.NAT_NS + 1
+        #end-if
+        ldr_dptr_ns = routine_weight_kernel.get_tmstmp_ns(pcb_level_dfa.dptr_tmstmp)
+
+        return get_range_pos(ldr_dptr_ns,ldr_str_ns,chunk_end_ns),np.arange(spr_lo,spr_hi,dtype=np.int64)
+    #end-if
+
+    a_dptr_ns = routine_weight_kernel.get_tmstmp_ns(pcb_level_dfa.dptr_tmstmp)
+    b_arvl_ns = routine_weight_kernel.get_tmstmp_ns(pcb_level_dfb.arvl_tmstmp)
+
+    return (get_range_pos(a_dptr_ns,chunk_str_ns - margin_ns,chunk_end_ns + margin_ns),
+            get_range_pos(b_arvl_ns,chunk_str_ns - margin_ns,chunk_end_ns + margin_ns))
+#end-proc
+
+
+def run_chunk_stage(stage,direction,pcb_level_dfa,pcb_level_dfb,chunk_str_ns,chunk_end_ns,job_config,hist_mode):
+    """
+    Purpose : Matched table of the events owned by a chunk, indices mapped to the input file rows
+    Inputs  : stage, direction            - Association
+              pcb_level_dfa,pcb_level_dfb - Events of the two stations (date range plus margin)
+              chunk_str_ns,chunk_end_ns   - Chunk [start, end) in int64 ns
+              job_config                  - Job configuration (get_job_config)
+              hist_mode                   - Modal LDR-SPR delay
+    Output  : matched_df                  - Matched table of the owned events
+    """
+
+    margin_ns   = int(round(job_config['margin_seconds'] * 1e9))
+    a_pos,b_pos = get_chunk_slices(stage,direction,pcb_level_dfa,pcb_level_dfb,chunk_str_ns,chunk_end_ns,margin_ns)
+
+    chunk_dfa = pcb_level_dfa.iloc[a_pos].reset_index(drop=True)
+    chunk_dfb = pcb_level_dfb.iloc[b_pos].reset_index(drop=True)
+
+    unit_seconds        = job_config['unit_seconds']
+    min_transit_seconds = job_config.get('%s_min_transit_seconds' % (stage,))
+    max_transit_seconds = job_config.get('%s_max_transit_seconds' % (stage,))
+    weighting           = job_config.get('%s_weighting' % (stage,))
+
+    if (job_config['workers'] > 1):
+        matched_df = routine_parallel_execution.parallel_matching({stage : (chunk_dfa,chunk_dfb)},stage,unit_seconds,
+                                                                  max_transit_seconds,min_transit_seconds,direction,
+                                                                  hist_mode,job_config['workers'],weighting)[stage]
+    elif (stage == 'ldrspr'):
+        matched_df = routine_chunked_execution.chunked_ldrspr_matching(chunk_dfa,chunk_dfb,unit_seconds,hist_mode)
+    elif (stage == 'sprpp1'):
+        matched_df = routine_chunked_execution.chunked_sprpp1_matching(chunk_dfa,chunk_dfb,unit_seconds,max_transit_seconds,
+                                                                       min_transit_seconds,direction,weighting)
+    else:
+        matched_df = routine_chunked_execution.chunked_pp1pp2_matching(chunk_dfa,chunk_dfb,unit_seconds,max_transit_seconds,
+                                                                       min_transit_seconds,direction,weighting)
+    #end-if
+
+    #Owned rows
+    own_ns     = routine_weight_kernel.get_tmstmp_ns(matched_df[STAGE_SPECS[stage][2][direction]])
+    matched_df = matched_df[(own_ns >= chunk_str_ns) & (own_ns < chunk_end_ns)].reset_index(drop=True)
+
+    #Chunk positions -> input file rows
+    for column,pos,pcb_level_df in zip(STAGE_SPECS[stage][3],(a_pos,b_pos),(pcb_level_dfa,pcb_level_dfb)):
+        if (column is not None):
+            file_rows          = np.asarray(pcb_level_df.index,dtype=np.int64)[pos]
+            matched_df[column] = file_rows[matched_df[column].to_numpy()]
+        #end-if
+    #end-for
+
+    return matched_df
+#end-proc
+
+
+def get_job_config(args):
+    """
+    Purpose : Job configuration (JSON serializable) from the parsed arguments; a checkpoint is resumed only if it matches
+    """
+
+    directions = list(DIRECTIONS) if (args.direction == 'both') else [args.direction]
+
+    return {
+        'inputs'                     : {station : os.path.abspath(getattr(args,station)) for station in ('ldr','spr','pp1','pp2')},
+        'start'                      : str(pd.Timestamp(args.start)),
+        'end'                        : str(pd.Timestamp(args.end)),
+        'stages'                     : [stage for stage in STAGES if (stage in args.stages)],
+        'directions'                 : directions,
+        'chunk_seconds'              : args.chunk_seconds,
+        'unit_seconds'               : args.unit_seconds,
+        'margin_seconds'             : args.margin_seconds,
+        'workers'                    : args.workers,
+        'sprpp1_min_transit_seconds' : args.sprpp1_min_transit,
+        'sprpp1_max_transit_seconds' : args.sprpp1_max_transit,
+        'pp1pp2_min_transit_seconds' : args.pp1pp2_min_transit,
+        'pp1pp2_max_transit_seconds' : args.pp1pp2_max_transit,
+        'sprpp1_weighting'           : args.sprpp1_weighting,
+        'pp1pp2_weighting'           : args.pp1pp2_weighting,
+        'hist_mode'                  : args.hist_mode,
+        'output_format'              : args.output_format,
+        }
+#end-proc
+
+
+def get_stage_runs(job_config):
+    """
+    Purpose : (stage, direction) pairs of the job (LDR-SPR is reverse only)
+    """
+
+    stage_runs = []
+    for stage in job_config['stages']:
+        if (stage == 'ldrspr'):
+            stage_runs.append((stage,'rev'))
+            continue
+        #end-if
+        for direction in job_config['directions']:
+            stage_runs.append((stage,direction))
+        #end-for
+    #end-for
+
+    return stage_runs
+#end-proc
+
+
+def write_json(json_obj,path):
+    """
+    Purpose : Write a JSON file atomically (temporary file, then rename)
+    """
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path,'w') as json_file:
+        json.dump(json_obj,json_file,indent=2,default=str)
+    #end-with
+    os.replace(tmp_path,path)
+#end-proc
+
+
+def write_output(matched_df,path,file_format):
+    """
+    Purpose : Write a matched table atomically with typed columns (routine_event_io)
+    """
+
+    tmp_path = path + '.tmp'
+    routine_event_io.write_event_table(matched_df,tmp_path,file_format=file_format,keep_event_indx=False)
+    os.replace(tmp_path,path)
+#end-proc
+
+
+def load_checkpoint(output_dir,job_config,resume):
+    """
+    Purpose : Checkpoint of a previous run of the same job (resume), else a new one
+    """
+
+    checkpoint_path = os.path.join(output_dir,CHECKPOINT_FILE)
+    if (resume) and os.path.exists(checkpoint_path):
+        with open(checkpoint_path) as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+        #end-with
+        if (checkpoint['config'] != job_config):
+            raise ValueError('checkpoint %r was written by a different job configuration' % (checkpoint_path,))
+        #end-if
+        return checkpoint
+    #end-if
+
+    return {'config' : job_config,'hist_mode' : None,'completed_chunks' : [],'chunk_records' : []}
+#end-proc
+
+
+def run_batch_job(job_config,output_dir,resume=False):
+    """
+    Purpose : Run the associations of the job chunk by chunk, checkpointing every completed chunk
+    Inputs  : job_config - Job configuration (get_job_config)
+              output_dir - Output directory (created if needed)
+              resume     - Skip the chunks completed by a previous run of the same job
+    Output  : job_record - Status, chunk records and metrics (also written to metrics.json)
+    """
+
+    os.makedirs(output_dir,exist_ok=True)
+    checkpoint = load_checkpoint(output_dir,job_config,resume)
+    stage_runs = get_stage_runs(job_config)
+    extension  = '.parquet' if (job_config['output_format'] == 'parquet') else '.arrow'
+
+    str_time   = time.perf_counter()
+    job_record = {'status' : 'running','config' : job_config,'resumed_chunks' : len(checkpoint['completed_chunks'])}
+
+    with routine_instrumentation.collect_metrics() as metrics:
+        try:
+            #Events of the date range plus the margin
+            margin   = pd.Timedelta(seconds=job_config['margin_seconds'])
+            str_read = pd.Timestamp(job_config['start']) - margin
+            end_read = pd.Timestamp(job_config['end']) + margin
+            with routine_instrumentation.timed_phase('batch.read'):
+                station_dfs = {station : read_input_df(path,str_read,end_read) for station,path in job_config['inputs'].items()}
+            #end-with
+
+            if ('ldrspr' in job_config['stages']) and (checkpoint['hist_mode'] is None):
+                hist_mode = job_config['hist_mode']
+                if (hist_mode is None):
+                    hist_mode = routine_ldrspr_matching_algo.get_ldrspr_hist_mode(station_dfs['ldr'],station_dfs['spr'])
+                #end-if
+                checkpoint['hist_mode'] = None if (hist_mode is None) else float(hist_mode)
+            #end-if
+
+            chunk_bounds = routine_chunked_execution.get_time_chunks(pd.Timestamp(job_config['start']).value,
+                                                                     pd.Timestamp(job_config['end']).value - 1,
+                                                                     job_config['chunk_seconds'])
+            for stage,direction in stage_runs:
+                os.makedirs(os.path.join(output_dir,'%s_%s' % (stage,direction)),exist_ok=True)
+            #end-for
+
+            for chunk_str_ns,chunk_end_ns in chunk_bounds:
+                #The first and last chunks are clipped to the date range
+                chunk_str_ns = max(int(chunk_str_ns),pd.Timestamp(job_config['start']).value)
+                chunk_end_ns = min(int(chunk_end_ns),pd.Timestamp(job_config['end']).value)
+                chunk_label  = pd.Timestamp(chunk_str_ns).strftime('%Y%m%dT%H%M%S')
+                if (chunk_label in checkpoint['completed_chunks']):
+                    continue
+                #end-if
+
+                chunk_time   = time.perf_counter()
+                chunk_record = {'chunk' : chunk_label,'str' : str(pd.Timestamp(chunk_str_ns)),'end' : str(pd.Timestamp(chunk_end_ns)),
+                                'rows' : {}}
+                for stage,direction in stage_runs:
+                    station_a,station_b = STAGE_SPECS[stage][:2]
+                    with routine_instrumentation.timed_phase('batch.%s_%s' % (stage,direction)):
+                        matched_df = run_chunk_stage(stage,direction,station_dfs[station_a],station_dfs[station_b],
+                                                     chunk_str_ns,chunk_end_ns,job_config,checkpoint['hist_mode'])
+                    #end-with
+                    with routine_instrumentation.timed_phase('batch.write'):
+                        write_output(matched_df,os.path.join(output_dir,'%s_%s' % (stage,direction),chunk_label + extension),
+                                     job_config['output_format'])
+                    #end-with
+                    chunk_record['rows']['%s_%s' % (stage,direction)] = len(matched_df)
+                #end-for
+                chunk_record['seconds'] = time.perf_counter() - chunk_time
+
+                checkpoint['completed_chunks'].append(chunk_label)
+                checkpoint['chunk_records'].append(chunk_record)
+                write_json(checkpoint,os.path.join(output_dir,CHECKPOINT_FILE))
+                routine_instrumentation.LOGGER.info('chunk %s : %s',chunk_label,chunk_record['rows'])
+            #end-for
+
+            #Matched tables of the date range
+            with routine_instrumentation.timed_phase('batch.write'):
+                for stage,direction in stage_runs:
+                    run_dir    = os.path.join(output_dir,'%s_%s' % (stage,direction))
+                    chunk_dfs  = [routine_event_io.read_event_table(os.path.join(run_dir,chunk_label + extension))
+                                  for chunk_label in checkpoint['completed_chunks']]
+                    matched_df = pd.concat(chunk_dfs,ignore_index=True)
+                    write_output(matched_df,os.path.join(output_dir,'%s_%s%s' % (stage,direction,extension)),
+                                 job_config['output_format'])
+                #end-for
+            #end-with
+
+            job_record['status'] = 'completed'
+        except Exception as error:
+            job_record['status'] = 'failed'
+            job_record['error']  = '%s: %s' % (type(error).__name__,error)
+            routine_instrumentation.LOGGER.exception('batch job failed')
+        #end-try
+    #end-with
+
+    job_record['hist_mode']     = checkpoint['hist_mode']
+    job_record['chunks']        = checkpoint['chunk_records']
+    job_record['total_seconds'] = time.perf_counter() - str_time
+    job_record['metrics']       = metrics.get_summary()
+    write_json(job_record,os.path.join(output_dir,METRICS_FILE))
+
+    return job_record
+#end-proc
+
+
+def main(argv=None):
+    """
+    Purpose : Command line entry point (python routine_batch_runner.py -h)
+    """
+
+    parser = argparse.ArgumentParser(description='Line-wide PCB Data Association batch job')
+    for station in ('ldr','spr','pp1','pp2'):
+        parser.add_argument('--%s' % (station,),required=True,help='%s event file (Parquet, Arrow IPC or CSV)' % (station.upper(),))
+    #end-for
+    parser.add_argument('--start',required=True,help='Start of the date range (inclusive)')
+    parser.add_argument('--end',required=True,help='End of the date range (exclusive)')
+    parser.add_argument('--output-dir',required=True)
+    parser.add_argument('--stages',nargs='+',choices=list(STAGES),default=list(STAGES))
+    parser.add_argument('--direction',choices=['fwd','rev','both'],default='fwd',help='SPR-PP1 / PP1-PP2 direction (LDR-SPR : rev)')
+    parser.add_argument('--chunk-seconds',type=float,default=CHUNK_SECONDS,help='Checkpoint chunk length [s]')
+    parser.add_argument('--unit-seconds',type=float,default=UNIT_SECONDS,help='Work unit length within a chunk [s]')
+    parser.add_argument('--margin-seconds',type=float,default=MARGIN_SECONDS,help='Margin around the range and chunks [s]')
+    parser.add_argument('--workers',type=int,default=1,help='Worker processes (1 : serial)')
+    parser.add_argument('--sprpp1-min-transit',type=float,default=None)
+    parser.add_argument('--sprpp1-max-transit',type=float,default=None)
+    parser.add_argument('--pp1pp2-min-transit',type=float,default=None)
+    parser.add_argument('--pp1pp2-max-transit',type=float,default=None)
+    parser.add_argument('--sprpp1-weighting',nargs='+',default=None,metavar='NAME_OR_PARAM',
+                        help='SPR-PP1 weighting function NAME [PARAM=VALUE ...] (%s; default %s)'
+                             % (', '.join(routine_weighting_functions.get_weighting_names('sprpp1')),routine_weighting_functions.DEFAULT_WEIGHTING))
+    parser.add_argument('--pp1pp2-weighting',nargs='+',default=None,metavar='NAME_OR_PARAM',
+                        help='PP1-PP2 weighting function NAME [PARAM=VALUE ...] (%s; default %s)'
+                             % (', '.join(routine_weighting_functions.get_weighting_names('pp1pp2')),routine_weighting_functions.DEFAULT_WEIGHTING))
+    parser.add_argument('--hist-mode',type=float,default=None,help='Modal LDR-SPR delay [s] (estimated if not given)')
+    parser.add_argument('--output-format',choices=['parquet','ipc'],default='parquet')
+    parser.add_argument('--resume',action='store_true',help='Skip the chunks completed by a previous run (checkpoint.json)')
+    parser.add_argument('--log-level',default='INFO')
+    args = parser.parse_args(argv)
+
+    for stage in ('sprpp1','pp1pp2'):
+        max_transit_seconds = getattr(args,'%s_max_transit' % (stage,))
+        if (stage in args.stages) and (max_transit_seconds is None):
+            parser.error('--%s-max-transit is required for the %s stage' % (stage,stage))
+        #end-if
+        if (max_transit_seconds is not None) and (max_transit_seconds > args.margin_seconds):
+            parser.error('--margin-seconds must be at least --%s-max-transit' % (stage,))
+        #end-if
+        try:
+            setattr(args,'%s_weighting' % (stage,),routine_weighting_functions.get_weighting_arg(stage,getattr(args,'%s_weighting' % (stage,))))
+        except ValueError as error:
+            parser.error('--%s-weighting : %s' % (stage,error))
+        #end-try
+    #end-for
+    if (args.workers < 1):
+        parser.error('--workers must be at least 1')
+    #end-if
+    if (pd.Timestamp(args.end) <= pd.Timestamp(args.start)):
+        parser.error('--end must be after --start')
+    #end-if
+
+    logging.basicConfig(level=args.log_level.upper(),format='%(asctime)s %(levelname)s %(name)s : %(message)s')
+
+    try:
+        job_record = run_batch_job(get_job_config(args),args.output_dir,args.resume)
+    except (OSError,ValueError) as error:
+        #Output directory or checkpoint unusable (no metrics written)
+        routine_instrumentation.LOGGER.error('batch job not started : %s',error)
+        return 1
+    #end-try
+
+    return 0 if (job_record['status'] == 'completed') else 1
+#end-proc
+
+
+if (__name__ == '__main__'):
+    sys.exit(main())
+#end-if
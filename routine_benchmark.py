@@ -0,0 +1,375 @@
+#******************************************************************************************************************************************
+# TITLE     : ROUTINE_BENCHMARK
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : wall time, peak memory and accuracy of the matchers on synthetic lines
+# 2026-10-18        | CONTRIBUTORS        | Import-time benchmark (fresh interpreter per import)
+# 2026-10-18        | CONTRIBUTORS        | Weighting sweep of the SPR-PP1 / PP1-PP2 matchers (weightings)
+# 2026-10-18        | CONTRIBUTORS        | routine_streaming_matcher and routine_matching_service in IMPORT_MODULES
+#******************************************************************************************************************************************
+
+#Benchmark of the PCB Data Association matchers
+#
+#For every number of boards, a synthetic line is generated (routine_synthetic_line, fixed seed) and every matcher is
+#run on it : rev_ldrspr_matching_algo, fwd/rev_sprpp1_matching_algo and fwd/rev_pp1pp2_matching_algo. Reported per run :
+#
+#    wall_seconds - Best wall time over the repeats (tracemalloc off)
+#    peak_mbytes  - Peak traced memory of one extra run (tracemalloc on; numpy allocations are traced)
+#    precision    - Fraction of the matched pairs that are true pairs
+#    recall       - Fraction of the true pairs (both events present) that are matched
+#
+#The SPR-PP1 and PP1-PP2 weight matrices are dense up to DENSE_MAX_CELLS cells and banded (transit-time window of the
+#generator mean + BAND_NO_OF_STDS std) beyond, unless weight_mtrx is forced to 'dense' or 'band'.
+#
+#    python routine_benchmark.py --sizes 1000 10000 100000 1000000 --output bench.csv
+#
+#The SPR-PP1 and PP1-PP2 matchers are run once per weighting of weightings (routine_weighting_functions); a weighting
+#with a mode_seconds parameter given by name only is centred on the generator transit time (scale : its std).
+#
+#    python routine_benchmark.py --sizes 4320 --weightings inverse_delay gaussian_mode log_likelihood
+#
+#The import benchmark imports every module of IMPORT_MODULES in a fresh interpreter and reports the import wall time,
+#the bytes written to stdout (expected 0) and the heavy modules loaded by the import (HEAVY_MODULES).
+#
+#    python routine_benchmark.py --import-time
+
+import argparse
+import contextlib
+import inspect
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy  as np
+import pandas as pd
+
+import routine_synthetic_line
+import routine_ldrspr_matching_algo
+import routine_sprpp1_matching_algo
+import routine_pp1pp2_matching_algo
+import routine_weighting_functions
+
+#Default numbers of boards
+BENCHMARK_SIZES = (1000,10000,100000,1000000)
+
+#Largest dense weight matrix (cells) in the 'auto' mode
+DENSE_MAX_CELLS = 10**7
+
+#Half width of the transit-time window of the banded weight matrices (in std of the generator transit time)
+BAND_NO_OF_STDS = 6.0
+
+#Modules of the import benchmark
+IMPORT_MODULES = ('pcb_data_association','routine_ldrspr_matching_algo','routine_sprpp1_matching_algo',
+                  'routine_pp1pp2_matching_algo','routine_traceability_pipeline','routine_parallel_execution',
+                  'routine_streaming_matcher','routine_matching_service')
+
+#Modules the matching code should not import eagerly (pandas itself may load csv and pyarrow)
+HEAVY_MODULES = ('matplotlib','scipy','scipy.sparse','scipy.optimize')
+
+IMPORT_COLUMNS = ['module','import_seconds','stdout_bytes','heavy_modules']
+
+BENCHMARK_COLUMNS = ['stage','matcher','no_of_boards','no_of_rows','no_of_cols','weight_mtrx','weighting','wall_seconds','peak_mbytes',
+                     'no_of_matches','precision','recall']
+
+
+def get_pair_accuracy(match_row,match_col,true_row,true_col):
+    """
+    Purpose : Precision and recall of matched (row, col) pairs against the true pairs
+    Inputs  : match_row, match_col - Positions of the matched pairs
+              true_row, true_col   - Positions of the true pairs (-1 : event missing, pair ignored)
+    Output  : precision, recall
+    """
+
+    true_mask = (true_row >= 0) & (true_col >= 0)
+    no_of_cols = int(max(np.max(match_col,initial=0),np.max(true_col,initial=0))) + 1
+
+    match_key = np.asarray(match_row,dtype=np.int64) * no_of_cols + np.asarray(match_col,dtype=np.int64)
+    true_key  = true_row[true_mask].astype(np.int64) * no_of_cols + true_col[true_mask].astype(np.int64)
+
+    no_of_correct = int(np.isin(match_key,true_key).sum())
+    precision = no_of_correct / len(match_key) if (len(match_key) > 0) else np.nan
+    recall    = no_of_correct / len(true_key)  if (len(true_key)  > 0) else np.nan
+
+    return precision,recall
+#end-proc
+
+
+def get_ldrspr_accuracy(matched_df,pcb_level_dfldr,truth_df):
+    """
+    Purpose : Precision and recall of the LDR-SPR matches (loader departure of every SPR event) against the ground truth
+    """
+
+    ldr_dptr_ns = pcb_level_dfldr.dptr_tmstmp.to_numpy().astype(np.int64)
+    ldr_indx    = truth_df.ldr_indx.to_numpy()
+    spr_indx    = truth_df.spr_indx.to_numpy()
+
+    #The matched dataframe gives the loader departure : back to the loader position (departures are sorted)
+    match_mask = (matched_df.spr_special_entry.to_numpy() == 0) & matched_df.ldr_dptr.notna().to_numpy()
+    match_ldr  = np.searchsorted(ldr_dptr_ns,matched_df.ldr_dptr.to_numpy()[match_mask].astype(np.int64))
+    match_spr  = matched_df.spr_indx.to_numpy()[match_mask]
+
+    return get_pair_accuracy(match_spr,match_ldr,spr_indx,ldr_indx)
+#end-proc
+
+
+def get_band_window(transit):
+    """
+    Purpose : Transit-time window (min, max) in seconds covering a (mean, std) generator transit time
+    """
+
+    if callable(transit):
+        return None,None
+    #end-if
+
+    mean,std = transit
+
+    return 0.0,mean + BAND_NO_OF_STDS * std
+#end-proc
+
+
+def get_band_weighting(stage,weighting,transit):
+    """
+    Purpose : weighting= argument of a SPR-PP1 / PP1-PP2 matcher for a benchmark weighting
+    Inputs  : stage     - 'sprpp1' or 'pp1pp2'
+              weighting - Name, (name, params) or WeightFunction
+              transit   - Generator transit time (mean, std) of the stage
+    Output  : weighting - The weighting, with mode_seconds/scale_seconds set from transit when only a name is given
+    """
+
+    if isinstance(weighting,str) and (not callable(transit)):
+        params = routine_weighting_functions.get_weighting_params(stage,weighting)
+        if ('mode_seconds' in params):
+            mean,std = transit
+            return (weighting,{'mode_seconds' : mean,'scale_seconds' : std})
+        #end-if
+    #end-if
+
+    return weighting
+#end-proc
+
+
+def run_timed(run_fn,no_of_repeats,trace_memory,quiet):
+    """
+    Purpose : Best wall time over the repeats and peak traced memory of run_fn()
+    Output  : result       - Return value of the last run
+              wall_seconds - Best wall time [s]
+              peak_mbytes  - Peak traced memory [MiB] (NaN if not traced)
+    """
+
+    with open(os.devnull,'w') as devnull:
+        with (contextlib.redirect_stdout(devnull) if (quiet) else contextlib.nullcontext()):
+            wall_seconds = np.inf
+            for repeat in range(no_of_repeats):
+                str_time = time.perf_counter()
+                result   = run_fn()
+                wall_seconds = min(wall_seconds,time.perf_counter() - str_time)
+            #end-for
+
+            peak_mbytes = np.nan
+            if (trace_memory):
+                tracemalloc.start()
+                try:
+                    result = run_fn()
+                    peak_mbytes = tracemalloc.get_traced_memory()[1] / 2**20
+                finally:
+                    tracemalloc.stop()
+                #end-try
+            #end-if
+        #end-with
+    #end-with
+
+    return result,wall_seconds,peak_mbytes
+#end-proc
+
+
+def run_benchmark(sizes=BENCHMARK_SIZES,seed=0,no_of_repeats=1,trace_memory=True,weight_mtrx='auto',
+                  stages=('ldrspr','sprpp1','pp1pp2'),quiet=True,weightings=(None,),**line_kwargs):
+    """
+    Purpose : Benchmark the matchers on synthetic lines of increasing size
+    Inputs  : sizes         - Numbers of boards
+              seed          - Seed of the synthetic lines
+              no_of_repeats - Timed runs per matcher (best one reported)
+              trace_memory  - Measure the peak memory (one extra run under tracemalloc)
+              weight_mtrx   - 'auto', 'dense' or 'band' (SPR-PP1 and PP1-PP2)
+              stages        - Stages to benchmark ('ldrspr', 'sprpp1', 'pp1pp2')
+              quiet         - Silence the progress prints of the matchers
+              weightings    - Weightings of the SPR-PP1 and PP1-PP2 matchers (see get_band_weighting; None : default)
+              line_kwargs   - Arguments of routine_synthetic_line.gen_synthetic_line
+    Output  : bench_df      - One row per (size, matcher) (BENCHMARK_COLUMNS)
+    """
+
+    if (weight_mtrx not in ('auto','dense','band')):
+        raise ValueError("weight_mtrx must be 'auto', 'dense' or 'band', got %r" % (weight_mtrx,))
+    #end-if
+
+    line_parms = inspect.signature(routine_synthetic_line.gen_synthetic_line).parameters
+    transits = {
+        'sprpp1' : line_kwargs.get('sprpp1_transit',line_parms['sprpp1_transit'].default),
+        'pp1pp2' : line_kwargs.get('pp1pp2_transit',line_parms['pp1pp2_transit'].default),
+        }
+    sprpp1_window = get_band_window(transits['sprpp1'])
+    pp1pp2_window = get_band_window(transits['pp1pp2'])
+
+    bench_rows = []
+    for no_of_boards in sizes:
+        dfldr,dfspr,dfpp1,dfpp2,truth_df = routine_synthetic_line.gen_synthetic_line(no_of_boards,seed,**line_kwargs)
+
+        cases = []
+        if ('ldrspr' in stages):
+            cases.append(('ldrspr','rev_ldrspr_matching_algo',dfldr,dfspr,None,None))
+        #end-if
+        for weighting in weightings:
+            if ('sprpp1' in stages):
+                weighting_arg = get_band_weighting('sprpp1',weighting,transits['sprpp1'])
+                cases.append(('sprpp1','fwd_sprpp1_matching_algo',dfspr,dfpp1,sprpp1_window,weighting_arg))
+                cases.append(('sprpp1','rev_sprpp1_matching_algo',dfspr,dfpp1,sprpp1_window,weighting_arg))
+            #end-if
+            if ('pp1pp2' in stages):
+                weighting_arg = get_band_weighting('pp1pp2',weighting,transits['pp1pp2'])
+                cases.append(('pp1pp2','fwd_pp1pp2_matching_algo',dfpp1,dfpp2,pp1pp2_window,weighting_arg))
+                cases.append(('pp1pp2','rev_pp1pp2_matching_algo',dfpp1,dfpp2,pp1pp2_window,weighting_arg))
+            #end-if
+        #end-for
+
+        for stage,matcher,df_a,df_b,window,weighting in cases:
+            mtrx_kind      = None
+            weighting_name = None
+            if (stage == 'ldrspr'):
+                run_fn = lambda: routine_ldrspr_matching_algo.rev_ldrspr_matching_algo(df_a,df_b)
+            else:
+                mtrx_kind = weight_mtrx
+                if (mtrx_kind == 'auto'):
+                    mtrx_kind = 'dense' if (len(df_a) * len(df_b) <= DENSE_MAX_CELLS) or (window[1] is None) else 'band'
+                #end-if
+                min_transit_seconds,max_transit_seconds = window if (mtrx_kind == 'band') else (None,None)
+                module = routine_sprpp1_matching_algo if (stage == 'sprpp1') else routine_pp1pp2_matching_algo
+                weighting_name = routine_weighting_functions.get_weighting(stage,weighting).name
+                run_fn = lambda: getattr(module,matcher)(df_a,df_b,min_transit_seconds,max_transit_seconds,weighting=weighting)
+            #end-if
+
+            matched_df,wall_seconds,peak_mbytes = run_timed(run_fn,no_of_repeats,trace_memory,quiet)
+
+            if (stage == 'ldrspr'):
+                precision,recall = get_ldrspr_accuracy(matched_df,df_a,truth_df)
+            elif (stage == 'sprpp1'):
+                precision,recall = get_pair_accuracy(matched_df.spr_indx.to_numpy(),matched_df.pp1_indx.to_numpy(),
+                                                     truth_df.spr_indx.to_numpy(),truth_df.pp1_indx.to_numpy())
+            else:
+                precision,recall = get_pair_accuracy(matched_df.pp1_indx.to_numpy(),matched_df.pp2_indx.to_numpy(),
+                                                     truth_df.pp1_indx.to_numpy(),truth_df.pp2_indx.to_numpy())
+            #end-if
+
+            bench_rows.append([stage,matcher,no_of_boards,len(df_a),len(df_b),mtrx_kind,weighting_name,wall_seconds,peak_mbytes,
+                               len(matched_df),precision,recall])
+        #end-for
+    #end-for
+
+    return pd.DataFrame(bench_rows,columns=BENCHMARK_COLUMNS)
+#end-proc
+
+
+def get_import_stats(module_name):
+    """
+    Purpose : Import a module in a fresh interpreter
+    Inputs  : module_name   - Module to import
+    Output  : import_secs   - Wall time of the import [s]
+              stdout_bytes  - Bytes written to stdout by the import
+              heavy_modules - HEAVY_MODULES loaded by the import
+    """
+
+    code = ('import sys,time,json,io\n'
+            'stdout = sys.stdout\n'
+            'sys.stdout = io.StringIO()\n'
+            'str_time = time.perf_counter()\n'
+            'import %s\n'
+            'import_secs = time.perf_counter() - str_time\n'
+            'stdout_bytes = len(sys.stdout.getvalue())\n'
+            'sys.stdout = stdout\n'
+            'print(json.dumps([import_secs,stdout_bytes,[m for m in %r if m in sys.modules]]))\n') % (module_name,HEAVY_MODULES)
+
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join([os.path.dirname(os.path.abspath(__file__))] + ([env['PYTHONPATH']] if ('PYTHONPATH' in env) else []))
+
+    result = subprocess.run([sys.executable,'-c',code],env=env,capture_output=True,text=True,check=True)
+    import_secs,stdout_bytes,heavy_modules = json.loads(result.stdout.strip().splitlines()[-1])
+
+    return import_secs,stdout_bytes,heavy_modules
+#end-proc
+
+
+def run_import_benchmark(modules=IMPORT_MODULES,no_of_repeats=3):
+    """
+    Purpose : Import-time benchmark (best of no_of_repeats fresh interpreters per module)
+    Output  : import_df - One row per module (IMPORT_COLUMNS)
+    """
+
+    import_rows = []
+    for module_name in modules:
+        import_secs = np.inf
+        for repeat in range(no_of_repeats):
+            secs,stdout_bytes,heavy_modules = get_import_stats(module_name)
+            import_secs = min(import_secs,secs)
+        #end-for
+        import_rows.append([module_name,import_secs,stdout_bytes,' '.join(heavy_modules)])
+    #end-for
+
+    return pd.DataFrame(import_rows,columns=IMPORT_COLUMNS)
+#end-proc
+
+
+def main(argv=None):
+    """
+    Purpose : Command line entry point (python routine_benchmark.py -h)
+    """
+
+    parser = argparse.ArgumentParser(description='Benchmark of the PCB Data Association matchers on synthetic lines')
+    parser.add_argument('--sizes',type=int,nargs='+',default=list(BENCHMARK_SIZES),help='Numbers of boards')
+    parser.add_argument('--seed',type=int,default=0,help='Seed of the synthetic lines')
+    parser.add_argument('--repeats',type=int,default=1,help='Timed runs per matcher (best one reported)')
+    parser.add_argument('--no-memory',action='store_true',help='Do not measure the peak memory')
+    parser.add_argument('--weight-mtrx',choices=['auto','dense','band'],default='auto',help='SPR-PP1 / PP1-PP2 weight matrix')
+    parser.add_argument('--stages',nargs='+',choices=['ldrspr','sprpp1','pp1pp2'],default=['ldrspr','sprpp1','pp1pp2'])
+    parser.add_argument('--weightings',nargs='+',default=[routine_weighting_functions.DEFAULT_WEIGHTING],
+                        help='SPR-PP1 / PP1-PP2 weightings (%s)' % ', '.join(routine_weighting_functions.get_weighting_names('sprpp1')))
+    parser.add_argument('--double-load-rate',type=float,default=0.02)
+    parser.add_argument('--drop-rate',type=float,default=0.01)
+    parser.add_argument('--weightage-noise',type=float,default=0.05)
+    parser.add_argument('--output',default=None,help='CSV file of the results')
+    parser.add_argument('--import-time',action='store_true',help='Run the import benchmark instead')
+    args = parser.parse_args(argv)
+
+    if (args.import_time):
+        bench_df = run_import_benchmark(no_of_repeats=max(args.repeats,3))
+    else:
+        bench_df = run_benchmark(args.sizes,args.seed,args.repeats,not args.no_memory,args.weight_mtrx,args.stages,
+                                 weightings=args.weightings,
+                                 double_load_rate=args.double_load_rate,drop_rate=args.drop_rate,
+                                 weightage_noise=args.weightage_noise)
+    #end-if
+
+    with pd.option_context('display.width',200,'display.max_columns',None):
+        print(bench_df.to_string(index=False))
+    #end-with
+    if (args.output is not None):
+        bench_df.to_csv(args.output,index=False)
+    #end-if
+
+    return 0
+#end-proc
+
+
+if (__name__ == '__main__'):
+    sys.exit(main())
+#end-if
@@ -0,0 +1,366 @@
+#******************************************************************************************************************************************
+# TITLE     : ROUTINE_CHUNKED_EXECUTION
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : time-partitioned LDR-SPR, SPR-PP1 and PP1-PP2 matching
+# 2026-10-18        | CONTRIBUTORS        | Pluggable weighting function (weighting=) for SPR-PP1 and PP1-PP2
+# 2026-10-18        | CONTRIBUTORS        | StationEventIndex inputs; chunks sliced from the index (no per-chunk conversion)
+#******************************************************************************************************************************************
+
+#Chunked (time-partitioned) PCB Data Association
+#
+#The history is split into fixed time chunks (e.g. chunk_seconds=3600 for hourly, 8*3600 for a shift), aligned on
+#multiples of chunk_seconds since the epoch. The existing matchers run on one chunk at a time, so the weight matrix
+#(and the peak memory) is bounded by the events of a chunk plus its overlap margin, not by the history length.
+#
+#Stitching at the chunk boundaries is by ownership, so no match is produced twice :
+#  - SPR-PP1 / PP1-PP2 forward : a chunk owns the rows (departures) inside it and receives the columns (arrivals) up to
+#    max_transit_seconds past its end. Every candidate of an owned row is present, so its argmax is the one of the
+#    unchunked run.
+#  - SPR-PP1 / PP1-PP2 reverse : a chunk owns the columns (arrivals) inside it and receives the rows (departures) from
+#    max_transit_seconds before its start.
+#  - LDR-SPR : a chunk owns the SPR events inside it and receives the preceding SPR event (dropped from the output)
+#    and the loader events of the owned intervals. hist_mode is estimated once over the whole history.
+#
+#The output (indices are positions in the full input dataframes) equals fwd_*/rev_* called with the same
+#min/max_transit_seconds and weighting, and rev_ldrspr_matching_algo when the SPR departures are sorted.
+#
+#The inputs may be the PCB level dataframes or their routine_station_index.StationEventIndex. The stations are
+#converted once and every chunk is a slice of the index (StationEventIndex.get_subset), so no chunk converts again.
+
+import numpy  as np
+import pandas as pd
+
+import routine_station_index
+import routine_ldrspr_matching_algo
+import routine_sprpp1_matching_algo
+import routine_pp1pp2_matching_algo
+
+
+def get_time_chunks(str_ns,end_ns,chunk_seconds):
+    """
+    Purpose : Split the time range [str_ns, end_ns] into chunks aligned on multiples of chunk_seconds
+    Inputs  : str_ns        - int64 ns start of the range
+              end_ns        - int64 ns end of the range (inclusive)
+              chunk_seconds - Length of a chunk in seconds
+    Output  : chunk_bounds  - int64 array of shape (no_of_chunks, 2) : [chunk_str, chunk_end) in ns
+    """
+
+    if (chunk_seconds is None) or (chunk_seconds <= 0):
+        raise ValueError('chunk_seconds must be positive, got %r' % (chunk_seconds,))
+    #end-if
+
+    chunk_ns  = int(round(chunk_seconds * 1e9))
+    chunk_str = (int(str_ns) // chunk_ns) * chunk_ns
+    chunk_end = (int(end_ns) // chunk_ns + 1) * chunk_ns
+
+    chunk_edges = np.arange(chunk_str,chunk_end + 1,chunk_ns,dtype=np.int64)
+
+    return np.column_stack([chunk_edges[:-1],chunk_edges[1:]])
+#end-proc
+
+
+def get_sorted_tmstmp(tmstmp_ns):
+    """
+    Purpose : Sort the valid (non-NaT) timestamps once for the window lookups
+    Inputs  : tmstmp_ns  - int64 ns timestamps
+    Output  : tmstmp_srt - Sorted valid timestamps
+              srt_order  - Positions of tmstmp_srt in tmstmp_ns
+    """
+
+    return routine_station_index.get_sorted_tmstmp(tmstmp_ns)
+#end-proc
+
+
+def get_band_chunk_windows(row_srt,col_srt,chunk_seconds,min_transit_seconds,max_transit_seconds,direction):
+    """
+    Purpose : Rows and columns of every non-empty chunk of a banded matcher, as ranges on the sorted timestamps
+    Inputs  : row_srt             - Sorted int64 ns row timestamps (departure from the first station)
+              col_srt             - Sorted int64 ns column timestamps (arrival at the second station)
+              chunk_seconds       - Length of a chunk in seconds
+              min_transit_seconds - Minimum transit time (None : 0)
+              max_transit_seconds - Maximum transit time (the overlap margin between chunks)
+              direction           - 'fwd' (chunks own the rows) or 'rev' (chunks own the columns)
+    Output  : chunk_windows       - int64 array of shape (no_of_chunks, 4) : row_lo, row_hi, col_lo, col_hi
+    """
+
+    if (max_transit_seconds is None):
+        raise ValueError('max_transit_seconds is required for chunked matching')
+    #end-if
+    if (direction not in ('fwd','rev')):
+        raise ValueError("direction must be 'fwd' or 'rev', got %r" % (direction,))
+    #end-if
+
+    if (len(row_srt) == 0) or (len(col_srt) == 0):
+        return np.zeros((0,4),dtype=np.int64)
+    #end-if
+
+    #Same rounding as routine_weight_kernel.get_band_pairs, so the windows hold every candidate of the band
+    min_ns = 0 if (min_transit_seconds is None) else int(round(min_transit_seconds * 1e9))
+    max_ns = int(round(max_transit_seconds * 1e9))
+
+    if (direction == 'fwd'):
+        chunk_bounds = get_time_chunks(row_srt[0],row_srt[-1],chunk_seconds)
+        row_str,row_end = chunk_bounds[:,0],chunk_bounds[:,1]
+        col_str,col_end = chunk_bounds[:,0] + min_ns,chunk_bounds[:,1] + max_ns
+    else:
+        chunk_bounds = get_time_chunks(col_srt[0],col_srt[-1],chunk_seconds)
+        col_str,col_end = chunk_bounds[:,0],chunk_bounds[:,1]
+        row_str,row_end = chunk_bounds[:,0] - max_ns,chunk_bounds[:,1] - min_ns
+    #end-if
+
+    chunk_windows = np.column_stack([np.searchsorted(row_srt,row_str,side='left'),
+                                     np.searchsorted(row_srt,row_end,side='left'),
+                                     np.searchsorted(col_srt,col_str,side='left'),
+                                     np.searchsorted(col_srt,col_end,side='left')]).astype(np.int64)
+
+    non_empty = (chunk_windows[:,1] > chunk_windows[:,0]) & (chunk_windows[:,3] > chunk_windows[:,2])
+
+    return chunk_windows[non_empty]
+#end-proc
+
+
+def get_band_chunk_matches(match_fn,row_pos,col_pos,row_col,col_col):
+    """
+    Purpose : Run a banded matcher on one chunk and map its indices back to the full inputs
+    Inputs  : match_fn   - match_fn(row_pos,col_pos) : matched dataframe of the sliced inputs
+              row_pos    - Ascending positions of the chunk rows in the full inputs
+              col_pos    - Ascending positions of the chunk columns in the full inputs
+              row_col    - Name of the row index column in the matched dataframe
+              col_col    - Name of the column index column in the matched dataframe
+    Output  : chunk_df   - Matched dataframe of the chunk, indices are positions in the full inputs
+    """
+
+    chunk_df = match_fn(row_pos,col_pos)
+
+    chunk_df[row_col] = row_pos[chunk_df[row_col].to_numpy()]
+    chunk_df[col_col] = col_pos[chunk_df[col_col].to_numpy()]
+
+    return chunk_df
+#end-proc
+
+
+def stitch_chunk_matches(chunk_df_list,own_col):
+    """
+    Purpose : Merge the chunk results (every match is owned by exactly one chunk) in the order of the owned index
+    Inputs  : chunk_df_list - Matched dataframes of the chunks, in chunk order (at least one)
+              own_col       - Name of the owned index column (row index : 'fwd', column index : 'rev')
+    Output  : matched_df    - Stitched matched dataframe
+    """
+
+    matched_df = pd.concat(chunk_df_list,ignore_index=True)
+    matched_df = matched_df.sort_values(by=own_col,kind='stable',ignore_index=True)
+
+    return matched_df
+#end-proc
+
+
+def run_band_chunks(row_tmstmp_srt,col_tmstmp_srt,match_fn,row_col,col_col,chunk_seconds,
+                    min_transit_seconds,max_transit_seconds,direction):
+    """
+    Purpose : Run a banded matcher chunk by chunk and stitch the chunk results by ownership
+    Inputs  : row_tmstmp_srt      - Sorted row timestamps and their positions (departure from the first station,
+                                    get_sorted_tmstmp)
+              col_tmstmp_srt      - Sorted column timestamps and their positions (arrival at the second station)
+              match_fn            - match_fn(row_pos,col_pos) : matched dataframe of the sliced inputs
+              row_col             - Name of the row index column in the matched dataframe
+              col_col             - Name of the column index column in the matched dataframe
+              chunk_seconds       - Length of a chunk in seconds
+              min_transit_seconds - Minimum transit time (None : 0)
+              max_transit_seconds - Maximum transit time (the overlap margin between chunks)
+              direction           - 'fwd' (chunks own the rows) or 'rev' (chunks own the columns)
+    Output  : matched_df          - Stitched matched dataframe, indices are positions in the full inputs
+    """
+
+    row_srt,row_order = row_tmstmp_srt
+    col_srt,col_order = col_tmstmp_srt
+
+    chunk_windows = get_band_chunk_windows(row_srt,col_srt,chunk_seconds,min_transit_seconds,max_transit_seconds,direction)
+
+    if (len(chunk_windows) == 0):
+        return match_fn(np.zeros(0,dtype=np.int64),np.zeros(0,dtype=np.int64))
+    #end-if
+
+    chunk_df_list = []
+    for row_lo,row_hi,col_lo,col_hi in chunk_windows:
+        row_pos  = np.sort(row_order[row_lo:row_hi])
+        col_pos  = np.sort(col_order[col_lo:col_hi])
+        chunk_df = get_band_chunk_matches(match_fn,row_pos,col_pos,row_col,col_col)
+        chunk_df_list.append(chunk_df)
+    #end-for
+
+    return stitch_chunk_matches(chunk_df_list,row_col if (direction == 'fwd') else col_col)
+#end-proc
+
+
+#==============================================================================================
+"""SPR-PP1 and PP1-PP2"""
+
+def chunked_sprpp1_matching(pcb_level_dfspr,pcb_level_dfpp1,chunk_seconds,max_transit_seconds,min_transit_seconds=None,
+                            direction='fwd',weighting=None):
+    """
+    Purpose : SPR-PP1 matching chunk by chunk (equal to fwd/rev_sprpp1_matching_algo with the same transit window)
+    Inputs  : pcb_level_dfspr     - The PCB level dataframe corresponding to screen printer
+              pcb_level_dfpp1     - The PCB level dataframe corresponding to PP1
+              chunk_seconds       - Length of a chunk in seconds (e.g. 3600 : hourly)
+              max_transit_seconds - Maximum SPR departure to PP1 arrival time (overlap margin between chunks)
+              min_transit_seconds - (Optional) Minimum SPR departure to PP1 arrival time
+              direction           - 'fwd' or 'rev'
+              weighting           - (Optional) Weighting function (routine_weighting_functions.get_weighting)
+    Output  : matched_df          - The dataframe that contains the matched PCBs
+    """
+
+    if (direction == 'fwd'):
+        matching_algo = routine_sprpp1_matching_algo.fwd_sprpp1_matching_algo
+    else:
+        matching_algo = routine_sprpp1_matching_algo.rev_sprpp1_matching_algo
+    #end-if
+
+    spr_index = routine_station_index.get_station_index(pcb_level_dfspr,'spr')
+    pp1_index = routine_station_index.get_station_index(pcb_level_dfpp1,'pp1')
+
+    def match_fn(spr_pos,pp1_pos):
+        return matching_algo(spr_index.get_subset(spr_pos),pp1_index.get_subset(pp1_pos),
+                             min_transit_seconds,max_transit_seconds,weighting=weighting)
+    #end-proc
+
+    return run_band_chunks(spr_index.get_sorted_tmstmp('dptr_tmstmp'),pp1_index.get_sorted_tmstmp('arvl_tmstmp'),match_fn,'spr_indx','pp1_indx',chunk_seconds,
+                           min_transit_seconds,max_transit_seconds,direction)
+#end-proc
+
+
+def chunked_pp1pp2_matching(pcb_level_dfone,pcb_level_dftwo,chunk_seconds,max_transit_seconds,min_transit_seconds=None,
+                            direction='fwd',weighting=None):
+    """
+    Purpose : PP1-PP2 matching chunk by chunk (equal to fwd/rev_pp1pp2_matching_algo with the same transit window)
+    Inputs  : pcb_level_dfone     - The PCB level dataframe corresponding to first machine (PP1)
+              pcb_level_dftwo     - The PCB level dataframe corresponding to second machine (PP2)
+              chunk_seconds       - Length of a chunk in seconds (e.g. 3600 : hourly)
+              max_transit_seconds - Maximum PP1 departure to PP2 arrival time (overlap margin between chunks)
+              min_transit_seconds - (Optional) Minimum PP1 departure to PP2 arrival time
+              direction           - 'fwd' or 'rev'
+              weighting           - (Optional) Weighting function (routine_weighting_functions.get_weighting)
+    Output  : matched_df          - The dataframe that contains the matched PCBs
+    """
+
+    if (direction == 'fwd'):
+        matching_algo = routine_pp1pp2_matching_algo.fwd_pp1pp2_matching_algo
+    else:
+        matching_algo = routine_pp1pp2_matching_algo.rev_pp1pp2_matching_algo
+    #end-if
+
+    one_index = routine_station_index.get_station_index(pcb_level_dfone,'pp1')
+    two_index = routine_station_index.get_station_index(pcb_level_dftwo,'pp2')
+
+    def match_fn(one_pos,two_pos):
+        return matching_algo(one_index.get_subset(one_pos),two_index.get_subset(two_pos),
+                             min_transit_seconds,max_transit_seconds,weighting=weighting)
+    #end-proc
+
+    return run_band_chunks(one_index.get_sorted_tmstmp('dptr_tmstmp'),two_index.get_sorted_tmstmp('arvl_tmstmp'),match_fn,'pp1_indx','pp2_indx',chunk_seconds,
+                           min_transit_seconds,max_transit_seconds,direction)
+#end-proc
+
+
+#==============================================================================================
+"""LDR-SPR"""
+
+def get_ldrspr_chunk_windows(ldr_srt,spr_dptr_ns,chunk_seconds):
+    """
+    Purpose : SPR and loader events of every non-empty LDR-SPR chunk (sorted SPR departures)
+    Inputs  : ldr_srt       - Sorted int64 ns loader departures (NaT excluded)
+              spr_dptr_ns   - Sorted int64 ns SPR departures
+              chunk_seconds - Length of a chunk in seconds
+    Output  : chunk_windows - int64 array of shape (no_of_chunks, 5) : spr_lo, spr_hi (SPR positions, guard included),
+                              ldr_lo, ldr_hi (range on ldr_srt) and guard (1 if spr_lo is the preceding SPR event)
+    """
+
+    chunk_bounds = get_time_chunks(spr_dptr_ns[0],spr_dptr_ns[-1],chunk_seconds)
+    spr_edges    = np.append(np.searchsorted(spr_dptr_ns,chunk_bounds[:,0],side='left'),len(spr_dptr_ns))
+
+    spr_str = spr_edges[:-1]
+    spr_end = spr_edges[1:]
+    owned   = (spr_end > spr_str)
+    spr_str = spr_str[owned]
+    spr_end = spr_end[owned]
+
+    #Preceding SPR event (guard) closes the first owned interval
+    guard  = (spr_str > 0).astype(np.int64)
+    spr_lo = spr_str - guard
+
+    #Loader events of the owned intervals : (spr_dptr[spr_str-1], spr_dptr[spr_end-1])
+    ldr_lo = np.where(guard == 1,np.searchsorted(ldr_srt,spr_dptr_ns[spr_lo],side='right'),0)
+    ldr_hi = np.searchsorted(ldr_srt,spr_dptr_ns[spr_end - 1],side='left')
+
+    return np.column_stack([spr_lo,spr_end,ldr_lo,np.maximum(ldr_hi,ldr_lo),guard]).astype(np.int64)
+#end-proc
+
+
+def get_ldrspr_chunk_matches(chunk_dfldr,chunk_dfspr,spr_offset,guard,hist_mode):
+    """
+    Purpose : Run rev_ldrspr_matching_algo on one chunk and map the SPR index back to the full input
+    Inputs  : chunk_dfldr - Loader events of the chunk (dataframe or StationEventIndex)
+              chunk_dfspr - SPR events of the chunk (guard included)
+              spr_offset  - Position of the first SPR event of the chunk in the full input
+              guard       - 1 if the first SPR event of the chunk is the guard (dropped from the output)
+              hist_mode   - Modal LDR-SPR delay
+    Output  : chunk_df    - Matched dataframe of the chunk, spr_indx are positions in the full input
+    """
+
+    chunk_df = routine_ldrspr_matching_algo.rev_ldrspr_matching_algo(chunk_dfldr,chunk_dfspr,hist_mode)
+    chunk_df = chunk_df[chunk_df.spr_indx.to_numpy() >= guard]
+    chunk_df = chunk_df.assign(spr_indx=chunk_df.spr_indx.to_numpy() + spr_offset)
+
+    return chunk_df
+#end-proc
+
+
+def chunked_ldrspr_matching(pcb_level_dfldr,pcb_level_dfspr,chunk_seconds,hist_mode=None):
+    """
+    Purpose : LDR-SPR matching chunk by chunk (equal to rev_ldrspr_matching_algo for sorted SPR departures)
+    Inputs  : pcb_level_dfldr - The PCB level dataframe corresponding to loader
+              pcb_level_dfspr - The PCB level dataframe corresponding to screen printer
+              chunk_seconds   - Length of a chunk in seconds (e.g. 3600 : hourly)
+              hist_mode       - (Optional) Modal LDR-SPR delay; estimated once over the whole history if not given
+    Output  : matched_df      - The dataframe that contains the matched PCBs
+    """
+
+    ldr_index = routine_station_index.get_station_index(pcb_level_dfldr,'ldr')
+    spr_index = routine_station_index.get_station_index(pcb_level_dfspr,'spr')
+
+    spr_dptr_ns = spr_index.get_column('dptr_tmstmp')
+
+    if (hist_mode is None):
+        hist_mode = routine_ldrspr_matching_algo.get_ldrspr_hist_mode(ldr_index,spr_index)
+    #end-if
+
+    #The SPR intervals follow the row order; they are time chunks only for sorted SPR departures
+    if (not spr_index.is_sorted('dptr_tmstmp')) or (len(spr_dptr_ns) == 0):
+        return routine_ldrspr_matching_algo.rev_ldrspr_matching_algo(ldr_index,spr_index,hist_mode)
+    #end-if
+
+    ldr_srt,ldr_order = ldr_index.get_sorted_tmstmp('dptr_tmstmp')
+
+    chunk_windows = get_ldrspr_chunk_windows(ldr_srt,spr_dptr_ns,chunk_seconds)
+
+    chunk_df_list = []
+    for spr_lo,spr_hi,ldr_lo,ldr_hi,guard in chunk_windows:
+        chunk_df = get_ldrspr_chunk_matches(ldr_index.get_subset(np.sort(ldr_order[ldr_lo:ldr_hi])),
+                                            spr_index.get_subset(slice(spr_lo,spr_hi)),
+                                            spr_lo,guard,hist_mode)
+        chunk_df_list.append(chunk_df)
+    #end-for
+
+    matched_df = pd.concat(chunk_df_list,ignore_index=True)
+
+    return matched_df
+#end-proc
@@ -0,0 +1,175 @@
+#******************************************************************************************************************************************
+# TITLE     : ROUTINE_DELAY_HISTOGRAM
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : vectorized (and incremental) delay histogram and modal delay
+#******************************************************************************************************************************************
+
+#Delay distribution estimator
+#
+#The delays (in seconds) are binned on [bin_origin + k*bin_width, bin_origin + (k+1)*bin_width) with np.bincount; the
+#modal delay is the center of the most populated bin (the lowest one on ties). NaN delays are ignored.
+#DelayHistogram keeps the bin counts between calls, so a streaming or rolling run adds (and removes) only the new
+#delays instead of rebuilding the histogram.
+
+import numpy  as np
+import pandas as pd
+
+#Default binning of the LDR-SPR delays
+HIST_BIN_ORIGIN = 0.0
+HIST_BIN_WIDTH  = 0.5
+
+
+class DelayHistogram(object):
+    """
+    Purpose : Incremental fixed-width histogram of delays
+    """
+
+    def __init__(self,bin_width=HIST_BIN_WIDTH,bin_origin=HIST_BIN_ORIGIN):
+        """
+        Purpose : Initialize an empty histogram
+        Inputs  : bin_width  - Bin width [s]
+                  bin_origin - Left edge of bin 0 [s]
+        """
+
+        if (bin_width is None) or (bin_width <= 0):
+            raise ValueError('bin_width must be positive, got %r' % (bin_width,))
+        #end-if
+
+        self.bin_width  = bin_width
+        self.bin_origin = bin_origin
+        self.bin_lo     = 0                             #Bin number of counts[0]
+        self.counts     = np.zeros(0,dtype=np.int64)
+    #end-proc
+
+    def get_bin_indx(self,delays):
+        """
+        Purpose : Bin numbers of the (non-NaN) delays
+        """
+
+        delays = np.asarray(delays,dtype=np.float64)
+        delays = delays[~np.isnan(delays)]
+
+        return np.floor((delays - self.bin_origin) / self.bin_width).astype(np.int64)
+    #end-proc
+
+    def add_delays(self,delays):
+        """
+        Purpose : Add delays to the histogram
+        Inputs  : delays - Delays [s] (array or Series)
+        Output  : None
+        """
+
+        bin_indx = self.get_bin_indx(delays)
+        if (len(bin_indx) == 0):
+            return
+        #end-if
+
+        if (len(self.counts) == 0):
+            bin_lo = int(bin_indx.min())
+            bin_hi = int(bin_indx.max())
+        else:
+            bin_lo = min(self.bin_lo,int(bin_indx.min()))
+            bin_hi = max(self.bin_lo + len(self.counts) - 1,int(bin_indx.max()))
+        #end-if
+
+        counts = np.bincount(bin_indx - bin_lo,minlength=bin_hi - bin_lo + 1).astype(np.int64)
+        counts[self.bin_lo - bin_lo:self.bin_lo - bin_lo + len(self.counts)] += self.counts
+
+        self.bin_lo = bin_lo
+        self.counts = counts
+    #end-proc
+
+    def remove_delays(self,delays):
+        """
+        Purpose : Remove delays previously added (rolling window)
+        Inputs  : delays - Delays [s] (array or Series)
+        Output  : None
+        """
+
+        bin_indx = self.get_bin_indx(delays) - self.bin_lo
+        if (len(bin_indx) == 0):
+            return
+        #end-if
+
+        if (bin_indx.min() < 0) or (bin_indx.max() >= len(self.counts)):
+            raise ValueError('delays to remove are not in the histogram')
+        #end-if
+        counts = self.counts - np.bincount(bin_indx,minlength=len(self.counts))
+        if np.any(counts < 0):
+            raise ValueError('delays to remove are not in the histogram')
+        #end-if
+
+        self.counts = counts
+    #end-proc
+
+    def get_no_of_delays(self):
+        """
+        Purpose : Number of delays in the histogram
+        """
+        return int(self.counts.sum())
+    #end-proc
+
+    def get_mode(self):
+        """
+        Purpose : Modal delay : center of the most populated bin (lowest bin on ties), NaN if empty
+        """
+
+        if (self.get_no_of_delays() == 0):
+            return np.nan
+        #end-if
+        mode_bin = self.bin_lo + int(np.argmax(self.counts))
+
+        return self.bin_origin + (mode_bin + 0.5) * self.bin_width
+    #end-proc
+
+    def get_hist_df(self):
+        """
+        Purpose : Histogram as a dataframe (bin_left, bin_right, bin_count), from the first to the last non-empty bin
+        """
+
+        non_empty = np.flatnonzero(self.counts)
+        if (len(non_empty) == 0):
+            bin_nums = np.zeros(0,dtype=np.int64)
+            counts   = np.zeros(0,dtype=np.int64)
+        else:
+            bin_nums = np.arange(non_empty[0],non_empty[-1] + 1)
+            counts   = self.counts[bin_nums]
+            bin_nums = bin_nums + self.bin_lo
+        #end-if
+
+        hist_df = pd.DataFrame({
+            'bin_left'  : self.bin_origin + bin_nums * self.bin_width,
+            'bin_right' : self.bin_origin + (bin_nums + 1) * self.bin_width,
+            'bin_count' : counts,
+            },columns=['bin_left','bin_right','bin_count'])
+
+        return hist_df
+    #end-proc
+#end-class
+
+
+def get_mode(delay_srs,bin_origin=HIST_BIN_ORIGIN,bin_width=HIST_BIN_WIDTH):
+    """
+    Purpose : Histogram and modal delay of a set of delays
+    Inputs  : delay_srs  - Delays [s] (Series or array)
+              bin_origin - Left edge of bin 0 [s]
+              bin_width  - Bin width [s]
+    Output  : hist_df    - Histogram (bin_left, bin_right, bin_count)
+              hist_mode  - Center of the most populated bin, NaN if there is no delay
+    """
+
+    delay_hist = DelayHistogram(bin_width,bin_origin)
+    delay_hist.add_delays(delay_srs)
+
+    return delay_hist.get_hist_df(),delay_hist.get_mode()
+#end-proc
@@ -0,0 +1,299 @@
+#******************************************************************************************************************************************
+# TITLE     : ROUTINE_EVENT_IO
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : Parquet / Arrow IPC readers and writers of event and matched tables
+# 2026-10-18        | CONTRIBUTORS        | IPC : memory map closed after the read, time range applied per record batch
+#******************************************************************************************************************************************
+
+#Columnar I/O of the PCB level event tables and of the matched tables (requires pyarrow)
+#
+#Formats (from the file extension, or file_format) : 'parquet' (.parquet, .pq) and 'ipc' (Arrow IPC file : .arrow,
+#.feather, .ipc). Only the requested columns are read; timestamps are returned as datetime64[ns] and weightage as float64.
+#IPC files are memory-mapped (the mapping is closed once read) and converted without consolidating the columns into a
+#single block.
+#
+#A time range [str_tmstmp, end_tmstmp) on one timestamp column is pushed down to the reader : for Parquet, the row groups
+#whose statistics lie outside the range are skipped; for IPC, the record batches whose min/max of the column lie
+#outside it are not read. The tables should be written sorted on that column (see write_event_table, row_group_size :
+#rows per row group / record batch). The row number of every event in the full table is kept as the index of the
+#returned dataframe : the matchers return positions in the slice, pcb_level_df.index[pos] maps them back to the table.
+
+import os
+
+import numpy  as np
+import pandas as pd
+
+#Columns of a PCB level event table
+EVENT_COLUMNS = ['arvl_tmstmp','dptr_tmstmp','weightage']
+
+#Name of the stored row number column
+EVENT_INDX_COLUMN = 'event_indx'
+
+#Default number of rows per Parquet row group (granularity of the time range pushdown)
+ROW_GROUP_SIZE = 2**16
+
+PARQUET_EXTENSIONS = ('.parquet','.pq')
+IPC_EXTENSIONS     = ('.arrow','.feather','.ipc')
+
+
+def get_pyarrow():
+    """
+    Purpose : Import pyarrow (optional dependency of this module only)
+    """
+
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError('routine_event_io requires pyarrow (pip install pyarrow)')
+    #end-try
+
+    return pyarrow
+#end-proc
+
+
+def get_file_format(path,file_format=None):
+    """
+    Purpose : File format ('parquet' or 'ipc') of a path, from its extension unless given
+    """
+
+    if (file_format is None):
+        extension = os.path.splitext(str(path))[1].lower()
+        if (extension in PARQUET_EXTENSIONS):
+            file_format = 'parquet'
+        elif (extension in IPC_EXTENSIONS):
+            file_format = 'ipc'
+        #end-if
+    #end-if
+
+    if (file_format not in ('parquet','ipc')):
+        raise ValueError("file_format must be 'parquet' or 'ipc', got %r (path %r)" % (file_format,path))
+    #end-if
+
+    return file_format
+#end-proc
+
+
+def get_typed_df(matched_df):
+    """
+    Purpose : Matched (or event) dataframe with typed columns : datetime64[ns] timestamps, int64 indices, float64 weights
+    Inputs  : matched_df - Dataframe, possibly with object columns (legacy DataFrame.append outputs)
+    Output  : typed_df   - Dataframe with the same columns
+    """
+
+    typed_df = matched_df.copy(deep=False)
+
+    for column in typed_df.columns:
+        column_srs = typed_df[column]
+        if (column_srs.dtype != object) and (not pd.api.types.is_datetime64_any_dtype(column_srs)):
+            continue
+        #end-if
+
+        if column.endswith(('_tmstmp','_arvl','_dptr')) or pd.api.types.is_datetime64_any_dtype(column_srs):
+            typed_df[column] = pd.to_datetime(column_srs).astype('datetime64[ns]')
+        else:
+            typed_df[column] = pd.to_numeric(column_srs)
+        #end-if
+    #end-for
+
+    return typed_df
+#end-proc
+
+
+def get_time_filter(time_column,str_tmstmp,end_tmstmp):
+    """
+    Purpose : pyarrow.compute expression selecting str_tmstmp <= time_column < end_tmstmp (None : unbounded)
+    """
+
+    pyarrow = get_pyarrow()
+    import pyarrow.compute
+
+    time_filter = None
+    for bound,is_lower in ((str_tmstmp,True),(end_tmstmp,False)):
+        if (bound is None):
+            continue
+        #end-if
+        bound_scalar = pyarrow.scalar(pd.Timestamp(bound).as_unit('ns').to_datetime64(),type=pyarrow.timestamp('ns'))
+        field        = pyarrow.compute.field(time_column)
+        condition    = (field >= bound_scalar) if (is_lower) else (field < bound_scalar)
+        time_filter  = condition if (time_filter is None) else (time_filter & condition)
+    #end-for
+
+    return time_filter
+#end-proc
+
+
+def read_event_table(path,columns=None,str_tmstmp=None,end_tmstmp=None,time_column='dptr_tmstmp',file_format=None):
+    """
+    Purpose : Read a PCB level event table (or a matched table) from a Parquet or Arrow IPC file
+    Inputs  : path          - File path
+              columns       - (Optional) Columns to read (default : EVENT_COLUMNS, or all the columns of a matched table)
+              str_tmstmp    - (Optional) Start of the time range (inclusive) on time_column
+              end_tmstmp    - (Optional) End of the time range (exclusive) on time_column
+              time_column   - (Optional) Timestamp column of the time range
+              file_format   - (Optional) 'parquet' or 'ipc' (default : from the extension)
+    Output  : pcb_level_df  - Dataframe of the selected rows; timestamps datetime64[ns], weightage float64; index = row
+                              number in the full table (EVENT_INDX_COLUMN, when stored)
+    """
+
+    pyarrow     = get_pyarrow()
+    file_format = get_file_format(path,file_format)
+    time_filter = get_time_filter(time_column,str_tmstmp,end_tmstmp)
+
+    if (file_format == 'parquet'):
+        import pyarrow.parquet
+        read_columns = get_read_columns(path,pyarrow.parquet.read_schema(path),columns,time_column,time_filter)
+        #The filter is evaluated on the row group statistics first (pushdown), then on the rows
+        event_table  = pyarrow.parquet.read_table(path,columns=read_columns,filters=time_filter,memory_map=True)
+    else:
+        import pyarrow.ipc
+        with pyarrow.memory_map(str(path),'r') as source:
+            reader       = pyarrow.ipc.open_file(source)
+            read_columns = get_read_columns(path,reader.schema,columns,time_column,time_filter)
+            event_table  = read_ipc_batches(reader,read_columns,str_tmstmp,end_tmstmp,time_column)
+        #end-with
+        if (time_filter is not None):
+            event_table = event_table.filter(time_filter)
+        #end-if
+        event_table = event_table.select(read_columns)
+    #end-if
+
+    return get_event_df(event_table)
+#end-proc
+
+
+def get_read_columns(path,schema,columns,time_column,time_filter):
+    """
+    Purpose : Columns to read from a file (requested columns plus the stored row numbers); ValueError if missing
+    """
+
+    if (columns is None) and all((column in schema.names) for column in EVENT_COLUMNS):
+        columns = EVENT_COLUMNS
+    elif (columns is None):
+        columns = [column for column in schema.names if (column != EVENT_INDX_COLUMN)]
+    #end-if
+    columns = list(columns)
+
+    missing_columns = [column for column in columns if (column not in schema.names)]
+    if (len(missing_columns) > 0):
+        raise ValueError('columns not in %r : %r' % (path,missing_columns))
+    #end-if
+
+    read_columns = list(columns)
+    if (EVENT_INDX_COLUMN in schema.names) and (EVENT_INDX_COLUMN not in read_columns):
+        read_columns.append(EVENT_INDX_COLUMN)
+    #end-if
+
+    if (time_filter is not None) and (time_column not in schema.names):
+        raise ValueError('time_column %r not in %r' % (time_column,path))
+    #end-if
+
+    return read_columns
+#end-proc
+
+
+def read_ipc_batches(reader,read_columns,str_tmstmp,end_tmstmp,time_column):
+    """
+    Purpose : Record batches of an Arrow IPC file that may hold rows of the time range (min/max of time_column), as a
+              table of the read columns and time_column (the rows are filtered by the caller)
+    """
+
+    pyarrow = get_pyarrow()
+    import pyarrow.compute
+
+    str_ns = None if (str_tmstmp is None) else pd.Timestamp(str_tmstmp).as_unit('ns').value
+    end_ns = None if (end_tmstmp is None) else pd.Timestamp(end_tmstmp).as_unit('ns').value
+
+    has_range     = (str_ns is not None) or (end_ns is not None)
+    batch_columns = list(read_columns)
+    if (has_range) and (time_column not in batch_columns):
+        batch_columns.append(time_column)
+    #end-if
+
+    record_batches = []
+    for batch_no in range(reader.num_record_batches):
+        record_batch = reader.get_batch(batch_no)
+        if (has_range):
+            min_max = pyarrow.compute.min_max(record_batch.column(time_column).cast(pyarrow.timestamp('ns')))
+            if (min_max['min'].is_valid) and (((str_ns is not None) and (min_max['max'].value < str_ns)) or
+                                              ((end_ns is not None) and (min_max['min'].value >= end_ns))):
+                continue
+            #end-if
+        #end-if
+        record_batches.append(record_batch.select(batch_columns))
+    #end-for
+
+    return pyarrow.Table.from_batches(record_batches,schema=pyarrow.schema([reader.schema.field(column) for column in batch_columns]))
+#end-proc
+
+
+def get_event_df(event_table):
+    """
+    Purpose : Convert an Arrow table to a dataframe with datetime64[ns] timestamps and float64 weightage
+    """
+
+    pyarrow = get_pyarrow()
+
+    for pos,field in enumerate(event_table.schema):
+        if pyarrow.types.is_timestamp(field.type) and (field.type.unit != 'ns'):
+            event_table = event_table.set_column(pos,field.name,event_table.column(pos).cast(pyarrow.timestamp('ns',field.type.tz)))
+        #end-if
+        if (field.name == 'weightage') and (field.type != pyarrow.float64()):
+            event_table = event_table.set_column(pos,field.name,event_table.column(pos).cast(pyarrow.float64()))
+        #end-if
+    #end-for
+
+    #split_blocks : one block per column, no consolidation copy
+    pcb_level_df = event_table.to_pandas(split_blocks=True,ignore_metadata=True)
+
+    if (EVENT_INDX_COLUMN in pcb_level_df.columns):
+        pcb_level_df = pcb_level_df.set_index(EVENT_INDX_COLUMN)
+        pcb_level_df.index.name = None
+    #end-if
+
+    return pcb_level_df
+#end-proc
+
+
+def write_event_table(pcb_level_df,path,file_format=None,row_group_size=ROW_GROUP_SIZE,keep_event_indx=True):
+    """
+    Purpose : Write a PCB level event table (or a matched table) to a Parquet or Arrow IPC file with typed columns
+    Inputs  : pcb_level_df    - Dataframe (object columns are typed with get_typed_df)
+              path            - File path
+              file_format     - (Optional) 'parquet' or 'ipc' (default : from the extension)
+              row_group_size  - (Optional) Rows per Parquet row group / Arrow IPC record batch
+              keep_event_indx - (Optional) Store the row numbers as EVENT_INDX_COLUMN (kept by filtered reads)
+    Output  : None
+    """
+
+    pyarrow     = get_pyarrow()
+    file_format = get_file_format(path,file_format)
+
+    typed_df = get_typed_df(pcb_level_df).reset_index(drop=True)
+    if (keep_event_indx) and (EVENT_INDX_COLUMN not in typed_df.columns):
+        typed_df[EVENT_INDX_COLUMN] = np.arange(len(typed_df),dtype=np.int64)
+    #end-if
+
+    event_table = pyarrow.Table.from_pandas(typed_df,preserve_index=False)
+
+    if (file_format == 'parquet'):
+        import pyarrow.parquet
+        pyarrow.parquet.write_table(event_table,path,row_group_size=row_group_size)
+    else:
+        import pyarrow.ipc
+        with pyarrow.OSFile(str(path),'wb') as sink:
+            with pyarrow.ipc.new_file(sink,event_table.schema) as writer:
+                writer.write_table(event_table,max_chunksize=row_group_size)
+            #end-with
+        #end-with
+    #end-if
+#end-proc
@@ -0,0 +1,219 @@
+#******************************************************************************************************************************************
+# TITLE     : ROUTINE_INSTRUMENTATION
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : per-phase timers, counters and optional cProfile/tracemalloc capture
+#******************************************************************************************************************************************
+
+#Instrumentation of the matchers (replaces the START/END banners and EXEC_TIME prints)
+#
+#The matchers time their phases (<stage>.weight_generation, <stage>.matching, <stage>.correction,
+#<stage>.result_building, <stage>.total) and count their events (<stage>.no_event, <stage>.multi_event,
+#<stage>.matched, <stage>.rejected_by_threshold) through timed_phase and add_count. Both are recorded in the active
+#MatchMetrics (none by default) and logged at DEBUG level on LOGGER; the summary of every matcher call is logged at
+#INFO level. Nothing is printed.
+#
+#    with routine_instrumentation.collect_metrics(profile=True,trace_memory=True) as metrics:
+#        matched_df = routine_sprpp1_matching_algo.fwd_sprpp1_matching_algo(dfspr,dfpp1)
+#    metrics.phase_timings, metrics.counters, metrics.peak_mbytes, metrics.profile_stats.print_stats(20)
+#
+#    logging.basicConfig(level=logging.DEBUG)     #or a handler on logging.getLogger('pcb_data_association')
+
+import collections
+import contextlib
+import logging
+import time
+
+#Logger of the matchers
+LOGGER = logging.getLogger('pcb_data_association')
+
+#Active metrics (None : only logging)
+ACTIVE_METRICS = None
+
+
+class MatchMetrics(object):
+    """
+    Purpose : Phase timings, counters and optional profile / peak memory of matcher calls
+    """
+
+    def __init__(self):
+        """
+        Purpose : Initialize empty metrics
+        """
+
+        self.phase_timings = collections.OrderedDict()     #phase -> wall time [s], accumulated over calls
+        self.phase_calls   = collections.OrderedDict()     #phase -> number of calls
+        self.counters      = collections.OrderedDict()     #counter -> value, accumulated over calls
+        self.profile_stats = None                          #pstats.Stats (collect_metrics(profile=True))
+        self.peak_mbytes   = None                          #Peak traced memory [MiB] (collect_metrics(trace_memory=True))
+    #end-proc
+
+    def add_time(self,phase,seconds):
+        """
+        Purpose : Add the wall time of a phase
+        """
+
+        self.phase_timings[phase] = self.phase_timings.get(phase,0.0) + seconds
+        self.phase_calls[phase]   = self.phase_calls.get(phase,0) + 1
+    #end-proc
+
+    def add_count(self,counter,value=1):
+        """
+        Purpose : Add to a counter
+        """
+
+        self.counters[counter] = self.counters.get(counter,0) + int(value)
+    #end-proc
+
+    def get_summary(self):
+        """
+        Purpose : Metrics as a dictionary (JSON serializable)
+        """
+
+        return {
+            'phase_timings' : dict(self.phase_timings),
+            'phase_calls'   : dict(self.phase_calls),
+            'counters'      : dict(self.counters),
+            'peak_mbytes'   : self.peak_mbytes,
+            }
+    #end-proc
+
+    def log_summary(self,logger=LOGGER,level=logging.INFO):
+        """
+        Purpose : Log the phase timings and counters
+        """
+
+        for phase,seconds in self.phase_timings.items():
+            logger.log(level,'%s : %.6f s (%d calls)',phase,seconds,self.phase_calls[phase])
+        #end-for
+        for counter,value in self.counters.items():
+            logger.log(level,'%s = %d',counter,value)
+        #end-for
+        if (self.peak_mbytes is not None):
+            logger.log(level,'peak traced memory : %.3f MiB',self.peak_mbytes)
+        #end-if
+    #end-proc
+#end-class
+
+
+def set_metrics(metrics):
+    """
+    Purpose : Set (MatchMetrics) or clear (None) the active metrics
+    Output  : prev_metrics - The previously active metrics
+    """
+
+    global ACTIVE_METRICS
+
+    prev_metrics   = ACTIVE_METRICS
+    ACTIVE_METRICS = metrics
+
+    return prev_metrics
+#end-proc
+
+
+def get_metrics():
+    """
+    Purpose : The active metrics (None : only logging)
+    """
+    return ACTIVE_METRICS
+#end-proc
+
+
+@contextlib.contextmanager
+def timed_phase(phase):
+    """
+    Purpose : Time a phase (with block) into the active metrics and the DEBUG log
+    """
+
+    metrics = ACTIVE_METRICS
+    if (metrics is None) and (not LOGGER.isEnabledFor(logging.DEBUG)):
+        yield
+        return
+    #end-if
+
+    str_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - str_time
+        if (metrics is not None):
+            metrics.add_time(phase,seconds)
+        #end-if
+        LOGGER.debug('%s : %.6f s',phase,seconds)
+    #end-try
+#end-proc
+
+
+def add_time(phase,seconds):
+    """
+    Purpose : Add the wall time of a phase timed by the caller to the active metrics (and the DEBUG log)
+    """
+
+    if (ACTIVE_METRICS is not None):
+        ACTIVE_METRICS.add_time(phase,seconds)
+    #end-if
+    LOGGER.debug('%s : %.6f s',phase,seconds)
+#end-proc
+
+
+def add_count(counter,value=1):
+    """
+    Purpose : Add to a counter of the active metrics (and the DEBUG log)
+    """
+
+    if (ACTIVE_METRICS is not None):
+        ACTIVE_METRICS.add_count(counter,value)
+    #end-if
+    LOGGER.debug('%s += %d',counter,value)
+#end-proc
+
+
+@contextlib.contextmanager
+def collect_metrics(profile=False,trace_memory=False):
+    """
+    Purpose : Collect the metrics of the matcher calls of a with block
+    Inputs  : profile      - Run the block under cProfile (metrics.profile_stats)
+              trace_memory - Run the block under tracemalloc (metrics.peak_mbytes)
+    Output  : metrics      - MatchMetrics (filled at the end of the block)
+    """
+
+    metrics      = MatchMetrics()
+    prev_metrics = set_metrics(metrics)
+
+    profiler = None
+    if (profile):
+        import cProfile
+        profiler = cProfile.Profile()
+    #end-if
+    if (trace_memory):
+        import tracemalloc
+        tracemalloc.start()
+    #end-if
+
+    try:
+        if (profiler is not None):
+            profiler.enable()
+        #end-if
+        yield metrics
+    finally:
+        if (profiler is not None):
+            profiler.disable()
+            import pstats
+            metrics.profile_stats = pstats.Stats(profiler)
+        #end-if
+        if (trace_memory):
+            metrics.peak_mbytes = tracemalloc.get_traced_memory()[1] / 2**20
+            tracemalloc.stop()
+        #end-if
+        set_metrics(prev_metrics)
+    #end-try
+#end-proc
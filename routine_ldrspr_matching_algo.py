@@ -12,175 +12,268 @@
 # DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
 #------------------------------------------------------------------------------------------------------------------------------------------
 # 2019-10-11        | PRAKASH HIREMATH M  | Initial version
+# 2026-10-18        | CONTRIBUTORS        | Loader events bucketed into SPR intervals with np.searchsorted (O(N log N))
+# 2026-10-18        | CONTRIBUTORS        | Result dataframes built once from index arrays (no per-row DataFrame.append)
+# 2026-10-18        | CONTRIBUTORS        | Optional hist_mode argument; 1-1 delays computed from the interval events
+# 2026-10-18        | CONTRIBUTORS        | Modal delay from the in-package routine_delay_histogram (configurable bin_width)
+# 2026-10-18        | CONTRIBUTORS        | Multiple loader events corrected with one group-wise argmin (no per-SPR query)
+# 2026-10-18        | CONTRIBUTORS        | Phase timers and counters (routine_instrumentation) instead of per-row prints
+# 2026-10-18        | CONTRIBUTORS        | Side-effect-free import : no prints, no csv import
+# 2026-10-18        | CONTRIBUTORS        | Optional compact struct-of-arrays result (compact=True)
+# 2026-10-18        | CONTRIBUTORS        | Station tables or StationEventIndex (routine_station_index) accepted, converted once per call
 #******************************************************************************************************************************************
 
 #LDR-SPR PCB Data Association 
 
-import csv
-import datetime
+import time
 
 import numpy  as np
-import pandas as pd
 
-import importlib
-
-import routine_get_histogram
-importlib.reload(routine_get_histogram)
+import routine_weight_kernel
+import routine_station_index
+import routine_match_result
+import routine_delay_histogram
+import routine_instrumentation
 
 #pcb_level_dfldr : arvl_tmstmp, dptr_tmstmp
 #pcb_level_dfspr : dptr_tmstmp
+#(or their routine_station_index.StationEventIndex : the departures are then not converted again)
 
-#Procedure to perform data association (matching) between loader and screen-printer
-print('Start of defining procedure : rev_ldrspr_matching_algo :', datetime.datetime.now())
-print('Version : 2019-04-27 21:05')
-
-def rev_ldrspr_matching_algo (pcb_level_dfldr,pcb_level_dfspr):
-
-    STR_TIME = datetime.datetime.now()
-    
-    print('=======================================================')
-    print("START : ", STR_TIME)
-    print('=======================================================')
-    
-    no_of_matched_pcbs = 0
-    matched_df = pd.DataFrame(columns=['ldr_dptr','spr_indx','spr_dptr','spr_special_entry','ldr_multiple_events'])
-
-    print('Creating initial matched dataframe...')
-    
-    for i in range(0,len(pcb_level_dfspr)):
-        spr_curr_tmstmp = pcb_level_dfspr.dptr_tmstmp[i]
-        if (i == 0):
-            ldr_events_df = pcb_level_dfldr.query('dptr_tmstmp < @spr_curr_tmstmp')
-        else:
-            spr_prev_tmstmp = pcb_level_dfspr.dptr_tmstmp[i-1]
-            ldr_events_df = pcb_level_dfldr.query('(dptr_tmstmp > @spr_prev_tmstmp) & (dptr_tmstmp < @spr_curr_tmstmp)')
+def get_spr_interval_events(ldr_dptr_ns,spr_dptr_ns):
+    """
+    Purpose : Assign loader departures to SPR intervals : the interval of SPR event i is (spr_dptr[i-1], spr_dptr[i]),
+              the first interval is (-inf, spr_dptr[0]); both bounds are exclusive
+    Inputs  : ldr_dptr_ns - int64 ns departure timestamps of the loader
+              spr_dptr_ns - int64 ns departure timestamps of the screen printer
+    Output  : ev_ldr_pos  - Positional index of the loader event (ascending within each SPR interval)
+              ev_spr_indx - SPR index of the interval containing the loader event (ascending)
+    """
+
+    NAT_NS    = routine_weight_kernel.NAT_NS
+    ldr_valid = (ldr_dptr_ns != NAT_NS)
+
+    if (len(spr_dptr_ns) == 0):
+        return np.zeros(0,dtype=np.int64),np.zeros(0,dtype=np.int64)
+    #end-if
+
+    if np.all(spr_dptr_ns != NAT_NS) and np.all(np.diff(spr_dptr_ns) >= 0):
+        #Sorted SPR departures : single binary search, the interval is the first SPR departure strictly after the loader event
+        spr_indx   = np.searchsorted(spr_dptr_ns,ldr_dptr_ns,side='right')
+        prev_equal = (spr_indx > 0) & (spr_dptr_ns[np.maximum(spr_indx - 1,0)] == ldr_dptr_ns)
+        in_intrvl  = ldr_valid & (spr_indx < len(spr_dptr_ns)) & ~prev_equal
+
+        ev_ldr_pos  = np.flatnonzero(in_intrvl)
+        ev_spr_indx = spr_indx[ev_ldr_pos]
+        srt_indx    = np.argsort(ev_spr_indx,kind='stable')
+
+        return ev_ldr_pos[srt_indx],ev_spr_indx[srt_indx].astype(np.int64)
+    #end-if
+
+    #Unsorted SPR departures (intervals may overlap) : scan interval by interval
+    ev_ldr_pos  = []
+    ev_spr_indx = []
+    for i in range(0,len(spr_dptr_ns)):
+        if (spr_dptr_ns[i] == NAT_NS) or ((i > 0) and (spr_dptr_ns[i-1] == NAT_NS)):
+            continue
         #end-if
-        ldr_events_df = ldr_events_df.reset_index()
-        ldr_events_df = ldr_events_df.iloc[:,1:len(ldr_events_df.columns)]
-    
-        if (len(ldr_events_df) == 0):
-            print('No loader event identified at i =', i, ':spr_timestamp =', spr_curr_tmstmp)
-            ldr_dptr = np.nan
-            spr_indx = i
-            spr_dptr = spr_curr_tmstmp
-            spr_special_entry   = 1   
-            ldr_multiple_events = 0
-            data = pd.DataFrame([[ldr_dptr,spr_indx,spr_dptr,spr_special_entry,ldr_multiple_events]],columns=matched_df.columns)
-            matched_df = matched_df.append(data)
-            del data
-        elif (len(ldr_events_df) == 1):
-            ldr_dptr = ldr_events_df.dptr_tmstmp[0]
-            spr_indx = i
-            spr_dptr = spr_curr_tmstmp
-            spr_special_entry   = 0
-            ldr_multiple_events = 0
-            data = pd.DataFrame([[ldr_dptr,spr_indx,spr_dptr,spr_special_entry,ldr_multiple_events]],columns=matched_df.columns)
-            matched_df = matched_df.append(data)
-            del data
-        else:
-            print('Multiple loader events identified at i =', i, ':spr_timestamp =', spr_curr_tmstmp)
-            for j in range(0,len(ldr_events_df)):
-                ldr_dptr = ldr_events_df.dptr_tmstmp[j]
-                spr_indx = i
-                spr_dptr = spr_curr_tmstmp
-                spr_special_entry   = 0
-                ldr_multiple_events = 1
-                data = pd.DataFrame([[ldr_dptr,spr_indx,spr_dptr,spr_special_entry,ldr_multiple_events]],columns=matched_df.columns)
-                matched_df = matched_df.append(data)
-                del data
-            #end-for
+        in_intrvl = ldr_valid & (ldr_dptr_ns < spr_dptr_ns[i])
+        if (i > 0):
+            in_intrvl = in_intrvl & (ldr_dptr_ns > spr_dptr_ns[i-1])
         #end-if
-    #end-for    
-
-    matched_df = matched_df.reset_index()
-    matched_df = matched_df.iloc[:,1:len(matched_df.columns)]
-    
-    #Obtain the 1-1 LDR-SPR matched events
-    temp_df = matched_df.query('(ldr_multiple_events == 0) & (spr_special_entry == 0)')
-    temp_df = temp_df.reset_index()
-    temp_df = temp_df.iloc[:,1:len(temp_df.columns)]
-    
-    print('Finding maximum likely time delay between LDR event and SPR exit...')
-    
-    #Obtain the maximum likely delay between loader event and screen-printer exit
-    time_diff = []
-    for i in range (0,len(temp_df)):
-        td = pd.Timedelta(pd.Timestamp(temp_df.spr_dptr[i]) - pd.Timestamp(temp_df.ldr_dptr[i])).total_seconds()
-        time_diff = np.append(time_diff,td)
-    #end-for  
-
-    hist_df,hist_mode = routine_get_histogram.get_mode(pd.Series(time_diff),0.0,0.5)
-    
-    print('hist_mode =', hist_mode)
-    
-    #Obtain the many-to-1 LDR-SPR matched events
-    mult_ldr_df = matched_df.query('ldr_multiple_events == 1')
-    mult_ldr_df = mult_ldr_df.reset_index()
-    mult_ldr_df = mult_ldr_df.iloc[:,1:len(mult_ldr_df.columns)]
-    
-    print('Correction for multiple loader events...')
-    
-    #Correction for multiple loading events
-    cor_mult_ldr_df = pd.DataFrame(columns=matched_df.columns)
-
-    uniq_spr_indx = mult_ldr_df.spr_indx.unique()
-    uniq_spr_dptr = mult_ldr_df.spr_dptr.unique()
-
-    for i in range (0,len(uniq_spr_indx)):
-        curr_spr_indx = uniq_spr_indx[i]
-        ldr_dptr_srs = mult_ldr_df.query('spr_indx == @curr_spr_indx').loc[:,['ldr_dptr']]
-        ldr_dptr_srs = ldr_dptr_srs.reset_index()
-        ldr_dptr_srs = ldr_dptr_srs.iloc[:,1:len(ldr_dptr_srs.columns)]
-    
-        dev_arr = []
-        for j in range (0,len(ldr_dptr_srs)):
-            td = pd.Timedelta(pd.Timestamp(uniq_spr_dptr[i]) - pd.Timestamp(ldr_dptr_srs.ldr_dptr[j])).total_seconds()
-            dev_arr = np.append(dev_arr,np.abs(td-hist_mode))
-        #end-for
-        min_dev = np.argmin(dev_arr)
-    
-        ldr_dptr            = ldr_dptr_srs.ldr_dptr[min_dev]
-        spr_indx            = uniq_spr_indx[i]
-        spr_dptr            = uniq_spr_dptr[i]
-        spr_special_entry   = 0
-        ldr_multiple_events = 1
-        data = pd.DataFrame([[ldr_dptr,spr_indx,spr_dptr,spr_special_entry,ldr_multiple_events]],columns=matched_df.columns)
-        cor_mult_ldr_df = cor_mult_ldr_df.append(data)
-        del data
+        ldr_pos = np.flatnonzero(in_intrvl)
+        ev_ldr_pos.append(ldr_pos)
+        ev_spr_indx.append(np.full(len(ldr_pos),i,dtype=np.int64))
     #end-for
 
-    cor_mult_ldr_df = cor_mult_ldr_df.reset_index()
-    cor_mult_ldr_df = cor_mult_ldr_df.iloc[:,1:len(cor_mult_ldr_df.columns)]
-    
-    print('Creating final matched dataframe...')
-    
-    #Combine all to form only 1-1 LDR-SPR matched dataframe
-    ldr_spr_matched_df = pd.DataFrame(columns=matched_df.columns)
-
-    non_mult_ldr_df = matched_df.query('ldr_multiple_events == 0')
-
-    ldr_spr_matched_df = ldr_spr_matched_df.append(non_mult_ldr_df)
-    ldr_spr_matched_df = ldr_spr_matched_df.append(cor_mult_ldr_df)
-    ldr_spr_matched_df = ldr_spr_matched_df.sort_values(by='spr_dptr')
-    ldr_spr_matched_df = ldr_spr_matched_df.reset_index()
-    ldr_spr_matched_df = ldr_spr_matched_df.iloc[:,1:len(ldr_spr_matched_df.columns)]
-    
-    no_of_matched_pcbs = len(ldr_spr_matched_df)
-    print('No. of matched PCBs =', no_of_matched_pcbs)
-    
-    END_TIME = datetime.datetime.now()
-    
-    print('=======================================================')
-    print("END   : ", END_TIME)
-    print('=======================================================')
-    
-    DUR_TS    = pd.Timestamp(END_TIME) - pd.Timestamp(STR_TIME)
-    EXEC_TIME = pd.Timedelta(DUR_TS).total_seconds()
-    
-    return ldr_spr_matched_df
-    
+    if (len(ev_ldr_pos) == 0):
+        return np.zeros(0,dtype=np.int64),np.zeros(0,dtype=np.int64)
+    #end-if
+
+    return np.concatenate(ev_ldr_pos),np.concatenate(ev_spr_indx)
+#end-proc
+
+
+def get_group_argmin(group_indx,values):
+    """
+    Purpose : Position of the minimum of every group (np.argmin semantics : first minimum, a NaN wins)
+    Inputs  : group_indx - Group of every element, ascending (elements of a group are contiguous)
+              values     - float64 values
+    Output  : min_pos    - Position of the selected element of every group, in group order
+    """
+
+    if (len(values) == 0):
+        return np.zeros(0,dtype=np.int64)
+    #end-if
+
+    #NaN first, as np.argmin does
+    min_key = np.where(np.isnan(values),-np.inf,values)
+
+    grp_str = np.flatnonzero(np.r_[True,group_indx[1:] != group_indx[:-1]])
+    grp_len = np.diff(np.r_[grp_str,len(values)])
+    grp_min = np.minimum.reduceat(min_key,grp_str)
+
+    #First element equal to its group minimum
+    is_min  = (min_key == np.repeat(grp_min,grp_len))
+    min_pos = np.flatnonzero(is_min)
+    grp_num = np.repeat(np.arange(len(grp_str)),grp_len)[min_pos]
+
+    return min_pos[np.r_[True,grp_num[1:] != grp_num[:-1]]]
+#end-proc
+
+
+def get_single_event_delays(ldr_dptr_ns,spr_dptr_ns):
+    """
+    Purpose : Delays (in seconds) between the loader event and the SPR exit of the SPR events with a single loader event
+    Inputs  : ldr_dptr_ns - int64 ns departure timestamps of the loader
+              spr_dptr_ns - int64 ns departure timestamps of the screen printer
+    Output  : time_diff   - float64 delays, ordered by SPR index
+    """
+
+    ev_ldr_pos,ev_spr_indx = get_spr_interval_events(ldr_dptr_ns,spr_dptr_ns)
+
+    no_of_events = np.bincount(ev_spr_indx,minlength=len(spr_dptr_ns))
+    single_ev    = (no_of_events[ev_spr_indx] == 1)
+
+    return routine_weight_kernel.get_delay_seconds(spr_dptr_ns[ev_spr_indx[single_ev]],ldr_dptr_ns[ev_ldr_pos[single_ev]])
+#end-proc
+
+
+def get_ldrspr_hist_mode(pcb_level_dfldr,pcb_level_dfspr,bin_width=routine_delay_histogram.HIST_BIN_WIDTH):
+    """
+    Purpose : Maximum likely delay between loader event and screen-printer exit (mode of the 1-1 delays)
+    Inputs  : pcb_level_dfldr - The PCB level dataframe corresponding to loader
+              pcb_level_dfspr - The PCB level dataframe corresponding to screen printer
+              bin_width       - (Optional) Bin width [s] of the delay histogram
+    Output  : hist_mode       - Modal delay in seconds
+    """
+
+    ldr_dptr_ns = routine_station_index.get_station_index(pcb_level_dfldr,'ldr').get_column('dptr_tmstmp')
+    spr_dptr_ns = routine_station_index.get_station_index(pcb_level_dfspr,'spr').get_column('dptr_tmstmp')
+
+    time_diff = get_single_event_delays(ldr_dptr_ns,spr_dptr_ns)
+
+    hist_df,hist_mode = routine_delay_histogram.get_mode(time_diff,routine_delay_histogram.HIST_BIN_ORIGIN,bin_width)
+
+    return hist_mode
 #end-proc
-print('End   of defining procedure : rev_ldrspr_matching_algo :', datetime.datetime.now())
 
 
+#Procedure to perform data association (matching) between loader and screen-printer
+def get_ldrspr_match_indx(pcb_level_dfldr,pcb_level_dfspr,hist_mode=None,bin_width=routine_delay_histogram.HIST_BIN_WIDTH):
+    """
+    Purpose : LDR-SPR matching on index arrays (the rows of rev_ldrspr_matching_algo, without the dataframe)
+    Inputs  : pcb_level_dfldr     - The PCB level dataframe corresponding to loader
+              pcb_level_dfspr     - The PCB level dataframe corresponding to screen printer
+              hist_mode           - (Optional) Modal LDR-SPR delay; estimated from the 1-1 delays if not given
+              bin_width           - (Optional) Bin width [s] of the delay histogram used to estimate hist_mode
+    Output  : ldr_pos             - Positional index of the matched loader event (-1 : no loader event)
+              spr_indx            - Positional index of the SPR event
+              spr_special_entry   - 1 if no loader event was identified for the SPR event, else 0
+              ldr_multiple_events - 1 if multiple loader events were identified for the SPR event, else 0
+    """
+
+    ldr_index = routine_station_index.get_station_index(pcb_level_dfldr,'ldr')
+    spr_index = routine_station_index.get_station_index(pcb_level_dfspr,'spr')
+
+    #Assign every loader departure to its SPR interval (spr_dptr[i-1], spr_dptr[i])
+    with routine_instrumentation.timed_phase('ldrspr.matching'):
+        ldr_dptr_ns = ldr_index.get_column('dptr_tmstmp')
+        spr_dptr_ns = spr_index.get_column('dptr_tmstmp')
+
+        ev_ldr_pos,ev_spr_indx = get_spr_interval_events(ldr_dptr_ns,spr_dptr_ns)
+
+        #Categorize every SPR event : no loader event, single loader event or multiple loader events
+        no_of_events   = np.bincount(ev_spr_indx,minlength=len(spr_dptr_ns))
+        no_event_mask  = (no_of_events == 0)
+        mult_ldr_mask  = (no_of_events > 1)
+    #end-with
+
+    routine_instrumentation.add_count('ldrspr.no_event',np.count_nonzero(no_event_mask))
+    routine_instrumentation.add_count('ldrspr.multi_event',np.count_nonzero(mult_ldr_mask))
+
+    #Obtain the maximum likely delay between loader event and screen-printer exit (mode of the 1-1 LDR-SPR delays),
+    #unless provided by the caller (e.g. estimated once over the whole history by the chunked driver)
+    if (hist_mode is None):
+        with routine_instrumentation.timed_phase('ldrspr.delay_histogram'):
+            time_diff = get_single_event_delays(ldr_dptr_ns,spr_dptr_ns)
+
+            hist_df,hist_mode = routine_delay_histogram.get_mode(time_diff,routine_delay_histogram.HIST_BIN_ORIGIN,bin_width)
+        #end-with
+    #end-if
+
+    routine_instrumentation.LOGGER.debug('ldrspr hist_mode = %s',hist_mode)
+
+    #Correction for multiple loading events : keep the loader event whose delay is closest to hist_mode
+    with routine_instrumentation.timed_phase('ldrspr.correction'):
+        mult_ev      = mult_ldr_mask[ev_spr_indx]
+        mult_ldr_pos = ev_ldr_pos[mult_ev]
+        mult_spr_ev  = ev_spr_indx[mult_ev]
+
+        dev_arr = np.abs(routine_weight_kernel.get_delay_seconds(spr_dptr_ns[mult_spr_ev],ldr_dptr_ns[mult_ldr_pos]) - hist_mode)
+        min_dev = get_group_argmin(mult_spr_ev,dev_arr)
+
+        uniq_spr_indx = mult_spr_ev[min_dev]
+        cor_ldr_pos   = mult_ldr_pos[min_dev]
+    #end-with
+
+    with routine_instrumentation.timed_phase('ldrspr.matching'):
+        #One row per SPR event with a single loader event plus one special row per SPR event without loader event
+        sngl_ev      = ~mult_ev
+        row_spr_indx = np.concatenate([ev_spr_indx[sngl_ev],np.flatnonzero(no_event_mask)])
+        row_ldr_pos  = np.concatenate([ev_ldr_pos[sngl_ev],np.full(np.count_nonzero(no_event_mask),-1,dtype=np.int64)])
+        row_order    = np.argsort(row_spr_indx,kind='stable')
+
+        #Combine all to form only 1-1 LDR-SPR matched rows, ordered by SPR departure
+        ldr_pos             = np.concatenate([row_ldr_pos[row_order],cor_ldr_pos])
+        spr_indx            = np.concatenate([row_spr_indx[row_order],uniq_spr_indx])
+        spr_special_entry   = no_event_mask[spr_indx].astype(np.int64)
+        ldr_multiple_events = mult_ldr_mask[spr_indx].astype(np.int64)
+
+        spr_dptr_srs = routine_match_result.get_column_values(spr_index.pcb_level_df.dptr_tmstmp,spr_indx)
+        final_order  = spr_dptr_srs.sort_values().index.to_numpy()
+    #end-with
+
+    routine_instrumentation.add_count('ldrspr.matched',len(spr_indx) - np.count_nonzero(spr_special_entry))
+
+    return ldr_pos[final_order],spr_indx[final_order],spr_special_entry[final_order],ldr_multiple_events[final_order]
+#end-proc
+
+
+#Version : 2019-04-27 21:05
+
+def rev_ldrspr_matching_algo (pcb_level_dfldr,pcb_level_dfspr,hist_mode=None,bin_width=routine_delay_histogram.HIST_BIN_WIDTH,compact=False):
+    """
+    Purpose : Perform matching from SPR to LDR (one loader event per SPR event)
+    Inputs  : pcb_level_dfldr    - The PCB level dataframe corresponding to loader
+              pcb_level_dfspr    - The PCB level dataframe corresponding to screen printer
+              hist_mode          - (Optional) Modal LDR-SPR delay; estimated from the 1-1 delays if not given
+              bin_width          - (Optional) Bin width [s] of the delay histogram used to estimate hist_mode
+              compact            - (Optional) Return a routine_match_result.CompactMatchResult instead of a dataframe
+    Output  : ldr_spr_matched_df - The dataframe that contains the matched PCBs
+    """
+
+    str_time = time.perf_counter()
+
+    ldr_index = routine_station_index.get_station_index(pcb_level_dfldr,'ldr')
+    spr_index = routine_station_index.get_station_index(pcb_level_dfspr,'spr')
+
+    ldr_pos,spr_indx,spr_special_entry,ldr_multiple_events = get_ldrspr_match_indx(ldr_index,spr_index,hist_mode,bin_width)
+
+    with routine_instrumentation.timed_phase('ldrspr.result_building'):
+        if (compact):
+            ldr_spr_matched_df = routine_match_result.get_ldrspr_compact_result(ldr_index.pcb_level_df,spr_index.pcb_level_df,ldr_pos,spr_indx,
+                                                                                spr_special_entry,ldr_multiple_events)
+        else:
+            ldr_spr_matched_df = routine_match_result.get_ldrspr_matched_df(ldr_index.pcb_level_df,spr_index.pcb_level_df,ldr_pos,spr_indx,
+                                                                            spr_special_entry,ldr_multiple_events)
+        #end-if
+    #end-with
+
+    exec_time = time.perf_counter() - str_time
+    routine_instrumentation.add_time('ldrspr.total',exec_time)
+    routine_instrumentation.LOGGER.info('rev_ldrspr_matching_algo : %d rows in %.3f s',len(ldr_spr_matched_df),exec_time)
+
+    return ldr_spr_matched_df
+#end-proc
+
 
@@ -0,0 +1,335 @@
+#******************************************************************************************************************************************
+# TITLE     : ROUTINE_MATCH_KERNEL
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : row/column argmax on dense and sparse weight matrices
+# 2026-10-18        | CONTRIBUTORS        | Row and column argmax in a single block-wise pass (bidirectional matching)
+# 2026-10-18        | CONTRIBUTORS        | Globally optimal one-to-one assignment on connected components
+# 2026-10-18        | CONTRIBUTORS        | Block-wise dense argmax (float32 and np.memmap backed weight matrices)
+# 2026-10-18        | CONTRIBUTORS        | scipy imported on first use (sparse matrices, optimal assignment)
+# 2026-10-18        | CONTRIBUTORS        | Optimal assignment reads dense matrices in row blocks (get_dense_edges), rejects mmap_path
+#******************************************************************************************************************************************
+
+#Matching kernels shared by the SPR-PP1 and PP1-PP2 PCB Data Association
+#
+#The argmax helpers follow np.argmax semantics on the dense matrix : the first maximum wins and NaN counts as the maximum.
+#For a sparse matrix, a row (column) without stored cells returns index 0 with weight 0.0, which is what np.argmax returns
+#on an all-zero row of the dense matrix; such entries are rejected by the (weight > 0) check of the matchers.
+#
+#The optimal assignment solves the maximum-weight bipartite matching over the eligible edges (weight > 0 and both ends
+#passing the weightage gates). The bipartite graph is split into connected components and each component is solved
+#independently with scipy.optimize.linear_sum_assignment. With a transit-time window the components span only a few
+#boards, so the cost grows linearly with the length of the history.
+
+import numpy as np
+
+import routine_weight_kernel
+
+
+def get_compressed_argmax(indptr,indices,data,no_of_lines):
+    """
+    Purpose : Argmax of every line of a compressed (CSR rows / CSC columns) sparse structure
+    Inputs  : indptr      - Line pointer array
+              indices     - Index of each stored cell within its line, ascending within each line
+              data        - Stored weights
+              no_of_lines - Number of lines
+    Output  : max_indx    - int64 array, index of the first maximum of each line (0 for empty lines)
+              max_wght    - float64 array, maximum weight of each line (0.0 for empty lines)
+    """
+
+    max_indx = np.zeros(no_of_lines,dtype=np.int64)
+    max_wght = np.zeros(no_of_lines,dtype=np.float64)
+
+    counts   = np.diff(indptr)
+    nnz_line = np.flatnonzero(counts > 0)
+    if (len(nnz_line) == 0):
+        return max_indx,max_wght
+    #end-if
+
+    #np.fmax ignores NaN; NaN lines are patched afterwards to keep np.argmax semantics
+    line_max  = np.fmax.reduceat(data,indptr[nnz_line])
+    line_indx = np.repeat(np.arange(no_of_lines),counts)
+
+    nan_cell  = np.isnan(data)
+    line_nan  = np.zeros(no_of_lines,dtype=bool)
+    line_nan[line_indx[nan_cell]] = True
+
+    full_max  = np.zeros(no_of_lines,dtype=np.float64)
+    full_max[nnz_line] = line_max
+    full_max[line_nan] = np.nan
+
+    is_max    = (data == full_max[line_indx]) | (nan_cell & line_nan[line_indx])
+    max_pos   = np.flatnonzero(is_max)
+    first_pos = max_pos[np.r_[True,line_indx[max_pos][1:] != line_indx[max_pos][:-1]]]
+
+    max_indx[line_indx[first_pos]] = indices[first_pos]
+    max_wght[line_indx[first_pos]] = data[first_pos]
+
+    return max_indx,max_wght
+#end-proc
+
+
+def get_dense_argmax(weight_mtrx,get_rows=True,get_cols=True):
+    """
+    Purpose : Row-wise and/or column-wise argmax of a dense (possibly memory-mapped) weight matrix, one row block at a time
+    Inputs  : weight_mtrx  - Dense numpy array or np.memmap
+              get_rows     - Compute the row-wise argmax
+              get_cols     - Compute the column-wise argmax
+    Output  : row_max_indx - int64 array, column index of the maximum of every row (zeros if not computed)
+              row_max_wght - float64 array, maximum weight of every row
+              col_max_indx - int64 array, row index of the maximum of every column (zeros if not computed)
+              col_max_wght - float64 array, maximum weight of every column
+    """
+
+    no_of_rows,no_of_cols = weight_mtrx.shape
+
+    row_max_indx = np.zeros(no_of_rows,dtype=np.int64)
+    row_max_wght = np.zeros(no_of_rows,dtype=np.float64)
+    col_max_indx = np.zeros(no_of_cols,dtype=np.int64)
+    col_max_wght = np.zeros(no_of_cols,dtype=np.float64)
+
+    if (no_of_rows == 0) or (no_of_cols == 0):
+        return row_max_indx,row_max_wght,col_max_indx,col_max_wght
+    #end-if
+
+    if (get_cols):
+        col_max_wght[:] = -np.inf
+    #end-if
+
+    #Only one row block (read as float64) is resident at a time : the matrix may be a float32 and/or memory-mapped array
+    blk_size = routine_weight_kernel.get_blk_size(no_of_cols)
+    for blk_str in range(0,no_of_rows,blk_size):
+        blk_end  = min(blk_str + blk_size,no_of_rows)
+        blk_mtrx = np.asarray(weight_mtrx[blk_str:blk_end,:],dtype=np.float64)
+
+        if (get_rows):
+            blk_row_indx = np.argmax(blk_mtrx,axis=1)
+            row_max_indx[blk_str:blk_end] = blk_row_indx
+            row_max_wght[blk_str:blk_end] = blk_mtrx[np.arange(blk_end - blk_str),blk_row_indx]
+        #end-if
+
+        #A later block replaces the running column maximum only if strictly larger (first maximum wins, NaN is sticky)
+        if (get_cols):
+            blk_col_indx = np.argmax(blk_mtrx,axis=0)
+            blk_col_wght = blk_mtrx[blk_col_indx,np.arange(no_of_cols)]
+            upd_mask     = (blk_col_wght > col_max_wght) | (np.isnan(blk_col_wght) & ~np.isnan(col_max_wght))
+            col_max_indx[upd_mask] = blk_col_indx[upd_mask] + blk_str
+            col_max_wght[upd_mask] = blk_col_wght[upd_mask]
+        #end-if
+    #endfor
+
+    return row_max_indx,row_max_wght,col_max_indx,col_max_wght
+#end-proc
+
+
+def get_row_argmax(weight_mtrx):
+    """
+    Purpose : Column index and weight of the maximum of every row of the weight matrix
+    Inputs  : weight_mtrx - Dense numpy array or scipy.sparse matrix
+    Output  : max_indx    - int64 array of length no. of rows
+              max_wght    - float64 array of length no. of rows
+    """
+
+    if routine_weight_kernel.is_sparse_mtrx(weight_mtrx):
+        from scipy import sparse
+        weight_mtrx = sparse.csr_matrix(weight_mtrx)
+        weight_mtrx.sort_indices()
+        return get_compressed_argmax(weight_mtrx.indptr,weight_mtrx.indices,weight_mtrx.data,weight_mtrx.shape[0])
+    #end-if
+
+    row_max_indx,row_max_wght,col_max_indx,col_max_wght = get_dense_argmax(weight_mtrx,True,False)
+
+    return row_max_indx,row_max_wght
+#end-proc
+
+
+def get_col_argmax(weight_mtrx):
+    """
+    Purpose : Row index and weight of the maximum of every column of the weight matrix
+    Inputs  : weight_mtrx - Dense numpy array or scipy.sparse matrix
+    Output  : max_indx    - int64 array of length no. of columns
+              max_wght    - float64 array of length no. of columns
+    """
+
+    if routine_weight_kernel.is_sparse_mtrx(weight_mtrx):
+        from scipy import sparse
+        weight_mtrx = sparse.csc_matrix(weight_mtrx)
+        weight_mtrx.sort_indices()
+        return get_compressed_argmax(weight_mtrx.indptr,weight_mtrx.indices,weight_mtrx.data,weight_mtrx.shape[1])
+    #end-if
+
+    row_max_indx,row_max_wght,col_max_indx,col_max_wght = get_dense_argmax(weight_mtrx,False,True)
+
+    return col_max_indx,col_max_wght
+#end-proc
+
+
+def get_row_col_argmax(weight_mtrx):
+    """
+    Purpose : Row-wise and column-wise argmax of the weight matrix in a single pass over row blocks
+    Inputs  : weight_mtrx  - Dense numpy array or scipy.sparse matrix
+    Output  : row_max_indx - int64 array, column index of the maximum of every row
+              row_max_wght - float64 array, maximum weight of every row
+              col_max_indx - int64 array, row index of the maximum of every column
+              col_max_wght - float64 array, maximum weight of every column
+    """
+
+    if routine_weight_kernel.is_sparse_mtrx(weight_mtrx):
+        row_max_indx,row_max_wght = get_row_argmax(weight_mtrx)
+        col_max_indx,col_max_wght = get_col_argmax(weight_mtrx)
+        return row_max_indx,row_max_wght,col_max_indx,col_max_wght
+    #end-if
+
+    return get_dense_argmax(weight_mtrx,True,True)
+#end-proc
+
+
+def check_assignment(assignment,mmap_path=None):
+    """
+    Purpose : Validate the assignment mode of the matchers
+    Inputs  : assignment - 'greedy' (argmax per row/column) or 'optimal' (maximum-weight one-to-one matching)
+              mmap_path  - (Optional) np.memmap file of the dense weight matrix; greedy assignment only, since the
+                           optimal one solves every connected component as a dense in-memory matrix (without a window,
+                           about the whole N x M matrix)
+    Output  : None (ValueError for an unknown mode or an optimal assignment with mmap_path)
+    """
+
+    if (assignment not in ('greedy','optimal')):
+        raise ValueError("assignment must be 'greedy' or 'optimal', got %r" % (assignment,))
+    #end-if
+    if (assignment == 'optimal') and (mmap_path is not None):
+        raise ValueError("mmap_path requires assignment='greedy' (the optimal assignment holds the components in memory), got %r"
+                         % (mmap_path,))
+    #end-if
+#end-proc
+
+
+def get_dense_edges(weight_mtrx,row_mask,col_mask):
+    """
+    Purpose : Eligible edges of a dense (possibly memory-mapped) weight matrix, one row block at a time
+    Inputs  : weight_mtrx - Dense numpy array or np.memmap
+              row_mask    - Boolean array, rows allowed to be matched
+              col_mask    - Boolean array, columns allowed to be matched
+    Output  : edg_row     - int64 array, row of every positive cell between allowed rows and columns (row-major order)
+              edg_col     - int64 array, column of every such cell
+              edg_wght    - float64 array, weight of every such cell
+    """
+
+    no_of_rows,no_of_cols = weight_mtrx.shape
+
+    edg_row  = [np.zeros(0,dtype=np.int64)]
+    edg_col  = [np.zeros(0,dtype=np.int64)]
+    edg_wght = [np.zeros(0,dtype=np.float64)]
+
+    #Only one row block (read as float64) is resident at a time, as in get_dense_argmax
+    blk_size = routine_weight_kernel.get_blk_size(no_of_cols)
+    for blk_str in range(0,no_of_rows,blk_size):
+        blk_end  = min(blk_str + blk_size,no_of_rows)
+        blk_mtrx = np.asarray(weight_mtrx[blk_str:blk_end,:],dtype=np.float64)
+
+        blk_keep = (blk_mtrx > 0) & row_mask[blk_str:blk_end,np.newaxis] & col_mask[np.newaxis,:]
+        blk_row,blk_col = np.nonzero(blk_keep)
+        edg_row.append(blk_row.astype(np.int64) + blk_str)
+        edg_col.append(blk_col.astype(np.int64))
+        edg_wght.append(blk_mtrx[blk_row,blk_col])
+    #end-for
+
+    return np.concatenate(edg_row),np.concatenate(edg_col),np.concatenate(edg_wght)
+#end-proc
+
+
+def get_optimal_matches(weight_mtrx,row_mask,col_mask):
+    """
+    Purpose : Maximum-weight one-to-one matching over the eligible cells of the weight matrix
+    Inputs  : weight_mtrx - Dense numpy array, np.memmap (read in row blocks, see get_dense_edges) or scipy.sparse matrix
+              row_mask    - Boolean array, rows allowed to be matched
+              col_mask    - Boolean array, columns allowed to be matched
+    Output  : row_indx    - int64 array of matched rows (ascending)
+              col_indx    - int64 array of matched columns
+              edge_weight - float64 array of the weights of the matched cells
+    """
+
+    from scipy import sparse
+    from scipy.optimize       import linear_sum_assignment
+    from scipy.sparse.csgraph import connected_components
+
+    no_of_rows,no_of_cols = weight_mtrx.shape
+
+    #Eligible edges : positive weight (NaN excluded) between allowed rows and columns
+    if routine_weight_kernel.is_sparse_mtrx(weight_mtrx):
+        coo_mtrx = sparse.coo_matrix(weight_mtrx)
+        edg_row  = coo_mtrx.row.astype(np.int64)
+        edg_col  = coo_mtrx.col.astype(np.int64)
+        edg_wght = coo_mtrx.data.astype(np.float64)
+        edg_keep = (edg_wght > 0) & row_mask[edg_row] & col_mask[edg_col]
+        edg_row  = edg_row[edg_keep]
+        edg_col  = edg_col[edg_keep]
+        edg_wght = edg_wght[edg_keep]
+    else:
+        edg_row,edg_col,edg_wght = get_dense_edges(weight_mtrx,row_mask,col_mask)
+    #end-if
+
+    if (len(edg_wght) == 0):
+        return np.zeros(0,dtype=np.int64),np.zeros(0,dtype=np.int64),np.zeros(0,dtype=np.float64)
+    #end-if
+
+    #Connected components of the bipartite graph (rows : 0..N-1, columns : N..N+M-1)
+    graph = sparse.coo_matrix((np.ones(len(edg_row)),(edg_row,edg_col + no_of_rows)),shape=(no_of_rows + no_of_cols,no_of_rows + no_of_cols))
+    no_of_comps,comp_label = connected_components(graph,directed=False)
+
+    edg_comp  = comp_label[edg_row]
+    edg_order = np.argsort(edg_comp,kind='stable')
+    edg_row   = edg_row[edg_order]
+    edg_col   = edg_col[edg_order]
+    edg_wght  = edg_wght[edg_order]
+    edg_comp  = edg_comp[edg_order]
+
+    comp_str = np.flatnonzero(np.r_[True,edg_comp[1:] != edg_comp[:-1]])
+    comp_end = np.r_[comp_str[1:],len(edg_comp)]
+
+    match_row  = []
+    match_col  = []
+    match_wght = []
+
+    #Components with a single edge are matched directly
+    single_edg = comp_str[(comp_end - comp_str) == 1]
+    match_row.append(edg_row[single_edg])
+    match_col.append(edg_col[single_edg])
+    match_wght.append(edg_wght[single_edg])
+
+    for k in np.flatnonzero((comp_end - comp_str) > 1):
+        comp_row  = edg_row[comp_str[k]:comp_end[k]]
+        comp_col  = edg_col[comp_str[k]:comp_end[k]]
+        comp_wght = edg_wght[comp_str[k]:comp_end[k]]
+
+        uniq_row,row_loc = np.unique(comp_row,return_inverse=True)
+        uniq_col,col_loc = np.unique(comp_col,return_inverse=True)
+
+        comp_mtrx = np.zeros([len(uniq_row),len(uniq_col)])
+        comp_mtrx[row_loc,col_loc] = comp_wght
+
+        asgn_row,asgn_col = linear_sum_assignment(comp_mtrx,maximize=True)
+        asgn_keep = comp_mtrx[asgn_row,asgn_col] > 0
+
+        match_row.append(uniq_row[asgn_row[asgn_keep]])
+        match_col.append(uniq_col[asgn_col[asgn_keep]])
+        match_wght.append(comp_mtrx[asgn_row[asgn_keep],asgn_col[asgn_keep]])
+    #endfor
+
+    row_indx    = np.concatenate(match_row).astype(np.int64)
+    col_indx    = np.concatenate(match_col).astype(np.int64)
+    edge_weight = np.concatenate(match_wght).astype(np.float64)
+
+    srt_indx = np.argsort(row_indx,kind='stable')
+
+    return row_indx[srt_indx],col_indx[srt_indx],edge_weight[srt_indx]
+#end-proc
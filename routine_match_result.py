@@ -0,0 +1,341 @@
+#******************************************************************************************************************************************
+# TITLE     : ROUTINE_MATCH_RESULT
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : matched dataframes materialized once from index arrays
+# 2026-10-18        | CONTRIBUTORS        | Per-board LDR-SPR-PP1-PP2 trace table (get_trace_df)
+# 2026-10-18        | CONTRIBUTORS        | Compact struct-of-arrays results (CompactMatchResult)
+#******************************************************************************************************************************************
+
+#Result builders shared by the LDR-SPR, SPR-PP1 and PP1-PP2 PCB Data Association
+#
+#The matchers collect the matched positional indices (and edge weights) in NumPy arrays and call one of the builders
+#below once, instead of appending a one-row dataframe per matched PCB. The column names and order are unchanged;
+#index columns are int64, timestamp columns keep the dtype of the source column and edge weights are float64.
+#
+#CompactMatchResult is the optional compact form of the same results : int32 index arrays, float32 edge weights and
+#int8 flags, with references to the source tables instead of timestamp columns (about 4 bytes per index and 4 per weight
+#instead of 8 per cell plus one 8 byte timestamp per event and station). Timestamps are gathered on request as int64
+#epoch nanoseconds (get_tmstmp_ns) and to_df() builds the dataframe of the builders (weights rounded to float32).
+
+import numpy  as np
+import pandas as pd
+
+LDRSPR_COLUMNS = ['ldr_dptr','spr_indx','spr_dptr','spr_special_entry','ldr_multiple_events']
+SPRPP1_COLUMNS = ['spr_indx','spr_dptr','pp1_indx','pp1_arvl','pp1_dptr','edge_weight_sprpp1']
+PP1PP2_COLUMNS = ['pp1_indx','pp1_arvl','pp1_dptr','pp2_indx','pp2_arvl','pp2_dptr','edge_weight_pp1pp2']
+#Timestamp column -> (source table, source column)
+TMSTMP_SOURCES = {
+    'ldr_dptr' : ('ldr','dptr_tmstmp'),
+    'spr_dptr' : ('spr','dptr_tmstmp'),
+    'pp1_arvl' : ('pp1','arvl_tmstmp'),
+    'pp1_dptr' : ('pp1','dptr_tmstmp'),
+    'pp2_arvl' : ('pp2','arvl_tmstmp'),
+    'pp2_dptr' : ('pp2','dptr_tmstmp'),
+    }
+
+TRACE_COLUMNS  = ['ldr_indx','ldr_dptr','spr_indx','spr_dptr','pp1_indx','pp1_arvl','pp1_dptr','pp2_indx','pp2_arvl','pp2_dptr',
+                  'edge_weight_sprpp1','edge_weight_pp1pp2','spr_special_entry','ldr_multiple_events']
+
+
+def get_column_values(column_srs,pos):
+    """
+    Purpose : Take the values of a column at positional indices, missing (NaN/NaT) where the index is negative
+    Inputs  : column_srs - Source column (Series)
+              pos        - int64 positional indices, -1 for missing
+    Output  : values_srs - Series of length len(pos)
+    """
+
+    pos = np.asarray(pos,dtype=np.int64)
+
+    if (len(column_srs) == 0):
+        return pd.Series(column_srs.to_numpy()[:0]).reindex(pd.RangeIndex(len(pos)))
+    #end-if
+
+    values_srs = pd.Series(column_srs.to_numpy()[np.maximum(pos,0)])
+
+    return values_srs.where(pos >= 0)
+#end-proc
+
+
+def get_ldrspr_matched_df(pcb_level_dfldr,pcb_level_dfspr,ldr_pos,spr_indx,spr_special_entry,ldr_multiple_events):
+    """
+    Purpose : Materialize the LDR-SPR matched dataframe
+    Inputs  : pcb_level_dfldr     - The PCB level dataframe corresponding to loader
+              pcb_level_dfspr     - The PCB level dataframe corresponding to screen printer
+              ldr_pos             - Positional index of the loader event (-1 : no loader event)
+              spr_indx            - Positional index of the SPR event
+              spr_special_entry   - 1 if no loader event was identified for the SPR event, else 0
+              ldr_multiple_events - 1 if multiple loader events were identified for the SPR event, else 0
+    Output  : matched_df          - The dataframe that contains the matched PCBs
+    """
+
+    matched_df = pd.DataFrame({
+        'ldr_dptr'            : get_column_values(pcb_level_dfldr.dptr_tmstmp,ldr_pos),
+        'spr_indx'            : np.asarray(spr_indx,dtype=np.int64),
+        'spr_dptr'            : get_column_values(pcb_level_dfspr.dptr_tmstmp,spr_indx),
+        'spr_special_entry'   : np.asarray(spr_special_entry,dtype=np.int64),
+        'ldr_multiple_events' : np.asarray(ldr_multiple_events,dtype=np.int64),
+        },columns=LDRSPR_COLUMNS)
+
+    return matched_df
+#end-proc
+
+
+def get_sprpp1_matched_df(pcb_level_dfspr,pcb_level_dfpp1,spr_indx,pp1_indx,edge_weight):
+    """
+    Purpose : Materialize the SPR-PP1 matched dataframe
+    Inputs  : pcb_level_dfspr - The PCB level dataframe corresponding to screen printer
+              pcb_level_dfpp1 - The PCB level dataframe corresponding to PP1
+              spr_indx        - Positional index of the matched SPR events
+              pp1_indx        - Positional index of the matched PP1 events
+              edge_weight     - Edge weight of the matched pairs
+    Output  : matched_df      - The dataframe that contains the matched PCBs
+    """
+
+    matched_df = pd.DataFrame({
+        'spr_indx'           : np.asarray(spr_indx,dtype=np.int64),
+        'spr_dptr'           : get_column_values(pcb_level_dfspr.dptr_tmstmp,spr_indx),
+        'pp1_indx'           : np.asarray(pp1_indx,dtype=np.int64),
+        'pp1_arvl'           : get_column_values(pcb_level_dfpp1.arvl_tmstmp,pp1_indx),
+        'pp1_dptr'           : get_column_values(pcb_level_dfpp1.dptr_tmstmp,pp1_indx),
+        'edge_weight_sprpp1' : np.asarray(edge_weight,dtype=np.float64),
+        },columns=SPRPP1_COLUMNS)
+
+    return matched_df
+#end-proc
+
+
+def get_pp1pp2_matched_df(pcb_level_dfone,pcb_level_dftwo,pp1_indx,pp2_indx,edge_weight):
+    """
+    Purpose : Materialize the PP1-PP2 matched dataframe
+    Inputs  : pcb_level_dfone - The PCB level dataframe corresponding to first machine (PP1)
+              pcb_level_dftwo - The PCB level dataframe corresponding to second machine (PP2)
+              pp1_indx        - Positional index of the matched PP1 events
+              pp2_indx        - Positional index of the matched PP2 events
+              edge_weight     - Edge weight of the matched pairs
+    Output  : matched_df      - The dataframe that contains the matched PCBs
+    """
+
+    matched_df = pd.DataFrame({
+        'pp1_indx'           : np.asarray(pp1_indx,dtype=np.int64),
+        'pp1_arvl'           : get_column_values(pcb_level_dfone.arvl_tmstmp,pp1_indx),
+        'pp1_dptr'           : get_column_values(pcb_level_dfone.dptr_tmstmp,pp1_indx),
+        'pp2_indx'           : np.asarray(pp2_indx,dtype=np.int64),
+        'pp2_arvl'           : get_column_values(pcb_level_dftwo.arvl_tmstmp,pp2_indx),
+        'pp2_dptr'           : get_column_values(pcb_level_dftwo.dptr_tmstmp,pp2_indx),
+        'edge_weight_pp1pp2' : np.asarray(edge_weight,dtype=np.float64),
+        },columns=PP1PP2_COLUMNS)
+
+    return matched_df
+#end-proc
+
+
+def get_trace_df(pcb_level_dfldr,pcb_level_dfspr,pcb_level_dfone,pcb_level_dftwo,ldr_pos,spr_indx,pp1_indx,pp2_indx,
+                 edge_weight_sprpp1,edge_weight_pp1pp2,spr_special_entry,ldr_multiple_events):
+    """
+    Purpose : Materialize the per-board trace table (loader departure through PP2 departure)
+    Inputs  : pcb_level_dfldr     - The PCB level dataframe corresponding to loader
+              pcb_level_dfspr     - The PCB level dataframe corresponding to screen printer
+              pcb_level_dfone     - The PCB level dataframe corresponding to first machine (PP1)
+              pcb_level_dftwo     - The PCB level dataframe corresponding to second machine (PP2)
+              ldr_pos             - Positional index of the loader event (-1 : none)
+              spr_indx            - Positional index of the SPR event
+              pp1_indx            - Positional index of the PP1 event (-1 : none)
+              pp2_indx            - Positional index of the PP2 event (-1 : none)
+              edge_weight_sprpp1  - Edge weight of the SPR-PP1 pair (NaN : none)
+              edge_weight_pp1pp2  - Edge weight of the PP1-PP2 pair (NaN : none)
+              spr_special_entry   - 1 if no loader event was identified for the SPR event, else 0
+              ldr_multiple_events - 1 if multiple loader events were identified for the SPR event, else 0
+    Output  : trace_df            - One row per board; index columns are -1 where the board was not matched
+    """
+
+    trace_df = pd.DataFrame({
+        'ldr_indx'            : np.asarray(ldr_pos,dtype=np.int64),
+        'ldr_dptr'            : get_column_values(pcb_level_dfldr.dptr_tmstmp,ldr_pos),
+        'spr_indx'            : np.asarray(spr_indx,dtype=np.int64),
+        'spr_dptr'            : get_column_values(pcb_level_dfspr.dptr_tmstmp,spr_indx),
+        'pp1_indx'            : np.asarray(pp1_indx,dtype=np.int64),
+        'pp1_arvl'            : get_column_values(pcb_level_dfone.arvl_tmstmp,pp1_indx),
+        'pp1_dptr'            : get_column_values(pcb_level_dfone.dptr_tmstmp,pp1_indx),
+        'pp2_indx'            : np.asarray(pp2_indx,dtype=np.int64),
+        'pp2_arvl'            : get_column_values(pcb_level_dftwo.arvl_tmstmp,pp2_indx),
+        'pp2_dptr'            : get_column_values(pcb_level_dftwo.dptr_tmstmp,pp2_indx),
+        'edge_weight_sprpp1'  : np.asarray(edge_weight_sprpp1,dtype=np.float64),
+        'edge_weight_pp1pp2'  : np.asarray(edge_weight_pp1pp2,dtype=np.float64),
+        'spr_special_entry'   : np.asarray(spr_special_entry,dtype=np.int64),
+        'ldr_multiple_events' : np.asarray(ldr_multiple_events,dtype=np.int64),
+        },columns=TRACE_COLUMNS)
+
+    return trace_df
+#end-proc
+
+
+class CompactMatchResult(object):
+    """
+    Purpose : Struct-of-arrays matched result (int32 indices, float32 edge weights, int8 flags) referencing the source tables
+    """
+
+    #Index columns, with ldr_indx added to the LDR-SPR columns (reference of ldr_dptr)
+    RESULT_COLUMNS = {
+        'ldrspr' : ['ldr_indx'] + LDRSPR_COLUMNS,
+        'sprpp1' : SPRPP1_COLUMNS,
+        'pp1pp2' : PP1PP2_COLUMNS,
+        'trace'  : TRACE_COLUMNS,
+        }
+
+    def __init__(self,kind,source_dfs,arrays):
+        """
+        Purpose : Initialize the result
+        Inputs  : kind       - 'ldrspr', 'sprpp1', 'pp1pp2' or 'trace'
+                  source_dfs - Source tables by station ('ldr', 'spr', 'pp1', 'pp2'); referenced, not copied
+                  arrays     - Column name -> array for the index (*_indx), edge weight (edge_weight_*) and flag columns
+        """
+
+        if (kind not in self.RESULT_COLUMNS):
+            raise ValueError('kind must be one of %r, got %r' % (sorted(self.RESULT_COLUMNS),kind))
+        #end-if
+
+        self.kind       = kind
+        self.source_dfs = dict(source_dfs)
+        self.arrays     = {}
+
+        for column,values in arrays.items():
+            if column.endswith('_indx'):
+                values = np.asarray(values,dtype=np.int64)
+                if (len(values) > 0) and (values.max() > np.iinfo(np.int32).max):
+                    raise ValueError('%s does not fit in int32 (max %d)' % (column,values.max()))
+                #end-if
+                self.arrays[column] = values.astype(np.int32)
+            elif column.startswith('edge_weight'):
+                self.arrays[column] = np.asarray(values,dtype=np.float32)
+            else:
+                self.arrays[column] = np.asarray(values,dtype=np.int8)
+            #end-if
+        #end-for
+    #end-proc
+
+    def __len__(self):
+        """
+        Purpose : Number of matched rows
+        """
+        return len(next(iter(self.arrays.values()))) if (len(self.arrays) > 0) else 0
+    #end-proc
+
+    def get_nbytes(self):
+        """
+        Purpose : Memory held by the result arrays (the source tables are shared)
+        """
+        return sum(values.nbytes for values in self.arrays.values())
+    #end-proc
+
+    def get_tmstmp_ns(self,column):
+        """
+        Purpose : Timestamp column as int64 epoch nanoseconds (NAT_NS where the index is -1)
+        Inputs  : column  - Timestamp column (TMSTMP_SOURCES), e.g. 'spr_dptr'
+        Output  : tmstmp_ns - int64 array
+        """
+
+        station,source_column = TMSTMP_SOURCES[column]
+        indx = self.arrays[station + '_indx']
+
+        source_ns = self.source_dfs[station][source_column].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        if (len(source_ns) == 0):
+            return np.full(len(indx),np.iinfo(np.int64).min,dtype=np.int64)
+        #end-if
+
+        return np.where(indx >= 0,source_ns[np.maximum(indx,0)],np.iinfo(np.int64).min)
+    #end-proc
+
+    def to_df(self):
+        """
+        Purpose : Materialize the dataframe of the matching builder (int64 indices, source timestamps, float64 weights)
+        """
+
+        matched_df = pd.DataFrame(index=pd.RangeIndex(len(self)))
+        for column in self.RESULT_COLUMNS[self.kind]:
+            if (column in TMSTMP_SOURCES):
+                station,source_column = TMSTMP_SOURCES[column]
+                matched_df[column] = get_column_values(self.source_dfs[station][source_column],self.arrays[station + '_indx'])
+            elif column.startswith('edge_weight'):
+                matched_df[column] = self.arrays[column].astype(np.float64)
+            elif (column in self.arrays):
+                matched_df[column] = self.arrays[column].astype(np.int64)
+            #end-if
+        #end-for
+
+        if (self.kind == 'ldrspr'):
+            matched_df = matched_df.drop(columns='ldr_indx')
+        #end-if
+
+        return matched_df
+    #end-proc
+#end-class
+
+
+def get_ldrspr_compact_result(pcb_level_dfldr,pcb_level_dfspr,ldr_pos,spr_indx,spr_special_entry,ldr_multiple_events):
+    """
+    Purpose : Compact form of get_ldrspr_matched_df (same inputs)
+    """
+
+    return CompactMatchResult('ldrspr',{'ldr' : pcb_level_dfldr,'spr' : pcb_level_dfspr},{
+        'ldr_indx'            : ldr_pos,
+        'spr_indx'            : spr_indx,
+        'spr_special_entry'   : spr_special_entry,
+        'ldr_multiple_events' : ldr_multiple_events,
+        })
+#end-proc
+
+
+def get_sprpp1_compact_result(pcb_level_dfspr,pcb_level_dfpp1,spr_indx,pp1_indx,edge_weight):
+    """
+    Purpose : Compact form of get_sprpp1_matched_df (same inputs)
+    """
+
+    return CompactMatchResult('sprpp1',{'spr' : pcb_level_dfspr,'pp1' : pcb_level_dfpp1},{
+        'spr_indx'           : spr_indx,
+        'pp1_indx'           : pp1_indx,
+        'edge_weight_sprpp1' : edge_weight,
+        })
+#end-proc
+
+
+def get_pp1pp2_compact_result(pcb_level_dfone,pcb_level_dftwo,pp1_indx,pp2_indx,edge_weight):
+    """
+    Purpose : Compact form of get_pp1pp2_matched_df (same inputs)
+    """
+
+    return CompactMatchResult('pp1pp2',{'pp1' : pcb_level_dfone,'pp2' : pcb_level_dftwo},{
+        'pp1_indx'           : pp1_indx,
+        'pp2_indx'           : pp2_indx,
+        'edge_weight_pp1pp2' : edge_weight,
+        })
+#end-proc
+
+
+def get_trace_compact_result(pcb_level_dfldr,pcb_level_dfspr,pcb_level_dfone,pcb_level_dftwo,ldr_pos,spr_indx,pp1_indx,pp2_indx,
+                             edge_weight_sprpp1,edge_weight_pp1pp2,spr_special_entry,ldr_multiple_events):
+    """
+    Purpose : Compact form of get_trace_df (same inputs)
+    """
+
+    return CompactMatchResult('trace',{'ldr' : pcb_level_dfldr,'spr' : pcb_level_dfspr,'pp1' : pcb_level_dfone,'pp2' : pcb_level_dftwo},{
+        'ldr_indx'            : ldr_pos,
+        'spr_indx'            : spr_indx,
+        'pp1_indx'            : pp1_indx,
+        'pp2_indx'            : pp2_indx,
+        'edge_weight_sprpp1'  : edge_weight_sprpp1,
+        'edge_weight_pp1pp2'  : edge_weight_pp1pp2,
+        'spr_special_entry'   : spr_special_entry,
+        'ldr_multiple_events' : ldr_multiple_events,
+        })
+#end-proc
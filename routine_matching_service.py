@@ -0,0 +1,917 @@
+#******************************************************************************************************************************************
+# TITLE     : ROUTINE_MATCHING_SERVICE
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : asyncio matching service with trace lookups over TCP / Unix / HTTP
+# 2026-10-18        | CONTRIBUTORS        | Out of order ingest batches rejected (get_last_tmstmp)
+# 2026-10-18        | CONTRIBUTORS        | Pluggable weighting functions (sprpp1_weighting, pp1pp2_weighting)
+# 2026-10-18        | CONTRIBUTORS        | LDR-SPR trace index from the loader positions of the streaming matcher
+#******************************************************************************************************************************************
+
+#Live matching service (asyncio)
+#
+#A MatchingService keeps the streaming matchers of the line (routine_streaming_matcher : LDR-SPR, SPR-PP1, PP1-PP2) and
+#a trace index in memory. Ingested events are queued per station and fed to the matchers in batches (batch_size events,
+#or every batch_delay_seconds); the emitted matches are written into the trace index, one growable array per station
+#and field, so a trace lookup is a few array reads. A lookup first flushes the queued events.
+#
+#Every station stream must be ingested in time order (as for the streaming matchers); a batch whose timestamps decrease
+#or start before the last ones ingested for the station is rejected. The station index of an event is its position in
+#the stream of the station. Matches appear once their transit window has closed (see
+#routine_streaming_matcher); until then the trace fields are -1 / null.
+#
+#Protocols (the same requests) :
+#  - JSON lines over TCP or a Unix socket : one JSON object per line, one JSON response per line
+#        {"op": "ingest", "station": "spr", "events": [{"dptr_tmstmp": "2019-05-01 08:00:20"}, ...]}
+#        {"op": "trace", "station": "spr", "indx": 12}  or  {"op": "trace", "station": "spr", "tmstmp": "2019-05-01 08:00:20"}
+#        {"op": "flush"}, {"op": "stats"}
+#  - HTTP/1.1 : POST /ingest (body {"station": ..., "events": [...]}), GET /trace?station=spr&indx=12 (or &tmstmp=...),
+#    POST /flush, GET /stats
+#Responses are {"ok": true, ...} or {"ok": false, "error": "..."} (HTTP status 400).
+#
+#    python routine_matching_service.py --port 8765 --http-port 8080 --sprpp1-max-transit 600 --pp1pp2-max-transit 600
+#
+#MatchingClient (JSON lines) and http_request talk to a running service from asyncio code (dashboards, tests).
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+import urllib.parse
+
+import numpy  as np
+import pandas as pd
+
+import routine_weight_kernel
+import routine_instrumentation
+import routine_streaming_matcher
+import routine_weighting_functions
+
+STATIONS = ('ldr','spr','pp1','pp2')
+
+#Event fields of every station (timestamps as int64 ns)
+STATION_EVENT_FIELDS = {
+    'ldr' : ('dptr_tmstmp',),
+    'spr' : ('dptr_tmstmp',),
+    'pp1' : ('arvl_tmstmp','dptr_tmstmp','weightage'),
+    'pp2' : ('arvl_tmstmp','dptr_tmstmp','weightage'),
+    }
+
+#Trace fields of every station : (name, dtype, fill value)
+STATION_TRACE_FIELDS = {
+    'ldr' : (('spr_indx',np.int64,-1),),
+    'spr' : (('ldr_indx',np.int64,-1),('spr_special_entry',np.int8,-1),('ldr_multiple_events',np.int8,-1),
+             ('pp1_indx',np.int64,-1),('edge_weight_sprpp1',np.float64,np.nan)),
+    'pp1' : (('spr_indx',np.int64,-1),('pp2_indx',np.int64,-1),('edge_weight_pp1pp2',np.float64,np.nan)),
+    'pp2' : (('pp1_indx',np.int64,-1),),
+    }
+
+#Default ingest batching
+BATCH_SIZE          = 1024
+BATCH_DELAY_SECONDS = 0.05
+
+#Largest request line / HTTP body [bytes]
+MAX_REQUEST_BYTES = 2**26
+
+
+class StationLog(object):
+    """
+    Purpose : Growable columns (capacity doubling) of the events of one station and their trace fields
+    """
+
+    def __init__(self,fields):
+        """
+        Purpose : Initialize empty columns
+        Inputs  : fields - (name, dtype, fill value) of every column
+        """
+
+        self.fields   = tuple(fields)
+        self.size     = 0
+        self.capacity = 0
+        self.columns  = {name : np.zeros(0,dtype=dtype) for (name,dtype,fill) in self.fields}
+    #end-proc
+
+    def __len__(self):
+        return self.size
+    #end-proc
+
+    def append(self,values):
+        """
+        Purpose : Append events (values : column name -> array; the missing columns take their fill value)
+        """
+
+        no_of_events = len(next(iter(values.values())))
+        if (self.size + no_of_events > self.capacity):
+            capacity = max(2 * self.capacity,self.size + no_of_events,1024)
+            for (name,dtype,fill) in self.fields:
+                column = np.full(capacity,fill,dtype=dtype)
+                column[:self.size] = self.columns[name][:self.size]
+                self.columns[name] = column
+            #end-for
+            self.capacity = capacity
+        #end-if
+
+        for name,column_values in values.items():
+            self.columns[name][self.size:self.size + no_of_events] = column_values
+        #end-for
+        self.size = self.size + no_of_events
+    #end-proc
+
+    def get_column(self,name):
+        """
+        Purpose : Column of the events appended so far (view)
+        """
+        return self.columns[name][:self.size]
+    #end-proc
+#end-class
+
+
+class MatchingService(object):
+    """
+    Purpose : Incremental match state of a line (streaming matchers and trace index) with batched ingest
+    """
+
+    def __init__(self,sprpp1_max_transit_seconds,pp1pp2_max_transit_seconds,sprpp1_min_transit_seconds=None,
+                 pp1pp2_min_transit_seconds=None,sprpp1_direction='fwd',pp1pp2_direction='fwd',hist_mode=None,
+                 batch_size=BATCH_SIZE,batch_delay_seconds=BATCH_DELAY_SECONDS,sprpp1_weighting=None,pp1pp2_weighting=None):
+        """
+        Purpose : Initialize the service state
+        Inputs  : sprpp1_max_transit_seconds - Maximum SPR departure to PP1 arrival time
+                  pp1pp2_max_transit_seconds - Maximum PP1 departure to PP2 arrival time
+                  sprpp1_min_transit_seconds - (Optional) Minimum SPR departure to PP1 arrival time
+                  pp1pp2_min_transit_seconds - (Optional) Minimum PP1 departure to PP2 arrival time
+                  sprpp1_direction           - (Optional) 'fwd' or 'rev' SPR-PP1 matching
+                  pp1pp2_direction           - (Optional) 'fwd' or 'rev' PP1-PP2 matching
+                  hist_mode                  - (Optional) Modal LDR-SPR delay (else the running mode of the 1-1 delays)
+                  batch_size                 - (Optional) Queued events that trigger a flush
+                  batch_delay_seconds        - (Optional) Longest time an event stays queued (serve)
+                  sprpp1_weighting           - (Optional) SPR-PP1 weighting function : name, (name, params) or
+                                               WeightFunction (routine_weighting_functions.get_weighting)
+                  pp1pp2_weighting           - (Optional) PP1-PP2 weighting function (same forms)
+        """
+
+        if (batch_size < 1):
+            raise ValueError('batch_size must be at least 1, got %r' % (batch_size,))
+        #end-if
+
+        self.ldrspr_matcher = routine_streaming_matcher.LdrSprStreamingMatcher(hist_mode)
+        self.sprpp1_matcher = routine_streaming_matcher.SprPp1StreamingMatcher(sprpp1_max_transit_seconds,
+                                                                               sprpp1_min_transit_seconds,sprpp1_direction,
+                                                                               sprpp1_weighting)
+        self.pp1pp2_matcher = routine_streaming_matcher.Pp1Pp2StreamingMatcher(pp1pp2_max_transit_seconds,
+                                                                               pp1pp2_min_transit_seconds,pp1pp2_direction,
+                                                                               pp1pp2_weighting)
+
+        self.batch_size          = batch_size
+        self.batch_delay_seconds = batch_delay_seconds
+
+        self.station_logs = {}
+        for station in STATIONS:
+            fields = [(name,np.float64 if (name == 'weightage') else np.int64,
+                       np.nan if (name == 'weightage') else routine_weight_kernel.NAT_NS) for name in STATION_EVENT_FIELDS[station]]
+            self.station_logs[station] = StationLog(fields + list(STATION_TRACE_FIELDS[station]))
+        #end-for
+
+        self.pending_events = {station : [] for station in STATIONS}
+        self.last_tmstmp_ns = {station : {field : routine_weight_kernel.NAT_NS for field in STATION_EVENT_FIELDS[station]
+                                          if field.endswith('_tmstmp')} for station in STATIONS}
+        self.no_of_pending  = 0
+        self.no_of_matches  = {'ldrspr' : 0,'sprpp1' : 0,'pp1pp2' : 0}
+        self.no_of_flushes  = 0
+        self.flush_seconds  = 0.0
+    #end-proc
+
+    #--------------------------------------------------------------------------------------------------------------------
+    #Ingest
+
+    def add_events(self,station,events):
+        """
+        Purpose : Queue events of a station (flushed when batch_size events are queued)
+        Inputs  : station - 'ldr', 'spr', 'pp1' or 'pp2'
+                  events  - List of dicts with the fields of STATION_EVENT_FIELDS (timestamps as strings or int ns), in
+                            time order and not before the events of the station already ingested (else ValueError)
+        Output  : no_of_events - Number of events queued
+        """
+
+        if (station not in STATIONS):
+            raise ValueError('station must be one of %s, got %r' % (', '.join(STATIONS),station))
+        #end-if
+        if (not isinstance(events,list)):
+            raise ValueError('events must be a list, got %r' % (type(events).__name__,))
+        #end-if
+
+        fields = STATION_EVENT_FIELDS[station]
+        for event in events:
+            if (not isinstance(event,dict)) or any((field not in event) for field in fields):
+                raise ValueError('%s events require %s, got %r' % (station,', '.join(fields),event))
+            #end-if
+        #end-for
+
+        #Converted and checked on arrival : a malformed or out of order request is rejected before it reaches the matchers
+        event_df    = self.get_event_df(station,events)
+        last_tmstmp = self.get_last_tmstmp(station,event_df)
+
+        self.pending_events[station].append(event_df)
+        self.last_tmstmp_ns[station] = last_tmstmp
+        self.no_of_pending = self.no_of_pending + len(events)
+
+        if (self.no_of_pending >= self.batch_size):
+            self.flush()
+        #end-if
+
+        return len(events)
+    #end-proc
+
+    def get_event_df(self,station,events):
+        """
+        Purpose : PCB level dataframe of ingested events
+        """
+
+        event_df = pd.DataFrame({field : [event[field] for event in events] for field in STATION_EVENT_FIELDS[station]})
+        for field in STATION_EVENT_FIELDS[station]:
+            if field.endswith('_tmstmp'):
+                event_df[field] = pd.to_datetime(event_df[field]).astype('datetime64[ns]')
+            else:
+                event_df[field] = event_df[field].astype(np.float64)
+            #end-if
+        #end-for
+
+        return event_df
+    #end-proc
+
+    def get_last_tmstmp(self,station,event_df):
+        """
+        Purpose : Check that a batch continues the stream of its station in time order
+        Inputs  : station     - Station of the batch
+                  event_df    - Converted batch (get_event_df)
+        Output  : last_tmstmp - Timestamp field -> last valid timestamp [ns] of the stream with the batch
+        """
+
+        last_tmstmp = dict(self.last_tmstmp_ns[station])
+        for field in STATION_EVENT_FIELDS[station]:
+            if (not field.endswith('_tmstmp')):
+                continue
+            #end-if
+            tmstmp_ns = routine_weight_kernel.get_tmstmp_ns(event_df[field])
+            tmstmp_ns = tmstmp_ns[tmstmp_ns != routine_weight_kernel.NAT_NS]
+            if (len(tmstmp_ns) == 0):
+                continue
+            #end-if
+            if np.any(np.diff(tmstmp_ns) < 0):
+                raise ValueError('%s events must be in time order, %s decreases within the batch' % (station,field))
+            #end-if
+            if (tmstmp_ns[0] < last_tmstmp[field]):
+                raise ValueError('%s events must be in time order, %s %s is before the last one ingested (%s)'
+                                 % (station,field,pd.Timestamp(int(tmstmp_ns[0])),pd.Timestamp(int(last_tmstmp[field]))))
+            #end-if
+            last_tmstmp[field] = tmstmp_ns[-1]
+        #end-for
+
+        return last_tmstmp
+    #end-proc
+
+    def flush(self):
+        """
+        Purpose : Feed the queued events to the matchers and write the emitted matches into the trace index
+        Output  : no_of_events - Number of events flushed
+        """
+
+        if (self.no_of_pending == 0):
+            return 0
+        #end-if
+
+        str_time     = time.perf_counter()
+        no_of_events = self.no_of_pending
+
+        with routine_instrumentation.timed_phase('service.flush'):
+            for station in STATIONS:
+                if (len(self.pending_events[station]) == 0):
+                    continue
+                #end-if
+                event_df = pd.concat(self.pending_events[station],ignore_index=True)
+                self.station_logs[station].append({field : (routine_weight_kernel.get_tmstmp_ns(event_df[field])
+                                                            if field.endswith('_tmstmp') else event_df[field].to_numpy())
+                                                   for field in STATION_EVENT_FIELDS[station]})
+
+                if (station == 'ldr'):
+                    self.ldrspr_matcher.add_ldr_events(event_df)
+                elif (station == 'spr'):
+                    self.ldrspr_matcher.add_spr_events(event_df)
+                    self.sprpp1_matcher.add_spr_events(event_df)
+                elif (station == 'pp1'):
+                    self.sprpp1_matcher.add_pp1_events(event_df)
+                    self.pp1pp2_matcher.add_pp1_events(event_df)
+                else:
+                    self.pp1pp2_matcher.add_pp2_events(event_df)
+                #end-if
+                self.pending_events[station] = []
+            #end-for
+            self.no_of_pending = 0
+
+            self.set_ldrspr_matches(self.ldrspr_matcher.get_matches(with_ldr_indx=True))
+            self.set_pair_matches('sprpp1',self.sprpp1_matcher.get_matches())
+            self.set_pair_matches('pp1pp2',self.pp1pp2_matcher.get_matches())
+        #end-with
+
+        self.no_of_flushes = self.no_of_flushes + 1
+        self.flush_seconds = self.flush_seconds + (time.perf_counter() - str_time)
+
+        return no_of_events
+    #end-proc
+
+    def set_ldrspr_matches(self,matched_df):
+        """
+        Purpose : Write emitted LDR-SPR matches (with their loader stream positions, ldr_indx) into the trace index
+        """
+
+        if (len(matched_df) == 0):
+            return
+        #end-if
+
+        spr_log  = self.station_logs['spr']
+        ldr_log  = self.station_logs['ldr']
+        spr_indx = matched_df.spr_indx.to_numpy()
+        ldr_indx = matched_df.ldr_indx.to_numpy()
+
+        spr_log.get_column('ldr_indx')[spr_indx]            = ldr_indx
+        spr_log.get_column('spr_special_entry')[spr_indx]   = matched_df.spr_special_entry.to_numpy()
+        spr_log.get_column('ldr_multiple_events')[spr_indx] = matched_df.ldr_multiple_events.to_numpy()
+        ldr_log.get_column('spr_indx')[ldr_indx[ldr_indx >= 0]] = spr_indx[ldr_indx >= 0]
+
+        self.no_of_matches['ldrspr'] = self.no_of_matches['ldrspr'] + len(matched_df)
+    #end-proc
+
+    def set_pair_matches(self,stage,matched_df):
+        """
+        Purpose : Write emitted SPR-PP1 or PP1-PP2 matches into the trace index
+        """
+
+        if (len(matched_df) == 0):
+            return
+        #end-if
+
+        if (stage == 'sprpp1'):
+            row_log,col_log,row_col,col_col = self.station_logs['spr'],self.station_logs['pp1'],'spr_indx','pp1_indx'
+        else:
+            row_log,col_log,row_col,col_col = self.station_logs['pp1'],self.station_logs['pp2'],'pp1_indx','pp2_indx'
+        #end-if
+
+        row_indx = matched_df[row_col].to_numpy()
+        col_indx = matched_df[col_col].to_numpy()
+
+        row_log.get_column(col_col)[row_indx] = col_indx
+        row_log.get_column('edge_weight_' + stage)[row_indx] = matched_df['edge_weight_' + stage].to_numpy()
+        col_log.get_column(row_col)[col_indx] = row_indx
+
+        self.no_of_matches[stage] = self.no_of_matches[stage] + len(matched_df)
+    #end-proc
+
+    #--------------------------------------------------------------------------------------------------------------------
+    #Lookups
+
+    def get_station_indx(self,station,indx=None,tmstmp=None):
+        """
+        Purpose : Station index of an event given by its index or its departure timestamp (latest departure at or before)
+        """
+
+        if (station not in STATIONS):
+            raise ValueError('station must be one of %s, got %r' % (', '.join(STATIONS),station))
+        #end-if
+
+        station_log = self.station_logs[station]
+        if (indx is not None):
+            indx = int(indx)
+            if (indx < 0) or (indx >= len(station_log)):
+                raise ValueError('%s index %d out of range (0 to %d)' % (station,indx,len(station_log) - 1))
+            #end-if
+            return indx
+        #end-if
+        if (tmstmp is None):
+            raise ValueError('trace requires indx or tmstmp')
+        #end-if
+
+        tmstmp_ns = pd.Timestamp(tmstmp).as_unit('ns').value
+        indx      = int(np.searchsorted(station_log.get_column('dptr_tmstmp'),tmstmp_ns,side='right')) - 1
+        if (indx < 0):
+            raise ValueError('no %s event departing at or before %s' % (station,tmstmp))
+        #end-if
+
+        return indx
+    #end-proc
+
+    def get_event(self,station,indx):
+        """
+        Purpose : Event of a station as a JSON serializable dict (None if indx is -1)
+        """
+
+        if (indx is None) or (indx < 0):
+            return None
+        #end-if
+
+        station_log = self.station_logs[station]
+        event = {'indx' : int(indx)}
+        for field in STATION_EVENT_FIELDS[station]:
+            value = station_log.get_column(field)[indx]
+            if field.endswith('_tmstmp'):
+                event[field] = None if (value == routine_weight_kernel.NAT_NS) else pd.Timestamp(int(value)).isoformat()
+            else:
+                event[field] = None if np.isnan(value) else float(value)
+            #end-if
+        #end-for
+
+        return event
+    #end-proc
+
+    def trace(self,station,indx=None,tmstmp=None):
+        """
+        Purpose : Trace of a board from one of its events (LDR -> SPR -> PP1 -> PP2)
+        Inputs  : station - Station of the event
+                  indx    - (Optional) Station index of the event
+                  tmstmp  - (Optional) Departure of the event (latest event departing at or before)
+        Output  : trace   - dict : the event of every station (None : not matched yet) and the edge weights
+        """
+
+        self.flush()
+
+        logs = self.station_logs
+        chain_indx = dict.fromkeys(STATIONS,-1)
+        chain_indx[station] = self.get_station_indx(station,indx,tmstmp)
+
+        #Upstream to the SPR event, then downstream
+        if (station == 'pp2'):
+            chain_indx['pp1'] = int(logs['pp2'].get_column('pp1_indx')[chain_indx['pp2']])
+        #end-if
+        if (station in ('pp1','pp2')) and (chain_indx['pp1'] >= 0):
+            chain_indx['spr'] = int(logs['pp1'].get_column('spr_indx')[chain_indx['pp1']])
+        #end-if
+        if (station == 'ldr'):
+            chain_indx['spr'] = int(logs['ldr'].get_column('spr_indx')[chain_indx['ldr']])
+        #end-if
+        if (chain_indx['spr'] >= 0):
+            if (chain_indx['ldr'] < 0):
+                chain_indx['ldr'] = int(logs['spr'].get_column('ldr_indx')[chain_indx['spr']])
+            #end-if
+            if (chain_indx['pp1'] < 0):
+                chain_indx['pp1'] = int(logs['spr'].get_column('pp1_indx')[chain_indx['spr']])
+            #end-if
+        #end-if
+        if (chain_indx['pp1'] >= 0) and (chain_indx['pp2'] < 0):
+            chain_indx['pp2'] = int(logs['pp1'].get_column('pp2_indx')[chain_indx['pp1']])
+        #end-if
+
+        trace = {station_name : self.get_event(station_name,chain_indx[station_name]) for station_name in STATIONS}
+
+        edge_weight_sprpp1 = np.nan
+        if (chain_indx['spr'] >= 0) and (logs['spr'].get_column('pp1_indx')[chain_indx['spr']] == chain_indx['pp1']):
+            edge_weight_sprpp1 = logs['spr'].get_column('edge_weight_sprpp1')[chain_indx['spr']]
+        #end-if
+        edge_weight_pp1pp2 = np.nan
+        if (chain_indx['pp1'] >= 0) and (logs['pp1'].get_column('pp2_indx')[chain_indx['pp1']] == chain_indx['pp2']):
+            edge_weight_pp1pp2 = logs['pp1'].get_column('edge_weight_pp1pp2')[chain_indx['pp1']]
+        #end-if
+        trace['edge_weight_sprpp1'] = None if np.isnan(edge_weight_sprpp1) else float(edge_weight_sprpp1)
+        trace['edge_weight_pp1pp2'] = None if np.isnan(edge_weight_pp1pp2) else float(edge_weight_pp1pp2)
+
+        if (chain_indx['spr'] >= 0):
+            spr_special_entry   = int(logs['spr'].get_column('spr_special_entry')[chain_indx['spr']])
+            ldr_multiple_events = int(logs['spr'].get_column('ldr_multiple_events')[chain_indx['spr']])
+            trace['spr_special_entry']   = None if (spr_special_entry < 0) else spr_special_entry
+            trace['ldr_multiple_events'] = None if (ldr_multiple_events < 0) else ldr_multiple_events
+        #end-if
+
+        return trace
+    #end-proc
+
+    def get_stats(self):
+        """
+        Purpose : Event, match, buffer and flush counts
+        """
+
+        return {
+            'events'          : {station : len(self.station_logs[station]) for station in STATIONS},
+            'pending_events'  : self.no_of_pending,
+            'matches'         : dict(self.no_of_matches),
+            'buffered_events' : {
+                'ldrspr' : [int(n) for n in self.ldrspr_matcher.get_no_of_buffered_events()],
+                'sprpp1' : [int(n) for n in self.sprpp1_matcher.get_no_of_buffered_events()],
+                'pp1pp2' : [int(n) for n in self.pp1pp2_matcher.get_no_of_buffered_events()],
+                },
+            'flushes'         : self.no_of_flushes,
+            'flush_seconds'   : self.flush_seconds,
+            }
+    #end-proc
+
+    def handle_request(self,request):
+        """
+        Purpose : Execute a request (dict with 'op') and return the response dict
+        """
+
+        try:
+            if (not isinstance(request,dict)):
+                raise ValueError('request must be a JSON object')
+            #end-if
+            op = request.get('op')
+            if (op == 'ingest'):
+                response = {'queued' : self.add_events(request.get('station'),request.get('events',[]))}
+            elif (op == 'trace'):
+                response = {'trace' : self.trace(request.get('station'),request.get('indx'),request.get('tmstmp'))}
+            elif (op == 'flush'):
+                response = {'flushed' : self.flush()}
+            elif (op == 'stats'):
+                response = {'stats' : self.get_stats()}
+            else:
+                raise ValueError("op must be 'ingest', 'trace', 'flush' or 'stats', got %r" % (op,))
+            #end-if
+        except (ValueError,TypeError,KeyError) as error:
+            return {'ok' : False,'error' : '%s: %s' % (type(error).__name__,error)}
+        #end-try
+
+        response['ok'] = True
+
+        return response
+    #end-proc
+#end-class
+
+
+#==============================================================================================
+"""Servers"""
+
+async def handle_line_client(service,reader,writer):
+    """
+    Purpose : Serve a JSON lines connection (one request per line, one response per line)
+    """
+
+    try:
+        while True:
+            line = await reader.readline()
+            if (len(line) == 0):
+                break
+            #end-if
+            if (len(line.strip()) == 0):
+                continue
+            #end-if
+            try:
+                request = json.loads(line)
+            except ValueError as error:
+                response = {'ok' : False,'error' : 'invalid JSON : %s' % (error,)}
+            else:
+                response = service.handle_request(request)
+            #end-try
+            writer.write(json.dumps(response).encode() + b'\n')
+            await writer.drain()
+        #end-while
+    except (ConnectionError,asyncio.IncompleteReadError,asyncio.LimitOverrunError,ValueError):
+        pass
+    finally:
+        writer.close()
+    #end-try
+#end-proc
+
+
+def get_http_request(method,target,body):
+    """
+    Purpose : Service request of an HTTP request
+    """
+
+    url   = urllib.parse.urlsplit(target)
+    query = dict(urllib.parse.parse_qsl(url.query))
+
+    if (method == 'POST') and (url.path == '/ingest'):
+        request = json.loads(body) if (len(body) > 0) else {}
+        if (not isinstance(request,dict)):
+            raise ValueError('body must be a JSON object')
+        #end-if
+        request['op'] = 'ingest'
+        return request
+    #end-if
+    if (method == 'GET') and (url.path == '/trace'):
+        request = {'op' : 'trace','station' : query.get('station'),'tmstmp' : query.get('tmstmp')}
+        if ('indx' in query):
+            request['indx'] = int(query['indx'])
+        #end-if
+        return request
+    #end-if
+    if (method == 'POST') and (url.path == '/flush'):
+        return {'op' : 'flush'}
+    #end-if
+    if (method == 'GET') and (url.path == '/stats'):
+        return {'op' : 'stats'}
+    #end-if
+
+    raise ValueError('no route for %s %s' % (method,url.path))
+#end-proc
+
+
+async def handle_http_client(service,reader,writer):
+    """
+    Purpose : Serve an HTTP/1.1 connection (keep-alive; JSON responses)
+    """
+
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+            except asyncio.IncompleteReadError:
+                break
+            #end-try
+            lines = head.decode('latin-1').split('\r\n')
+            method,target = lines[0].split(' ')[:2]
+            headers = {}
+            for line in lines[1:]:
+                if (':' in line):
+                    name,value = line.split(':',1)
+                    headers[name.strip().lower()] = value.strip()
+                #end-if
+            #end-for
+
+            content_length = int(headers.get('content-length','0'))
+            if (content_length > MAX_REQUEST_BYTES):
+                raise ValueError('request body too large')
+            #end-if
+            body = await reader.readexactly(content_length) if (content_length > 0) else b''
+
+            try:
+                response = service.handle_request(get_http_request(method,target,body))
+            except ValueError as error:
+                response = {'ok' : False,'error' : '%s: %s' % (type(error).__name__,error)}
+            #end-try
+
+            payload = json.dumps(response).encode()
+            status  = '200 OK' if (response['ok']) else '400 Bad Request'
+            close   = (headers.get('connection','').lower() == 'close')
+            writer.write(('HTTP/1.1 %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\nConnection: %s\r\n\r\n'
+                          % (status,len(payload),'close' if (close) else 'keep-alive')).encode() + payload)
+            await writer.drain()
+            if (close):
+                break
+            #end-if
+        #end-while
+    except (ConnectionError,asyncio.IncompleteReadError,asyncio.LimitOverrunError,ValueError):
+        pass
+    finally:
+        writer.close()
+    #end-try
+#end-proc
+
+
+async def run_flush_loop(service):
+    """
+    Purpose : Flush the queued events every batch_delay_seconds
+    """
+
+    while True:
+        await asyncio.sleep(service.batch_delay_seconds)
+        service.flush()
+    #end-while
+#end-proc
+
+
+async def start_servers(service,host='127.0.0.1',port=None,unix_path=None,http_port=None):
+    """
+    Purpose : Start the JSON lines (TCP and / or Unix socket) and HTTP servers and the flush loop of a service
+    Inputs  : service   - MatchingService
+              host      - (Optional) Host of the TCP and HTTP servers
+              port      - (Optional) TCP port of the JSON lines server (0 : any free port)
+              unix_path - (Optional) Unix socket path of the JSON lines server
+              http_port - (Optional) TCP port of the HTTP server (0 : any free port)
+    Output  : servers   - List of asyncio servers (server.sockets[0].getsockname() gives the bound address)
+              flush_task- Flush loop task (cancel it with stop_servers)
+    """
+
+    def line_handler(reader,writer):
+        return handle_line_client(service,reader,writer)
+    #end-proc
+
+    def http_handler(reader,writer):
+        return handle_http_client(service,reader,writer)
+    #end-proc
+
+    servers = []
+    if (port is not None):
+        servers.append(await asyncio.start_server(line_handler,host,port,limit=MAX_REQUEST_BYTES))
+    #end-if
+    if (unix_path is not None):
+        servers.append(await asyncio.start_unix_server(line_handler,unix_path,limit=MAX_REQUEST_BYTES))
+    #end-if
+    if (http_port is not None):
+        servers.append(await asyncio.start_server(http_handler,host,http_port,limit=MAX_REQUEST_BYTES))
+    #end-if
+    if (len(servers) == 0):
+        raise ValueError('at least one of port, unix_path and http_port is required')
+    #end-if
+
+    flush_task = asyncio.ensure_future(run_flush_loop(service))
+
+    return servers,flush_task
+#end-proc
+
+
+async def stop_servers(servers,flush_task):
+    """
+    Purpose : Stop the servers and the flush loop started by start_servers
+    """
+
+    flush_task.cancel()
+    for server in servers:
+        server.close()
+        await server.wait_closed()
+    #end-for
+#end-proc
+
+
+#==============================================================================================
+"""Clients"""
+
+class MatchingClient(object):
+    """
+    Purpose : asyncio client of the JSON lines protocol
+    """
+
+    def __init__(self,host='127.0.0.1',port=None,unix_path=None):
+        """
+        Purpose : Initialize the client (connect with open)
+        """
+
+        self.host      = host
+        self.port      = port
+        self.unix_path = unix_path
+        self.reader    = None
+        self.writer    = None
+    #end-proc
+
+    async def open(self):
+        if (self.unix_path is not None):
+            self.reader,self.writer = await asyncio.open_unix_connection(self.unix_path,limit=MAX_REQUEST_BYTES)
+        else:
+            self.reader,self.writer = await asyncio.open_connection(self.host,self.port,limit=MAX_REQUEST_BYTES)
+        #end-if
+        return self
+    #end-proc
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+    #end-proc
+
+    async def request(self,request):
+        """
+        Purpose : Send a request (dict) and wait for its response (dict)
+        """
+
+        self.writer.write(json.dumps(request,default=str).encode() + b'\n')
+        await self.writer.drain()
+
+        return json.loads(await self.reader.readline())
+    #end-proc
+
+    async def ingest(self,station,events):
+        return await self.request({'op' : 'ingest','station' : station,'events' : events})
+    #end-proc
+
+    async def trace(self,station,indx=None,tmstmp=None):
+        request = {'op' : 'trace','station' : station}
+        if (indx is not None):
+            request['indx'] = int(indx)
+        #end-if
+        if (tmstmp is not None):
+            request['tmstmp'] = str(tmstmp)
+        #end-if
+        return await self.request(request)
+    #end-proc
+#end-class
+
+
+def get_events(pcb_level_df):
+    """
+    Purpose : Events of a PCB level dataframe as JSON serializable dicts (timestamps as int ns) for ingest requests
+    """
+
+    columns = [column for column in ('arvl_tmstmp','dptr_tmstmp','weightage') if (column in pcb_level_df.columns)]
+    values  = {}
+    for column in columns:
+        if column.endswith('_tmstmp'):
+            values[column] = routine_weight_kernel.get_tmstmp_ns(pcb_level_df[column]).tolist()
+        else:
+            values[column] = pcb_level_df[column].astype(np.float64).tolist()
+        #end-if
+    #end-for
+
+    return [dict(zip(columns,event_values)) for event_values in zip(*[values[column] for column in columns])]
+#end-proc
+
+
+async def http_request(host,port,method,target,body=None):
+    """
+    Purpose : Send one HTTP request to the service (Connection: close)
+    Output  : status   - HTTP status code
+              response - Response dict
+    """
+
+    reader,writer = await asyncio.open_connection(host,port,limit=MAX_REQUEST_BYTES)
+    payload = b'' if (body is None) else json.dumps(body,default=str).encode()
+    writer.write(('%s %s HTTP/1.1\r\nHost: %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\nConnection: close\r\n\r\n'
+                  % (method,target,host,len(payload))).encode() + payload)
+    await writer.drain()
+
+    head    = await reader.readuntil(b'\r\n\r\n')
+    status  = int(head.split(b' ')[1])
+    headers = dict(line.split(': ',1) for line in head.decode('latin-1').split('\r\n')[1:] if (': ' in line))
+    body    = await reader.readexactly(int(headers['Content-Length']))
+    writer.close()
+    await writer.wait_closed()
+
+    return status,json.loads(body)
+#end-proc
+
+
+#==============================================================================================
+"""Command line"""
+
+async def serve(service,host,port,unix_path,http_port):
+    """
+    Purpose : Run the servers until cancelled
+    """
+
+    servers,flush_task = await start_servers(service,host,port,unix_path,http_port)
+    for server in servers:
+        for sock in server.sockets:
+            routine_instrumentation.LOGGER.info('listening on %s',sock.getsockname())
+        #end-for
+    #end-for
+
+    try:
+        await asyncio.gather(*[server.serve_forever() for server in servers])
+    finally:
+        await stop_servers(servers,flush_task)
+    #end-try
+#end-proc
+
+
+def main(argv=None):
+    """
+    Purpose : Command line entry point (python routine_matching_service.py -h)
+    """
+
+    parser = argparse.ArgumentParser(description='Live PCB Data Association service')
+    parser.add_argument('--host',default='127.0.0.1')
+    parser.add_argument('--port',type=int,default=None,help='TCP port of the JSON lines protocol')
+    parser.add_argument('--unix-path',default=None,help='Unix socket of the JSON lines protocol')
+    parser.add_argument('--http-port',type=int,default=None,help='TCP port of the HTTP protocol')
+    parser.add_argument('--sprpp1-max-transit',type=float,required=True)
+    parser.add_argument('--pp1pp2-max-transit',type=float,required=True)
+    parser.add_argument('--sprpp1-min-transit',type=float,default=None)
+    parser.add_argument('--pp1pp2-min-transit',type=float,default=None)
+    parser.add_argument('--sprpp1-direction',choices=['fwd','rev'],default='fwd')
+    parser.add_argument('--pp1pp2-direction',choices=['fwd','rev'],default='fwd')
+    parser.add_argument('--sprpp1-weighting',nargs='+',default=None,metavar='NAME_OR_PARAM',
+                        help='SPR-PP1 weighting function NAME [PARAM=VALUE ...] (%s; default %s)'
+                             % (', '.join(routine_weighting_functions.get_weighting_names('sprpp1')),routine_weighting_functions.DEFAULT_WEIGHTING))
+    parser.add_argument('--pp1pp2-weighting',nargs='+',default=None,metavar='NAME_OR_PARAM',
+                        help='PP1-PP2 weighting function NAME [PARAM=VALUE ...] (%s; default %s)'
+                             % (', '.join(routine_weighting_functions.get_weighting_names('pp1pp2')),routine_weighting_functions.DEFAULT_WEIGHTING))
+    parser.add_argument('--hist-mode',type=float,default=None,help='Modal LDR-SPR delay [s] (running mode if not given)')
+    parser.add_argument('--batch-size',type=int,default=BATCH_SIZE)
+    parser.add_argument('--batch-delay',type=float,default=BATCH_DELAY_SECONDS,help='Longest time an event stays queued [s]')
+    parser.add_argument('--log-level',default='INFO')
+    args = parser.parse_args(argv)
+
+    if (args.port is None) and (args.unix_path is None) and (args.http_port is None):
+        parser.error('at least one of --port, --unix-path and --http-port is required')
+    #end-if
+    for stage in ('sprpp1','pp1pp2'):
+        try:
+            setattr(args,'%s_weighting' % (stage,),routine_weighting_functions.get_weighting_arg(stage,getattr(args,'%s_weighting' % (stage,))))
+        except ValueError as error:
+            parser.error('--%s-weighting : %s' % (stage,error))
+        #end-try
+    #end-for
+
+    logging.basicConfig(level=args.log_level.upper(),format='%(asctime)s %(levelname)s %(name)s : %(message)s')
+
+    service = MatchingService(args.sprpp1_max_transit,args.pp1pp2_max_transit,args.sprpp1_min_transit,args.pp1pp2_min_transit,
+                              args.sprpp1_direction,args.pp1pp2_direction,args.hist_mode,args.batch_size,args.batch_delay,
+                              args.sprpp1_weighting,args.pp1pp2_weighting)
+    try:
+        asyncio.run(serve(service,args.host,args.port,args.unix_path,args.http_port))
+    except KeyboardInterrupt:
+        pass
+    #end-try
+
+    return 0
+#end-proc
+
+
+if (__name__ == '__main__'):
+    sys.exit(main())
+#end-if
@@ -0,0 +1,390 @@
+#******************************************************************************************************************************************
+# TITLE     : ROUTINE_PARALLEL_EXECUTION
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : (line, time-chunk) work units over a process pool
+# 2026-10-18        | CONTRIBUTORS        | StationEventIndex inputs; shared arrays and sort orders taken from the index
+# 2026-10-18        | CONTRIBUTORS        | Pluggable weighting function (weighting=) for SPR-PP1 and PP1-PP2
+# 2026-10-18        | CONTRIBUTORS        | LDR-SPR units return the matched loader positions of the kernel
+#******************************************************************************************************************************************
+
+#Parallel PCB Data Association over several SMT lines
+#
+#Every line is split into the time chunks of routine_chunked_execution and every (line, chunk) pair is one work unit
+#of a concurrent.futures.ProcessPoolExecutor (all cores unless max_workers is given). The station columns of a line
+#are placed once in shared memory (int64 ns timestamps, float64 weightage, int64 sort orders); a work unit only
+#carries the names of the shared blocks and its chunk window, and returns index arrays. The parent stitches the
+#chunks of a line in order and materializes the matched dataframe from its own dataframes, so the output equals
+#the one of routine_chunked_execution (and of the unchunked banded run).
+
+import concurrent.futures
+
+import numpy  as np
+import pandas as pd
+
+from multiprocessing import shared_memory
+
+import routine_station_index
+import routine_match_result
+import routine_chunked_execution
+import routine_weighting_functions
+import routine_ldrspr_matching_algo
+import routine_sprpp1_matching_algo
+import routine_pp1pp2_matching_algo
+
+STAGES = ('ldrspr','sprpp1','pp1pp2')
+
+
+#==============================================================================================
+"""Shared memory"""
+
+#Station index column -> shared array name (after the prefix)
+SHARED_COLUMNS = {'arvl_tmstmp' : 'arvl','dptr_tmstmp' : 'dptr','weightage' : 'wght'}
+
+
+def get_station_arrays(pcb_level_df,prefix):
+    """
+    Purpose : Columns of a PCB level dataframe as plain arrays (int64 ns timestamps, float64 weightage)
+    Inputs  : pcb_level_df - PCB level dataframe (arvl_tmstmp, dptr_tmstmp, weightage; any subset) or its StationEventIndex
+              prefix       - Prefix of the array names (e.g. 'row_', 'col_')
+    Output  : arrays       - dict of array name -> array
+    """
+
+    station_index = routine_station_index.get_station_index(pcb_level_df)
+
+    arrays = {}
+    for column,name in SHARED_COLUMNS.items():
+        if (column in station_index.arrays):
+            arrays[prefix + name] = station_index.get_column(column)
+        #end-if
+    #end-for
+
+    return arrays
+#end-proc
+
+
+def share_arrays(arrays):
+    """
+    Purpose : Copy arrays into new shared memory blocks
+    Inputs  : arrays     - dict of array name -> array
+    Output  : shm_list   - SharedMemory handles (the caller closes and unlinks them)
+              array_spec - dict of array name -> (block name, dtype, shape), picklable
+    """
+
+    shm_list   = []
+    array_spec = {}
+    for name,arr in arrays.items():
+        arr = np.ascontiguousarray(arr)
+        shm = shared_memory.SharedMemory(create=True,size=max(arr.nbytes,1))
+        shm_list.append(shm)
+        np.ndarray(arr.shape,dtype=arr.dtype,buffer=shm.buf)[...] = arr
+        array_spec[name] = (shm.name,arr.dtype.str,arr.shape)
+    #end-for
+
+    return shm_list,array_spec
+#end-proc
+
+
+def attach_arrays(array_spec):
+    """
+    Purpose : Attach to the shared memory blocks of share_arrays (no copy)
+    Inputs  : array_spec - dict of array name -> (block name, dtype, shape)
+    Output  : shm_list   - SharedMemory handles (the caller closes them)
+              arrays     - dict of array name -> array backed by the shared block
+    """
+
+    shm_list = []
+    arrays   = {}
+    for name,(shm_name,dtype,shape) in array_spec.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        shm_list.append(shm)
+        arrays[name] = np.ndarray(shape,dtype=np.dtype(dtype),buffer=shm.buf)
+    #end-for
+
+    return shm_list,arrays
+#end-proc
+
+
+def release_arrays(shm_list,unlink=False):
+    """
+    Purpose : Close (and optionally unlink) shared memory blocks
+    Inputs  : shm_list - SharedMemory handles
+              unlink   - True in the process that created the blocks
+    Output  : None
+    """
+
+    for shm in shm_list:
+        shm.close()
+        if (unlink):
+            shm.unlink()
+        #end-if
+    #end-for
+#end-proc
+
+
+def get_station_frame(arrays,prefix,pos):
+    """
+    Purpose : PCB level dataframe of the events at positions pos, rebuilt from the shared arrays
+    Inputs  : arrays - dict of array name -> array (get_station_arrays names)
+              prefix - Prefix of the array names
+              pos    - Positions of the events
+    Output  : pcb_level_df - PCB level dataframe (datetime64[ns] timestamps)
+    """
+
+    pcb_level_df = pd.DataFrame(index=pd.RangeIndex(len(pos)))
+    if ((prefix + 'arvl') in arrays):
+        pcb_level_df['arvl_tmstmp'] = arrays[prefix + 'arvl'][pos].view('datetime64[ns]')
+    #end-if
+    if ((prefix + 'dptr') in arrays):
+        pcb_level_df['dptr_tmstmp'] = arrays[prefix + 'dptr'][pos].view('datetime64[ns]')
+    #end-if
+    if ((prefix + 'wght') in arrays):
+        pcb_level_df['weightage'] = arrays[prefix + 'wght'][pos]
+    #end-if
+
+    return pcb_level_df
+#end-proc
+
+
+#==============================================================================================
+"""Work units (run in the worker processes)"""
+
+def get_band_matching_algo(stage,direction):
+    """
+    Purpose : Matching routine of a banded stage
+    Inputs  : stage     - 'sprpp1' or 'pp1pp2'
+              direction - 'fwd' or 'rev'
+    Output  : matching_algo, row index column, column index column
+    """
+
+    if (stage == 'sprpp1'):
+        if (direction == 'fwd'):
+            return routine_sprpp1_matching_algo.fwd_sprpp1_matching_algo,'spr_indx','pp1_indx'
+        #end-if
+        return routine_sprpp1_matching_algo.rev_sprpp1_matching_algo,'spr_indx','pp1_indx'
+    #end-if
+
+    if (direction == 'fwd'):
+        return routine_pp1pp2_matching_algo.fwd_pp1pp2_matching_algo,'pp1_indx','pp2_indx'
+    #end-if
+    return routine_pp1pp2_matching_algo.rev_pp1pp2_matching_algo,'pp1_indx','pp2_indx'
+#end-proc
+
+
+def run_band_unit(stage,array_spec,chunk_window,min_transit_seconds,max_transit_seconds,direction,weighting=None):
+    """
+    Purpose : Match one chunk of a banded stage (SPR-PP1 or PP1-PP2)
+    Inputs  : stage               - 'sprpp1' or 'pp1pp2'
+              array_spec          - Shared arrays of the line (row_*, col_*, row_order, col_order)
+              chunk_window        - row_lo, row_hi, col_lo, col_hi on the sorted timestamps
+              min_transit_seconds - Minimum transit time
+              max_transit_seconds - Maximum transit time
+              direction           - 'fwd' or 'rev'
+              weighting           - (Optional) Weighting function (routine_weighting_functions.get_weighting)
+    Output  : row_indx, col_indx, edge_weight of the matches (positions in the full inputs)
+    """
+
+    matching_algo,row_col,col_col = get_band_matching_algo(stage,direction)
+    edge_col = 'edge_weight_' + stage
+
+    shm_list,arrays = attach_arrays(array_spec)
+    try:
+        row_lo,row_hi,col_lo,col_hi = chunk_window
+        row_pos = np.sort(arrays['row_order'][row_lo:row_hi])
+        col_pos = np.sort(arrays['col_order'][col_lo:col_hi])
+
+        def match_fn(row_pos,col_pos):
+            return matching_algo(get_station_frame(arrays,'row_',row_pos),get_station_frame(arrays,'col_',col_pos),
+                                 min_transit_seconds,max_transit_seconds,weighting=weighting)
+        #end-proc
+
+        chunk_df = routine_chunked_execution.get_band_chunk_matches(match_fn,row_pos,col_pos,row_col,col_col)
+
+        return (chunk_df[row_col].to_numpy(dtype=np.int64),chunk_df[col_col].to_numpy(dtype=np.int64),
+                chunk_df[edge_col].to_numpy(dtype=np.float64))
+    finally:
+        release_arrays(shm_list)
+    #end-try
+#end-proc
+
+
+def run_ldrspr_unit(array_spec,chunk_window,hist_mode):
+    """
+    Purpose : Match one LDR-SPR chunk
+    Inputs  : array_spec   - Shared arrays of the line (row_* : loader, col_* : SPR, row_order)
+              chunk_window - spr_lo, spr_hi, ldr_lo, ldr_hi, guard
+              hist_mode    - Modal LDR-SPR delay
+    Output  : ldr_pos, spr_indx, spr_special_entry, ldr_multiple_events (positions in the full inputs, -1 : none)
+    """
+
+    shm_list,arrays = attach_arrays(array_spec)
+    try:
+        spr_lo,spr_hi,ldr_lo,ldr_hi,guard = chunk_window
+        ldr_pos = np.sort(arrays['row_order'][ldr_lo:ldr_hi])
+
+        chunk_ldr_pos,spr_indx,spr_special_entry,ldr_multiple_events = routine_ldrspr_matching_algo.get_ldrspr_match_indx(
+            get_station_frame(arrays,'row_',ldr_pos),get_station_frame(arrays,'col_',np.arange(spr_lo,spr_hi)),hist_mode)
+
+        #Guard SPR event dropped; chunk positions -> positions in the full inputs
+        keep      = (spr_indx >= guard)
+        match_pos = np.full(np.count_nonzero(keep),-1,dtype=np.int64)
+        has_ldr   = (chunk_ldr_pos[keep] >= 0)
+        match_pos[has_ldr] = ldr_pos[chunk_ldr_pos[keep][has_ldr]]
+
+        return match_pos,spr_indx[keep] + spr_lo,spr_special_entry[keep],ldr_multiple_events[keep]
+    finally:
+        release_arrays(shm_list)
+    #end-try
+#end-proc
+
+
+#==============================================================================================
+"""Parallel runner"""
+
+def parallel_matching(line_inputs,stage,chunk_seconds,max_transit_seconds=None,min_transit_seconds=None,direction='fwd',
+                      hist_mode=None,max_workers=None,weighting=None):
+    """
+    Purpose : Run one association stage over several lines, (line, time-chunk) work units in a process pool
+    Inputs  : line_inputs         - dict of line id -> (first dataframe, second dataframe) of the stage :
+                                    'ldrspr' : (dfldr, dfspr), 'sprpp1' : (dfspr, dfpp1), 'pp1pp2' : (dfone, dftwo)
+                                    (dataframes or routine_station_index.StationEventIndex)
+              stage               - 'ldrspr', 'sprpp1' or 'pp1pp2'
+              chunk_seconds       - Length of a chunk in seconds (e.g. 3600 : hourly)
+              max_transit_seconds - Maximum transit time (required for 'sprpp1' and 'pp1pp2')
+              min_transit_seconds - (Optional) Minimum transit time
+              direction           - 'fwd' or 'rev' ('sprpp1' and 'pp1pp2')
+              hist_mode           - (Optional, 'ldrspr') Modal LDR-SPR delay; estimated per line if not given
+              max_workers         - (Optional) Maximum number of worker processes (None : all cores)
+              weighting           - (Optional, 'sprpp1' and 'pp1pp2') Weighting function : name, (name, params) or
+                                    WeightFunction (routine_weighting_functions.get_weighting; default 'inverse_delay')
+    Output  : matched_dfs         - dict of line id -> matched dataframe, in the order of line_inputs
+    """
+
+    if (stage not in STAGES):
+        raise ValueError("stage must be one of %s, got %r" % (', '.join(STAGES),stage))
+    #end-if
+    if (stage != 'ldrspr'):
+        #Resolved once here : an invalid weighting fails before the pool starts, the workers receive the WeightFunction
+        weighting = routine_weighting_functions.get_weighting(stage,weighting)
+    #end-if
+
+    shm_list   = []
+    line_units = {}
+    line_dfs   = {}
+    try:
+        #Shared arrays and chunk windows of every line
+        for line_id,(pcb_level_dfa,pcb_level_dfb) in line_inputs.items():
+            index_a = routine_station_index.get_station_index(pcb_level_dfa)
+            index_b = routine_station_index.get_station_index(pcb_level_dfb)
+
+            arrays = get_station_arrays(index_a,'row_')
+            arrays.update(get_station_arrays(index_b,'col_'))
+
+            if (stage == 'ldrspr'):
+                line_hist_mode = hist_mode
+                if (line_hist_mode is None):
+                    line_hist_mode = routine_ldrspr_matching_algo.get_ldrspr_hist_mode(index_a,index_b)
+                #end-if
+
+                ldr_srt,ldr_order = index_a.get_sorted_tmstmp('dptr_tmstmp')
+                spr_dptr_ns       = arrays['col_dptr']
+                spr_sorted        = index_b.is_sorted('dptr_tmstmp')
+
+                if (len(spr_dptr_ns) == 0):
+                    line_dfs[line_id] = routine_ldrspr_matching_algo.rev_ldrspr_matching_algo(index_a,index_b,
+                                                                                              line_hist_mode)
+                    continue
+                elif (spr_sorted):
+                    chunk_windows = routine_chunked_execution.get_ldrspr_chunk_windows(ldr_srt,spr_dptr_ns,chunk_seconds)
+                else:
+                    #Unsorted SPR departures : the line is a single work unit
+                    chunk_windows = np.array([[0,len(spr_dptr_ns),0,len(ldr_srt),0]],dtype=np.int64)
+                #end-if
+                arrays['row_order'] = ldr_order
+                unit_args = [(line_hist_mode,) for i in range(0,len(chunk_windows))]
+            else:
+                row_srt,row_order = index_a.get_sorted_tmstmp('dptr_tmstmp')
+                col_srt,col_order = index_b.get_sorted_tmstmp('arvl_tmstmp')
+
+                chunk_windows = routine_chunked_execution.get_band_chunk_windows(row_srt,col_srt,chunk_seconds,
+                                                                                 min_transit_seconds,max_transit_seconds,
+                                                                                 direction)
+                arrays['row_order'] = row_order
+                arrays['col_order'] = col_order
+                unit_args = [(min_transit_seconds,max_transit_seconds,direction,weighting) for i in range(0,len(chunk_windows))]
+            #end-if
+
+            line_shm_list,array_spec = share_arrays(arrays)
+            shm_list.extend(line_shm_list)
+
+            line_units[line_id] = [(array_spec,tuple(int(v) for v in chunk_window)) + args
+                                   for chunk_window,args in zip(chunk_windows,unit_args)]
+        #end-for
+
+        #Fan out the work units, collect the results in submission order
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+            line_futures = {}
+            for line_id,units in line_units.items():
+                if (stage == 'ldrspr'):
+                    line_futures[line_id] = [executor.submit(run_ldrspr_unit,*unit) for unit in units]
+                else:
+                    line_futures[line_id] = [executor.submit(run_band_unit,stage,*unit) for unit in units]
+                #end-if
+            #end-for
+
+            line_results = {}
+            for line_id,futures in line_futures.items():
+                line_results[line_id] = [future.result() for future in futures]
+            #end-for
+        #end-with
+    finally:
+        release_arrays(shm_list,unlink=True)
+    #end-try
+
+    #Stitch the chunks of every line and materialize the matched dataframes
+    matched_dfs = {}
+    for line_id,(pcb_level_dfa,pcb_level_dfb) in line_inputs.items():
+        if (line_id in line_dfs):
+            matched_dfs[line_id] = line_dfs[line_id]
+            continue
+        #end-if
+
+        pcb_level_dfa = routine_station_index.get_station_df(pcb_level_dfa)
+        pcb_level_dfb = routine_station_index.get_station_df(pcb_level_dfb)
+
+        results = line_results[line_id]
+        if (len(results) == 0):
+            results = [tuple(np.zeros(0,dtype=np.int64) for i in range(0,4 if (stage == 'ldrspr') else 3))]
+        #end-if
+        result_arrs = [np.concatenate(arrs) for arrs in zip(*results)]
+
+        if (stage == 'ldrspr'):
+            ldr_pos,spr_indx,spr_special_entry,ldr_multiple_events = result_arrs
+            matched_dfs[line_id] = routine_match_result.get_ldrspr_matched_df(pcb_level_dfa,pcb_level_dfb,ldr_pos,spr_indx,
+                                                                              spr_special_entry,ldr_multiple_events)
+            continue
+        #end-if
+
+        row_indx,col_indx,edge_weight = result_arrs
+        srt_indx = np.argsort(row_indx if (direction == 'fwd') else col_indx,kind='stable')
+
+        if (stage == 'sprpp1'):
+            matched_dfs[line_id] = routine_match_result.get_sprpp1_matched_df(pcb_level_dfa,pcb_level_dfb,row_indx[srt_indx],
+                                                                              col_indx[srt_indx],edge_weight[srt_indx])
+        else:
+            matched_dfs[line_id] = routine_match_result.get_pp1pp2_matched_df(pcb_level_dfa,pcb_level_dfb,row_indx[srt_indx],
+                                                                              col_indx[srt_indx],edge_weight[srt_indx])
+        #end-if
+    #end-for
+
+    return matched_dfs
+#end-proc
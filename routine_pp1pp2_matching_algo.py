@@ -12,20 +12,203 @@
 # DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
 #------------------------------------------------------------------------------------------------------------------------------------------
 # 2019-10-11        | PRAKASH HIREMATH M  | Initial version
+# 2026-10-18        | CONTRIBUTORS        | Weight matrix generated by the shared vectorized kernel (routine_weight_kernel)
+# 2026-10-18        | CONTRIBUTORS        | Optional sparse banded weight matrix (min_transit_seconds/max_transit_seconds)
+# 2026-10-18        | CONTRIBUTORS        | Matched dataframe built once from the argmax arrays (no per-row DataFrame.append) ; module-level PP1PP2_MATCH_THRESHOLD
+# 2026-10-18        | CONTRIBUTORS        | Bidirectional matching (bidirectional_pp1pp2_matching) on a single weight matrix
+# 2026-10-18        | CONTRIBUTORS        | Optional globally optimal one-to-one assignment (assignment='optimal')
+# 2026-10-18        | CONTRIBUTORS        | mmap_path rejected with assignment='optimal'
+# 2026-10-18        | CONTRIBUTORS        | Index-array entry point (get_pp1pp2_match_indx)
+# 2026-10-18        | CONTRIBUTORS        | Opt-in weight matrix cache (routine_weight_cache)
+# 2026-10-18        | CONTRIBUTORS        | Optional float32 and np.memmap backed dense weight matrix (weight_dtype, mmap_path)
+# 2026-10-18        | CONTRIBUTORS        | Phase timers and counters (routine_instrumentation) instead of START/END prints
+# 2026-10-18        | CONTRIBUTORS        | Side-effect-free import : no prints, no matplotlib/scipy/csv imports
+# 2026-10-18        | CONTRIBUTORS        | Optional compact struct-of-arrays result (compact=True)
+# 2026-10-18        | CONTRIBUTORS        | Pluggable weighting function (weighting=, routine_weighting_functions)
+# 2026-10-18        | CONTRIBUTORS        | Station tables or StationEventIndex (routine_station_index) accepted, converted once per call
 #******************************************************************************************************************************************
 
 #PP1-PP2 PCB Data Association
+#
+#The matchers accept the PCB level dataframes or their routine_station_index.StationEventIndex (timestamps and
+#weightage converted once, e.g. by the pipeline for a station shared by two associations).
 
-import pandas as pd
 import numpy as np
-import scipy as sp
 
-import csv
-import datetime
+import time
 
-from matplotlib import pyplot as plt
-from matplotlib import dates  as md 
-from matplotlib.colors import LogNorm
+import routine_weight_kernel
+import routine_station_index
+import routine_weighting_functions
+import routine_match_kernel
+import routine_match_result
+import routine_weight_cache
+import routine_instrumentation
+
+#Minimum weightage of both PP1 and PP2 events for a PP1-PP2 match
+PP1PP2_MATCH_THRESHOLD = 0.7
+
+#==============================================================================================
+"""
+Weight matrix and matching kernels shared by the forward, reverse and bidirectional PP1 - PP2 matching
+"""
+
+def gen_pp1pp2_weight_mtrx(pcb_level_dfone,pcb_level_dftwo,min_transit_seconds=None,max_transit_seconds=None,weight_dtype=np.float64,mmap_path=None,
+                           weighting=None):
+    """
+    Purpose : Generate the PP1-PP2 weight matrix (dense, or sparse banded when a transit-time window is given)
+    Inputs  : pcb_level_dfone     - The PCB level dataframe corresponding to first machine (PP1)
+              pcb_level_dftwo     - The PCB level dataframe corresponding to second machine (PP2)
+              min_transit_seconds - Minimum PP1 departure to PP2 arrival time considered for a match
+              max_transit_seconds - Maximum PP1 departure to PP2 arrival time considered for a match
+              weight_dtype        - (Optional) Storage dtype of the dense matrix (np.float64 or np.float32)
+              mmap_path           - (Optional) Path of a np.memmap file backing the dense matrix (kept for audits)
+              weighting           - (Optional) Weighting function : name, (name, params) or WeightFunction
+                                    (routine_weighting_functions.get_weighting; default 'inverse_delay')
+    Output  : weight_mtrx         - numpy array or scipy.sparse CSR matrix of shape (len(pcb_level_dfone), len(pcb_level_dftwo))
+    """
+
+    weight_function = routine_weighting_functions.get_weighting('pp1pp2',weighting)
+
+    one_index = routine_station_index.get_station_index(pcb_level_dfone,'pp1')
+    two_index = routine_station_index.get_station_index(pcb_level_dftwo,'pp2')
+
+    def build_weight_mtrx():
+        if (min_transit_seconds is None) and (max_transit_seconds is None):
+            return routine_weight_kernel.get_pp1pp2_weight_mtrx(one_index,two_index,weight_dtype,mmap_path,weight_function)
+        #end-if
+        return routine_weight_kernel.get_pp1pp2_weight_band(one_index,two_index,min_transit_seconds,max_transit_seconds,
+                                                            weight_function)
+    #end-proc
+
+    #Opt-in cache keyed on the inputs of the weighting function (see routine_weight_cache); a memory-mapped matrix is
+    #always written to its file
+    if (routine_weight_cache.get_weight_cache() is None) or (mmap_path is not None):
+        return build_weight_mtrx()
+    #end-if
+
+    key_parts = ('routine_weight_kernel.get_pp1pp2_weights',weight_function.get_key(),min_transit_seconds,max_transit_seconds,np.dtype(weight_dtype).str,
+                 one_index.get_column('arvl_tmstmp'),
+                 one_index.get_column('dptr_tmstmp'),
+                 one_index.get_column('weightage'),
+                 two_index.get_column('arvl_tmstmp'),
+                 two_index.get_column('dptr_tmstmp'),
+                 two_index.get_column('weightage'))
+
+    return routine_weight_cache.get_cached_weight_mtrx(key_parts,build_weight_mtrx)
+#end-proc
+
+
+def get_fwd_pp1pp2_matches(row_max_indx,row_max_wght,wght_one,wght_two):
+    """
+    Purpose : Forward (PP1 -> PP2) matches from the row-wise argmax of the weight matrix
+    Inputs  : row_max_indx - PP2 index of the maximum of every PP1 row
+              row_max_wght - Maximum weight of every PP1 row
+              wght_one     - Weightage of PP1
+              wght_two     - Weightage of PP2
+    Output  : pp1_indx, pp2_indx, edge_weight - Matched pairs ordered by PP1 index
+    """
+
+    match_mask = (wght_one >= PP1PP2_MATCH_THRESHOLD) & (row_max_wght > 0)
+    match_mask[match_mask] = (wght_two[row_max_indx[match_mask]] >= PP1PP2_MATCH_THRESHOLD)
+
+    pp1_indx = np.flatnonzero(match_mask)
+    routine_instrumentation.add_count('pp1pp2.rejected_by_threshold',np.count_nonzero(row_max_wght > 0) - len(pp1_indx))
+
+    return pp1_indx,row_max_indx[pp1_indx],row_max_wght[pp1_indx]
+#end-proc
+
+
+def get_rev_pp1pp2_matches(col_max_indx,col_max_wght,wght_one,wght_two):
+    """
+    Purpose : Reverse (PP2 -> PP1) matches from the column-wise argmax of the weight matrix
+    Inputs  : col_max_indx - PP1 index of the maximum of every PP2 column
+              col_max_wght - Maximum weight of every PP2 column
+              wght_one     - Weightage of PP1
+              wght_two     - Weightage of PP2
+    Output  : pp1_indx, pp2_indx, edge_weight - Matched pairs ordered by PP2 index
+    """
+
+    match_mask = (wght_two >= PP1PP2_MATCH_THRESHOLD) & (col_max_wght > 0)
+    match_mask[match_mask] = (wght_one[col_max_indx[match_mask]] >= PP1PP2_MATCH_THRESHOLD)
+
+    pp2_indx = np.flatnonzero(match_mask)
+    routine_instrumentation.add_count('pp1pp2.rejected_by_threshold',np.count_nonzero(col_max_wght > 0) - len(pp2_indx))
+
+    return col_max_indx[pp2_indx],pp2_indx,col_max_wght[pp2_indx]
+#end-proc
+
+
+def get_optimal_pp1pp2_matches(weight_mtrx,wght_one,wght_two):
+    """
+    Purpose : Globally optimal one-to-one PP1-PP2 matches (maximum total edge weight) under the weightage gates
+    Inputs  : weight_mtrx - PP1-PP2 weight matrix (dense or sparse)
+              wght_one    - Weightage of PP1
+              wght_two    - Weightage of PP2
+    Output  : pp1_indx, pp2_indx, edge_weight - Matched pairs ordered by PP1 index
+    """
+
+    row_mask = (wght_one >= PP1PP2_MATCH_THRESHOLD)
+    col_mask = (wght_two >= PP1PP2_MATCH_THRESHOLD)
+
+    return routine_match_kernel.get_optimal_matches(weight_mtrx,row_mask,col_mask)
+#end-proc
+
+
+def get_pp1pp2_match_indx(pcb_level_dfone,pcb_level_dftwo,direction='fwd',min_transit_seconds=None,max_transit_seconds=None,
+                          assignment='greedy',weight_dtype=np.float64,mmap_path=None,weighting=None):
+    """
+    Purpose : PP1-PP2 matching on index arrays (the rows of fwd/rev_pp1pp2_matching_algo, without the dataframe)
+    Inputs  : pcb_level_dfone     - The PCB level dataframe corresponding to first machine (PP1)
+              pcb_level_dftwo     - The PCB level dataframe corresponding to second machine (PP2)
+              direction           - 'fwd' (best PP2 event for every PP1 event) or 'rev' (best PP1 event for every PP2 event)
+              min_transit_seconds - (Optional) Minimum PP1 departure to PP2 arrival time considered for a match
+              max_transit_seconds - (Optional) Maximum PP1 departure to PP2 arrival time considered for a match
+              assignment          - (Optional) 'greedy' or 'optimal'
+              weight_dtype        - (Optional) Storage dtype of the dense weight matrix (np.float64 or np.float32)
+              mmap_path           - (Optional) Path of a np.memmap file backing the dense weight matrix (greedy assignment only)
+              weighting           - (Optional) Weighting function (routine_weighting_functions.get_weighting)
+    Output  : pp1_indx, pp2_indx, edge_weight - Matched pairs ordered by PP1 index ('fwd') or PP2 index ('rev')
+    """
+
+    routine_match_kernel.check_assignment(assignment,mmap_path)
+    if (direction not in ('fwd','rev')):
+        raise ValueError("direction must be 'fwd' or 'rev', got %r" % (direction,))
+    #end-if
+
+    one_index = routine_station_index.get_station_index(pcb_level_dfone,'pp1')
+    two_index = routine_station_index.get_station_index(pcb_level_dftwo,'pp2')
+
+    #Generate weight matrix (vectorized kernel)
+    with routine_instrumentation.timed_phase('pp1pp2.weight_generation'):
+        weight_mtrx = gen_pp1pp2_weight_mtrx(one_index,two_index,min_transit_seconds,max_transit_seconds,weight_dtype,mmap_path,
+                                             weighting)
+    #end-with
+
+    #Now perform the matching
+    with routine_instrumentation.timed_phase('pp1pp2.matching'):
+        wght_one = one_index.get_column('weightage')
+        wght_two = two_index.get_column('weightage')
+
+        if (assignment == 'optimal'):
+            pp1_indx,pp2_indx,edge_weight = get_optimal_pp1pp2_matches(weight_mtrx,wght_one,wght_two)
+            if (direction == 'rev'):
+                srt_indx = np.argsort(pp2_indx,kind='stable')
+                pp1_indx,pp2_indx,edge_weight = pp1_indx[srt_indx],pp2_indx[srt_indx],edge_weight[srt_indx]
+            #end-if
+        elif (direction == 'fwd'):
+            max_indx,max_wght = routine_match_kernel.get_row_argmax(weight_mtrx)
+            pp1_indx,pp2_indx,edge_weight = get_fwd_pp1pp2_matches(max_indx,max_wght,wght_one,wght_two)
+        else:
+            max_indx,max_wght = routine_match_kernel.get_col_argmax(weight_mtrx)
+            pp1_indx,pp2_indx,edge_weight = get_rev_pp1pp2_matches(max_indx,max_wght,wght_one,wght_two)
+        #end-if
+    #end-with
+
+    routine_instrumentation.add_count('pp1pp2.matched',len(pp1_indx))
+
+    return pp1_indx,pp2_indx,edge_weight
+#end-proc
 
 #==============================================================================================
 
@@ -33,98 +216,51 @@ from matplotlib.colors import LogNorm
 Forward PP1 PP2 Matching Process
 """
 
-print('Start of defining procedure : fwd_pp1pp2_matching_algo :', datetime.datetime.now())
-print('Version used : 2019-06-19 14:37')
+#Version : 2019-06-19 14:37
 
-def fwd_pp1pp2_matching_algo(pcb_level_dfone,pcb_level_dftwo):
+def fwd_pp1pp2_matching_algo(pcb_level_dfone,pcb_level_dftwo,min_transit_seconds=None,max_transit_seconds=None,assignment='greedy',
+                             weight_dtype=np.float64,mmap_path=None,compact=False,weighting=None):
     """
     Purpose : Perform PP1-PP2 forward matching
-    Inputs  : pcb_level_dfone - The PCB level dataframe corresponding to first machine (PP1)
-              pcb_level_dfone - The PCB level dataframe corresponding to second machine (PP2)
-    Output  : matched_df      - The dataframe that contains the matched PCBs       
+    Inputs  : pcb_level_dfone     - The PCB level dataframe corresponding to first machine (PP1)
+              pcb_level_dftwo     - The PCB level dataframe corresponding to second machine (PP2)
+              min_transit_seconds - (Optional) Minimum PP1 departure to PP2 arrival time considered for a match
+              max_transit_seconds - (Optional) Maximum PP1 departure to PP2 arrival time considered for a match
+                                    When either is given, only the band of candidate cells is stored (sparse matrix)
+              assignment          - (Optional) 'greedy' : best match per event (default)
+                                               'optimal': maximum-weight one-to-one matching over all events
+              weight_dtype        - (Optional) Storage dtype of the dense weight matrix (np.float64, or np.float32 : half the
+                                    memory, weights rounded to float32)
+              mmap_path           - (Optional) Path of a np.memmap file backing the dense weight matrix (kept for audits;
+                                    greedy assignment only)
+              compact             - (Optional) Return a routine_match_result.CompactMatchResult instead of a dataframe
+              weighting           - (Optional) Weighting function : name, (name, params) or WeightFunction
+                                    (routine_weighting_functions.get_weighting; default 'inverse_delay')
+    Output  : matched_df          - The dataframe that contains the matched PCBs       
     """
     
-    STR_TIME = datetime.datetime.now()
-    
-    print('=======================================================')
-    print("START : ", STR_TIME)
-    print('=======================================================')
+    str_time = time.perf_counter()
 
-    PP1PP2_MATCH_THRESHOLD = 0.7
-    
-    #Initialization
-    no_of_matched_pcbs = 0
-    
-    #Initialize weight matrix
-    weight_mtrx = np.zeros([len(pcb_level_dfone),len(pcb_level_dftwo)])
-
-    #Assign weights
-    for i in range(0,len(pcb_level_dfone)):
-        for j in range(0,len(pcb_level_dftwo)):
-            arvl_one = pcb_level_dfone.arvl_tmstmp[i]
-            arvl_two = pcb_level_dftwo.arvl_tmstmp[j]
-            parm1 = 1 / (pd.Timedelta(pd.Timestamp(arvl_two) - pd.Timestamp(arvl_one)).total_seconds())
-        
-            dptr_one = pcb_level_dfone.dptr_tmstmp[i]
-            dptr_two = pcb_level_dftwo.dptr_tmstmp[j]
-            parm2 = 1 / (pd.Timedelta(pd.Timestamp(dptr_two) - pd.Timestamp(dptr_one)).total_seconds())
-        
-            parm3 = 1 / (pd.Timedelta(pd.Timestamp(arvl_two) - pd.Timestamp(dptr_one)).total_seconds())
-        
-            if parm1 < 0 :
-                parm1 = 0.0
-            if parm2 < 0 :
-                parm2 = 0.0
-            if parm3 < 0 :
-                parm3 = 0.0
-            
-            sum_parms = parm1 + parm2 + parm3
-            prd_parms = parm1 * parm2 * parm3
-        
-            weight_mtrx[i,j] = pcb_level_dfone.weightage[i] * prd_parms * pcb_level_dftwo.weightage[j]
-        #endfor
-    #endfor    
-    
-    print('Weight matrix generation completed at:', datetime.datetime.now())
-    
-    #Now perform the matchng
-    matched_df = pd.DataFrame(columns=['pp1_indx','pp1_arvl','pp1_dptr','pp2_indx','pp2_arvl','pp2_dptr','edge_weight_pp1pp2'])
-    for i in range (0,len(pcb_level_dfone)):
-        if (pcb_level_dfone.weightage[i] >= PP1PP2_MATCH_THRESHOLD):
-            j = np.argmax(weight_mtrx[i,:])
-            if (pcb_level_dftwo.weightage[j] >= PP1PP2_MATCH_THRESHOLD):
-                if (weight_mtrx[i,j] > 0):
-                    edge_weight_pp1pp2 = np.asscalar(weight_mtrx[i,j])
-                    data = pd.DataFrame([[i,pcb_level_dfone.arvl_tmstmp[i],pcb_level_dfone.dptr_tmstmp[i],j,pcb_level_dftwo.arvl_tmstmp[j],pcb_level_dftwo.dptr_tmstmp[j],edge_weight_pp1pp2]],columns=matched_df.columns)                    
-                    matched_df = matched_df.append(data)
-                    del data
-                    no_of_matched_pcbs = no_of_matched_pcbs + 1
-                #endif
-            #endif 
-        #endif
-    #endfor  
-    
-    matched_df = matched_df.reset_index()
-    matched_df = matched_df.iloc[:,1:len(matched_df.columns)]
-    
-    END_TIME = datetime.datetime.now()
-    
-    print('No. of matched PCBs =', no_of_matched_pcbs)
-    
-    print('=======================================================')
-    print("END   : ", END_TIME)
-    print('=======================================================')
-    
-    DUR_TS    = pd.Timestamp(END_TIME) - pd.Timestamp(STR_TIME)
-    EXEC_TIME = pd.Timedelta(DUR_TS).total_seconds()
-    
-    print("Execution time =",EXEC_TIME/60,"mins")
-    print('=======================================================')
+    one_index = routine_station_index.get_station_index(pcb_level_dfone,'pp1')
+    two_index = routine_station_index.get_station_index(pcb_level_dftwo,'pp2')
+
+    pp1_indx,pp2_indx,edge_weight = get_pp1pp2_match_indx(one_index,two_index,'fwd',min_transit_seconds,max_transit_seconds,assignment,
+                                                          weight_dtype,mmap_path,weighting)
+
+    with routine_instrumentation.timed_phase('pp1pp2.result_building'):
+        if (compact):
+            matched_df = routine_match_result.get_pp1pp2_compact_result(one_index.pcb_level_df,two_index.pcb_level_df,pp1_indx,pp2_indx,edge_weight)
+        else:
+            matched_df = routine_match_result.get_pp1pp2_matched_df(one_index.pcb_level_df,two_index.pcb_level_df,pp1_indx,pp2_indx,edge_weight)
+        #end-if
+    #end-with
+
+    exec_time = time.perf_counter() - str_time
+    routine_instrumentation.add_time('pp1pp2.total',exec_time)
+    routine_instrumentation.LOGGER.info('fwd_pp1pp2_matching_algo : %d matched PCBs in %.3f s',len(matched_df),exec_time)
 
     return matched_df
 #end-proc
-print('End   of defining procedure : fwd_pp1pp2_matching_algo :', datetime.datetime.now())
-
 
 
 #=============================================================================================================
@@ -133,94 +269,120 @@ print('End   of defining procedure : fwd_pp1pp2_matching_algo :', datetime.datet
 Reverse PP1 PP2 Matching Process
 """
 
-print('Start of defining procedure : rev_pp1pp2_matching_algo :', datetime.datetime.now())
-print('Version used : 2019-06-19 14:37')
+#Version : 2019-06-19 14:37
 
-def rev_pp1pp2_matching_algo(pcb_level_dfone,pcb_level_dftwo):
+def rev_pp1pp2_matching_algo(pcb_level_dfone,pcb_level_dftwo,min_transit_seconds=None,max_transit_seconds=None,assignment='greedy',
+                             weight_dtype=np.float64,mmap_path=None,compact=False,weighting=None):
     """
     Purpose : Perform PP1-PP2 reverse matching
-    Inputs  : pcb_level_dfone - The PCB level dataframe corresponding to first machine (PP1)
-              pcb_level_dfone - The PCB level dataframe corresponding to second machine (PP2)
-    Output  : matched_df      - The dataframe that contains the matched PCBs       
+    Inputs  : pcb_level_dfone     - The PCB level dataframe corresponding to first machine (PP1)
+              pcb_level_dftwo     - The PCB level dataframe corresponding to second machine (PP2)
+              min_transit_seconds - (Optional) Minimum PP1 departure to PP2 arrival time considered for a match
+              max_transit_seconds - (Optional) Maximum PP1 departure to PP2 arrival time considered for a match
+                                    When either is given, only the band of candidate cells is stored (sparse matrix)
+              assignment          - (Optional) 'greedy' : best match per event (default)
+                                               'optimal': maximum-weight one-to-one matching over all events
+              weight_dtype        - (Optional) Storage dtype of the dense weight matrix (np.float64, or np.float32 : half the
+                                    memory, weights rounded to float32)
+              mmap_path           - (Optional) Path of a np.memmap file backing the dense weight matrix (kept for audits;
+                                    greedy assignment only)
+              compact             - (Optional) Return a routine_match_result.CompactMatchResult instead of a dataframe
+              weighting           - (Optional) Weighting function : name, (name, params) or WeightFunction
+                                    (routine_weighting_functions.get_weighting; default 'inverse_delay')
+    Output  : matched_df          - The dataframe that contains the matched PCBs       
     """
     
-    STR_TIME = datetime.datetime.now()
-    
-    print('=======================================================')
-    print("START : ", STR_TIME)
-    print('=======================================================')
+    str_time = time.perf_counter()
 
-    PP1PP2_MATCH_THRESHOLD
-    
-    #Initialization
-    no_of_matched_pcbs = 0
-    
-    #Initialize weight matrix
-    weight_mtrx = np.zeros([len(pcb_level_dfone),len(pcb_level_dftwo)])
-
-    #Assign weights
-    for i in range(0,len(pcb_level_dfone)):
-        for j in range(0,len(pcb_level_dftwo)):
-            arvl_one = pcb_level_dfone.arvl_tmstmp[i]
-            arvl_two = pcb_level_dftwo.arvl_tmstmp[j]
-            parm1 = 1 / (pd.Timedelta(pd.Timestamp(arvl_two) - pd.Timestamp(arvl_one)).total_seconds())
-        
-            dptr_one = pcb_level_dfone.dptr_tmstmp[i]
-            dptr_two = pcb_level_dftwo.dptr_tmstmp[j]
-            parm2 = 1 / (pd.Timedelta(pd.Timestamp(dptr_two) - pd.Timestamp(dptr_one)).total_seconds())
-        
-            parm3 = 1 / (pd.Timedelta(pd.Timestamp(arvl_two) - pd.Timestamp(dptr_one)).total_seconds())
-        
-            if parm1 < 0 :
-                parm1 = 0.0
-            if parm2 < 0 :
-                parm2 = 0.0
-            if parm3 < 0 :
-                parm3 = 0.0
-            
-            sum_parms = parm1 + parm2 + parm3
-            prd_parms = parm1 * parm2 * parm3
-        
-            weight_mtrx[i,j] = pcb_level_dfone.weightage[i] * prd_parms * pcb_level_dftwo.weightage[j]
-        #endfor
-    #endfor    
-    
-    print('Weight matrix generation completed at:', datetime.datetime.now())
-    
-    #Now perform the matchng
-    matched_df = pd.DataFrame(columns=['pp1_indx','pp1_arvl','pp1_dptr','pp2_indx','pp2_arvl','pp2_dptr','edge_weight_pp1pp2'])
-    for j in range (0,len(pcb_level_dftwo)):
-        if (pcb_level_dftwo.weightage[j] >= PP1PP2_MATCH_THRESHOLD):
-            i = np.argmax(weight_mtrx[:,j])
-            if (pcb_level_dfone.weightage[i] >= PP1PP2_MATCH_THRESHOLD):
-                if (weight_mtrx[i,j] > 0):
-                    edge_weight_pp1pp2 = np.asscalar(weight_mtrx[i,j])
-                    data = pd.DataFrame([[i,pcb_level_dfone.arvl_tmstmp[i],pcb_level_dfone.dptr_tmstmp[i],j,pcb_level_dftwo.arvl_tmstmp[j],pcb_level_dftwo.dptr_tmstmp[j],edge_weight_pp1pp2]],columns=matched_df.columns)                    
-                    matched_df = matched_df.append(data)
-                    del data
-                    no_of_matched_pcbs = no_of_matched_pcbs + 1
-                #endif
-            #endif 
-        #endif
-    #endfor  
-    
-    matched_df = matched_df.reset_index()
-    matched_df = matched_df.iloc[:,1:len(matched_df.columns)]
+    one_index = routine_station_index.get_station_index(pcb_level_dfone,'pp1')
+    two_index = routine_station_index.get_station_index(pcb_level_dftwo,'pp2')
 
-    END_TIME = datetime.datetime.now()
-    
-    print('No. of matched PCBs =', no_of_matched_pcbs)
-    
-    print('=======================================================')
-    print("END   : ", END_TIME)
-    print('=======================================================')
-    
-    DUR_TS    = pd.Timestamp(END_TIME) - pd.Timestamp(STR_TIME)
-    EXEC_TIME = pd.Timedelta(DUR_TS).total_seconds()
-    
-    print("Execution time =",EXEC_TIME/60,"mins")
-    print('=======================================================')
+    pp1_indx,pp2_indx,edge_weight = get_pp1pp2_match_indx(one_index,two_index,'rev',min_transit_seconds,max_transit_seconds,assignment,
+                                                          weight_dtype,mmap_path,weighting)
+
+    with routine_instrumentation.timed_phase('pp1pp2.result_building'):
+        if (compact):
+            matched_df = routine_match_result.get_pp1pp2_compact_result(one_index.pcb_level_df,two_index.pcb_level_df,pp1_indx,pp2_indx,edge_weight)
+        else:
+            matched_df = routine_match_result.get_pp1pp2_matched_df(one_index.pcb_level_df,two_index.pcb_level_df,pp1_indx,pp2_indx,edge_weight)
+        #end-if
+    #end-with
+
+    exec_time = time.perf_counter() - str_time
+    routine_instrumentation.add_time('pp1pp2.total',exec_time)
+    routine_instrumentation.LOGGER.info('rev_pp1pp2_matching_algo : %d matched PCBs in %.3f s',len(matched_df),exec_time)
 
     return matched_df
 #end-proc
-print('End   of defining procedure : rev_pp1pp2_matching_algo :', datetime.datetime.now())
\ No newline at end of file
+
+
+#=============================================================================================================
+
+"""
+Bidirectional PP1 PP2 Matching Process
+"""
+
+
+def bidirectional_pp1pp2_matching(pcb_level_dfone,pcb_level_dftwo,min_transit_seconds=None,max_transit_seconds=None,weight_dtype=np.float64,
+                                  mmap_path=None,weighting=None):
+    """
+    Purpose : Perform forward and reverse PP1-PP2 matching on a single weight matrix and find the mutual best matches
+    Inputs  : pcb_level_dfone     - The PCB level dataframe corresponding to first machine (PP1)
+              pcb_level_dftwo     - The PCB level dataframe corresponding to second machine (PP2)
+              min_transit_seconds - (Optional) Minimum PP1 departure to PP2 arrival time considered for a match
+              max_transit_seconds - (Optional) Maximum PP1 departure to PP2 arrival time considered for a match
+              weight_dtype        - (Optional) Storage dtype of the dense weight matrix (np.float64 or np.float32)
+              mmap_path           - (Optional) Path of a np.memmap file backing the dense weight matrix
+              weighting           - (Optional) Weighting function (routine_weighting_functions.get_weighting)
+    Output  : fwd_matched_df      - Same as fwd_pp1pp2_matching_algo, plus 'mutual_match' (1 if the reverse match agrees)
+              rev_matched_df      - Same as rev_pp1pp2_matching_algo, plus 'mutual_match' (1 if the forward match agrees)
+              mutual_matched_df   - The pairs (i <-> j) found by both the forward and the reverse matching
+    """
+    
+    str_time = time.perf_counter()
+
+    one_index = routine_station_index.get_station_index(pcb_level_dfone,'pp1')
+    two_index = routine_station_index.get_station_index(pcb_level_dftwo,'pp2')
+
+    #Generate weight matrix once for both directions
+    with routine_instrumentation.timed_phase('pp1pp2.weight_generation'):
+        weight_mtrx = gen_pp1pp2_weight_mtrx(one_index,two_index,min_transit_seconds,max_transit_seconds,weight_dtype,mmap_path,
+                                             weighting)
+    #end-with
+
+    #Row-wise (forward) and column-wise (reverse) argmax in one pass
+    with routine_instrumentation.timed_phase('pp1pp2.matching'):
+        row_max_indx,row_max_wght,col_max_indx,col_max_wght = routine_match_kernel.get_row_col_argmax(weight_mtrx)
+    #end-with
+
+    wght_one = one_index.get_column('weightage')
+    wght_two = two_index.get_column('weightage')
+
+    fwd_pp1_indx,fwd_pp2_indx,fwd_edge_weight = get_fwd_pp1pp2_matches(row_max_indx,row_max_wght,wght_one,wght_two)
+    rev_pp1_indx,rev_pp2_indx,rev_edge_weight = get_rev_pp1pp2_matches(col_max_indx,col_max_wght,wght_one,wght_two)
+
+    #Agreement : the forward match of PP1 i is PP2 j and the reverse match of PP2 j is PP1 i
+    rev_pp1_of_pp2 = np.full(len(two_index),-1,dtype=np.int64)
+    rev_pp1_of_pp2[rev_pp2_indx] = rev_pp1_indx
+    fwd_pp2_of_pp1 = np.full(len(one_index),-1,dtype=np.int64)
+    fwd_pp2_of_pp1[fwd_pp1_indx] = fwd_pp2_indx
+
+    fwd_agree = (rev_pp1_of_pp2[fwd_pp2_indx] == fwd_pp1_indx)
+    rev_agree = (fwd_pp2_of_pp1[rev_pp1_indx] == rev_pp2_indx)
+
+    fwd_matched_df = routine_match_result.get_pp1pp2_matched_df(one_index.pcb_level_df,two_index.pcb_level_df,fwd_pp1_indx,fwd_pp2_indx,fwd_edge_weight)
+    fwd_matched_df['mutual_match'] = fwd_agree.astype(np.int64)
+
+    rev_matched_df = routine_match_result.get_pp1pp2_matched_df(one_index.pcb_level_df,two_index.pcb_level_df,rev_pp1_indx,rev_pp2_indx,rev_edge_weight)
+    rev_matched_df['mutual_match'] = rev_agree.astype(np.int64)
+
+    mutual_matched_df = routine_match_result.get_pp1pp2_matched_df(one_index.pcb_level_df,two_index.pcb_level_df,
+                                                                   fwd_pp1_indx[fwd_agree],fwd_pp2_indx[fwd_agree],fwd_edge_weight[fwd_agree])
+
+    exec_time = time.perf_counter() - str_time
+    routine_instrumentation.add_time('pp1pp2.total',exec_time)
+    routine_instrumentation.LOGGER.info('bidirectional_pp1pp2_matching : %d forward, %d reverse, %d mutual matched PCBs in %.3f s',
+                                        len(fwd_matched_df),len(rev_matched_df),len(mutual_matched_df),exec_time)
+
+    return fwd_matched_df,rev_matched_df,mutual_matched_df
+#end-proc
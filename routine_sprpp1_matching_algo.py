@@ -12,103 +12,244 @@
 # DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
 #------------------------------------------------------------------------------------------------------------------------------------------
 # 2019-10-11        | PRAKASH HIREMATH M  | Initial version
+# 2026-10-18        | CONTRIBUTORS        | Weight matrix generated by the shared vectorized kernel (routine_weight_kernel)
+# 2026-10-18        | CONTRIBUTORS        | Optional sparse banded weight matrix (min_transit_seconds/max_transit_seconds)
+# 2026-10-18        | CONTRIBUTORS        | Matched dataframe built once from the argmax arrays (no per-row DataFrame.append)
+# 2026-10-18        | CONTRIBUTORS        | Bidirectional matching (bidirectional_sprpp1_matching) on a single weight matrix
+# 2026-10-18        | CONTRIBUTORS        | Optional globally optimal one-to-one assignment (assignment='optimal')
+# 2026-10-18        | CONTRIBUTORS        | mmap_path rejected with assignment='optimal'
+# 2026-10-18        | CONTRIBUTORS        | Index-array entry point (get_sprpp1_match_indx)
+# 2026-10-18        | CONTRIBUTORS        | Opt-in weight matrix cache (routine_weight_cache)
+# 2026-10-18        | CONTRIBUTORS        | Optional float32 and np.memmap backed dense weight matrix (weight_dtype, mmap_path)
+# 2026-10-18        | CONTRIBUTORS        | Phase timers and counters (routine_instrumentation) instead of START/END prints
+# 2026-10-18        | CONTRIBUTORS        | Side-effect-free import : no prints, no matplotlib/scipy/csv imports
+# 2026-10-18        | CONTRIBUTORS        | Optional compact struct-of-arrays result (compact=True)
+# 2026-10-18        | CONTRIBUTORS        | Pluggable weighting function (weighting=, routine_weighting_functions)
+# 2026-10-18        | CONTRIBUTORS        | Station tables or StationEventIndex (routine_station_index) accepted, converted once per call
 #******************************************************************************************************************************************
 
 #SPR-PP1 PCB Data Association 
+#
+#The matchers accept the PCB level dataframes or their routine_station_index.StationEventIndex (timestamps and
+#weightage converted once, e.g. by the pipeline for a station shared by two associations).
 
-import pandas as pd
 import numpy as np
-import scipy as sp
 
-import csv
-import datetime
+import time
 
-from matplotlib import pyplot as plt
-from matplotlib import dates  as md 
-from matplotlib.colors import LogNorm
+import routine_weight_kernel
+import routine_station_index
+import routine_weighting_functions
+import routine_match_kernel
+import routine_match_result
+import routine_weight_cache
+import routine_instrumentation
+
+#Minimum weightage of the PP1 event for a SPR-PP1 match
+SPRPP1_MATCH_THRESHOLD = 0.8
+
+#==============================================================================================
+"""
+Weight matrix and matching kernels shared by the forward, reverse and bidirectional SPR - PP1 matching
+"""
+
+def gen_sprpp1_weight_mtrx(pcb_level_dfspr,pcb_level_dfpp1,min_transit_seconds=None,max_transit_seconds=None,weight_dtype=np.float64,mmap_path=None,
+                           weighting=None):
+    """
+    Purpose : Generate the SPR-PP1 weight matrix (dense, or sparse banded when a transit-time window is given)
+    Inputs  : pcb_level_dfspr     - The PCB level dataframe corresponding to screen printer
+              pcb_level_dfpp1     - The PCB level dataframe corresponding to PP1
+              min_transit_seconds - Minimum SPR departure to PP1 arrival time considered for a match
+              max_transit_seconds - Maximum SPR departure to PP1 arrival time considered for a match
+              weight_dtype        - (Optional) Storage dtype of the dense matrix (np.float64 or np.float32)
+              mmap_path           - (Optional) Path of a np.memmap file backing the dense matrix (kept for audits)
+              weighting           - (Optional) Weighting function : name, (name, params) or WeightFunction
+                                    (routine_weighting_functions.get_weighting; default 'inverse_delay')
+    Output  : weight_mtrx         - numpy array or scipy.sparse CSR matrix of shape (len(pcb_level_dfspr), len(pcb_level_dfpp1))
+    """
+
+    weight_function = routine_weighting_functions.get_weighting('sprpp1',weighting)
+
+    spr_index = routine_station_index.get_station_index(pcb_level_dfspr,'spr')
+    pp1_index = routine_station_index.get_station_index(pcb_level_dfpp1,'pp1')
+
+    def build_weight_mtrx():
+        if (min_transit_seconds is None) and (max_transit_seconds is None):
+            return routine_weight_kernel.get_sprpp1_weight_mtrx(spr_index,pp1_index,weight_dtype,mmap_path,weight_function)
+        #end-if
+        return routine_weight_kernel.get_sprpp1_weight_band(spr_index,pp1_index,min_transit_seconds,max_transit_seconds,
+                                                            weight_function)
+    #end-proc
+
+    #Opt-in cache keyed on the inputs of the weighting function (see routine_weight_cache); a memory-mapped matrix is
+    #always written to its file
+    if (routine_weight_cache.get_weight_cache() is None) or (mmap_path is not None):
+        return build_weight_mtrx()
+    #end-if
+
+    key_parts = ('routine_weight_kernel.get_sprpp1_weights',weight_function.get_key(),min_transit_seconds,max_transit_seconds,np.dtype(weight_dtype).str,
+                 spr_index.get_column('dptr_tmstmp'),
+                 pp1_index.get_column('arvl_tmstmp'),
+                 pp1_index.get_column('weightage'))
+
+    return routine_weight_cache.get_cached_weight_mtrx(key_parts,build_weight_mtrx)
+#end-proc
+
+
+def get_fwd_sprpp1_matches(row_max_indx,row_max_wght,wght_pp1):
+    """
+    Purpose : Forward (SPR -> PP1) matches from the row-wise argmax of the weight matrix
+    Inputs  : row_max_indx - PP1 index of the maximum of every SPR row
+              row_max_wght - Maximum weight of every SPR row
+              wght_pp1     - Weightage of PP1
+    Output  : spr_indx, pp1_indx, edge_weight - Matched pairs ordered by SPR index
+    """
+
+    match_mask = (row_max_wght > 0)
+    match_mask[match_mask] = (wght_pp1[row_max_indx[match_mask]] >= SPRPP1_MATCH_THRESHOLD)
+
+    spr_indx = np.flatnonzero(match_mask)
+    routine_instrumentation.add_count('sprpp1.rejected_by_threshold',np.count_nonzero(row_max_wght > 0) - len(spr_indx))
+
+    return spr_indx,row_max_indx[spr_indx],row_max_wght[spr_indx]
+#end-proc
+
+
+def get_rev_sprpp1_matches(col_max_indx,col_max_wght,wght_pp1):
+    """
+    Purpose : Reverse (PP1 -> SPR) matches from the column-wise argmax of the weight matrix
+    Inputs  : col_max_indx - SPR index of the maximum of every PP1 column
+              col_max_wght - Maximum weight of every PP1 column
+              wght_pp1     - Weightage of PP1
+    Output  : spr_indx, pp1_indx, edge_weight - Matched pairs ordered by PP1 index
+    """
+
+    match_mask = (wght_pp1 >= SPRPP1_MATCH_THRESHOLD) & (col_max_wght > 0)
+
+    pp1_indx = np.flatnonzero(match_mask)
+    routine_instrumentation.add_count('sprpp1.rejected_by_threshold',np.count_nonzero(col_max_wght > 0) - len(pp1_indx))
+
+    return col_max_indx[pp1_indx],pp1_indx,col_max_wght[pp1_indx]
+#end-proc
+
+
+def get_optimal_sprpp1_matches(weight_mtrx,wght_pp1):
+    """
+    Purpose : Globally optimal one-to-one SPR-PP1 matches (maximum total edge weight) under the weightage gate
+    Inputs  : weight_mtrx - SPR-PP1 weight matrix (dense or sparse)
+              wght_pp1    - Weightage of PP1
+    Output  : spr_indx, pp1_indx, edge_weight - Matched pairs ordered by SPR index
+    """
+
+    row_mask = np.ones(weight_mtrx.shape[0],dtype=bool)
+    col_mask = (wght_pp1 >= SPRPP1_MATCH_THRESHOLD)
+
+    return routine_match_kernel.get_optimal_matches(weight_mtrx,row_mask,col_mask)
+#end-proc
+
+
+def get_sprpp1_match_indx(pcb_level_dfspr,pcb_level_dfpp1,direction='fwd',min_transit_seconds=None,max_transit_seconds=None,
+                          assignment='greedy',weight_dtype=np.float64,mmap_path=None,weighting=None):
+    """
+    Purpose : SPR-PP1 matching on index arrays (the rows of fwd/rev_sprpp1_matching_algo, without the dataframe)
+    Inputs  : pcb_level_dfspr     - The PCB level dataframe corresponding to screen printer
+              pcb_level_dfpp1     - The PCB level dataframe corresponding to PP1
+              direction           - 'fwd' (best PP1 event for every SPR event) or 'rev' (best SPR event for every PP1 event)
+              min_transit_seconds - (Optional) Minimum SPR departure to PP1 arrival time considered for a match
+              max_transit_seconds - (Optional) Maximum SPR departure to PP1 arrival time considered for a match
+              assignment          - (Optional) 'greedy' or 'optimal'
+              weight_dtype        - (Optional) Storage dtype of the dense weight matrix (np.float64 or np.float32)
+              mmap_path           - (Optional) Path of a np.memmap file backing the dense weight matrix (greedy assignment only)
+              weighting           - (Optional) Weighting function (routine_weighting_functions.get_weighting)
+    Output  : spr_indx, pp1_indx, edge_weight - Matched pairs ordered by SPR index ('fwd') or PP1 index ('rev')
+    """
+
+    routine_match_kernel.check_assignment(assignment,mmap_path)
+    if (direction not in ('fwd','rev')):
+        raise ValueError("direction must be 'fwd' or 'rev', got %r" % (direction,))
+    #end-if
+
+    spr_index = routine_station_index.get_station_index(pcb_level_dfspr,'spr')
+    pp1_index = routine_station_index.get_station_index(pcb_level_dfpp1,'pp1')
+
+    #Generate weight matrix (vectorized kernel)
+    with routine_instrumentation.timed_phase('sprpp1.weight_generation'):
+        weight_mtrx = gen_sprpp1_weight_mtrx(spr_index,pp1_index,min_transit_seconds,max_transit_seconds,weight_dtype,mmap_path,
+                                             weighting)
+    #end-with
+
+    #Now perform the matching
+    with routine_instrumentation.timed_phase('sprpp1.matching'):
+        wght_pp1 = pp1_index.get_column('weightage')
+
+        if (assignment == 'optimal'):
+            spr_indx,pp1_indx,edge_weight = get_optimal_sprpp1_matches(weight_mtrx,wght_pp1)
+            if (direction == 'rev'):
+                srt_indx = np.argsort(pp1_indx,kind='stable')
+                spr_indx,pp1_indx,edge_weight = spr_indx[srt_indx],pp1_indx[srt_indx],edge_weight[srt_indx]
+            #end-if
+        elif (direction == 'fwd'):
+            max_indx,max_wght = routine_match_kernel.get_row_argmax(weight_mtrx)
+            spr_indx,pp1_indx,edge_weight = get_fwd_sprpp1_matches(max_indx,max_wght,wght_pp1)
+        else:
+            max_indx,max_wght = routine_match_kernel.get_col_argmax(weight_mtrx)
+            spr_indx,pp1_indx,edge_weight = get_rev_sprpp1_matches(max_indx,max_wght,wght_pp1)
+        #end-if
+    #end-with
+
+    routine_instrumentation.add_count('sprpp1.matched',len(spr_indx))
+
+    return spr_indx,pp1_indx,edge_weight
+#end-proc
 
 #==============================================================================================
 """
 Forward SPR - PP1 Matching Process
 """
 
-print('Start of defining procesure : fwd_sprpp1_matching_algo :', datetime.datetime.now())
-def fwd_sprpp1_matching_algo(pcb_level_dfspr,pcb_level_dfpp1):
+def fwd_sprpp1_matching_algo(pcb_level_dfspr,pcb_level_dfpp1,min_transit_seconds=None,max_transit_seconds=None,assignment='greedy',
+                             weight_dtype=np.float64,mmap_path=None,compact=False,weighting=None):
     """
     Purpose : Perform forward matching of SPR and PP1
-    Inputs  : pcb_level_dfspr - The PCB level dataframe corresponding to screen printer
-              pcb_level_dfpp1 - The PCB level dataframe corresponding to PP1
-    Output  : matched_df      - The dataframe that contains the matched PCBs       
+    Inputs  : pcb_level_dfspr     - The PCB level dataframe corresponding to screen printer
+              pcb_level_dfpp1     - The PCB level dataframe corresponding to PP1
+              min_transit_seconds - (Optional) Minimum SPR departure to PP1 arrival time considered for a match
+              max_transit_seconds - (Optional) Maximum SPR departure to PP1 arrival time considered for a match
+                                    When either is given, only the band of candidate cells is stored (sparse matrix)
+              assignment          - (Optional) 'greedy' : best match per event (default)
+                                               'optimal': maximum-weight one-to-one matching over all events
+              weight_dtype        - (Optional) Storage dtype of the dense weight matrix (np.float64, or np.float32 : half the
+                                    memory, weights rounded to float32)
+              mmap_path           - (Optional) Path of a np.memmap file backing the dense weight matrix (kept for audits;
+                                    greedy assignment only)
+              compact             - (Optional) Return a routine_match_result.CompactMatchResult instead of a dataframe
+              weighting           - (Optional) Weighting function : name, (name, params) or WeightFunction
+                                    (routine_weighting_functions.get_weighting; default 'inverse_delay')
+    Output  : matched_df          - The dataframe that contains the matched PCBs       
     """
     
-    STR_TIME = datetime.datetime.now()
-    
-    print('=======================================================')
-    print("START : ", STR_TIME)
-    print('=======================================================')
+    str_time = time.perf_counter()
 
-    #Initialization
-    no_of_matched_pcbs = 0
-    
-    #Initialize weight matrix
-    weight_mtrx = np.zeros([len(pcb_level_dfspr),len(pcb_level_dfpp1)])
-
-    #Assign weights
-    for i in range(0,len(pcb_level_dfspr)):
-        for j in range(0,len(pcb_level_dfpp1)):
-            dptr_spr = pcb_level_dfspr.dptr_tmstmp[i]
-            arvl_pp1 = pcb_level_dfpp1.arvl_tmstmp[j]
-            dptr_pp1 = pcb_level_dfpp1.dptr_tmstmp[j]
-            parm1 = 1 / (pd.Timedelta(pd.Timestamp(arvl_pp1) - pd.Timestamp(dptr_spr)).total_seconds())
-                
-            if parm1 < 0 :
-                parm1 = 0.0
-            #endif    
-
-            prd_parms = parm1
-        
-            weight_mtrx[i,j] = prd_parms * pcb_level_dfpp1.weightage[j]
-        #endfor
-    #endfor    
-    
-    print('Weight matrix generation completed at:', datetime.datetime.now())
-    
-    #Now perform the matchng
-    matched_df = pd.DataFrame(columns=['spr_indx','spr_dptr','pp1_indx','pp1_arvl','pp1_dptr','edge_weight_sprpp1'])
-    for i in range (0,len(pcb_level_dfspr)):
-        j = np.argmax(weight_mtrx[i,:])
-        if (pcb_level_dfpp1.weightage[j] >= 0.8):
-            if (weight_mtrx[i,j] > 0):
-                edge_weight_sprpp1 = np.asscalar(weight_mtrx[i,j])
-                data = pd.DataFrame([[i,pcb_level_dfspr.dptr_tmstmp[i],j,pcb_level_dfpp1.arvl_tmstmp[j],pcb_level_dfpp1.dptr_tmstmp[j],edge_weight_sprpp1]],columns=matched_df.columns)                    
-                matched_df = matched_df.append(data)
-                del data
-                no_of_matched_pcbs = no_of_matched_pcbs + 1
-            #endif
-        #endif 
-    #endfor  
-    
-    matched_df = matched_df.reset_index()
-    matched_df = matched_df.iloc[:,1:len(matched_df.columns)]
+    spr_index = routine_station_index.get_station_index(pcb_level_dfspr,'spr')
+    pp1_index = routine_station_index.get_station_index(pcb_level_dfpp1,'pp1')
 
-    END_TIME = datetime.datetime.now()
-    
-    print('No. of matched PCBs =', no_of_matched_pcbs)
-    
-    print('=======================================================')
-    print("END   : ", END_TIME)
-    print('=======================================================')
-    
-    DUR_TS    = pd.Timestamp(END_TIME) - pd.Timestamp(STR_TIME)
-    EXEC_TIME = pd.Timedelta(DUR_TS).total_seconds()
-    
-    print("Execution time =",EXEC_TIME/60,"mins")
-    print('=======================================================')
+    spr_indx,pp1_indx,edge_weight = get_sprpp1_match_indx(spr_index,pp1_index,'fwd',min_transit_seconds,max_transit_seconds,assignment,
+                                                          weight_dtype,mmap_path,weighting)
+
+    with routine_instrumentation.timed_phase('sprpp1.result_building'):
+        if (compact):
+            matched_df = routine_match_result.get_sprpp1_compact_result(spr_index.pcb_level_df,pp1_index.pcb_level_df,spr_indx,pp1_indx,edge_weight)
+        else:
+            matched_df = routine_match_result.get_sprpp1_matched_df(spr_index.pcb_level_df,pp1_index.pcb_level_df,spr_indx,pp1_indx,edge_weight)
+        #end-if
+    #end-with
+
+    exec_time = time.perf_counter() - str_time
+    routine_instrumentation.add_time('sprpp1.total',exec_time)
+    routine_instrumentation.LOGGER.info('fwd_sprpp1_matching_algo : %d matched PCBs in %.3f s',len(matched_df),exec_time)
 
     return matched_df
 #end-proc
-print('End   of defining procedure : fwd_sprpp1_matching_algo :', datetime.datetime.now())
-
 
 
 #==============================================================================================================
@@ -116,82 +257,118 @@ print('End   of defining procedure : fwd_sprpp1_matching_algo :', datetime.datet
 Reverse SPR PP1 Matching
 """
 
-print('Start of defining procedure : rev_sprpp1_matching_algo :', datetime.datetime.now())
-print('Version used : 2019-05-08 13:02')
+#Version : 2019-05-08 13:02
 
-def rev_sprpp1_matching_algo(pcb_level_dfspr,pcb_level_dfpp1):
+def rev_sprpp1_matching_algo(pcb_level_dfspr,pcb_level_dfpp1,min_transit_seconds=None,max_transit_seconds=None,assignment='greedy',
+                             weight_dtype=np.float64,mmap_path=None,compact=False,weighting=None):
     """
     Purpose : Perform matching from PP1 to SPR
-    Inputs  : pcb_level_dfspr - The PCB level dataframe corresponding to screen printer
-              pcb_level_dfpp1 - The PCB level dataframe corresponding to PP1
-    Output  : matched_df      - The dataframe that contains the matched PCBs       
+    Inputs  : pcb_level_dfspr     - The PCB level dataframe corresponding to screen printer
+              pcb_level_dfpp1     - The PCB level dataframe corresponding to PP1
+              min_transit_seconds - (Optional) Minimum SPR departure to PP1 arrival time considered for a match
+              max_transit_seconds - (Optional) Maximum SPR departure to PP1 arrival time considered for a match
+                                    When either is given, only the band of candidate cells is stored (sparse matrix)
+              assignment          - (Optional) 'greedy' : best match per event (default)
+                                               'optimal': maximum-weight one-to-one matching over all events
+              weight_dtype        - (Optional) Storage dtype of the dense weight matrix (np.float64, or np.float32 : half the
+                                    memory, weights rounded to float32)
+              mmap_path           - (Optional) Path of a np.memmap file backing the dense weight matrix (kept for audits;
+                                    greedy assignment only)
+              compact             - (Optional) Return a routine_match_result.CompactMatchResult instead of a dataframe
+              weighting           - (Optional) Weighting function : name, (name, params) or WeightFunction
+                                    (routine_weighting_functions.get_weighting; default 'inverse_delay')
+    Output  : matched_df          - The dataframe that contains the matched PCBs       
     """
     
-    STR_TIME = datetime.datetime.now()
-    
-    print('=======================================================')
-    print("START : ", STR_TIME)
-    print('=======================================================')
+    str_time = time.perf_counter()
 
-    #Initialization
-    no_of_matched_pcbs = 0
-    
-    #Initialize weight matrix
-    weight_mtrx = np.zeros([len(pcb_level_dfspr),len(pcb_level_dfpp1)])
-    
-    #Assign weights
-    for i in range(0,len(pcb_level_dfspr)):
-        for j in range(0,len(pcb_level_dfpp1)):
-            dptr_spr = pcb_level_dfspr.dptr_tmstmp[i]
-            arvl_pp1 = pcb_level_dfpp1.arvl_tmstmp[j]
-            dptr_pp1 = pcb_level_dfpp1.dptr_tmstmp[j]
-            parm1 = 1 / (pd.Timedelta(pd.Timestamp(arvl_pp1) - pd.Timestamp(dptr_spr)).total_seconds())
-                
-            if parm1 < 0 :
-                parm1 = 0.0
-            #endif    
-
-            prd_parms = parm1
-        
-            weight_mtrx[i,j] = prd_parms * pcb_level_dfpp1.weightage[j]
-        #endfor
-    #endfor    
-    
-    print('Weight matrix generation completed at:', datetime.datetime.now())
-    
-    #Now perform the matching
-    matched_df = pd.DataFrame(columns=['spr_indx','spr_dptr','pp1_indx','pp1_arvl','pp1_dptr','edge_weight_sprpp1'])
-    for j in range (0,len(pcb_level_dfpp1)):
-        i = np.argmax(weight_mtrx[:,j])
-        if (pcb_level_dfpp1.weightage[j] >= 0.8):
-            if (weight_mtrx[i,j] > 0):
-                edge_weight_sprpp1 = np.asscalar(weight_mtrx[i,j])
-                data = pd.DataFrame([[i,pcb_level_dfspr.dptr_tmstmp[i],j,pcb_level_dfpp1.arvl_tmstmp[j],pcb_level_dfpp1.dptr_tmstmp[j],edge_weight_sprpp1]],columns=matched_df.columns)                    
-                matched_df = matched_df.append(data)
-                del data
-                no_of_matched_pcbs = no_of_matched_pcbs + 1
-            #endif
-        #endif 
-    #endfor  
-    
-    matched_df = matched_df.reset_index()
-    matched_df = matched_df.iloc[:,1:len(matched_df.columns)]
+    spr_index = routine_station_index.get_station_index(pcb_level_dfspr,'spr')
+    pp1_index = routine_station_index.get_station_index(pcb_level_dfpp1,'pp1')
 
-    END_TIME = datetime.datetime.now()
-    
-    print('No. of matched PCBs =', no_of_matched_pcbs)
-    
-    print('=======================================================')
-    print("END   : ", END_TIME)
-    print('=======================================================')
-    
-    DUR_TS    = pd.Timestamp(END_TIME) - pd.Timestamp(STR_TIME)
-    EXEC_TIME = pd.Timedelta(DUR_TS).total_seconds()
-    
-    print("Execution time =",EXEC_TIME/60,"mins")
-    print('=======================================================')
+    spr_indx,pp1_indx,edge_weight = get_sprpp1_match_indx(spr_index,pp1_index,'rev',min_transit_seconds,max_transit_seconds,assignment,
+                                                          weight_dtype,mmap_path,weighting)
+
+    with routine_instrumentation.timed_phase('sprpp1.result_building'):
+        if (compact):
+            matched_df = routine_match_result.get_sprpp1_compact_result(spr_index.pcb_level_df,pp1_index.pcb_level_df,spr_indx,pp1_indx,edge_weight)
+        else:
+            matched_df = routine_match_result.get_sprpp1_matched_df(spr_index.pcb_level_df,pp1_index.pcb_level_df,spr_indx,pp1_indx,edge_weight)
+        #end-if
+    #end-with
+
+    exec_time = time.perf_counter() - str_time
+    routine_instrumentation.add_time('sprpp1.total',exec_time)
+    routine_instrumentation.LOGGER.info('rev_sprpp1_matching_algo : %d matched PCBs in %.3f s',len(matched_df),exec_time)
 
     return matched_df
 #end-proc
-print('End   of defining procedure : rev_sprpp1_matching_algo :', datetime.datetime.now())
 
+
+#==============================================================================================================
+"""
+Bidirectional SPR PP1 Matching
+"""
+
+
+def bidirectional_sprpp1_matching(pcb_level_dfspr,pcb_level_dfpp1,min_transit_seconds=None,max_transit_seconds=None,weight_dtype=np.float64,
+                                  mmap_path=None,weighting=None):
+    """
+    Purpose : Perform forward and reverse SPR-PP1 matching on a single weight matrix and find the mutual best matches
+    Inputs  : pcb_level_dfspr     - The PCB level dataframe corresponding to screen printer
+              pcb_level_dfpp1     - The PCB level dataframe corresponding to PP1
+              min_transit_seconds - (Optional) Minimum SPR departure to PP1 arrival time considered for a match
+              max_transit_seconds - (Optional) Maximum SPR departure to PP1 arrival time considered for a match
+              weight_dtype        - (Optional) Storage dtype of the dense weight matrix (np.float64 or np.float32)
+              mmap_path           - (Optional) Path of a np.memmap file backing the dense weight matrix
+              weighting           - (Optional) Weighting function (routine_weighting_functions.get_weighting)
+    Output  : fwd_matched_df      - Same as fwd_sprpp1_matching_algo, plus 'mutual_match' (1 if the reverse match agrees)
+              rev_matched_df      - Same as rev_sprpp1_matching_algo, plus 'mutual_match' (1 if the forward match agrees)
+              mutual_matched_df   - The pairs (i <-> j) found by both the forward and the reverse matching
+    """
+    
+    str_time = time.perf_counter()
+
+    spr_index = routine_station_index.get_station_index(pcb_level_dfspr,'spr')
+    pp1_index = routine_station_index.get_station_index(pcb_level_dfpp1,'pp1')
+
+    #Generate weight matrix once for both directions
+    with routine_instrumentation.timed_phase('sprpp1.weight_generation'):
+        weight_mtrx = gen_sprpp1_weight_mtrx(spr_index,pp1_index,min_transit_seconds,max_transit_seconds,weight_dtype,mmap_path,
+                                             weighting)
+    #end-with
+
+    #Row-wise (forward) and column-wise (reverse) argmax in one pass
+    with routine_instrumentation.timed_phase('sprpp1.matching'):
+        row_max_indx,row_max_wght,col_max_indx,col_max_wght = routine_match_kernel.get_row_col_argmax(weight_mtrx)
+    #end-with
+
+    wght_pp1 = pp1_index.get_column('weightage')
+
+    fwd_spr_indx,fwd_pp1_indx,fwd_edge_weight = get_fwd_sprpp1_matches(row_max_indx,row_max_wght,wght_pp1)
+    rev_spr_indx,rev_pp1_indx,rev_edge_weight = get_rev_sprpp1_matches(col_max_indx,col_max_wght,wght_pp1)
+
+    #Agreement : the forward match of SPR i is PP1 j and the reverse match of PP1 j is SPR i
+    rev_spr_of_pp1 = np.full(len(pp1_index),-1,dtype=np.int64)
+    rev_spr_of_pp1[rev_pp1_indx] = rev_spr_indx
+    fwd_pp1_of_spr = np.full(len(spr_index),-1,dtype=np.int64)
+    fwd_pp1_of_spr[fwd_spr_indx] = fwd_pp1_indx
+
+    fwd_agree = (rev_spr_of_pp1[fwd_pp1_indx] == fwd_spr_indx)
+    rev_agree = (fwd_pp1_of_spr[rev_spr_indx] == rev_pp1_indx)
+
+    fwd_matched_df = routine_match_result.get_sprpp1_matched_df(spr_index.pcb_level_df,pp1_index.pcb_level_df,fwd_spr_indx,fwd_pp1_indx,fwd_edge_weight)
+    fwd_matched_df['mutual_match'] = fwd_agree.astype(np.int64)
+
+    rev_matched_df = routine_match_result.get_sprpp1_matched_df(spr_index.pcb_level_df,pp1_index.pcb_level_df,rev_spr_indx,rev_pp1_indx,rev_edge_weight)
+    rev_matched_df['mutual_match'] = rev_agree.astype(np.int64)
+
+    mutual_matched_df = routine_match_result.get_sprpp1_matched_df(spr_index.pcb_level_df,pp1_index.pcb_level_df,
+                                                                   fwd_spr_indx[fwd_agree],fwd_pp1_indx[fwd_agree],fwd_edge_weight[fwd_agree])
+
+    exec_time = time.perf_counter() - str_time
+    routine_instrumentation.add_time('sprpp1.total',exec_time)
+    routine_instrumentation.LOGGER.info('bidirectional_sprpp1_matching : %d forward, %d reverse, %d mutual matched PCBs in %.3f s',
+                                        len(fwd_matched_df),len(rev_matched_df),len(mutual_matched_df),exec_time)
+
+    return fwd_matched_df,rev_matched_df,mutual_matched_df
+#end-proc
@@ -0,0 +1,207 @@
+#******************************************************************************************************************************************
+# TITLE     : ROUTINE_STATION_INDEX
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : StationEventIndex (int64 timestamps, weightage, sorted views)
+#******************************************************************************************************************************************
+
+#Station event index
+#
+#A StationEventIndex holds the columns of one station table as contiguous NumPy arrays, converted once :
+#
+#    arvl_ns, dptr_ns - int64 epoch nanoseconds (NAT_NS for NaT), in row order
+#    weightage        - float64, in row order
+#    row_labels       - Position -> label of the row in the source table (the matchers report positions)
+#
+#and, built on first use and kept, the time-sorted views used by the banded and chunked matchers :
+#
+#    get_sorted_tmstmp('arvl_tmstmp') - sorted valid (non-NaT) arrival timestamps and their positions (stable order)
+#
+#Every matcher accepts a StationEventIndex wherever it accepts a PCB level dataframe. A station shared by two
+#associations (SPR : LDR-SPR and SPR-PP1, PP1 : SPR-PP1 and PP1-PP2) is then converted once, e.g.
+#
+#    spr_index = StationEventIndex(pcb_level_dfspr,'spr')
+#    ldr_spr_matched_df = rev_ldrspr_matching_algo(ldr_index,spr_index)
+#    spr_pp1_matched_df = fwd_sprpp1_matching_algo(spr_index,pp1_index)
+#
+#The matched dataframes are built from the source table (pcb_level_df), so they are the ones of the dataframe inputs.
+
+import numpy  as np
+import pandas as pd
+
+#Sentinel used by NumPy/pandas for NaT in the int64 view of datetime64[ns]
+NAT_NS = np.iinfo(np.int64).min
+
+#Timestamp columns of the station tables (converted to int64 ns)
+TMSTMP_COLUMNS = ('arvl_tmstmp','dptr_tmstmp')
+
+#Weightage column of the placement machine tables (converted to float64)
+WEIGHTAGE_COLUMN = 'weightage'
+
+
+def get_tmstmp_ns(tmstmp_srs):
+    """
+    Purpose : Convert a timestamp column to int64 nanoseconds since epoch
+    Inputs  : tmstmp_srs - Series/array of timestamps (datetime64, Timestamp objects or parseable strings)
+    Output  : tmstmp_ns  - int64 numpy array, NaT mapped to NAT_NS
+    """
+
+    tmstmp_srs = pd.to_datetime(pd.Series(tmstmp_srs))
+    if (tmstmp_srs.dt.tz is not None):
+        tmstmp_srs = tmstmp_srs.dt.tz_convert(None)
+    #end-if
+    tmstmp_ns = tmstmp_srs.to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+    return tmstmp_ns
+#end-proc
+
+
+def get_sorted_tmstmp(tmstmp_ns):
+    """
+    Purpose : Sort the valid (non-NaT) timestamps once for the window lookups
+    Inputs  : tmstmp_ns  - int64 ns timestamps
+    Output  : tmstmp_srt - Sorted valid timestamps
+              srt_order  - Positions of tmstmp_srt in tmstmp_ns
+    """
+
+    valid_pos = np.flatnonzero(tmstmp_ns != NAT_NS)
+    srt_order = valid_pos[np.argsort(tmstmp_ns[valid_pos],kind='stable')]
+
+    return tmstmp_ns[srt_order],srt_order
+#end-proc
+
+
+class StationEventIndex(object):
+    """
+    Purpose : Columns of a station table converted once to contiguous arrays, shared by every matcher of the station
+    """
+
+    def __init__(self,pcb_level_df,station=None,arrays=None):
+        """
+        Purpose : Convert the columns of a station table
+        Inputs  : pcb_level_df - The PCB level dataframe of the station (referenced, not copied)
+                  station      - (Optional) Station name, e.g. 'spr' (reported in the errors)
+                  arrays       - (Optional) Column name -> converted array (no conversion; see get_subset)
+        """
+
+        self.pcb_level_df = pcb_level_df
+        self.station      = station
+        self.row_labels   = pcb_level_df.index.to_numpy()
+        self.srt_tmstmp   = {}
+
+        if (arrays is None):
+            arrays = {}
+            for column in TMSTMP_COLUMNS:
+                if (column in pcb_level_df.columns):
+                    arrays[column] = np.ascontiguousarray(get_tmstmp_ns(pcb_level_df[column]))
+                #end-if
+            #end-for
+            if (WEIGHTAGE_COLUMN in pcb_level_df.columns):
+                arrays[WEIGHTAGE_COLUMN] = np.ascontiguousarray(pcb_level_df[WEIGHTAGE_COLUMN].to_numpy(dtype=np.float64))
+            #end-if
+        #end-if
+
+        self.arrays    = arrays
+        self.arvl_ns   = arrays.get('arvl_tmstmp')
+        self.dptr_ns   = arrays.get('dptr_tmstmp')
+        self.weightage = arrays.get(WEIGHTAGE_COLUMN)
+    #end-proc
+
+    def __len__(self):
+        """
+        Purpose : Number of events
+        """
+        return len(self.pcb_level_df)
+    #end-proc
+
+    def get_column(self,column):
+        """
+        Purpose : Converted column (int64 ns timestamps or float64 weightage), in row order
+        """
+
+        if (column not in self.arrays):
+            raise ValueError('%s events have no column %r (columns : %s)'
+                             % (self.station or 'station',column,', '.join(sorted(self.arrays)) or 'none'))
+        #end-if
+
+        return self.arrays[column]
+    #end-proc
+
+    def get_sorted_tmstmp(self,column):
+        """
+        Purpose : Sorted valid timestamps of a column and their positions (see get_sorted_tmstmp), built once
+        """
+
+        if (column not in self.srt_tmstmp):
+            self.srt_tmstmp[column] = get_sorted_tmstmp(self.get_column(column))
+        #end-if
+
+        return self.srt_tmstmp[column]
+    #end-proc
+
+    def is_sorted(self,column):
+        """
+        Purpose : True if the column has no NaT and is non-decreasing in row order
+        """
+
+        tmstmp_ns = self.get_column(column)
+
+        return bool(np.all(tmstmp_ns != NAT_NS) and np.all(np.diff(tmstmp_ns) >= 0))
+    #end-proc
+
+    def get_subset(self,pos):
+        """
+        Purpose : Index of the events at the given positions (rows renumbered from 0), without converting again
+        Inputs  : pos          - Positional indices or slice
+        Output  : subset_index - StationEventIndex of pcb_level_df.iloc[pos].reset_index(drop=True)
+        """
+
+        return StationEventIndex(self.pcb_level_df.iloc[pos].reset_index(drop=True),self.station,
+                                 {column : values[pos] for (column,values) in self.arrays.items()})
+    #end-proc
+
+    def get_row_labels(self,pos):
+        """
+        Purpose : Labels of the source table rows at the given positions (the matcher indices)
+        """
+        return self.row_labels[np.asarray(pos,dtype=np.int64)]
+    #end-proc
+#end-class
+
+
+def get_station_index(pcb_level_events,station=None):
+    """
+    Purpose : StationEventIndex of a matcher input
+    Inputs  : pcb_level_events - PCB level dataframe or StationEventIndex (returned as is)
+              station          - (Optional) Station name of a new index
+    Output  : station_index    - StationEventIndex
+    """
+
+    if isinstance(pcb_level_events,StationEventIndex):
+        return pcb_level_events
+    #end-if
+
+    return StationEventIndex(pcb_level_events,station)
+#end-proc
+
+
+def get_station_df(pcb_level_events):
+    """
+    Purpose : PCB level dataframe of a matcher input (dataframe or StationEventIndex)
+    """
+
+    if isinstance(pcb_level_events,StationEventIndex):
+        return pcb_level_events.pcb_level_df
+    #end-if
+
+    return pcb_level_events
+#end-proc
@@ -0,0 +1,584 @@
+#******************************************************************************************************************************************
+# TITLE     : ROUTINE_STREAMING_MATCHER
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : incremental LDR-SPR, SPR-PP1 and PP1-PP2 matchers
+# 2026-10-18        | CONTRIBUTORS        | Running LDR-SPR delay histogram kept in a routine_delay_histogram.DelayHistogram
+# 2026-10-18        | CONTRIBUTORS        | Pluggable weighting function (weighting=, routine_weighting_functions)
+# 2026-10-18        | CONTRIBUTORS        | Event batches as dataframes or StationEventIndex (routine_station_index)
+# 2026-10-18        | CONTRIBUTORS        | scipy.sparse imported on first use (get_band_weights)
+# 2026-10-18        | CONTRIBUTORS        | LDR-SPR : loader stream positions of the matches (with_ldr_indx)
+# 2026-10-18        | CONTRIBUTORS        | Unused LDR-SPR SPR event count removed; row / column batch docstrings
+#******************************************************************************************************************************************
+
+#Streaming (incremental) PCB Data Association
+#
+#The matchers accept batches of new events per station and emit the matches whose transit window has closed.
+#Only the events that can still take part in an open window are kept in memory.
+#
+#Assumptions :
+#  - Every station stream is fed in time order (non-decreasing timestamps across batches), i.e. in the row order of the
+#    dataframes the batch routines would receive.
+#  - The indices in the emitted matches (spr_indx, pp1_indx, ...) are positions in the full stream of the station,
+#    as in the batch routines.
+#  - A batch is a PCB level dataframe or its routine_station_index.StationEventIndex.
+#
+#SPR-PP1 / PP1-PP2 : the emitted matches are equal to fwd_*/rev_* called with the same min/max_transit_seconds and weighting.
+#  - forward : the match of a departure d is final once an arrival later than d + max_transit_seconds has been seen
+#  - reverse : the match of an arrival a is final once a departure later than a - min_transit_seconds has been seen
+#LDR-SPR : an SPR event is final once a loader departure at or after it has been seen. The multiple loader events are
+#  resolved with hist_mode if given (equal to rev_ldrspr_matching_algo when it is the mode of the batch run), else with
+#  the modal 1-1 delay observed so far.
+
+import numpy  as np
+import pandas as pd
+
+import routine_weight_kernel
+import routine_station_index
+import routine_weighting_functions
+import routine_match_kernel
+import routine_match_result
+import routine_delay_histogram
+import routine_ldrspr_matching_algo
+import routine_sprpp1_matching_algo
+import routine_pp1pp2_matching_algo
+
+
+def get_tmstmp_srs(tmstmp_ns):
+    """
+    Purpose : Convert int64 nanosecond timestamps back to a datetime64[ns] Series
+    Inputs  : tmstmp_ns  - int64 array (NAT_NS for NaT)
+    Output  : tmstmp_srs - datetime64[ns] Series
+    """
+
+    return pd.Series(np.asarray(tmstmp_ns,dtype=np.int64).view('datetime64[ns]'))
+#end-proc
+
+
+#==============================================================================================
+"""
+Banded streaming matcher (shared by SPR-PP1 and PP1-PP2)
+"""
+
+class BandStreamingMatcher(object):
+    """
+    Purpose : Incremental argmax matching of a departure stream (rows) against an arrival stream (columns) within a
+              transit-time window; the station specific parts (fields, weights, gates, output) are defined by subclasses
+    """
+
+    ROW_FIELDS = ()         #(column name, dtype) of the row events kept in the buffer
+    COL_FIELDS = ()         #(column name, dtype) of the column events kept in the buffer
+    ROW_KEY    = None       #Row timestamp that opens the transit window (departure)
+    COL_KEY    = None       #Column timestamp that closes the transit window (arrival)
+    STAGE      = None       #Stage of the weighting functions (routine_weighting_functions.STAGE_VARIABLES)
+
+    def __init__(self,max_transit_seconds,min_transit_seconds=None,direction='fwd',weighting=None):
+        """
+        Purpose : Initialize the matcher
+        Inputs  : max_transit_seconds - Maximum transit time (required, bounds the memory)
+                  min_transit_seconds - (Optional) Minimum transit time
+                  direction           - 'fwd' (best column for every row) or 'rev' (best row for every column)
+                  weighting           - (Optional) Weighting function (routine_weighting_functions.get_weighting)
+        """
+
+        if (max_transit_seconds is None):
+            raise ValueError('max_transit_seconds is required for streaming matching')
+        #end-if
+        if (direction not in ('fwd','rev')):
+            raise ValueError("direction must be 'fwd' or 'rev', got %r" % (direction,))
+        #end-if
+
+        self.max_transit_seconds = max_transit_seconds
+        self.min_transit_seconds = 0 if (min_transit_seconds is None) else min_transit_seconds
+        self.max_ns    = int(round(self.max_transit_seconds * 1e9))
+        self.min_ns    = int(round(self.min_transit_seconds * 1e9))
+        self.direction = direction
+        self.weight_function = routine_weighting_functions.get_weighting(self.STAGE,weighting)
+
+        self.row_buf = self.get_empty_buffer(self.ROW_FIELDS)
+        self.col_buf = self.get_empty_buffer(self.COL_FIELDS)
+        self.no_of_rows = 0
+        self.no_of_cols = 0
+        self.row_wm     = None
+        self.col_wm     = None
+        self.closed     = False
+    #end-proc
+
+    @staticmethod
+    def get_empty_buffer(fields):
+        """
+        Purpose : Empty event buffer (one array per field plus the position of the event in the full stream)
+        """
+        buf = {name : np.zeros(0,dtype=dtype) for (name,dtype) in fields}
+        buf['glob_indx'] = np.zeros(0,dtype=np.int64)
+        return buf
+    #end-proc
+
+    @staticmethod
+    def get_buffer_events(buf,mask):
+        """
+        Purpose : Select events of a buffer with a boolean mask or positional indices
+        """
+        return {name : values[mask] for (name,values) in buf.items()}
+    #end-proc
+
+    def add_events(self,buf,fields,key,event_df,no_of_events):
+        """
+        Purpose : Append a batch of events to a buffer and return the updated buffer, event count and watermark
+        """
+
+        event_index = routine_station_index.get_station_index(event_df)
+
+        new_buf = {}
+        for (name,dtype) in fields:
+            new_buf[name] = np.concatenate([buf[name],event_index.get_column(name).astype(dtype,copy=False)])
+        #end-for
+        new_buf['glob_indx'] = np.concatenate([buf['glob_indx'],np.arange(no_of_events,no_of_events + len(event_df),dtype=np.int64)])
+
+        key_ns = new_buf[key][len(buf[key]):]
+        key_ns = key_ns[key_ns != routine_weight_kernel.NAT_NS]
+        wm     = int(key_ns.max()) if (len(key_ns) > 0) else None
+
+        return new_buf,no_of_events + len(event_df),wm
+    #end-proc
+
+    @staticmethod
+    def get_max_wm(curr_wm,new_wm):
+        """
+        Purpose : Advance a watermark (latest timestamp seen, None if no timestamp yet)
+        """
+        if (curr_wm is None):
+            return new_wm
+        if (new_wm is None):
+            return curr_wm
+        return max(curr_wm,new_wm)
+    #end-proc
+
+    def add_row_events(self,event_df):
+        """
+        Purpose : Add a batch of row events (departure stream) and advance the row watermark
+        Inputs  : event_df - Dataframe or StationEventIndex with the ROW_FIELDS columns, in time order after the
+                             previous batches
+        Output  : None
+        """
+
+        if self.closed:
+            raise RuntimeError('matcher is closed')
+        #end-if
+        self.row_buf,self.no_of_rows,wm = self.add_events(self.row_buf,self.ROW_FIELDS,self.ROW_KEY,event_df,self.no_of_rows)
+        self.row_wm = self.get_max_wm(self.row_wm,wm)
+    #end-proc
+
+    def add_col_events(self,event_df):
+        """
+        Purpose : Add a batch of column events (arrival stream) and advance the column watermark
+        Inputs  : event_df - Dataframe or StationEventIndex with the COL_FIELDS columns, in time order after the
+                             previous batches
+        Output  : None
+        """
+
+        if self.closed:
+            raise RuntimeError('matcher is closed')
+        #end-if
+        self.col_buf,self.no_of_cols,wm = self.add_events(self.col_buf,self.COL_FIELDS,self.COL_KEY,event_df,self.no_of_cols)
+        self.col_wm = self.get_max_wm(self.col_wm,wm)
+    #end-proc
+
+    def get_no_of_buffered_events(self):
+        """
+        Purpose : Number of (row, column) events currently held in memory
+        """
+        return len(self.row_buf['glob_indx']),len(self.col_buf['glob_indx'])
+    #end-proc
+
+    def get_band_weights(self,rows,cols):
+        """
+        Purpose : Sparse banded weight matrix between the given row and column events
+        """
+
+        indptr,col_indx = routine_weight_kernel.get_band_pairs(rows[self.ROW_KEY],cols[self.COL_KEY],self.min_transit_seconds,self.max_transit_seconds)
+        row_indx        = np.repeat(np.arange(len(rows[self.ROW_KEY])),np.diff(indptr))
+
+        weights = self.get_weights(self.get_buffer_events(rows,row_indx),self.get_buffer_events(cols,col_indx))
+
+        from scipy import sparse
+
+        return sparse.csr_matrix((weights,col_indx,indptr),shape=(len(rows[self.ROW_KEY]),len(cols[self.COL_KEY])))
+    #end-proc
+
+    def get_matches(self):
+        """
+        Purpose : Emit the matches whose transit window has closed and release the events that are no longer needed
+        Output  : matched_df - The dataframe that contains the newly matched PCBs (same columns as the batch routines)
+        """
+
+        NAT_NS = routine_weight_kernel.NAT_NS
+
+        if (self.direction == 'fwd'):
+            row_key = self.row_buf[self.ROW_KEY]
+            if self.closed:
+                final_mask = np.ones(len(row_key),dtype=bool)
+            elif (self.col_wm is None):
+                final_mask = (row_key == NAT_NS)
+            else:
+                final_mask = (row_key == NAT_NS) | (row_key + self.max_ns < self.col_wm)
+            #end-if
+
+            rows = self.get_buffer_events(self.row_buf,final_mask)
+            cols = self.col_buf
+
+            weight_mtrx = self.get_band_weights(rows,cols)
+            max_indx,max_wght = routine_match_kernel.get_row_argmax(weight_mtrx)
+            row_pos,col_pos,edge_weight = self.get_fwd_matches(max_indx,max_wght,rows,cols)
+
+            #Release the final rows and the columns before the window of every pending and future row
+            self.row_buf = self.get_buffer_events(self.row_buf,~final_mask)
+            pend_key     = self.row_buf[self.ROW_KEY][self.row_buf[self.ROW_KEY] != NAT_NS]
+            low_key      = pend_key.min() if (len(pend_key) > 0) else self.row_wm
+            if self.closed:
+                self.col_buf = self.get_buffer_events(self.col_buf,np.zeros(len(self.col_buf['glob_indx']),dtype=bool))
+            elif (low_key is not None):
+                self.col_buf = self.get_buffer_events(self.col_buf,~(self.col_buf[self.COL_KEY] < low_key + self.min_ns))
+            #end-if
+        else:
+            col_key = self.col_buf[self.COL_KEY]
+            if self.closed:
+                final_mask = np.ones(len(col_key),dtype=bool)
+            elif (self.row_wm is None):
+                final_mask = (col_key == NAT_NS)
+            else:
+                final_mask = (col_key == NAT_NS) | (col_key - self.min_ns < self.row_wm)
+            #end-if
+
+            rows = self.row_buf
+            cols = self.get_buffer_events(self.col_buf,final_mask)
+
+            weight_mtrx = self.get_band_weights(rows,cols)
+            max_indx,max_wght = routine_match_kernel.get_col_argmax(weight_mtrx)
+            row_pos,col_pos,edge_weight = self.get_rev_matches(max_indx,max_wght,rows,cols)
+
+            #Release the final columns and the rows before the window of every pending and future column
+            self.col_buf = self.get_buffer_events(self.col_buf,~final_mask)
+            pend_key     = self.col_buf[self.COL_KEY][self.col_buf[self.COL_KEY] != NAT_NS]
+            low_key      = pend_key.min() if (len(pend_key) > 0) else self.col_wm
+            if self.closed:
+                self.row_buf = self.get_buffer_events(self.row_buf,np.zeros(len(self.row_buf['glob_indx']),dtype=bool))
+            elif (low_key is not None):
+                self.row_buf = self.get_buffer_events(self.row_buf,~(self.row_buf[self.ROW_KEY] < low_key - self.max_ns))
+            #end-if
+        #end-if
+
+        return self.get_matched_df(rows,cols,row_pos,col_pos,edge_weight)
+    #end-proc
+
+    def close(self):
+        """
+        Purpose : Close all windows (end of the streams) and emit the remaining matches
+        Output  : matched_df - The dataframe that contains the remaining matched PCBs
+        """
+
+        self.closed = True
+        return self.get_matches()
+    #end-proc
+#end-class
+
+
+#==============================================================================================
+"""
+Streaming SPR - PP1 Matching
+"""
+
+class SprPp1StreamingMatcher(BandStreamingMatcher):
+    """
+    Purpose : Incremental SPR-PP1 matching, equal to fwd_sprpp1_matching_algo / rev_sprpp1_matching_algo with the same
+              transit-time window (direction='fwd' / 'rev')
+    """
+
+    ROW_FIELDS = (('dptr_tmstmp',np.int64),)
+    COL_FIELDS = (('arvl_tmstmp',np.int64),('dptr_tmstmp',np.int64),('weightage',np.float64))
+    ROW_KEY    = 'dptr_tmstmp'
+    COL_KEY    = 'arvl_tmstmp'
+    STAGE      = 'sprpp1'
+
+    def add_spr_events(self,pcb_level_dfspr):
+        """
+        Purpose : Add a batch of screen printer events (dptr_tmstmp)
+        """
+        self.add_row_events(pcb_level_dfspr)
+    #end-proc
+
+    def add_pp1_events(self,pcb_level_dfpp1):
+        """
+        Purpose : Add a batch of PP1 events (arvl_tmstmp, dptr_tmstmp, weightage)
+        """
+        self.add_col_events(pcb_level_dfpp1)
+    #end-proc
+
+    def get_weights(self,rows,cols):
+        return routine_weight_kernel.get_sprpp1_weights(rows['dptr_tmstmp'],cols['arvl_tmstmp'],cols['weightage'],self.weight_function)
+    #end-proc
+
+    def get_fwd_matches(self,max_indx,max_wght,rows,cols):
+        return routine_sprpp1_matching_algo.get_fwd_sprpp1_matches(max_indx,max_wght,cols['weightage'])
+    #end-proc
+
+    def get_rev_matches(self,max_indx,max_wght,rows,cols):
+        return routine_sprpp1_matching_algo.get_rev_sprpp1_matches(max_indx,max_wght,cols['weightage'])
+    #end-proc
+
+    def get_matched_df(self,rows,cols,row_pos,col_pos,edge_weight):
+        matched_df = pd.DataFrame({
+            'spr_indx'           : rows['glob_indx'][row_pos],
+            'spr_dptr'           : get_tmstmp_srs(rows['dptr_tmstmp'][row_pos]),
+            'pp1_indx'           : cols['glob_indx'][col_pos],
+            'pp1_arvl'           : get_tmstmp_srs(cols['arvl_tmstmp'][col_pos]),
+            'pp1_dptr'           : get_tmstmp_srs(cols['dptr_tmstmp'][col_pos]),
+            'edge_weight_sprpp1' : edge_weight,
+            },columns=routine_match_result.SPRPP1_COLUMNS)
+        return matched_df
+    #end-proc
+#end-class
+
+
+#==============================================================================================
+"""
+Streaming PP1 - PP2 Matching
+"""
+
+class Pp1Pp2StreamingMatcher(BandStreamingMatcher):
+    """
+    Purpose : Incremental PP1-PP2 matching, equal to fwd_pp1pp2_matching_algo / rev_pp1pp2_matching_algo with the same
+              transit-time window (direction='fwd' / 'rev')
+    """
+
+    ROW_FIELDS = (('arvl_tmstmp',np.int64),('dptr_tmstmp',np.int64),('weightage',np.float64))
+    COL_FIELDS = (('arvl_tmstmp',np.int64),('dptr_tmstmp',np.int64),('weightage',np.float64))
+    ROW_KEY    = 'dptr_tmstmp'
+    COL_KEY    = 'arvl_tmstmp'
+    STAGE      = 'pp1pp2'
+
+    def add_pp1_events(self,pcb_level_dfone):
+        """
+        Purpose : Add a batch of PP1 events (arvl_tmstmp, dptr_tmstmp, weightage)
+        """
+        self.add_row_events(pcb_level_dfone)
+    #end-proc
+
+    def add_pp2_events(self,pcb_level_dftwo):
+        """
+        Purpose : Add a batch of PP2 events (arvl_tmstmp, dptr_tmstmp, weightage)
+        """
+        self.add_col_events(pcb_level_dftwo)
+    #end-proc
+
+    def get_weights(self,rows,cols):
+        return routine_weight_kernel.get_pp1pp2_weights(rows['arvl_tmstmp'],rows['dptr_tmstmp'],rows['weightage'],
+                                                        cols['arvl_tmstmp'],cols['dptr_tmstmp'],cols['weightage'],self.weight_function)
+    #end-proc
+
+    def get_fwd_matches(self,max_indx,max_wght,rows,cols):
+        return routine_pp1pp2_matching_algo.get_fwd_pp1pp2_matches(max_indx,max_wght,rows['weightage'],cols['weightage'])
+    #end-proc
+
+    def get_rev_matches(self,max_indx,max_wght,rows,cols):
+        return routine_pp1pp2_matching_algo.get_rev_pp1pp2_matches(max_indx,max_wght,rows['weightage'],cols['weightage'])
+    #end-proc
+
+    def get_matched_df(self,rows,cols,row_pos,col_pos,edge_weight):
+        matched_df = pd.DataFrame({
+            'pp1_indx'           : rows['glob_indx'][row_pos],
+            'pp1_arvl'           : get_tmstmp_srs(rows['arvl_tmstmp'][row_pos]),
+            'pp1_dptr'           : get_tmstmp_srs(rows['dptr_tmstmp'][row_pos]),
+            'pp2_indx'           : cols['glob_indx'][col_pos],
+            'pp2_arvl'           : get_tmstmp_srs(cols['arvl_tmstmp'][col_pos]),
+            'pp2_dptr'           : get_tmstmp_srs(cols['dptr_tmstmp'][col_pos]),
+            'edge_weight_pp1pp2' : edge_weight,
+            },columns=routine_match_result.PP1PP2_COLUMNS)
+        return matched_df
+    #end-proc
+#end-class
+
+
+#==============================================================================================
+"""
+Streaming LDR - SPR Matching
+"""
+
+class LdrSprStreamingMatcher(object):
+    """
+    Purpose : Incremental LDR-SPR matching (same intervals and categories as rev_ldrspr_matching_algo)
+    """
+
+    def __init__(self,hist_mode=None,bin_width=routine_delay_histogram.HIST_BIN_WIDTH):
+        """
+        Purpose : Initialize the matcher
+        Inputs  : hist_mode - (Optional) Modal LDR departure to SPR departure delay [s] used to resolve multiple loader
+                              events; if None, the modal delay of the 1-1 matches observed so far is used
+                  bin_width - Bin width [s] of the running delay histogram
+        """
+
+        self.hist_mode  = hist_mode
+        self.bin_width  = bin_width
+        self.delay_hist = routine_delay_histogram.DelayHistogram(bin_width)
+
+        self.ldr_dptr    = np.zeros(0,dtype=np.int64)
+        self.ldr_indx    = np.zeros(0,dtype=np.int64)          #Positions of the buffered loader events in the loader stream
+        self.spr_dptr    = np.zeros(0,dtype=np.int64)
+        self.no_of_ldr   = 0
+        self.no_of_final = 0
+        self.prev_spr    = None
+        self.ldr_wm      = None
+        self.closed      = False
+    #end-proc
+
+    def add_ldr_events(self,pcb_level_dfldr):
+        """
+        Purpose : Add a batch of loader events (dptr_tmstmp)
+        """
+
+        if self.closed:
+            raise RuntimeError('matcher is closed')
+        #end-if
+        dptr_ns = routine_station_index.get_station_index(pcb_level_dfldr,'ldr').get_column('dptr_tmstmp')
+        self.ldr_dptr  = np.concatenate([self.ldr_dptr,dptr_ns])
+        self.ldr_indx  = np.concatenate([self.ldr_indx,np.arange(self.no_of_ldr,self.no_of_ldr + len(dptr_ns),dtype=np.int64)])
+        self.no_of_ldr = self.no_of_ldr + len(dptr_ns)
+
+        dptr_ns = dptr_ns[dptr_ns != routine_weight_kernel.NAT_NS]
+        if (len(dptr_ns) > 0):
+            self.ldr_wm = int(dptr_ns.max()) if (self.ldr_wm is None) else max(self.ldr_wm,int(dptr_ns.max()))
+        #end-if
+    #end-proc
+
+    def add_spr_events(self,pcb_level_dfspr):
+        """
+        Purpose : Add a batch of screen printer events (dptr_tmstmp)
+        """
+
+        if self.closed:
+            raise RuntimeError('matcher is closed')
+        #end-if
+        self.spr_dptr = np.concatenate([self.spr_dptr,routine_station_index.get_station_index(pcb_level_dfspr,'spr').get_column('dptr_tmstmp')])
+    #end-proc
+
+    def get_no_of_buffered_events(self):
+        """
+        Purpose : Number of (loader, SPR) events currently held in memory
+        """
+        return len(self.ldr_dptr),len(self.spr_dptr)
+    #end-proc
+
+    def get_hist_mode(self):
+        """
+        Purpose : Modal delay [s] used for the correction of multiple loader events
+        """
+
+        if (self.hist_mode is not None):
+            return self.hist_mode
+        #end-if
+
+        return self.delay_hist.get_mode()
+    #end-proc
+
+    def get_matches(self,with_ldr_indx=False):
+        """
+        Purpose : Emit the SPR events whose loader interval has closed
+        Inputs  : with_ldr_indx - (Optional) Add the ldr_indx column : position of the matched loader event in the loader
+                                  stream (-1 : no loader event)
+        Output  : matched_df    - The dataframe that contains the newly matched PCBs (same columns as rev_ldrspr_matching_algo)
+        """
+
+        NAT_NS = routine_weight_kernel.NAT_NS
+
+        #SPR events are final (in stream order) once a loader departure at or after them has been seen
+        if self.closed:
+            no_of_final = len(self.spr_dptr)
+        elif (self.ldr_wm is None):
+            no_of_final = 0
+        else:
+            not_final   = np.flatnonzero(self.spr_dptr > self.ldr_wm)
+            no_of_final = not_final[0] if (len(not_final) > 0) else len(self.spr_dptr)
+        #end-if
+
+        final_spr = self.spr_dptr[:no_of_final]
+        spr_glob  = np.arange(self.no_of_final,self.no_of_final + no_of_final,dtype=np.int64)
+
+        #The last final SPR departure bounds the first pending interval
+        if (self.prev_spr is None):
+            intrvl_spr = final_spr
+            intrvl_off = 0
+        else:
+            intrvl_spr = np.concatenate([[self.prev_spr],final_spr])
+            intrvl_off = 1
+        #end-if
+
+        ev_ldr_pos,ev_spr_indx = routine_ldrspr_matching_algo.get_spr_interval_events(self.ldr_dptr,intrvl_spr)
+        ev_keep     = (ev_spr_indx >= intrvl_off)
+        ev_ldr_pos  = ev_ldr_pos[ev_keep]
+        ev_spr_indx = ev_spr_indx[ev_keep] - intrvl_off
+
+        no_of_events  = np.bincount(ev_spr_indx,minlength=no_of_final)
+        no_event_mask = (no_of_events == 0)
+        mult_ldr_mask = (no_of_events > 1)
+
+        #Update the running delay histogram with the 1-1 matches
+        single_ev = (no_of_events[ev_spr_indx] == 1)
+        single_td = routine_weight_kernel.get_delay_seconds(final_spr[ev_spr_indx[single_ev]],self.ldr_dptr[ev_ldr_pos[single_ev]])
+        self.delay_hist.add_delays(single_td)
+
+        #Multiple loader events : keep the event closest to the modal delay (first one on ties)
+        hist_mode = self.get_hist_mode()
+        ev_dev    = np.abs(routine_weight_kernel.get_delay_seconds(final_spr[ev_spr_indx],self.ldr_dptr[ev_ldr_pos]) - hist_mode)
+        ev_first  = routine_ldrspr_matching_algo.get_group_argmin(ev_spr_indx,ev_dev)
+
+        sel_ldr_dptr = np.full(no_of_final,NAT_NS,dtype=np.int64)
+        sel_ldr_dptr[ev_spr_indx[ev_first]] = self.ldr_dptr[ev_ldr_pos[ev_first]]
+        sel_ldr_indx = np.full(no_of_final,-1,dtype=np.int64)
+        sel_ldr_indx[ev_spr_indx[ev_first]] = self.ldr_indx[ev_ldr_pos[ev_first]]
+
+        matched_df = pd.DataFrame({
+            'ldr_dptr'            : get_tmstmp_srs(sel_ldr_dptr),
+            'spr_indx'            : spr_glob,
+            'spr_dptr'            : get_tmstmp_srs(final_spr),
+            'spr_special_entry'   : no_event_mask.astype(np.int64),
+            'ldr_multiple_events' : mult_ldr_mask.astype(np.int64),
+            },columns=routine_match_result.LDRSPR_COLUMNS)
+        if (with_ldr_indx):
+            matched_df['ldr_indx'] = sel_ldr_indx
+        #end-if
+
+        #Release the final SPR events and the loader events up to the last final SPR departure
+        if (no_of_final > 0):
+            self.prev_spr = int(final_spr[-1])
+            if (self.prev_spr != NAT_NS):
+                ldr_keep      = ~(self.ldr_dptr <= self.prev_spr)
+                self.ldr_dptr = self.ldr_dptr[ldr_keep]
+                self.ldr_indx = self.ldr_indx[ldr_keep]
+            #end-if
+        #end-if
+        self.spr_dptr    = self.spr_dptr[no_of_final:]
+        self.no_of_final = self.no_of_final + no_of_final
+
+        return matched_df
+    #end-proc
+
+    def close(self,with_ldr_indx=False):
+        """
+        Purpose : Close all intervals (end of the streams) and emit the remaining matches
+        Inputs  : with_ldr_indx - (Optional) Add the ldr_indx column (see get_matches)
+        Output  : matched_df    - The dataframe that contains the remaining matched PCBs
+        """
+
+        self.closed = True
+        return self.get_matches(with_ldr_indx)
+    #end-proc
+#end-class
@@ -0,0 +1,173 @@
+#******************************************************************************************************************************************
+# TITLE     : ROUTINE_SYNTHETIC_LINE
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : synthetic LDR / SPR / PP1 / PP2 event streams with ground truth
+#******************************************************************************************************************************************
+
+#Synthetic SMT line (loader -> screen printer -> pick and place 1 -> pick and place 2)
+#
+#Every board leaves the screen printer takt seconds after the previous one and the loader ldrspr_delay seconds before;
+#it reaches PP1 (PP2) sprpp1_transit (pp1pp2_transit) seconds after leaving the SPR (PP1) and stays pp1_cycle
+#(pp2_cycle) seconds on the machine. The boards stay in order (a machine does not release a board before the previous
+#one : the timestamps are made non-decreasing). The default transit times are short compared with the takt, the regime
+#the inverse-delay weights of the SPR-PP1 and PP1-PP2 matchers are designed for; longer transit times (several boards
+#on the conveyor) show how their accuracy degrades.
+#
+#A duration is given as (mean, std) in seconds (normal, truncated at 10% of the mean) or as a function
+#fn(rng,no_of_boards) returning the durations in seconds.
+#
+#Defects : with double_load_rate a board gets a second (spurious) loader event between its loader and SPR departures;
+#with drop_rate every station event is lost independently; the PP1/PP2 weightage is 1 - |N(0,weightage_noise)|.
+#
+#The ground truth gives, for every board, the position of its event in every table (-1 : event dropped).
+
+import numpy  as np
+import pandas as pd
+
+#Start of the synthetic event streams
+SYNTHETIC_STR_TMSTMP = '2019-05-01 08:00:00'
+
+
+def get_durations(rng,duration,no_of_boards):
+    """
+    Purpose : Draw durations in seconds
+    Inputs  : rng          - numpy Generator
+              duration     - (mean, std) in seconds, or fn(rng,no_of_boards)
+              no_of_boards - Number of durations
+    Output  : durations    - float64 array of durations [s]
+    """
+
+    if callable(duration):
+        return np.asarray(duration(rng,no_of_boards),dtype=np.float64)
+    #end-if
+
+    mean,std = duration
+
+    return np.maximum(rng.normal(mean,std,no_of_boards),0.1 * mean)
+#end-proc
+
+
+def get_seconds_ns(seconds):
+    """
+    Purpose : Convert seconds (float64 array) to int64 nanoseconds
+    """
+    return np.round(np.asarray(seconds) * 1e9).astype(np.int64)
+#end-proc
+
+
+def get_kept_events(rng,no_of_boards,drop_rate):
+    """
+    Purpose : Mask of the events kept (not dropped) and the position of every board in the resulting table
+    Output  : keep_mask - bool array, True if the event of the board is kept
+              board_pos - int64 array, position of the event in the table (-1 : dropped)
+    """
+
+    keep_mask = (rng.random(no_of_boards) >= drop_rate)
+    board_pos = np.where(keep_mask,np.cumsum(keep_mask) - 1,-1).astype(np.int64)
+
+    return keep_mask,board_pos
+#end-proc
+
+
+def get_station_df(arvl_ns,dptr_ns,weightage=None):
+    """
+    Purpose : PCB level dataframe of a station from nanosecond timestamps
+    """
+
+    station_df = pd.DataFrame({
+        'arvl_tmstmp' : pd.to_datetime(arvl_ns),
+        'dptr_tmstmp' : pd.to_datetime(dptr_ns),
+        })
+    if (weightage is not None):
+        station_df['weightage'] = np.asarray(weightage,dtype=np.float64)
+    #end-if
+
+    return station_df
+#end-proc
+
+
+def gen_synthetic_line(no_of_boards,seed=0,takt=(20.0,4.0),ldrspr_delay=(8.0,1.0),ldr_cycle=(2.0,0.5),spr_cycle=(10.0,1.0),
+                       sprpp1_transit=(6.0,1.0),pp1_cycle=(15.0,2.0),pp1pp2_transit=(6.0,1.0),pp2_cycle=(15.0,2.0),
+                       double_load_rate=0.02,drop_rate=0.01,weightage_noise=0.05,str_tmstmp=SYNTHETIC_STR_TMSTMP):
+    """
+    Purpose : Generate the LDR, SPR, PP1 and PP2 event tables of a synthetic line and the ground truth
+    Inputs  : no_of_boards     - Number of boards
+              seed             - Random seed
+              takt             - SPR departure to next SPR departure
+              ldrspr_delay     - LDR departure to SPR departure
+              ldr_cycle        - LDR arrival to LDR departure
+              spr_cycle        - SPR arrival to SPR departure
+              sprpp1_transit   - SPR departure to PP1 arrival
+              pp1_cycle        - PP1 arrival to PP1 departure
+              pp1pp2_transit   - PP1 departure to PP2 arrival
+              pp2_cycle        - PP2 arrival to PP2 departure
+              double_load_rate - Fraction of the boards with a spurious second loader event
+              drop_rate        - Probability that a station event is lost
+              weightage_noise  - Std of the weightage noise (PP1, PP2)
+              str_tmstmp       - Start of the event streams
+    Output  : pcb_level_dfldr, pcb_level_dfspr, pcb_level_dfpp1, pcb_level_dfpp2 - Event tables (sorted by departure)
+              truth_df         - One row per board : ldr_indx, spr_indx, pp1_indx, pp2_indx (positions, -1 : dropped)
+    """
+
+    rng    = np.random.default_rng(seed)
+    str_ns = pd.Timestamp(str_tmstmp).value
+
+    #Screen printer
+    spr_dptr = str_ns + np.cumsum(get_seconds_ns(get_durations(rng,takt,no_of_boards)))
+    spr_arvl = spr_dptr - get_seconds_ns(get_durations(rng,spr_cycle,no_of_boards))
+
+    #Loader (true event, then the spurious second event of the double loads)
+    ldr_dptr = spr_dptr - get_seconds_ns(get_durations(rng,ldrspr_delay,no_of_boards))
+    ldr_arvl = ldr_dptr - get_seconds_ns(get_durations(rng,ldr_cycle,no_of_boards))
+
+    double_mask = (rng.random(no_of_boards) < double_load_rate)
+    dbl_dptr    = ldr_dptr + ((spr_dptr - ldr_dptr) * rng.uniform(0.05,0.95,no_of_boards)).astype(np.int64)
+
+    #PP1 and PP2 (in order : non-decreasing timestamps)
+    pp1_arvl = np.maximum.accumulate(spr_dptr + get_seconds_ns(get_durations(rng,sprpp1_transit,no_of_boards)))
+    pp1_dptr = np.maximum.accumulate(pp1_arvl + get_seconds_ns(get_durations(rng,pp1_cycle,no_of_boards)))
+    pp2_arvl = np.maximum.accumulate(pp1_dptr + get_seconds_ns(get_durations(rng,pp1pp2_transit,no_of_boards)))
+    pp2_dptr = np.maximum.accumulate(pp2_arvl + get_seconds_ns(get_durations(rng,pp2_cycle,no_of_boards)))
+
+    pp1_wght = 1.0 - np.minimum(np.abs(rng.normal(0.0,weightage_noise,no_of_boards)),1.0)
+    pp2_wght = 1.0 - np.minimum(np.abs(rng.normal(0.0,weightage_noise,no_of_boards)),1.0)
+
+    #Dropped events
+    ldr_keep,ldr_indx = get_kept_events(rng,no_of_boards,drop_rate)
+    spr_keep,spr_indx = get_kept_events(rng,no_of_boards,drop_rate)
+    pp1_keep,pp1_indx = get_kept_events(rng,no_of_boards,drop_rate)
+    pp2_keep,pp2_indx = get_kept_events(rng,no_of_boards,drop_rate)
+
+    #Loader table : true and spurious events sorted by departure (stable : the true event comes first on ties)
+    dbl_mask      = double_mask & ldr_keep
+    all_ldr_dptr  = np.concatenate([ldr_dptr[ldr_keep],dbl_dptr[dbl_mask]])
+    all_ldr_arvl  = np.concatenate([ldr_arvl[ldr_keep],dbl_dptr[dbl_mask] - (ldr_dptr - ldr_arvl)[dbl_mask]])
+    ldr_order     = np.argsort(all_ldr_dptr,kind='stable')
+    ldr_rank      = np.empty(len(ldr_order),dtype=np.int64)
+    ldr_rank[ldr_order] = np.arange(len(ldr_order))
+    ldr_indx[ldr_keep]  = ldr_rank[:int(ldr_keep.sum())]
+
+    pcb_level_dfldr = get_station_df(all_ldr_arvl[ldr_order],all_ldr_dptr[ldr_order])
+    pcb_level_dfspr = get_station_df(spr_arvl[spr_keep],spr_dptr[spr_keep])
+    pcb_level_dfpp1 = get_station_df(pp1_arvl[pp1_keep],pp1_dptr[pp1_keep],pp1_wght[pp1_keep])
+    pcb_level_dfpp2 = get_station_df(pp2_arvl[pp2_keep],pp2_dptr[pp2_keep],pp2_wght[pp2_keep])
+
+    truth_df = pd.DataFrame({
+        'ldr_indx' : ldr_indx,
+        'spr_indx' : spr_indx,
+        'pp1_indx' : pp1_indx,
+        'pp2_indx' : pp2_indx,
+        },columns=['ldr_indx','spr_indx','pp1_indx','pp2_indx'])
+
+    return pcb_level_dfldr,pcb_level_dfspr,pcb_level_dfpp1,pcb_level_dfpp2,truth_df
+#end-proc
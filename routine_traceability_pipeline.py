@@ -0,0 +1,205 @@
+#******************************************************************************************************************************************
+# TITLE     : ROUTINE_TRACEABILITY_PIPELINE
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : LDR -> SPR -> PP1 -> PP2 pipeline with per-board trace table
+# 2026-10-18        | CONTRIBUTORS        | Optional compact trace result (compact=True)
+# 2026-10-18        | CONTRIBUTORS        | Station tables converted once per run (routine_station_index.StationEventIndex)
+# 2026-10-18        | CONTRIBUTORS        | Pluggable weighting functions (sprpp1_weighting, pp1pp2_weighting)
+#******************************************************************************************************************************************
+
+#End-to-end LDR -> SPR -> PP1 -> PP2 PCB Data Association
+#
+#The three associations run in sequence on index arrays (get_ldrspr_match_indx, get_sprpp1_match_indx,
+#get_pp1pp2_match_indx); no matched dataframe is built between the stages. The stages are chained with integer joins
+#on spr_indx and pp1_indx and the timestamps are gathered once into the trace table.
+#
+#Every station table is converted once per run to a routine_station_index.StationEventIndex, shared by the associations
+#of the station (SPR : LDR-SPR and SPR-PP1, PP1 : SPR-PP1 and PP1-PP2). The tables may also be given as indexes.
+#
+#The trace table has one row per SPR event (the LDR-SPR rows, ordered by SPR departure), extended with the matched
+#PP1 and PP2 events. A board without a match downstream keeps -1 in the index columns and NaT/NaN in the others; an
+#SPR (PP1) event matched by several PP1 (PP2) events, possible in the reverse direction, gets one row per match.
+
+import time
+
+import numpy  as np
+
+import routine_match_kernel
+import routine_match_result
+import routine_station_index
+import routine_weighting_functions
+import routine_ldrspr_matching_algo
+import routine_sprpp1_matching_algo
+import routine_pp1pp2_matching_algo
+
+def get_left_join(left_key,right_key):
+    """
+    Purpose : Left outer join of two integer key arrays (one output row per left row and matching right row)
+    Inputs  : left_key   - int64 keys of the left rows (negative : no key)
+              right_key  - int64 keys of the right rows (non-negative)
+    Output  : left_rows  - Position of the left row of every output row (ascending)
+              right_rows - Position of the right row of every output row (-1 : no matching right row)
+    """
+
+    right_order = np.argsort(right_key,kind='stable')
+    right_srt   = right_key[right_order]
+
+    lo = np.searchsorted(right_srt,left_key,side='left')
+    hi = np.searchsorted(right_srt,left_key,side='right')
+    no_of_matches = hi - lo
+
+    no_of_rows = np.maximum(no_of_matches,1)
+    left_rows  = np.repeat(np.arange(len(left_key)),no_of_rows)
+    grp_offset = np.arange(len(left_rows)) - (np.cumsum(no_of_rows) - no_of_rows)[left_rows]
+
+    right_rows = np.full(len(left_rows),-1,dtype=np.int64)
+    has_match  = (no_of_matches[left_rows] > 0)
+    right_rows[has_match] = right_order[lo[left_rows[has_match]] + grp_offset[has_match]]
+
+    return left_rows,right_rows
+#end-proc
+
+
+def get_indx_values(values,rows,fill_value):
+    """
+    Purpose : Take values at positions rows, fill_value where the position is negative
+    """
+    return np.where(rows >= 0,values[np.maximum(rows,0)] if (len(values) > 0) else fill_value,fill_value)
+#end-proc
+
+
+class TraceabilityPipeline(object):
+    """
+    Purpose : Run the LDR-SPR, SPR-PP1 and PP1-PP2 associations in sequence and build the per-board trace table
+    """
+
+    def __init__(self,sprpp1_direction='fwd',pp1pp2_direction='fwd',sprpp1_min_transit_seconds=None,
+                 sprpp1_max_transit_seconds=None,pp1pp2_min_transit_seconds=None,pp1pp2_max_transit_seconds=None,
+                 assignment='greedy',hist_mode=None,compact=False,sprpp1_weighting=None,pp1pp2_weighting=None):
+        """
+        Purpose : Initialize the pipeline
+        Inputs  : sprpp1_direction           - 'fwd' or 'rev' SPR-PP1 matching
+                  pp1pp2_direction           - 'fwd' or 'rev' PP1-PP2 matching
+                  sprpp1_min_transit_seconds - (Optional) Minimum SPR departure to PP1 arrival time
+                  sprpp1_max_transit_seconds - (Optional) Maximum SPR departure to PP1 arrival time
+                  pp1pp2_min_transit_seconds - (Optional) Minimum PP1 departure to PP2 arrival time
+                  pp1pp2_max_transit_seconds - (Optional) Maximum PP1 departure to PP2 arrival time
+                  assignment                 - (Optional) 'greedy' or 'optimal' (SPR-PP1 and PP1-PP2)
+                  hist_mode                  - (Optional) Modal LDR-SPR delay; estimated from the data if not given
+                  compact                    - (Optional) run returns a routine_match_result.CompactMatchResult
+                  sprpp1_weighting           - (Optional) SPR-PP1 weighting function : name, (name, params) or
+                                               WeightFunction (routine_weighting_functions.get_weighting)
+                  pp1pp2_weighting           - (Optional) PP1-PP2 weighting function (same forms)
+        """
+
+        routine_match_kernel.check_assignment(assignment)
+        for direction in (sprpp1_direction,pp1pp2_direction):
+            if (direction not in ('fwd','rev')):
+                raise ValueError("direction must be 'fwd' or 'rev', got %r" % (direction,))
+            #end-if
+        #end-for
+        routine_weighting_functions.get_weighting('sprpp1',sprpp1_weighting)
+        routine_weighting_functions.get_weighting('pp1pp2',pp1pp2_weighting)
+
+        self.sprpp1_direction           = sprpp1_direction
+        self.pp1pp2_direction           = pp1pp2_direction
+        self.sprpp1_min_transit_seconds = sprpp1_min_transit_seconds
+        self.sprpp1_max_transit_seconds = sprpp1_max_transit_seconds
+        self.pp1pp2_min_transit_seconds = pp1pp2_min_transit_seconds
+        self.pp1pp2_max_transit_seconds = pp1pp2_max_transit_seconds
+        self.assignment                 = assignment
+        self.hist_mode                  = hist_mode
+        self.compact                    = compact
+        self.sprpp1_weighting           = sprpp1_weighting
+        self.pp1pp2_weighting           = pp1pp2_weighting
+
+        self.ldrspr_indx   = None       #ldr_pos, spr_indx, spr_special_entry, ldr_multiple_events
+        self.sprpp1_indx   = None       #spr_indx, pp1_indx, edge_weight
+        self.pp1pp2_indx   = None       #pp1_indx, pp2_indx, edge_weight
+        self.stage_timings = {}         #'index', 'ldrspr', 'sprpp1', 'pp1pp2', 'trace' -> wall time in seconds
+    #end-proc
+
+    def run(self,pcb_level_dfldr,pcb_level_dfspr,pcb_level_dfpp1,pcb_level_dfpp2):
+        """
+        Purpose : Run the three associations and build the trace table
+        Inputs  : pcb_level_dfldr - The PCB level dataframe corresponding to loader
+                  pcb_level_dfspr - The PCB level dataframe corresponding to screen printer
+                  pcb_level_dfpp1 - The PCB level dataframe corresponding to PP1
+                  pcb_level_dfpp2 - The PCB level dataframe corresponding to PP2
+                  (each table may be given as its routine_station_index.StationEventIndex)
+        Output  : trace_df        - One row per board (routine_match_result.TRACE_COLUMNS; CompactMatchResult if compact)
+        """
+
+        self.stage_timings = {}
+
+        #Convert every station once (SPR and PP1 are shared by two associations)
+        str_time = time.perf_counter()
+        ldr_index = routine_station_index.get_station_index(pcb_level_dfldr,'ldr')
+        spr_index = routine_station_index.get_station_index(pcb_level_dfspr,'spr')
+        pp1_index = routine_station_index.get_station_index(pcb_level_dfpp1,'pp1')
+        pp2_index = routine_station_index.get_station_index(pcb_level_dfpp2,'pp2')
+        self.stage_timings['index'] = time.perf_counter() - str_time
+
+        str_time = time.perf_counter()
+        self.ldrspr_indx = routine_ldrspr_matching_algo.get_ldrspr_match_indx(ldr_index,spr_index,self.hist_mode)
+        self.stage_timings['ldrspr'] = time.perf_counter() - str_time
+
+        str_time = time.perf_counter()
+        self.sprpp1_indx = routine_sprpp1_matching_algo.get_sprpp1_match_indx(spr_index,pp1_index,self.sprpp1_direction,
+                                                                              self.sprpp1_min_transit_seconds,
+                                                                              self.sprpp1_max_transit_seconds,self.assignment,
+                                                                              weighting=self.sprpp1_weighting)
+        self.stage_timings['sprpp1'] = time.perf_counter() - str_time
+
+        str_time = time.perf_counter()
+        self.pp1pp2_indx = routine_pp1pp2_matching_algo.get_pp1pp2_match_indx(pp1_index,pp2_index,self.pp1pp2_direction,
+                                                                              self.pp1pp2_min_transit_seconds,
+                                                                              self.pp1pp2_max_transit_seconds,self.assignment,
+                                                                              weighting=self.pp1pp2_weighting)
+        self.stage_timings['pp1pp2'] = time.perf_counter() - str_time
+
+        str_time = time.perf_counter()
+        trace_df = self.get_trace_df(ldr_index.pcb_level_df,spr_index.pcb_level_df,pp1_index.pcb_level_df,pp2_index.pcb_level_df)
+        self.stage_timings['trace'] = time.perf_counter() - str_time
+
+        return trace_df
+    #end-proc
+
+    def get_trace_df(self,pcb_level_dfldr,pcb_level_dfspr,pcb_level_dfpp1,pcb_level_dfpp2):
+        """
+        Purpose : Chain the stage index arrays (joins on spr_indx and pp1_indx) and materialize the trace table
+        """
+
+        ldr_pos,spr_indx,spr_special_entry,ldr_multiple_events = self.ldrspr_indx
+        sp_spr_indx,sp_pp1_indx,sp_edge_weight = self.sprpp1_indx
+        pp_pp1_indx,pp_pp2_indx,pp_edge_weight = self.pp1pp2_indx
+
+        #LDR-SPR rows -> SPR-PP1 pairs
+        ls_rows,sp_rows = get_left_join(np.asarray(spr_indx,dtype=np.int64),np.asarray(sp_spr_indx,dtype=np.int64))
+        pp1_indx        = get_indx_values(sp_pp1_indx,sp_rows,-1)
+
+        #-> PP1-PP2 pairs
+        lp_rows,pp_rows = get_left_join(pp1_indx,np.asarray(pp_pp1_indx,dtype=np.int64))
+        ls_rows         = ls_rows[lp_rows]
+        sp_rows         = sp_rows[lp_rows]
+
+        get_trace_result = routine_match_result.get_trace_compact_result if (self.compact) else routine_match_result.get_trace_df
+
+        return get_trace_result(pcb_level_dfldr,pcb_level_dfspr,pcb_level_dfpp1,pcb_level_dfpp2,
+                                ldr_pos[ls_rows],spr_indx[ls_rows],pp1_indx[lp_rows],
+                                get_indx_values(pp_pp2_indx,pp_rows,-1),
+                                get_indx_values(sp_edge_weight,sp_rows,np.nan),
+                                get_indx_values(pp_edge_weight,pp_rows,np.nan),
+                                spr_special_entry[ls_rows],ldr_multiple_events[ls_rows])
+    #end-proc
+#end-class
@@ -0,0 +1,256 @@
+#******************************************************************************************************************************************
+# TITLE     : ROUTINE_WEIGHT_CACHE
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : fingerprint keyed LRU cache of weight matrices with disk spill
+# 2026-10-18        | CONTRIBUTORS        | scipy.sparse imported on first use
+# 2026-10-18        | CONTRIBUTORS        | Size bound of the spilled files (max_disk_bytes), least recently used deleted first
+#******************************************************************************************************************************************
+
+#Weight matrix cache (opt-in)
+#
+#The SPR-PP1 and PP1-PP2 weight matrices depend only on the timestamp/weightage arrays, the transit-time window and
+#the weighting function; the weightage thresholds (SPRPP1_MATCH_THRESHOLD, PP1PP2_MATCH_THRESHOLD) are applied after
+#the argmax. With a cache enabled, a threshold sweep over the same data builds every weight matrix once.
+#
+#    weight_cache = routine_weight_cache.WeightMatrixCache(max_bytes=4 * 2**30,spill_dir='/scratch/wmtrx')
+#    routine_weight_cache.set_weight_cache(weight_cache)
+#    ...
+#    routine_weight_cache.set_weight_cache(None)
+#
+#The matrices are kept in memory up to max_bytes (least recently used evicted first). With spill_dir, the evicted
+#matrices are written to disk (dense : .npy, read back memory-mapped; sparse : .npz) instead of being dropped; the
+#spilled files are kept up to max_disk_bytes (least recently used deleted first; None : unbounded, clear() deletes
+#them). A spilled matrix is served from its file and is not moved back to memory.
+#Cached matrices are shared between calls and must not be modified.
+
+import collections
+import hashlib
+import os
+
+import numpy  as np
+
+import routine_weight_kernel
+
+#Active cache (None : caching disabled)
+WEIGHT_CACHE = None
+
+
+def set_weight_cache(weight_cache):
+    """
+    Purpose : Enable (WeightMatrixCache) or disable (None) the weight matrix cache
+    Inputs  : weight_cache - WeightMatrixCache or None
+    Output  : prev_cache   - The previously active cache
+    """
+
+    global WEIGHT_CACHE
+
+    prev_cache   = WEIGHT_CACHE
+    WEIGHT_CACHE = weight_cache
+
+    return prev_cache
+#end-proc
+
+
+def get_weight_cache():
+    """
+    Purpose : The active weight matrix cache (None : caching disabled)
+    """
+    return WEIGHT_CACHE
+#end-proc
+
+
+def get_fingerprint(*key_parts):
+    """
+    Purpose : Hash of the inputs of a weight matrix
+    Inputs  : key_parts   - Arrays (hashed with dtype and shape) and scalars/strings (hashed with repr)
+    Output  : fingerprint - Hex digest
+    """
+
+    key_hash = hashlib.blake2b(digest_size=20)
+    for part in key_parts:
+        if isinstance(part,np.ndarray):
+            part = np.ascontiguousarray(part)
+            key_hash.update(repr((part.dtype.str,part.shape)).encode())
+            key_hash.update(part.view(np.uint8).reshape(-1))
+        else:
+            key_hash.update(repr(part).encode())
+        #end-if
+        key_hash.update(b'|')
+    #end-for
+
+    return key_hash.hexdigest()
+#end-proc
+
+
+def get_mtrx_nbytes(weight_mtrx):
+    """
+    Purpose : Memory footprint of a dense or sparse (CSR) weight matrix
+    """
+
+    if routine_weight_kernel.is_sparse_mtrx(weight_mtrx):
+        return weight_mtrx.data.nbytes + weight_mtrx.indices.nbytes + weight_mtrx.indptr.nbytes
+    #end-if
+
+    return weight_mtrx.nbytes
+#end-proc
+
+
+def get_cached_weight_mtrx(key_parts,build_fn):
+    """
+    Purpose : Weight matrix from the active cache, built (and cached) on a miss
+    Inputs  : key_parts   - Inputs of the weight matrix (see get_fingerprint), including the weighting function name
+              build_fn    - build_fn() : builds the weight matrix
+    Output  : weight_mtrx - The weight matrix
+    """
+
+    weight_cache = get_weight_cache()
+    if (weight_cache is None):
+        return build_fn()
+    #end-if
+
+    return weight_cache.get_or_build(get_fingerprint(*key_parts),build_fn)
+#end-proc
+
+
+class WeightMatrixCache(object):
+    """
+    Purpose : Size bounded LRU cache of weight matrices with optional spill to disk
+    """
+
+    def __init__(self,max_bytes=2**30,spill_dir=None,max_disk_bytes=None):
+        """
+        Purpose : Initialize an empty cache
+        Inputs  : max_bytes      - Maximum memory held by the cached matrices
+                  spill_dir      - (Optional) Directory of the evicted matrices (.npy / .npz); None : evicted matrices are dropped
+                  max_disk_bytes - (Optional) Maximum size of the spilled files; None : unbounded
+        """
+
+        self.max_bytes      = max_bytes
+        self.spill_dir      = spill_dir
+        self.max_disk_bytes = max_disk_bytes
+
+        self.mem_entries  = collections.OrderedDict()      #key -> weight matrix, least recently used first
+        self.mem_bytes    = 0
+        self.disk_entries = collections.OrderedDict()      #key -> (file path, file size), least recently used first
+        self.disk_bytes   = 0
+        self.no_of_hits   = 0
+        self.no_of_misses = 0
+
+        if (spill_dir is not None):
+            os.makedirs(spill_dir,exist_ok=True)
+        #end-if
+    #end-proc
+
+    def get(self,key):
+        """
+        Purpose : Cached weight matrix of a key, None on a miss
+        """
+
+        if (key in self.mem_entries):
+            self.mem_entries.move_to_end(key)
+            self.no_of_hits = self.no_of_hits + 1
+            return self.mem_entries[key]
+        #end-if
+
+        if (key in self.disk_entries):
+            self.disk_entries.move_to_end(key)
+            self.no_of_hits = self.no_of_hits + 1
+            path = self.disk_entries[key][0]
+            if path.endswith('.npz'):
+                from scipy import sparse
+                return sparse.load_npz(path)
+            #end-if
+            return np.load(path,mmap_mode='r')
+        #end-if
+
+        self.no_of_misses = self.no_of_misses + 1
+        return None
+    #end-proc
+
+    def put(self,key,weight_mtrx):
+        """
+        Purpose : Add a weight matrix, evicting (or spilling) the least recently used matrices beyond max_bytes
+        """
+
+        if (key in self.mem_entries) or (key in self.disk_entries):
+            return
+        #end-if
+
+        self.mem_entries[key] = weight_mtrx
+        self.mem_bytes = self.mem_bytes + get_mtrx_nbytes(weight_mtrx)
+
+        while (self.mem_bytes > self.max_bytes) and (len(self.mem_entries) > 0):
+            old_key,old_mtrx = self.mem_entries.popitem(last=False)
+            self.mem_bytes = self.mem_bytes - get_mtrx_nbytes(old_mtrx)
+            if (self.spill_dir is not None):
+                self.spill(old_key,old_mtrx)
+            #end-if
+        #end-while
+    #end-proc
+
+    def spill(self,key,weight_mtrx):
+        """
+        Purpose : Write an evicted weight matrix to the spill directory, deleting the least recently used files beyond
+                  max_disk_bytes
+        """
+
+        if routine_weight_kernel.is_sparse_mtrx(weight_mtrx):
+            from scipy import sparse
+            path = os.path.join(self.spill_dir,key + '.npz')
+            sparse.save_npz(path,sparse.csr_matrix(weight_mtrx),compressed=False)
+        else:
+            path = os.path.join(self.spill_dir,key + '.npy')
+            np.save(path,np.asarray(weight_mtrx))
+        #end-if
+        self.disk_entries[key] = (path,os.path.getsize(path))
+        self.disk_bytes = self.disk_bytes + self.disk_entries[key][1]
+
+        while (self.max_disk_bytes is not None) and (self.disk_bytes > self.max_disk_bytes) and (len(self.disk_entries) > 0):
+            old_path,old_size = self.disk_entries.popitem(last=False)[1]
+            self.disk_bytes = self.disk_bytes - old_size
+            if os.path.exists(old_path):
+                os.remove(old_path)
+            #end-if
+        #end-while
+    #end-proc
+
+    def get_or_build(self,key,build_fn):
+        """
+        Purpose : Cached weight matrix of a key, built with build_fn() and cached on a miss
+        """
+
+        weight_mtrx = self.get(key)
+        if (weight_mtrx is None):
+            weight_mtrx = build_fn()
+            self.put(key,weight_mtrx)
+        #end-if
+
+        return weight_mtrx
+    #end-proc
+
+    def clear(self):
+        """
+        Purpose : Drop all cached matrices and delete the spilled files
+        """
+
+        for path,size in self.disk_entries.values():
+            if os.path.exists(path):
+                os.remove(path)
+            #end-if
+        #end-for
+        self.mem_entries.clear()
+        self.disk_entries.clear()
+        self.mem_bytes  = 0
+        self.disk_bytes = 0
+    #end-proc
+#end-class
@@ -0,0 +1,396 @@
+#******************************************************************************************************************************************
+# TITLE     : ROUTINE_WEIGHT_KERNEL
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : vectorized SPR-PP1 and PP1-PP2 weight matrices
+# 2026-10-18        | CONTRIBUTORS        | Sparse banded weight matrices restricted to a transit-time window
+# 2026-10-18        | CONTRIBUTORS        | Dense weight matrices optionally backed by np.memmap and/or stored as float32
+# 2026-10-18        | CONTRIBUTORS        | scipy.sparse imported on first use (is_sparse_mtrx)
+# 2026-10-18        | CONTRIBUTORS        | Pluggable weighting functions (routine_weighting_functions), block-wise banded weights
+# 2026-10-18        | CONTRIBUTORS        | Station tables or StationEventIndex (routine_station_index) accepted; get_tmstmp_ns moved there
+#******************************************************************************************************************************************
+
+#Shared weight kernel for the SPR-PP1 and PP1-PP2 PCB Data Association
+#
+#The timestamps are converted once to int64 nanoseconds and all inverse-delay products are evaluated with NumPy broadcasting.
+#The arithmetic reproduces the per-cell loop exactly :
+#  - pd.Timedelta.total_seconds() truncates to microseconds, so delays are floored to microseconds before conversion to seconds
+#  - negative inverse delays are clamped to 0.0
+#  - the products are evaluated in the same order as the loop (w_one * ((parm1 * parm2) * parm3) * w_two)
+#Zero delays, on which the loop raised ZeroDivisionError, are given an inverse delay of 0.0 (no causal transit).
+#NaT timestamps propagate as NaN weights, as they did in the loop.
+#
+#With a transit-time window (min_transit_seconds/max_transit_seconds) only the band of candidate cells is evaluated and
+#stored as a scipy.sparse CSR matrix; memory and time then scale with the number of boards instead of N x M.
+#
+#When the full dense matrix is needed (audits), it can be backed by a np.memmap file (mmap_path) and/or stored as float32
+#(weight_dtype); it is filled block by block, so the resident memory is bounded by one row block. The weights are always
+#evaluated in float64; float32 storage rounds them (the argmax may then differ on near ties).
+#
+#scipy.sparse is imported only when a banded matrix is built (is_sparse_mtrx does not import it).
+#
+#The edge weights are evaluated by a weighting function of routine_weighting_functions (weighting= : default
+#'inverse_delay', the original weights) on the delay arrays of one block of cells at a time (BLK_CELLS cells, dense rows or
+#banded cells), so a weighting with several temporaries keeps a bounded memory footprint.
+#
+#The builders accept the station tables or their routine_station_index.StationEventIndex; with an index the timestamps
+#are not converted again and the banded builders reuse its sorted arrival timestamps.
+
+import sys
+
+import numpy  as np
+
+import routine_station_index
+import routine_weighting_functions
+
+#Sentinel used by NumPy/pandas for NaT in the int64 view of datetime64[ns]
+NAT_NS = routine_station_index.NAT_NS
+
+#Number of weight matrix cells evaluated per row block (bounds the size of the temporaries)
+BLK_CELLS = 2 ** 22
+
+
+def get_tmstmp_ns(tmstmp_srs):
+    """
+    Purpose : Convert a timestamp column to int64 nanoseconds since epoch
+    Inputs  : tmstmp_srs - Series/array of timestamps (datetime64, Timestamp objects or parseable strings)
+    Output  : tmstmp_ns  - int64 numpy array, NaT mapped to NAT_NS
+    """
+
+    return routine_station_index.get_tmstmp_ns(tmstmp_srs)
+#end-proc
+
+
+def get_delay_seconds(tmstmp_to_ns,tmstmp_from_ns):
+    """
+    Purpose : Compute (tmstmp_to - tmstmp_from) in seconds with pd.Timedelta.total_seconds() semantics
+    Inputs  : tmstmp_to_ns   - int64 nanosecond array (broadcastable)
+              tmstmp_from_ns - int64 nanosecond array (broadcastable)
+    Output  : delay_secs     - float64 array of delays in seconds, NaN where either timestamp is NaT
+    """
+
+    delay_ns   = np.subtract(tmstmp_to_ns,tmstmp_from_ns)
+    delay_us   = np.floor_divide(delay_ns,1000)
+    delay_secs = np.floor_divide(delay_us,1000000).astype(np.float64) + np.remainder(delay_us,1000000) / 1e6
+
+    nat_mask = (tmstmp_to_ns == NAT_NS) | (tmstmp_from_ns == NAT_NS)
+    if np.any(nat_mask):
+        delay_secs = np.where(nat_mask,np.nan,delay_secs)
+    #end-if
+
+    return delay_secs
+#end-proc
+
+
+def get_inverse_delay(tmstmp_to_ns,tmstmp_from_ns):
+    """
+    Purpose : Compute the clamped inverse delay 1/(tmstmp_to - tmstmp_from) used as a weighting parameter
+    Inputs  : tmstmp_to_ns   - int64 nanosecond array (broadcastable)
+              tmstmp_from_ns - int64 nanosecond array (broadcastable)
+    Output  : parm           - float64 array, 0.0 for negative or zero delays, NaN for NaT
+    """
+
+    return routine_weighting_functions.get_inverse_seconds(get_delay_seconds(tmstmp_to_ns,tmstmp_from_ns))
+#end-proc
+
+
+def get_sprpp1_weights(dptr_spr,arvl_pp1,wght_pp1,weighting=None):
+    """
+    Purpose : Evaluate SPR-PP1 edge weights (default : 1/delta_t x weightage) element-wise (broadcastable inputs)
+    Inputs  : dptr_spr  - int64 ns departure timestamps of the screen printer
+              arvl_pp1  - int64 ns arrival timestamps of PP1
+              wght_pp1  - float64 weightage of PP1
+              weighting - (Optional) Weighting function (routine_weighting_functions.get_weighting)
+    Output  : weights   - float64 array of edge weights
+    """
+
+    weight_function = routine_weighting_functions.get_weighting('sprpp1',weighting)
+
+    return weight_function.evaluate({
+        'dt_transit' : get_delay_seconds(arvl_pp1,dptr_spr),
+        'wght_pp1'   : wght_pp1,
+        })
+#end-proc
+
+
+def get_pp1pp2_weights(arvl_one,dptr_one,wght_one,arvl_two,dptr_two,wght_two,weighting=None):
+    """
+    Purpose : Evaluate PP1-PP2 edge weights (default : weightage x prod(1/delta_t) x weightage) element-wise (broadcastable inputs)
+    Inputs  : arvl_one, dptr_one, wght_one - int64 ns arrival/departure and weightage of the first machine (PP1)
+              arvl_two, dptr_two, wght_two - int64 ns arrival/departure and weightage of the second machine (PP2)
+              weighting                    - (Optional) Weighting function (routine_weighting_functions.get_weighting)
+    Output  : weights                      - float64 array of edge weights
+    """
+
+    weight_function = routine_weighting_functions.get_weighting('pp1pp2',weighting)
+
+    return weight_function.evaluate({
+        'dt_arvl'    : get_delay_seconds(arvl_two,arvl_one),
+        'dt_dptr'    : get_delay_seconds(dptr_two,dptr_one),
+        'dt_transit' : get_delay_seconds(arvl_two,dptr_one),
+        'wght_one'   : wght_one,
+        'wght_two'   : wght_two,
+        })
+#end-proc
+
+
+def is_sparse_mtrx(weight_mtrx):
+    """
+    Purpose : True if weight_mtrx is a scipy.sparse matrix (without importing scipy.sparse : if it is not loaded, no
+              sparse matrix can exist)
+    """
+
+    scipy_sparse = sys.modules.get('scipy.sparse')
+
+    return (scipy_sparse is not None) and scipy_sparse.issparse(weight_mtrx)
+#end-proc
+
+
+def get_blk_size(no_of_cols,blk_cells=BLK_CELLS):
+    """
+    Purpose : Number of rows per block such that a block holds about blk_cells weight matrix cells
+    Inputs  : no_of_cols - Number of columns of the weight matrix
+              blk_cells  - Target number of cells per block
+    Output  : blk_size   - Number of rows per block (at least 1)
+    """
+
+    return max(1,blk_cells // max(1,no_of_cols))
+#end-proc
+
+
+def get_empty_weight_mtrx(no_of_rows,no_of_cols,weight_dtype=np.float64,mmap_path=None):
+    """
+    Purpose : Allocate a zero dense weight matrix, in memory or backed by a np.memmap file
+    Inputs  : no_of_rows   - Number of rows
+              no_of_cols   - Number of columns
+              weight_dtype - Storage dtype (np.float64 or np.float32)
+              mmap_path    - (Optional) Path of the file backing the matrix (created or overwritten)
+    Output  : weight_mtrx  - numpy array or np.memmap of shape (no_of_rows, no_of_cols)
+    """
+
+    weight_dtype = np.dtype(weight_dtype)
+    if (weight_dtype not in (np.dtype(np.float64),np.dtype(np.float32))):
+        raise ValueError('weight_dtype must be float64 or float32, got %s' % (weight_dtype,))
+    #end-if
+
+    #np.memmap cannot map an empty file
+    if (mmap_path is None) or (no_of_rows == 0) or (no_of_cols == 0):
+        return np.zeros([no_of_rows,no_of_cols],dtype=weight_dtype)
+    #end-if
+
+    return np.memmap(mmap_path,dtype=weight_dtype,mode='w+',shape=(no_of_rows,no_of_cols))
+#end-proc
+
+
+def get_sprpp1_weight_mtrx(pcb_level_dfspr,pcb_level_dfpp1,weight_dtype=np.float64,mmap_path=None,weighting=None):
+    """
+    Purpose : Generate the dense SPR-PP1 weight matrix
+    Inputs  : pcb_level_dfspr - The PCB level dataframe corresponding to screen printer
+              pcb_level_dfpp1 - The PCB level dataframe corresponding to PP1
+              weight_dtype    - (Optional) Storage dtype (np.float64 or np.float32)
+              mmap_path       - (Optional) Path of a np.memmap file backing the matrix
+              weighting       - (Optional) Weighting function (routine_weighting_functions.get_weighting)
+    Output  : weight_mtrx     - Array (or np.memmap) of shape (len(pcb_level_dfspr), len(pcb_level_dfpp1))
+    """
+
+    weight_function = routine_weighting_functions.get_weighting('sprpp1',weighting)
+
+    spr_index = routine_station_index.get_station_index(pcb_level_dfspr,'spr')
+    pp1_index = routine_station_index.get_station_index(pcb_level_dfpp1,'pp1')
+
+    dptr_spr = spr_index.get_column('dptr_tmstmp')
+    arvl_pp1 = pp1_index.get_column('arvl_tmstmp')
+    wght_pp1 = pp1_index.get_column('weightage')
+
+    weight_mtrx = get_empty_weight_mtrx(len(dptr_spr),len(arvl_pp1),weight_dtype,mmap_path)
+
+    blk_size = get_blk_size(len(arvl_pp1))
+    for blk_str in range(0,len(dptr_spr),blk_size):
+        blk_end = min(blk_str + blk_size,len(dptr_spr))
+        weight_mtrx[blk_str:blk_end,:] = get_sprpp1_weights(dptr_spr[blk_str:blk_end,None],arvl_pp1[None,:],wght_pp1[None,:],
+                                                            weight_function)
+    #end-for
+
+    if isinstance(weight_mtrx,np.memmap):
+        weight_mtrx.flush()
+    #end-if
+
+    return weight_mtrx
+#end-proc
+
+
+def get_pp1pp2_weight_mtrx(pcb_level_dfone,pcb_level_dftwo,weight_dtype=np.float64,mmap_path=None,weighting=None):
+    """
+    Purpose : Generate the dense PP1-PP2 weight matrix
+    Inputs  : pcb_level_dfone - The PCB level dataframe corresponding to first machine (PP1)
+              pcb_level_dftwo - The PCB level dataframe corresponding to second machine (PP2)
+              weight_dtype    - (Optional) Storage dtype (np.float64 or np.float32)
+              mmap_path       - (Optional) Path of a np.memmap file backing the matrix
+              weighting       - (Optional) Weighting function (routine_weighting_functions.get_weighting)
+    Output  : weight_mtrx     - Array (or np.memmap) of shape (len(pcb_level_dfone), len(pcb_level_dftwo))
+    """
+
+    weight_function = routine_weighting_functions.get_weighting('pp1pp2',weighting)
+
+    one_index = routine_station_index.get_station_index(pcb_level_dfone,'pp1')
+    two_index = routine_station_index.get_station_index(pcb_level_dftwo,'pp2')
+
+    arvl_one = one_index.get_column('arvl_tmstmp')
+    dptr_one = one_index.get_column('dptr_tmstmp')
+    wght_one = one_index.get_column('weightage')
+    arvl_two = two_index.get_column('arvl_tmstmp')
+    dptr_two = two_index.get_column('dptr_tmstmp')
+    wght_two = two_index.get_column('weightage')
+
+    weight_mtrx = get_empty_weight_mtrx(len(arvl_one),len(arvl_two),weight_dtype,mmap_path)
+
+    blk_size = get_blk_size(len(arvl_two))
+    for blk_str in range(0,len(arvl_one),blk_size):
+        blk_end = min(blk_str + blk_size,len(arvl_one))
+        weight_mtrx[blk_str:blk_end,:] = get_pp1pp2_weights(arvl_one[blk_str:blk_end,None],dptr_one[blk_str:blk_end,None],wght_one[blk_str:blk_end,None],
+                                                            arvl_two[None,:],dptr_two[None,:],wght_two[None,:],weight_function)
+    #end-for
+
+    if isinstance(weight_mtrx,np.memmap):
+        weight_mtrx.flush()
+    #end-if
+
+    return weight_mtrx
+#end-proc
+
+
+def get_band_pairs(tmstmp_from_ns,tmstmp_to_ns,min_transit_seconds=None,max_transit_seconds=None,tmstmp_to_srt=None):
+    """
+    Purpose : Find all (row, col) pairs whose transit time (tmstmp_to[col] - tmstmp_from[row]) lies in the window
+    Inputs  : tmstmp_from_ns      - int64 ns timestamps of the rows (departure from the first station)
+              tmstmp_to_ns        - int64 ns timestamps of the columns (arrival at the second station)
+              min_transit_seconds - Lower bound of the transit time, inclusive (None : 0)
+              max_transit_seconds - Upper bound of the transit time, inclusive (None : unbounded)
+              tmstmp_to_srt       - (Optional) Sorted valid column timestamps and their positions
+                                    (routine_station_index.get_sorted_tmstmp), computed if not given
+    Output  : indptr              - int64 CSR row pointer array of length len(tmstmp_from_ns)+1
+              col_indx            - int64 column indices, ascending within each row
+    """
+
+    min_ns = 0 if (min_transit_seconds is None) else int(round(min_transit_seconds * 1e9))
+
+    #Candidate columns of each row form a contiguous range on the sorted timestamps (NaT columns are no candidates)
+    if (tmstmp_to_srt is None):
+        tmstmp_to_srt = routine_station_index.get_sorted_tmstmp(tmstmp_to_ns)
+    #end-if
+    tmstmp_to_st,col_order = tmstmp_to_srt
+
+    lo = np.searchsorted(tmstmp_to_st,tmstmp_from_ns + min_ns,side='left')
+    if (max_transit_seconds is None):
+        hi = np.full(len(tmstmp_from_ns),len(tmstmp_to_st))
+    else:
+        max_ns = int(round(max_transit_seconds * 1e9))
+        hi = np.searchsorted(tmstmp_to_st,tmstmp_from_ns + max_ns,side='right')
+    #end-if
+    hi = np.maximum(hi,lo)
+    hi[tmstmp_from_ns == NAT_NS] = lo[tmstmp_from_ns == NAT_NS]
+
+    counts = hi - lo
+    indptr = np.zeros(len(tmstmp_from_ns) + 1,dtype=np.int64)
+    np.cumsum(counts,out=indptr[1:])
+
+    row_indx = np.repeat(np.arange(len(tmstmp_from_ns)),counts)
+    col_pos  = np.arange(indptr[-1]) - indptr[row_indx] + lo[row_indx]
+    col_indx = col_order[col_pos]
+
+    #Restore ascending column order within each row when the columns were not already time-sorted
+    if np.any(np.diff(col_order) < 0):
+        srt_indx = np.lexsort((col_indx,row_indx))
+        col_indx = col_indx[srt_indx]
+    #end-if
+
+    return indptr,col_indx
+#end-proc
+
+
+def get_sprpp1_weight_band(pcb_level_dfspr,pcb_level_dfpp1,min_transit_seconds=None,max_transit_seconds=None,weighting=None):
+    """
+    Purpose : Generate the sparse banded SPR-PP1 weight matrix (transit : PP1 arrival - SPR departure)
+    Inputs  : pcb_level_dfspr     - The PCB level dataframe corresponding to screen printer
+              pcb_level_dfpp1     - The PCB level dataframe corresponding to PP1
+              min_transit_seconds - Minimum transit time between SPR departure and PP1 arrival
+              max_transit_seconds - Maximum transit time between SPR departure and PP1 arrival
+              weighting           - (Optional) Weighting function (routine_weighting_functions.get_weighting)
+    Output  : weight_mtrx         - scipy.sparse CSR matrix of shape (len(pcb_level_dfspr), len(pcb_level_dfpp1))
+    """
+
+    weight_function = routine_weighting_functions.get_weighting('sprpp1',weighting)
+
+    spr_index = routine_station_index.get_station_index(pcb_level_dfspr,'spr')
+    pp1_index = routine_station_index.get_station_index(pcb_level_dfpp1,'pp1')
+
+    dptr_spr = spr_index.get_column('dptr_tmstmp')
+    arvl_pp1 = pp1_index.get_column('arvl_tmstmp')
+    wght_pp1 = pp1_index.get_column('weightage')
+
+    indptr,col_indx = get_band_pairs(dptr_spr,arvl_pp1,min_transit_seconds,max_transit_seconds,
+                                     pp1_index.get_sorted_tmstmp('arvl_tmstmp'))
+    row_indx        = np.repeat(np.arange(len(dptr_spr)),np.diff(indptr))
+
+    weights = np.empty(len(col_indx),dtype=np.float64)
+    for blk_str in range(0,len(col_indx),BLK_CELLS):
+        blk_row = row_indx[blk_str:blk_str + BLK_CELLS]
+        blk_col = col_indx[blk_str:blk_str + BLK_CELLS]
+        weights[blk_str:blk_str + BLK_CELLS] = get_sprpp1_weights(dptr_spr[blk_row],arvl_pp1[blk_col],wght_pp1[blk_col],weight_function)
+    #end-for
+
+    from scipy import sparse
+
+    return sparse.csr_matrix((weights,col_indx,indptr),shape=(len(dptr_spr),len(arvl_pp1)))
+#end-proc
+
+
+def get_pp1pp2_weight_band(pcb_level_dfone,pcb_level_dftwo,min_transit_seconds=None,max_transit_seconds=None,weighting=None):
+    """
+    Purpose : Generate the sparse banded PP1-PP2 weight matrix (transit : PP2 arrival - PP1 departure)
+    Inputs  : pcb_level_dfone     - The PCB level dataframe corresponding to first machine (PP1)
+              pcb_level_dftwo     - The PCB level dataframe corresponding to second machine (PP2)
+              min_transit_seconds - Minimum transit time between PP1 departure and PP2 arrival
+              max_transit_seconds - Maximum transit time between PP1 departure and PP2 arrival
+              weighting           - (Optional) Weighting function (routine_weighting_functions.get_weighting)
+    Output  : weight_mtrx         - scipy.sparse CSR matrix of shape (len(pcb_level_dfone), len(pcb_level_dftwo))
+    """
+
+    weight_function = routine_weighting_functions.get_weighting('pp1pp2',weighting)
+
+    one_index = routine_station_index.get_station_index(pcb_level_dfone,'pp1')
+    two_index = routine_station_index.get_station_index(pcb_level_dftwo,'pp2')
+
+    arvl_one = one_index.get_column('arvl_tmstmp')
+    dptr_one = one_index.get_column('dptr_tmstmp')
+    wght_one = one_index.get_column('weightage')
+    arvl_two = two_index.get_column('arvl_tmstmp')
+    dptr_two = two_index.get_column('dptr_tmstmp')
+    wght_two = two_index.get_column('weightage')
+
+    indptr,col_indx = get_band_pairs(dptr_one,arvl_two,min_transit_seconds,max_transit_seconds,
+                                     two_index.get_sorted_tmstmp('arvl_tmstmp'))
+    row_indx        = np.repeat(np.arange(len(dptr_one)),np.diff(indptr))
+
+    weights = np.empty(len(col_indx),dtype=np.float64)
+    for blk_str in range(0,len(col_indx),BLK_CELLS):
+        blk_row = row_indx[blk_str:blk_str + BLK_CELLS]
+        blk_col = col_indx[blk_str:blk_str + BLK_CELLS]
+        weights[blk_str:blk_str + BLK_CELLS] = get_pp1pp2_weights(arvl_one[blk_row],dptr_one[blk_row],wght_one[blk_row],
+                                                                  arvl_two[blk_col],dptr_two[blk_col],wght_two[blk_col],
+                                                                  weight_function)
+    #end-for
+
+    from scipy import sparse
+
+    return sparse.csr_matrix((weights,col_indx,indptr),shape=(len(dptr_one),len(arvl_two)))
+#end-proc
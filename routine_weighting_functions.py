@@ -0,0 +1,433 @@
+#******************************************************************************************************************************************
+# TITLE     : ROUTINE_WEIGHTING_FUNCTIONS
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : registry of SPR-PP1 / PP1-PP2 edge weighting functions
+# 2026-10-18        | CONTRIBUTORS        | Command line weighting arguments (get_weighting_arg)
+# 2026-10-18        | CONTRIBUTORS        | numexpr expression of 'inverse_delay'
+#******************************************************************************************************************************************
+
+#Edge weighting functions of the SPR-PP1 and PP1-PP2 PCB Data Association
+#
+#A weighting function maps the vectorized delay and weightage arrays of a block of candidate cells to their edge weights.
+#routine_weight_kernel builds the arrays (delays in seconds, pd.Timedelta.total_seconds() semantics, NaN for NaT) block by
+#block for the dense and the banded matrices, so a new weighting is one element-wise function :
+#
+#    'sprpp1' : dt_transit (PP1 arrival - SPR departure), wght_pp1
+#    'pp1pp2' : dt_arvl (PP2 arrival - PP1 arrival), dt_dptr (PP2 departure - PP1 departure),
+#               dt_transit (PP2 arrival - PP1 departure), wght_one, wght_two
+#
+#The matchers keep a pair only if its weight is > 0 (see routine_match_kernel), so a weighting returns 0.0 for the
+#cells that are no candidates. Registered weightings :
+#
+#    'inverse_delay'  - The original weights (default) : 1/dt_transit x wght_pp1 and wght_one x prod(1/dt) x wght_two,
+#                       bit-identical to the original per-cell loop
+#    'gaussian_mode'  - Gaussian of the transit time around mode_seconds (scale_seconds) times the weightage(s)
+#    'log_likelihood' - Log-likelihood ratio of the transit time (normal around mode_seconds, scale_seconds) against a
+#                       uniform background over background_seconds, plus the log weightage(s); clamped at 0
+#
+#A weighting is selected with weighting= of the kernel and the matchers : None (default), a registered name, a
+#(name, params) pair, e.g. ('gaussian_mode', {'mode_seconds' : 6.0, 'scale_seconds' : 1.0}), or a WeightFunction.
+#
+#A weighting may also give a numexpr expression of the same variables and parameters; it is evaluated with numexpr
+#(multi-threaded, no temporaries) when numexpr is installed and USE_NUMEXPR is True, else the NumPy function is used.
+#'inverse_delay' is bit-identical on both paths (same operations in the same order); the others agree to rounding
+#(exp/log implementations).
+
+import math
+
+import numpy as np
+
+#Variables passed to the weighting functions of every stage
+STAGE_VARIABLES = {
+    'sprpp1' : ('dt_transit','wght_pp1'),
+    'pp1pp2' : ('dt_arvl','dt_dptr','dt_transit','wght_one','wght_two'),
+    }
+
+#Default weighting
+DEFAULT_WEIGHTING = 'inverse_delay'
+
+#Evaluate the numexpr expressions when numexpr is installed
+USE_NUMEXPR = True
+
+#Registered weightings : stage -> name -> WeightFunction
+WEIGHT_FUNCTIONS = {stage : {} for stage in STAGE_VARIABLES}
+
+
+def get_numexpr():
+    """
+    Purpose : numexpr module, or None if it is not installed or disabled (USE_NUMEXPR)
+    """
+
+    if (not USE_NUMEXPR):
+        return None
+    #end-if
+
+    try:
+        import numexpr
+    except ImportError:
+        return None
+    #end-try
+
+    return numexpr
+#end-proc
+
+
+class WeightFunction(object):
+    """
+    Purpose : Element-wise edge weighting function of a stage, with bound parameters
+    """
+
+    def __init__(self,stage,name,weight_fn,expr=None,params=None):
+        """
+        Purpose : Initialize the weighting
+        Inputs  : stage     - 'sprpp1' or 'pp1pp2'
+                  name      - Registered name
+                  weight_fn - weight_fn(variables,params) : float64 weights from the dicts of variable arrays and parameters
+                  expr      - (Optional) numexpr expression of the variables and parameters (same result as weight_fn)
+                  params    - (Optional) Parameter -> default value (None : required)
+        """
+
+        if (stage not in STAGE_VARIABLES):
+            raise ValueError('stage must be one of %s, got %r' % (', '.join(STAGE_VARIABLES),stage))
+        #end-if
+
+        self.stage     = stage
+        self.name      = name
+        self.weight_fn = weight_fn
+        self.expr      = expr
+        self.params    = dict(params or {})
+    #end-proc
+
+    def bind(self,**params):
+        """
+        Purpose : Copy of the weighting with parameter values set
+        """
+
+        unknown_params = sorted(set(params) - set(self.params))
+        if (len(unknown_params) > 0):
+            raise ValueError('%s weighting %r has no parameter %s (parameters : %s)'
+                             % (self.stage,self.name,', '.join(unknown_params),', '.join(sorted(self.params)) or 'none'))
+        #end-if
+
+        bound_params = dict(self.params)
+        bound_params.update(params)
+
+        return WeightFunction(self.stage,self.name,self.weight_fn,self.expr,bound_params)
+    #end-proc
+
+    def check_params(self):
+        """
+        Purpose : Raise ValueError if a required parameter has no value
+        """
+
+        missing_params = sorted(name for (name,value) in self.params.items() if (value is None))
+        if (len(missing_params) > 0):
+            raise ValueError('%s weighting %r requires %s' % (self.stage,self.name,', '.join(missing_params)))
+        #end-if
+    #end-proc
+
+    def get_key(self):
+        """
+        Purpose : Hashable identity of the weighting and its parameter values (weight matrix cache key)
+        """
+        return (self.stage,self.name,tuple(sorted(self.params.items())))
+    #end-proc
+
+    def evaluate(self,variables):
+        """
+        Purpose : Edge weights of a block of candidate cells
+        Inputs  : variables - Variable name (STAGE_VARIABLES) -> broadcastable array
+        Output  : weights   - float64 array
+        """
+
+        numexpr = get_numexpr() if (self.expr is not None) else None
+        if (numexpr is not None):
+            local_dict = dict(self.params)
+            local_dict.update(variables)
+            return numexpr.evaluate(self.expr,local_dict=local_dict)
+        #end-if
+
+        return self.weight_fn(variables,self.params)
+    #end-proc
+#end-class
+
+
+def register_weighting(stage,name,weight_fn,expr=None,params=None,replace=False):
+    """
+    Purpose : Register a weighting function
+    Inputs  : stage     - 'sprpp1' or 'pp1pp2'
+              name      - Name of the weighting
+              weight_fn - weight_fn(variables,params) : float64 weights (0.0 : no candidate)
+              expr      - (Optional) Equivalent numexpr expression
+              params    - (Optional) Parameter -> default value (None : required)
+              replace   - (Optional) Replace a registered weighting of the same name
+    Output  : weight_function - The registered WeightFunction
+    """
+
+    weight_function = WeightFunction(stage,name,weight_fn,expr,params)
+    if (name in WEIGHT_FUNCTIONS[stage]) and (not replace):
+        raise ValueError('%s weighting %r is already registered' % (stage,name))
+    #end-if
+
+    WEIGHT_FUNCTIONS[stage][name] = weight_function
+
+    return weight_function
+#end-proc
+
+
+def get_weighting_names(stage):
+    """
+    Purpose : Names of the registered weightings of a stage
+    """
+    return sorted(WEIGHT_FUNCTIONS[stage])
+#end-proc
+
+
+def get_weighting_params(stage,name):
+    """
+    Purpose : Parameters (-> default value, None : required) of a registered weighting
+    """
+
+    if (name not in WEIGHT_FUNCTIONS[stage]):
+        raise ValueError('%s weighting must be one of %s, got %r' % (stage,', '.join(get_weighting_names(stage)),name))
+    #end-if
+
+    return dict(WEIGHT_FUNCTIONS[stage][name].params)
+#end-proc
+
+
+def get_weighting(stage,weighting=None):
+    """
+    Purpose : Resolve the weighting= argument of the kernel and the matchers
+    Inputs  : stage     - 'sprpp1' or 'pp1pp2'
+              weighting - None (DEFAULT_WEIGHTING), a registered name, a (name, params) pair or a WeightFunction
+    Output  : weight_function - WeightFunction with all its parameters set
+    """
+
+    if isinstance(weighting,WeightFunction):
+        weight_function = weighting
+    else:
+        params = {}
+        if (weighting is None):
+            name = DEFAULT_WEIGHTING
+        elif isinstance(weighting,str):
+            name = weighting
+        else:
+            name,params = weighting
+        #end-if
+
+        if (name not in WEIGHT_FUNCTIONS[stage]):
+            raise ValueError('%s weighting must be one of %s, got %r' % (stage,', '.join(get_weighting_names(stage)),name))
+        #end-if
+        weight_function = WEIGHT_FUNCTIONS[stage][name].bind(**dict(params))
+    #end-if
+
+    if (weight_function.stage != stage):
+        raise ValueError('weighting %r is defined for %s, not %s' % (weight_function.name,weight_function.stage,stage))
+    #end-if
+    weight_function.check_params()
+
+    return weight_function
+#end-proc
+
+
+def get_weighting_arg(stage,tokens):
+    """
+    Purpose : weighting= argument of a command line option NAME [PARAM=VALUE ...], e.g. gaussian_mode mode_seconds=6
+    Inputs  : stage     - 'sprpp1' or 'pp1pp2'
+              tokens    - Tokens of the option (None or empty : default weighting)
+    Output  : weighting - None, the name, or [name, params] (a JSON serializable (name, params) pair); ValueError if the
+                          weighting is unknown or a parameter is malformed, unknown or missing
+    """
+
+    if (not tokens):
+        return None
+    #end-if
+
+    name   = tokens[0]
+    params = {}
+    for token in tokens[1:]:
+        param,sep,value = token.partition('=')
+        if (not sep):
+            raise ValueError('%s weighting parameters must be PARAM=VALUE, got %r' % (stage,token))
+        #end-if
+        try:
+            params[param] = float(value)
+        except ValueError:
+            raise ValueError('%s weighting parameter %r must be a number, got %r' % (stage,param,value))
+        #end-try
+    #end-for
+
+    weighting = [name,params] if (len(params) > 0) else name
+    get_weighting(stage,weighting)
+
+    return weighting
+#end-proc
+
+
+#==============================================================================================
+"""Inverse delay (original weights)"""
+
+def get_inverse_seconds(delay_secs):
+    """
+    Purpose : Clamped inverse delay 1/delay used as a weighting parameter
+    Inputs  : delay_secs - float64 array of delays in seconds
+    Output  : parm       - float64 array, 0.0 for negative or zero delays, NaN for NaN
+    """
+
+    with np.errstate(divide='ignore',over='ignore'):
+        parm = 1 / delay_secs
+    #end-with
+    parm = np.where((parm < 0) | np.isinf(parm),0.0,parm)
+
+    return parm
+#end-proc
+
+
+def get_inverse_delay_sprpp1_weights(variables,params):
+    """
+    Purpose : 1/dt_transit x wght_pp1
+    """
+
+    prd_parms = get_inverse_seconds(variables['dt_transit'])
+
+    return prd_parms * variables['wght_pp1']
+#end-proc
+
+
+def get_inverse_delay_pp1pp2_weights(variables,params):
+    """
+    Purpose : wght_one x (1/dt_arvl x 1/dt_dptr x 1/dt_transit) x wght_two
+    """
+
+    parm1 = get_inverse_seconds(variables['dt_arvl'])
+    parm2 = get_inverse_seconds(variables['dt_dptr'])
+    parm3 = get_inverse_seconds(variables['dt_transit'])
+
+    prd_parms = parm1 * parm2 * parm3
+
+    return variables['wght_one'] * prd_parms * variables['wght_two']
+#end-proc
+
+
+#==============================================================================================
+"""Gaussian around the modal transit time"""
+
+def get_gaussian_transit(dt_transit,params):
+    """
+    Purpose : exp(-((dt_transit - mode_seconds) / scale_seconds)^2 / 2) for positive transit times, else 0.0
+    """
+
+    with np.errstate(invalid='ignore'):
+        z = (dt_transit - params['mode_seconds']) / params['scale_seconds']
+        return np.where(dt_transit > 0,np.exp(-0.5 * z * z),0.0)
+    #end-with
+#end-proc
+
+
+def get_gaussian_mode_sprpp1_weights(variables,params):
+    """
+    Purpose : Gaussian of the SPR-PP1 transit time around its mode x wght_pp1
+    """
+    return get_gaussian_transit(variables['dt_transit'],params) * variables['wght_pp1']
+#end-proc
+
+
+def get_gaussian_mode_pp1pp2_weights(variables,params):
+    """
+    Purpose : wght_one x Gaussian of the PP1-PP2 transit time around its mode x wght_two
+    """
+    return variables['wght_one'] * get_gaussian_transit(variables['dt_transit'],params) * variables['wght_two']
+#end-proc
+
+
+#==============================================================================================
+"""Log-likelihood ratio"""
+
+def get_log_norm(params):
+    """
+    Purpose : log of the background density ratio : log(background_seconds / (scale_seconds sqrt(2 pi)))
+    """
+    return math.log(params['background_seconds'] / (params['scale_seconds'] * math.sqrt(2 * math.pi)))
+#end-proc
+
+
+def get_clamped_log_likelihood(dt_transit,log_wght,params):
+    """
+    Purpose : Log-likelihood ratio of positive transit times plus the log weightage, clamped at 0.0
+    """
+
+    with np.errstate(invalid='ignore',divide='ignore'):
+        z  = (dt_transit - params['mode_seconds']) / params['scale_seconds']
+        ll = get_log_norm(params) - 0.5 * z * z + log_wght
+        return np.where((dt_transit > 0) & (ll > 0),ll,0.0)
+    #end-with
+#end-proc
+
+
+def get_log_likelihood_sprpp1_weights(variables,params):
+    """
+    Purpose : Clamped log-likelihood ratio of the SPR-PP1 transit time plus log(wght_pp1)
+    """
+
+    with np.errstate(divide='ignore'):
+        log_wght = np.log(variables['wght_pp1'])
+    #end-with
+
+    return get_clamped_log_likelihood(variables['dt_transit'],log_wght,params)
+#end-proc
+
+
+def get_log_likelihood_pp1pp2_weights(variables,params):
+    """
+    Purpose : Clamped log-likelihood ratio of the PP1-PP2 transit time plus log(wght_one) + log(wght_two)
+    """
+
+    with np.errstate(divide='ignore'):
+        log_wght = np.log(variables['wght_one']) + np.log(variables['wght_two'])
+    #end-with
+
+    return get_clamped_log_likelihood(variables['dt_transit'],log_wght,params)
+#end-proc
+
+
+#==============================================================================================
+"""Registered weightings"""
+
+#Clamped inverse delay of get_inverse_seconds : NaN kept, 0.0 for negative, zero and overflowing (inf) inverses
+INVERSE_EXPR = 'where({0} > 0, where(1 / {0} <= 1.7976931348623157e308, 1 / {0}, 0.0), where({0} != {0}, {0}, 0.0))'
+
+GAUSSIAN_EXPR = 'where(dt_transit > 0, exp(-0.5 * ((dt_transit - mode_seconds) / scale_seconds) ** 2), 0.0)'
+
+LOG_LIKELIHOOD_EXPR = ('log(background_seconds / (scale_seconds * 2.5066282746310002)) '
+                       '- 0.5 * ((dt_transit - mode_seconds) / scale_seconds) ** 2 + %s')
+
+GAUSSIAN_PARAMS       = {'mode_seconds' : None,'scale_seconds' : 1.0}
+LOG_LIKELIHOOD_PARAMS = {'mode_seconds' : None,'scale_seconds' : 1.0,'background_seconds' : 60.0}
+
+register_weighting('sprpp1','inverse_delay',get_inverse_delay_sprpp1_weights,
+                   INVERSE_EXPR.format('dt_transit') + ' * wght_pp1')
+register_weighting('pp1pp2','inverse_delay',get_inverse_delay_pp1pp2_weights,
+                   'wght_one * (%s * %s * %s) * wght_two' % tuple(INVERSE_EXPR.format(delay) for delay in ('dt_arvl','dt_dptr','dt_transit')))
+
+register_weighting('sprpp1','gaussian_mode',get_gaussian_mode_sprpp1_weights,
+                   GAUSSIAN_EXPR + ' * wght_pp1',GAUSSIAN_PARAMS)
+register_weighting('pp1pp2','gaussian_mode',get_gaussian_mode_pp1pp2_weights,
+                   'wght_one * ' + GAUSSIAN_EXPR + ' * wght_two',GAUSSIAN_PARAMS)
+
+register_weighting('sprpp1','log_likelihood',get_log_likelihood_sprpp1_weights,
+                   'where((dt_transit > 0) & ((%s) > 0), %s, 0.0)' % ((LOG_LIKELIHOOD_EXPR % ('log(wght_pp1)',),) * 2),
+                   LOG_LIKELIHOOD_PARAMS)
+register_weighting('pp1pp2','log_likelihood',get_log_likelihood_pp1pp2_weights,
+                   'where((dt_transit > 0) & ((%s) > 0), %s, 0.0)' % ((LOG_LIKELIHOOD_EXPR % ('log(wght_one) + log(wght_two)',),) * 2),
+                   LOG_LIKELIHOOD_PARAMS)
@@ -0,0 +1,6 @@
+#Repository root on the import path (the matcher modules are top-level modules)
+
+import os
+import sys
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
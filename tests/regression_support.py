@@ -0,0 +1,576 @@
+#******************************************************************************************************************************************
+# TITLE     : REGRESSION_SUPPORT
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : golden fixtures, engines and agreement rate of the regression suite
+# 2026-10-18        | CONTRIBUTORS        | Engines : mmap_path, optimal assignment, pipeline stages, event table round trip
+# 2026-10-18        | CONTRIBUTORS        | Engine : batch job chunks (routine_batch_runner.run_chunk_stage)
+# 2026-10-18        | CONTRIBUTORS        | Engine : 'inverse_delay' weights evaluated by numexpr
+#******************************************************************************************************************************************
+
+#Golden outputs of the matchers and the engines compared against them
+#
+#The golden files freeze the output of rev_ldrspr_matching_algo, fwd/rev_sprpp1_matching_algo and
+#fwd/rev_pp1pp2_matching_algo (dataframe inputs, greedy assignment, default weighting) on deterministic synthetic lines
+#(FIXTURES), with the dense weight matrix and with a transit-time window (WINDOWS). One CSV per (fixture, case) :
+#
+#    golden/<fixture>/<case>.csv - the matched dataframe, timestamps as int64 epoch nanoseconds (NAT_NS for NaT),
+#                                  edge weights written with 17 significant digits (exact round trip)
+#
+#An engine (ENGINES) is another way of running a case (station index inputs, weight cache, chunked, parallel,
+#streaming, batch job chunks, numexpr weights, memory-mapped matrix, pipeline stages, event table round trip, optimal
+#assignment, ...). It is compared exactly with the golden output (comparison 'exact') or by the match agreement rate
+#(comparison : minimum rate, or fixture -> minimum rate), the fraction of owned events (SPR for LDR-SPR, the rows for
+#'fwd', the columns for 'rev') matched to the same partner as in the golden output. A new engine is adopted by adding
+#it to ENGINES.
+#
+#The golden files are written by (only when a change of the results is intended) :
+#
+#    python tests/regression_support.py --update
+
+import argparse
+import functools
+import importlib.util
+import os
+import sys
+import tempfile
+
+import numpy  as np
+import pandas as pd
+
+sys.path.insert(0,os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import routine_synthetic_line
+import routine_station_index
+import routine_weight_cache
+import routine_weighting_functions
+import routine_event_io
+import routine_match_result
+import routine_traceability_pipeline
+import routine_batch_runner
+import routine_chunked_execution
+import routine_parallel_execution
+import routine_streaming_matcher
+import routine_ldrspr_matching_algo
+import routine_sprpp1_matching_algo
+import routine_pp1pp2_matching_algo
+
+#Directory of the golden files
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),'golden')
+
+#Deterministic synthetic lines : fixture -> arguments of routine_synthetic_line.gen_synthetic_line
+FIXTURES = {
+    'nominal' : {'no_of_boards' : 400,'seed' : 11},
+    'noisy'   : {'no_of_boards' : 400,'seed' : 12,'takt' : (8.0,3.0),'double_load_rate' : 0.1,'drop_rate' : 0.05,
+                 'weightage_noise' : 0.2},
+    }
+
+#Transit-time windows (min_transit_seconds, max_transit_seconds) of the SPR-PP1 and PP1-PP2 cases
+WINDOWS = {
+    'dense' : (None,None),
+    'band'  : (0.0,30.0),
+    }
+
+#Matcher -> (stage, direction, owned index column, partner column)
+MATCHERS = {
+    'rev_ldrspr_matching_algo' : ('ldrspr','rev','spr_indx','ldr_dptr'),
+    'fwd_sprpp1_matching_algo' : ('sprpp1','fwd','spr_indx','pp1_indx'),
+    'rev_sprpp1_matching_algo' : ('sprpp1','rev','pp1_indx','spr_indx'),
+    'fwd_pp1pp2_matching_algo' : ('pp1pp2','fwd','pp1_indx','pp2_indx'),
+    'rev_pp1pp2_matching_algo' : ('pp1pp2','rev','pp2_indx','pp1_indx'),
+    }
+
+#Golden cases : (matcher, window); LDR-SPR has no weight matrix
+CASES = [('rev_ldrspr_matching_algo',None)] + [(matcher,window) for matcher in MATCHERS if (matcher != 'rev_ldrspr_matching_algo')
+                                                                for window in WINDOWS]
+
+#Chunk length of the chunked, parallel and streaming engines
+CHUNK_SECONDS = 600
+
+
+def get_case_name(matcher,window):
+    """
+    Purpose : Name of a golden case (file name without extension)
+    """
+    return matcher if (window is None) else '%s_%s' % (matcher,window)
+#end-proc
+
+
+@functools.lru_cache(maxsize=None)
+def get_fixture(fixture):
+    """
+    Purpose : Station tables of a fixture (generated once per process)
+    Output  : pcb_level_dfldr, pcb_level_dfspr, pcb_level_dfpp1, pcb_level_dfpp2, truth_df
+    """
+
+    line_kwargs  = dict(FIXTURES[fixture])
+    no_of_boards = line_kwargs.pop('no_of_boards')
+
+    return routine_synthetic_line.gen_synthetic_line(no_of_boards,**line_kwargs)
+#end-proc
+
+
+def get_stage_inputs(fixture,stage):
+    """
+    Purpose : The two station tables of a stage
+    """
+
+    dfldr,dfspr,dfpp1,dfpp2,truth_df = get_fixture(fixture)
+
+    return {'ldrspr' : (dfldr,dfspr),'sprpp1' : (dfspr,dfpp1),'pp1pp2' : (dfpp1,dfpp2)}[stage]
+#end-proc
+
+
+def get_matching_algo(matcher):
+    """
+    Purpose : Matching routine of a matcher name
+    """
+
+    stage = MATCHERS[matcher][0]
+    module = {'ldrspr' : routine_ldrspr_matching_algo,'sprpp1' : routine_sprpp1_matching_algo,
+              'pp1pp2' : routine_pp1pp2_matching_algo}[stage]
+
+    return getattr(module,matcher)
+#end-proc
+
+
+def run_case(matcher,window,pcb_level_dfa,pcb_level_dfb,**kwargs):
+    """
+    Purpose : Run a matcher on a case (window : key of WINDOWS, None for LDR-SPR)
+    """
+
+    if (window is None):
+        return get_matching_algo(matcher)(pcb_level_dfa,pcb_level_dfb,**kwargs)
+    #end-if
+
+    min_transit_seconds,max_transit_seconds = WINDOWS[window]
+
+    return get_matching_algo(matcher)(pcb_level_dfa,pcb_level_dfb,min_transit_seconds,max_transit_seconds,**kwargs)
+#end-proc
+
+
+#==============================================================================================
+"""Golden files"""
+
+def get_golden_path(fixture,case_name):
+    """
+    Purpose : Path of a golden file
+    """
+    return os.path.join(GOLDEN_DIR,fixture,case_name + '.csv')
+#end-proc
+
+
+def to_golden_df(matched_df):
+    """
+    Purpose : Matched dataframe in the golden form (timestamps as int64 ns, NaT : NAT_NS)
+    """
+
+    golden_df = pd.DataFrame(index=pd.RangeIndex(len(matched_df)))
+    for column in matched_df.columns:
+        values = matched_df[column]
+        if pd.api.types.is_datetime64_any_dtype(values.dtype) or (column.endswith('_arvl') or column.endswith('_dptr')):
+            golden_df[column] = routine_station_index.get_tmstmp_ns(values)
+        elif column.endswith('_indx') or (values.dtype.kind in 'iub'):
+            golden_df[column] = values.to_numpy(dtype=np.int64)
+        else:
+            golden_df[column] = values.to_numpy(dtype=np.float64)
+        #end-if
+    #end-for
+
+    return golden_df
+#end-proc
+
+
+def read_golden_df(fixture,case_name):
+    """
+    Purpose : Golden dataframe of a case
+    """
+
+    golden_df = pd.read_csv(get_golden_path(fixture,case_name),float_precision='round_trip')
+    for column in golden_df.columns:
+        if column.startswith('edge_weight'):
+            golden_df[column] = golden_df[column].astype(np.float64)
+        else:
+            golden_df[column] = golden_df[column].astype(np.int64)
+        #end-if
+    #end-for
+
+    return golden_df
+#end-proc
+
+
+def write_golden_files():
+    """
+    Purpose : (Re)write the golden files of all fixtures and cases with the reference (dataframe) run
+    Output  : golden_paths - Paths written
+    """
+
+    golden_paths = []
+    for fixture in FIXTURES:
+        os.makedirs(os.path.join(GOLDEN_DIR,fixture),exist_ok=True)
+        for matcher,window in CASES:
+            pcb_level_dfa,pcb_level_dfb = get_stage_inputs(fixture,MATCHERS[matcher][0])
+            golden_df   = to_golden_df(run_case(matcher,window,pcb_level_dfa,pcb_level_dfb))
+            golden_path = get_golden_path(fixture,get_case_name(matcher,window))
+            golden_df.to_csv(golden_path,index=False,float_format='%.17g')
+            golden_paths.append(golden_path)
+        #end-for
+    #end-for
+
+    return golden_paths
+#end-proc
+
+
+def get_agreement_rate(matched_df,golden_df,owner_col,partner_col):
+    """
+    Purpose : Fraction of the owned events matched to the same partner as in the golden output
+    Inputs  : matched_df  - Output of an engine (golden form)
+              golden_df   - Golden output
+              owner_col   - Owned index column (one row per owned event and partner)
+              partner_col - Partner column
+    Output  : rate        - Agreement rate over the owned events of either output (1.0 if both are empty)
+    """
+
+    matched_pairs = set(zip(matched_df[owner_col].to_numpy().tolist(),matched_df[partner_col].to_numpy().tolist()))
+    golden_pairs  = set(zip(golden_df[owner_col].to_numpy().tolist(),golden_df[partner_col].to_numpy().tolist()))
+
+    owners = set(owner for (owner,partner) in matched_pairs | golden_pairs)
+    if (len(owners) == 0):
+        return 1.0
+    #end-if
+
+    disagree = set(owner for (owner,partner) in matched_pairs ^ golden_pairs)
+
+    return 1.0 - len(disagree) / len(owners)
+#end-proc
+
+
+#==============================================================================================
+"""Engines"""
+
+def run_reference(fixture,matcher,window,pcb_level_dfa,pcb_level_dfb):
+    """
+    Purpose : Reference run of a case (the one frozen in the golden files)
+    """
+    return run_case(matcher,window,pcb_level_dfa,pcb_level_dfb)
+#end-proc
+
+
+def run_station_index(fixture,matcher,window,pcb_level_dfa,pcb_level_dfb):
+    """
+    Purpose : Case run on routine_station_index.StationEventIndex inputs
+    """
+    return run_case(matcher,window,routine_station_index.StationEventIndex(pcb_level_dfa),
+                    routine_station_index.StationEventIndex(pcb_level_dfb))
+#end-proc
+
+
+def run_weight_cache(fixture,matcher,window,pcb_level_dfa,pcb_level_dfb):
+    """
+    Purpose : Case run twice with an active weight matrix cache (second run : cache hit)
+    """
+
+    routine_weight_cache.set_weight_cache(routine_weight_cache.WeightMatrixCache())
+    try:
+        run_case(matcher,window,pcb_level_dfa,pcb_level_dfb)
+        return run_case(matcher,window,pcb_level_dfa,pcb_level_dfb)
+    finally:
+        routine_weight_cache.set_weight_cache(None)
+    #end-try
+#end-proc
+
+
+def run_compact(fixture,matcher,window,pcb_level_dfa,pcb_level_dfb):
+    """
+    Purpose : Case run with the compact result (edge weights rounded to float32)
+    """
+    return run_case(matcher,window,pcb_level_dfa,pcb_level_dfb,compact=True).to_df()
+#end-proc
+
+
+def run_float32(fixture,matcher,window,pcb_level_dfa,pcb_level_dfb):
+    """
+    Purpose : Case run with a float32 dense weight matrix (weight matrix cases only)
+    """
+
+    if (window is None):
+        return None
+    #end-if
+
+    return run_case(matcher,window,pcb_level_dfa,pcb_level_dfb,weight_dtype=np.float32)
+#end-proc
+
+
+def run_chunked(fixture,matcher,window,pcb_level_dfa,pcb_level_dfb):
+    """
+    Purpose : Case run chunk by chunk (routine_chunked_execution; banded cases and LDR-SPR)
+    """
+
+    stage,direction,owner_col,partner_col = MATCHERS[matcher]
+    if (stage == 'ldrspr'):
+        return routine_chunked_execution.chunked_ldrspr_matching(pcb_level_dfa,pcb_level_dfb,CHUNK_SECONDS)
+    elif (window != 'band'):
+        return None
+    #end-if
+
+    min_transit_seconds,max_transit_seconds = WINDOWS[window]
+    chunked_matching = getattr(routine_chunked_execution,'chunked_%s_matching' % stage)
+
+    return chunked_matching(pcb_level_dfa,pcb_level_dfb,CHUNK_SECONDS,max_transit_seconds,min_transit_seconds,direction)
+#end-proc
+
+
+def run_parallel(fixture,matcher,window,pcb_level_dfa,pcb_level_dfb):
+    """
+    Purpose : Case run as (line, chunk) work units of a process pool (routine_parallel_execution; banded cases and LDR-SPR)
+    """
+
+    stage,direction,owner_col,partner_col = MATCHERS[matcher]
+    if (stage != 'ldrspr') and (window != 'band'):
+        return None
+    #end-if
+
+    min_transit_seconds,max_transit_seconds = WINDOWS[window] if (window is not None) else (None,None)
+    matched_dfs = routine_parallel_execution.parallel_matching({'line' : (pcb_level_dfa,pcb_level_dfb)},stage,CHUNK_SECONDS,
+                                                               max_transit_seconds,min_transit_seconds,direction,max_workers=2)
+
+    return matched_dfs['line']
+#end-proc
+
+
+def run_streaming(fixture,matcher,window,pcb_level_dfa,pcb_level_dfb):
+    """
+    Purpose : Case fed in batches of CHUNK_SECONDS to the streaming matchers (banded cases; LDR-SPR with the batch
+              hist_mode)
+    """
+
+    stage,direction,owner_col,partner_col = MATCHERS[matcher]
+    if (stage == 'ldrspr'):
+        matcher_obj = routine_streaming_matcher.LdrSprStreamingMatcher(
+                          routine_ldrspr_matching_algo.get_ldrspr_hist_mode(pcb_level_dfa,pcb_level_dfb))
+        add_events  = (matcher_obj.add_ldr_events,matcher_obj.add_spr_events)
+    elif (window == 'band'):
+        min_transit_seconds,max_transit_seconds = WINDOWS[window]
+        if (stage == 'sprpp1'):
+            matcher_obj = routine_streaming_matcher.SprPp1StreamingMatcher(max_transit_seconds,min_transit_seconds,direction)
+            add_events  = (matcher_obj.add_spr_events,matcher_obj.add_pp1_events)
+        else:
+            matcher_obj = routine_streaming_matcher.Pp1Pp2StreamingMatcher(max_transit_seconds,min_transit_seconds,direction)
+            add_events  = (matcher_obj.add_pp1_events,matcher_obj.add_pp2_events)
+        #end-if
+    else:
+        return None
+    #end-if
+
+    #Batches of events departing in the same CHUNK_SECONDS interval, fed in time order
+    chunk_ns  = int(CHUNK_SECONDS * 1e9)
+    batch_ids = [routine_station_index.get_tmstmp_ns(pcb_level_df.dptr_tmstmp) // chunk_ns
+                 for pcb_level_df in (pcb_level_dfa,pcb_level_dfb)]
+
+    matched_df_list = []
+    for batch_id in np.unique(np.concatenate(batch_ids)):
+        for pcb_level_df,add_fn,ids in zip((pcb_level_dfa,pcb_level_dfb),add_events,batch_ids):
+            add_fn(pcb_level_df[ids == batch_id])
+        #end-for
+        matched_df_list.append(matcher_obj.get_matches())
+    #end-for
+    matched_df_list.append(matcher_obj.close())
+
+    matched_df = pd.concat(matched_df_list,ignore_index=True)
+
+    return matched_df.sort_values(by=owner_col,kind='stable',ignore_index=True)
+#end-proc
+
+
+def run_batch(fixture,matcher,window,pcb_level_dfa,pcb_level_dfb):
+    """
+    Purpose : Case run as the checkpoint chunks of a batch job (routine_batch_runner.run_chunk_stage : chunk slices,
+              owned rows, file rows; banded cases and LDR-SPR)
+    """
+
+    stage,direction,owner_col,partner_col = MATCHERS[matcher]
+    if (stage != 'ldrspr') and (window != 'band'):
+        return None
+    #end-if
+
+    min_transit_seconds,max_transit_seconds = WINDOWS[window] if (window is not None) else (None,None)
+    job_config = {'margin_seconds' : CHUNK_SECONDS,'unit_seconds' : CHUNK_SECONDS / 2,'workers' : 1,
+                  '%s_min_transit_seconds' % (stage,) : min_transit_seconds,'%s_max_transit_seconds' % (stage,) : max_transit_seconds}
+    hist_mode  = routine_ldrspr_matching_algo.get_ldrspr_hist_mode(pcb_level_dfa,pcb_level_dfb) if (stage == 'ldrspr') else None
+
+    #Chunks over every timestamp of the two stations (the owned timestamps are among them)
+    tmstmp_ns = np.concatenate([routine_station_index.get_tmstmp_ns(pcb_level_df[column]) for pcb_level_df in (pcb_level_dfa,pcb_level_dfb)
+                                                                                        for column in ('arvl_tmstmp','dptr_tmstmp')])
+    tmstmp_ns = tmstmp_ns[tmstmp_ns != routine_station_index.NAT_NS]
+
+    matched_df_list = []
+    for chunk_str_ns,chunk_end_ns in routine_chunked_execution.get_time_chunks(tmstmp_ns.min(),tmstmp_ns.max(),CHUNK_SECONDS):
+        matched_df_list.append(routine_batch_runner.run_chunk_stage(stage,direction,pcb_level_dfa,pcb_level_dfb,int(chunk_str_ns),
+                                                                    int(chunk_end_ns),job_config,hist_mode))
+    #end-for
+
+    return pd.concat(matched_df_list,ignore_index=True)
+#end-proc
+
+
+def run_numexpr(fixture,matcher,window,pcb_level_dfa,pcb_level_dfb):
+    """
+    Purpose : Case run with weighting='inverse_delay' evaluated by numexpr (weight matrix cases; needs numexpr)
+    """
+
+    if (window is None) or (importlib.util.find_spec('numexpr') is None):
+        return None
+    #end-if
+
+    use_numexpr = routine_weighting_functions.USE_NUMEXPR
+    routine_weighting_functions.USE_NUMEXPR = True
+    try:
+        return run_case(matcher,window,pcb_level_dfa,pcb_level_dfb,weighting='inverse_delay')
+    finally:
+        routine_weighting_functions.USE_NUMEXPR = use_numexpr
+    #end-try
+#end-proc
+
+
+def run_mmap(fixture,matcher,window,pcb_level_dfa,pcb_level_dfb):
+    """
+    Purpose : Case run with a np.memmap backed dense weight matrix (dense cases only)
+    """
+
+    if (window != 'dense'):
+        return None
+    #end-if
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        return run_case(matcher,window,pcb_level_dfa,pcb_level_dfb,mmap_path=os.path.join(tmp_dir,'weight_mtrx.dat'))
+    #end-with
+#end-proc
+
+
+def run_optimal(fixture,matcher,window,pcb_level_dfa,pcb_level_dfb):
+    """
+    Purpose : Case run with the globally optimal one-to-one assignment (weight matrix cases only)
+    """
+
+    if (window is None):
+        return None
+    #end-if
+
+    return run_case(matcher,window,pcb_level_dfa,pcb_level_dfb,assignment='optimal')
+#end-proc
+
+
+@functools.lru_cache(maxsize=None)
+def get_pipeline(fixture,window,direction):
+    """
+    Purpose : TraceabilityPipeline run on a fixture (window of both banded stages, direction of both), run once
+    """
+
+    min_transit_seconds,max_transit_seconds = WINDOWS[window]
+    pipeline = routine_traceability_pipeline.TraceabilityPipeline(direction,direction,min_transit_seconds,max_transit_seconds,
+                                                                  min_transit_seconds,max_transit_seconds)
+    pipeline.run(*get_fixture(fixture)[:4])
+
+    return pipeline
+#end-proc
+
+
+def run_pipeline(fixture,matcher,window,pcb_level_dfa,pcb_level_dfb):
+    """
+    Purpose : Stage output of routine_traceability_pipeline.TraceabilityPipeline (LDR-SPR : from the dense run)
+    """
+
+    stage,direction,owner_col,partner_col = MATCHERS[matcher]
+    pipeline = get_pipeline(fixture,'dense' if (window is None) else window,direction)
+
+    if (stage == 'ldrspr'):
+        return routine_match_result.get_ldrspr_matched_df(pcb_level_dfa,pcb_level_dfb,*pipeline.ldrspr_indx)
+    elif (stage == 'sprpp1'):
+        return routine_match_result.get_sprpp1_matched_df(pcb_level_dfa,pcb_level_dfb,*pipeline.sprpp1_indx)
+    #end-if
+
+    return routine_match_result.get_pp1pp2_matched_df(pcb_level_dfa,pcb_level_dfb,*pipeline.pp1pp2_indx)
+#end-proc
+
+
+def run_event_io(fixture,matcher,window,pcb_level_dfa,pcb_level_dfb):
+    """
+    Purpose : Reference output written and read back as a Parquet matched table (routine_event_io; needs pyarrow)
+    """
+
+    if (importlib.util.find_spec('pyarrow') is None):
+        return None
+    #end-if
+
+    matched_df = run_case(matcher,window,pcb_level_dfa,pcb_level_dfb)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        table_path = os.path.join(tmp_dir,'matched.parquet')
+        routine_event_io.write_event_table(matched_df,table_path,keep_event_indx=False)
+        return routine_event_io.read_event_table(table_path)
+    #end-with
+#end-proc
+
+
+#Engine -> (run_fn(fixture, matcher, window, dfa, dfb) : matched dataframe or None if not applicable, comparison)
+#comparison : 'exact' (same golden dataframe), the minimum agreement rate, or fixture -> minimum agreement rate
+ENGINES = {
+    'station_index' : (run_station_index,'exact'),
+    'weight_cache'  : (run_weight_cache,'exact'),
+    'chunked'       : (run_chunked,'exact'),
+    'parallel'      : (run_parallel,'exact'),
+    'streaming'     : (run_streaming,'exact'),
+    'batch'         : (run_batch,'exact'),
+    'mmap'          : (run_mmap,'exact'),
+    'numexpr'       : (run_numexpr,'exact'),
+    'pipeline'      : (run_pipeline,'exact'),
+    'event_io'      : (run_event_io,'exact'),
+    'compact'       : (run_compact,1.0),
+    'float32'       : (run_float32,0.99),
+    'optimal'       : (run_optimal,{'nominal' : 0.97,'noisy' : 0.6}),
+    }
+#The optimal assignment maximizes the total weight rather than taking the heaviest edges first : measured agreement
+#0.98-1.0 on 'nominal', 0.66-0.86 on 'noisy' (double loads and drops)
+
+
+def get_min_rate(comparison,fixture):
+    """
+    Purpose : Minimum agreement rate of an agreement comparison on a fixture
+    """
+    return comparison[fixture] if isinstance(comparison,dict) else comparison
+#end-proc
+
+
+def main(argv=None):
+    """
+    Purpose : Command line entry point (python tests/regression_support.py --update)
+    """
+
+    parser = argparse.ArgumentParser(description='Golden outputs of the PCB Data Association regression suite')
+    parser.add_argument('--update',action='store_true',help='Rewrite the golden files with the current results')
+    args = parser.parse_args(argv)
+
+    if (not args.update):
+        parser.print_help()
+        return 2
+    #end-if
+
+    for golden_path in write_golden_files():
+        print(os.path.relpath(golden_path))
+    #end-for
+
+    return 0
+#end-proc
+
+
+if (__name__ == '__main__'):
+    sys.exit(main())
+#end-if
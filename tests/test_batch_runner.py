@@ -0,0 +1,282 @@
+#******************************************************************************************************************************************
+# TITLE     : TEST_BATCH_RUNNER
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : batch job outputs, chunking, resume, exit codes and metrics
+#******************************************************************************************************************************************
+
+#Batch runner tests : routine_batch_runner.main on a synthetic line written to Parquet (PP2 : CSV)
+#
+#The date range starts before the first event of the line (the first LDR-SPR chunk has no guard SPR event) and ends
+#within it (the last chunk owns part of the events read with the margin). Every <stage>_<direction> output must
+#equal the matcher run on the whole tables, restricted to the owned events of the range.
+
+import json
+import os
+
+import pandas as pd
+import pytest
+
+import routine_batch_runner
+import routine_event_io
+import routine_synthetic_line
+import routine_ldrspr_matching_algo
+import routine_sprpp1_matching_algo
+import routine_pp1pp2_matching_algo
+
+NO_OF_BOARDS = 1200
+STR_TMSTMP   = '2019-05-01 07:00:00'
+END_TMSTMP   = '2019-05-01 12:00:00'
+
+#Maximum transit time of the SPR-PP1 and PP1-PP2 stages [s]
+MAX_TRANSIT_SECONDS = 60.0
+
+RUN_NAMES = ['ldrspr_rev','sprpp1_fwd','sprpp1_rev','pp1pp2_fwd','pp1pp2_rev']
+
+
+@pytest.fixture(scope='module')
+def line_files(tmp_path_factory):
+    """
+    Purpose : Station tables of the synthetic line and their input files
+    Output  : station_dfs, input_paths
+    """
+
+    input_dir = tmp_path_factory.mktemp('inputs')
+    station_dfs = dict(zip(('ldr','spr','pp1','pp2'),routine_synthetic_line.gen_synthetic_line(NO_OF_BOARDS,seed=3)[:4]))
+
+    input_paths = {}
+    for station,station_df in station_dfs.items():
+        if (station == 'pp2'):
+            input_paths[station] = str(input_dir / 'pp2.csv')
+            station_df.to_csv(input_paths[station],index=False)
+        else:
+            input_paths[station] = str(input_dir / ('%s.parquet' % (station,)))
+            routine_event_io.write_event_table(station_df,input_paths[station],row_group_size=200)
+        #end-if
+    #end-for
+
+    return station_dfs,input_paths
+#end-proc
+
+
+@pytest.fixture(scope='module')
+def reference_dfs(line_files):
+    """
+    Purpose : Matcher outputs on the whole tables restricted to the owned events of the date range
+    """
+
+    station_dfs,input_paths = line_files
+    dfldr,dfspr,dfpp1,dfpp2 = (station_dfs[station] for station in ('ldr','spr','pp1','pp2'))
+
+    #Modal delay of the events read by the job (date range plus the margin)
+    margin    = pd.Timedelta(seconds=routine_batch_runner.MARGIN_SECONDS)
+    in_read   = lambda pcb_level_df : pcb_level_df[((pcb_level_df.dptr_tmstmp >= pd.Timestamp(STR_TMSTMP) - margin) &
+                                                    (pcb_level_df.dptr_tmstmp < pd.Timestamp(END_TMSTMP) + margin)).to_numpy()]
+    hist_mode = routine_ldrspr_matching_algo.get_ldrspr_hist_mode(in_read(dfldr),in_read(dfspr))
+    matched_dfs = {
+        'ldrspr_rev' : (routine_ldrspr_matching_algo.rev_ldrspr_matching_algo(dfldr,dfspr,hist_mode),'spr_dptr'),
+        'sprpp1_fwd' : (routine_sprpp1_matching_algo.fwd_sprpp1_matching_algo(dfspr,dfpp1,None,MAX_TRANSIT_SECONDS),'spr_dptr'),
+        'sprpp1_rev' : (routine_sprpp1_matching_algo.rev_sprpp1_matching_algo(dfspr,dfpp1,None,MAX_TRANSIT_SECONDS),'pp1_arvl'),
+        'pp1pp2_fwd' : (routine_pp1pp2_matching_algo.fwd_pp1pp2_matching_algo(dfpp1,dfpp2,None,MAX_TRANSIT_SECONDS),'pp1_dptr'),
+        'pp1pp2_rev' : (routine_pp1pp2_matching_algo.rev_pp1pp2_matching_algo(dfpp1,dfpp2,None,MAX_TRANSIT_SECONDS),'pp2_arvl'),
+        }
+
+    reference_dfs = {}
+    for run_name,(matched_df,own_col) in matched_dfs.items():
+        owned = (matched_df[own_col] >= pd.Timestamp(STR_TMSTMP)) & (matched_df[own_col] < pd.Timestamp(END_TMSTMP))
+        reference_dfs[run_name] = matched_df[owned.to_numpy()].reset_index(drop=True)
+    #end-for
+
+    return reference_dfs
+#end-proc
+
+
+def get_argv(input_paths,output_dir,*extra_args):
+    """
+    Purpose : Command line of a batch job on the synthetic line
+    """
+
+    argv = []
+    for station in ('ldr','spr','pp1','pp2'):
+        argv = argv + ['--%s' % (station,),input_paths[station]]
+    #end-for
+
+    return argv + ['--start',STR_TMSTMP,'--end',END_TMSTMP,'--output-dir',str(output_dir),'--direction','both',
+                   '--sprpp1-max-transit',str(MAX_TRANSIT_SECONDS),'--pp1pp2-max-transit',str(MAX_TRANSIT_SECONDS),
+                   '--chunk-seconds','3600','--unit-seconds','1800','--log-level','CRITICAL'] + list(extra_args)
+#end-proc
+
+
+def read_outputs(output_dir):
+    """
+    Purpose : Matched tables of the date range written by a job
+    """
+    return {run_name : routine_event_io.read_event_table(os.path.join(str(output_dir),run_name + '.parquet')) for run_name in RUN_NAMES}
+#end-proc
+
+
+def read_json(output_dir,file_name):
+    """
+    Purpose : checkpoint.json / metrics.json of a job
+    """
+
+    with open(os.path.join(str(output_dir),file_name)) as json_file:
+        return json.load(json_file)
+    #end-with
+#end-proc
+
+
+def assert_outputs_equal(output_dfs,reference_dfs):
+    """
+    Purpose : Every output of a job equals the reference (values; the written columns are typed)
+    """
+
+    for run_name in RUN_NAMES:
+        pd.testing.assert_frame_equal(output_dfs[run_name],reference_dfs[run_name],check_dtype=False,obj=run_name)
+    #end-for
+#end-proc
+
+
+def test_outputs_match_matchers(line_files,reference_dfs,tmp_path):
+    """
+    Purpose : Every <stage>_<direction> output equals the matcher output, including the first SPR event of the line
+    """
+
+    station_dfs,input_paths = line_files
+    assert routine_batch_runner.main(get_argv(input_paths,tmp_path)) == 0
+
+    output_dfs = read_outputs(tmp_path)
+    assert_outputs_equal(output_dfs,reference_dfs)
+    assert output_dfs['ldrspr_rev'].spr_special_entry.iloc[0] == 0
+#end-proc
+
+
+@pytest.mark.parametrize('extra_args',[('--chunk-seconds','7200'),('--chunk-seconds','86400'),
+                                       ('--chunk-seconds','5400','--workers','2'),('--output-format','ipc')],
+                         ids=['2h','1d','workers','ipc'])
+def test_outputs_independent_of_chunking(line_files,reference_dfs,tmp_path,extra_args):
+    """
+    Purpose : Chunk length, worker processes and output format do not change the outputs
+    """
+
+    station_dfs,input_paths = line_files
+    assert routine_batch_runner.main(get_argv(input_paths,tmp_path,*extra_args)) == 0
+
+    extension = '.arrow' if ('ipc' in extra_args) else '.parquet'
+    output_dfs = {run_name : routine_event_io.read_event_table(os.path.join(str(tmp_path),run_name + extension)) for run_name in RUN_NAMES}
+    assert_outputs_equal(output_dfs,reference_dfs)
+#end-proc
+
+
+def test_failure_and_resume(line_files,reference_dfs,tmp_path,monkeypatch):
+    """
+    Purpose : A failed job exits with 1 keeping its completed chunks; --resume runs only the remaining chunks
+    """
+
+    station_dfs,input_paths = line_files
+    run_chunk_stage = routine_batch_runner.run_chunk_stage
+    chunk_calls     = []
+
+    def failing_chunk_stage(stage,direction,pcb_level_dfa,pcb_level_dfb,chunk_str_ns,chunk_end_ns,job_config,hist_mode):
+        if (len(set(chunk_calls)) == 2) and (chunk_str_ns not in chunk_calls):
+            raise RuntimeError('chunk failure')
+        #end-if
+        chunk_calls.append(chunk_str_ns)
+        return run_chunk_stage(stage,direction,pcb_level_dfa,pcb_level_dfb,chunk_str_ns,chunk_end_ns,job_config,hist_mode)
+    #end-proc
+
+    monkeypatch.setattr(routine_batch_runner,'run_chunk_stage',failing_chunk_stage)
+    assert routine_batch_runner.main(get_argv(input_paths,tmp_path)) == 1
+
+    metrics    = read_json(tmp_path,routine_batch_runner.METRICS_FILE)
+    checkpoint = read_json(tmp_path,routine_batch_runner.CHECKPOINT_FILE)
+    assert (metrics['status'] == 'failed') and ('chunk failure' in metrics['error'])
+    assert checkpoint['completed_chunks'] == ['20190501T070000','20190501T080000']
+    for run_name in RUN_NAMES:
+        assert sorted(os.listdir(os.path.join(str(tmp_path),run_name))) == ['20190501T070000.parquet','20190501T080000.parquet']
+    #end-for
+
+    resumed_chunks = []
+    monkeypatch.setattr(routine_batch_runner,'run_chunk_stage',
+                        lambda *args : resumed_chunks.append(args[4]) or run_chunk_stage(*args))
+    assert routine_batch_runner.main(get_argv(input_paths,tmp_path,'--resume')) == 0
+
+    metrics = read_json(tmp_path,routine_batch_runner.METRICS_FILE)
+    assert (metrics['status'] == 'completed') and (metrics['resumed_chunks'] == 2)
+    assert min(resumed_chunks) == pd.Timestamp('2019-05-01 09:00:00').value
+    assert len(set(resumed_chunks)) == 3
+    assert_outputs_equal(read_outputs(tmp_path),reference_dfs)
+
+    #A checkpoint is resumed only by the same job configuration
+    assert routine_batch_runner.main(get_argv(input_paths,tmp_path,'--resume','--sprpp1-weighting','gaussian_mode','mode_seconds=6')) == 1
+    assert routine_batch_runner.main(get_argv(input_paths,tmp_path,'--resume','--chunk-seconds','7200')) == 1
+#end-proc
+
+
+def test_metrics(line_files,reference_dfs,tmp_path):
+    """
+    Purpose : metrics.json records the status, the configuration, the chunk rows and the phase timings
+    """
+
+    station_dfs,input_paths = line_files
+    assert routine_batch_runner.main(get_argv(input_paths,tmp_path)) == 0
+
+    metrics    = read_json(tmp_path,routine_batch_runner.METRICS_FILE)
+    checkpoint = read_json(tmp_path,routine_batch_runner.CHECKPOINT_FILE)
+    assert metrics['status'] == 'completed'
+    assert metrics['config'] == checkpoint['config']
+    assert metrics['resumed_chunks'] == 0
+    assert metrics['hist_mode'] == checkpoint['hist_mode']
+
+    assert [chunk_record['chunk'] for chunk_record in metrics['chunks']] == checkpoint['completed_chunks']
+    assert [chunk_record['str'] for chunk_record in metrics['chunks']] == [str(tmstmp) for tmstmp in
+                                                                          pd.date_range(STR_TMSTMP,END_TMSTMP,freq='h')[:-1]]
+    for run_name in RUN_NAMES:
+        assert sum(chunk_record['rows'][run_name] for chunk_record in metrics['chunks']) == len(reference_dfs[run_name])
+    #end-for
+
+    phase_calls = metrics['metrics']['phase_calls']
+    assert phase_calls['batch.read'] == 1
+    assert phase_calls['batch.sprpp1_fwd'] == len(metrics['chunks'])
+    assert set(metrics['metrics']['phase_timings']) == set(phase_calls)
+    assert metrics['total_seconds'] > 0
+#end-proc
+
+
+@pytest.mark.parametrize('extra_args',[('--workers','0'),('--end',STR_TMSTMP),('--margin-seconds','30'),
+                                       ('--sprpp1-weighting','gaussian_mode'),('--direction','sideways')],
+                         ids=['workers','range','margin','weighting','direction'])
+def test_invalid_arguments(line_files,tmp_path,extra_args):
+    """
+    Purpose : Invalid arguments exit with 2 (argparse) before any output is written
+    """
+
+    station_dfs,input_paths = line_files
+    with pytest.raises(SystemExit) as exit_info:
+        routine_batch_runner.main(get_argv(input_paths,tmp_path / 'out',*extra_args))
+    #end-with
+
+    assert exit_info.value.code == 2
+    assert not os.path.exists(str(tmp_path / 'out'))
+#end-proc
+
+
+def test_unreadable_input(line_files,tmp_path):
+    """
+    Purpose : A missing input file fails the job (exit code 1, metrics.json status 'failed')
+    """
+
+    station_dfs,input_paths = line_files
+    input_paths = dict(input_paths,pp2=str(tmp_path / 'missing.csv'))
+    assert routine_batch_runner.main(get_argv(input_paths,tmp_path)) == 1
+    assert read_json(tmp_path,routine_batch_runner.METRICS_FILE)['status'] == 'failed'
+#end-proc
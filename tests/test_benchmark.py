@@ -0,0 +1,55 @@
+#******************************************************************************************************************************************
+# TITLE     : TEST_BENCHMARK
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : precision and recall of matched pairs (get_pair_accuracy)
+#******************************************************************************************************************************************
+
+#Benchmark accuracy tests (routine_benchmark)
+
+import numpy as np
+
+import routine_benchmark
+
+
+def test_pair_accuracy():
+    """
+    Purpose : Precision and recall on a hand-built case : wrong, duplicate and missing pairs, dropped events in the truth
+    """
+
+    #True pairs (0,0) (1,1) (2,3) (3,4); board 4 lost its col event, board 5 its row event
+    true_row = np.array([0,1,2,3,4,-1])
+    true_col = np.array([0,1,3,4,-1,2])
+
+    #3 of the 5 matched pairs are true : (1,2) is wrong, (4,5) pairs the event without a col event
+    match_row = np.array([0,1,2,3,4])
+    match_col = np.array([0,2,3,4,5])
+    precision,recall = routine_benchmark.get_pair_accuracy(match_row,match_col,true_row,true_col)
+    assert (precision,recall) == (3 / 5,3 / 4)
+
+    #A col position beyond the truth is a wrong pair, not an alias of another pair
+    precision,recall = routine_benchmark.get_pair_accuracy(np.array([0,0]),np.array([0,6]),true_row,true_col)
+    assert (precision,recall) == (1 / 2,1 / 4)
+
+    #Every true pair once
+    precision,recall = routine_benchmark.get_pair_accuracy(true_row[:4],true_col[:4],true_row,true_col)
+    assert (precision,recall) == (1.0,1.0)
+
+    #No matches : precision undefined
+    precision,recall = routine_benchmark.get_pair_accuracy(np.zeros(0,dtype=np.int64),np.zeros(0,dtype=np.int64),
+                                                           true_row,true_col)
+    assert np.isnan(precision) and (recall == 0.0)
+
+    #No true pairs : recall undefined
+    precision,recall = routine_benchmark.get_pair_accuracy(match_row,match_col,np.array([-1,2]),np.array([0,-1]))
+    assert (precision == 0.0) and np.isnan(recall)
+#end-proc
@@ -0,0 +1,101 @@
+#******************************************************************************************************************************************
+# TITLE     : TEST_DELAY_HISTOGRAM
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : add / remove delays, mode ties, rebuild equivalence
+#******************************************************************************************************************************************
+
+#Delay histogram tests (routine_delay_histogram)
+
+import numpy as np
+import pytest
+
+import routine_delay_histogram
+
+
+def test_mode_ties():
+    """
+    Purpose : The modal delay is the center of the most populated bin, the lowest one on ties (also after removals)
+    """
+
+    delay_hist = routine_delay_histogram.DelayHistogram(0.5)
+    assert np.isnan(delay_hist.get_mode())
+
+    #Bins 2 and 6 hold two delays each
+    delay_hist.add_delays([3.1,1.2,np.nan,3.2,1.3,5.0])
+    assert delay_hist.get_no_of_delays() == 5
+    assert delay_hist.get_mode() == 1.25
+
+    delay_hist.remove_delays([1.2])
+    assert delay_hist.get_mode() == 3.25
+
+    #A new lower bin (counts shifted) does not win with fewer delays
+    delay_hist.add_delays([-0.4])
+    assert delay_hist.bin_lo == -1
+    assert delay_hist.get_mode() == 3.25
+
+    #All bins with one delay : the lowest one
+    delay_hist.remove_delays(np.array([3.2,np.nan]))
+    assert delay_hist.get_mode() == -0.25
+
+    delay_hist.remove_delays([-0.4,1.3,3.1,5.0])
+    assert delay_hist.get_no_of_delays() == 0
+    assert np.isnan(delay_hist.get_mode())
+#end-proc
+
+
+def test_remove_delays_errors():
+    """
+    Purpose : Removing delays that are not in the histogram raises and leaves the counts unchanged
+    """
+
+    delay_hist = routine_delay_histogram.DelayHistogram(0.5)
+    delay_hist.add_delays([1.0,1.1,2.0])
+    counts = delay_hist.counts.copy()
+
+    for delays in [[0.2],[9.0],[1.6],[2.0,2.1],[1.0,1.1,1.2]]:
+        with pytest.raises(ValueError,match='not in the histogram'):
+            delay_hist.remove_delays(delays)
+        #end-with
+        np.testing.assert_array_equal(delay_hist.counts,counts)
+    #end-for
+
+    #Nothing to remove
+    delay_hist.remove_delays([np.nan])
+    delay_hist.remove_delays([])
+    np.testing.assert_array_equal(delay_hist.counts,counts)
+#end-proc
+
+
+def test_rolling_window_equals_rebuild():
+    """
+    Purpose : Adding and removing delays in a rolling window gives the histogram and mode of the window rebuilt from scratch
+    """
+
+    rng    = np.random.default_rng(0)
+    delays = np.round(rng.normal(20.0,3.0,2000),1)
+    delays[rng.random(len(delays)) < 0.05] = np.nan
+
+    delay_hist = routine_delay_histogram.DelayHistogram(0.5)
+    for str_pos in range(0,len(delays) - 400,100):
+        if (str_pos > 0):
+            delay_hist.remove_delays(delays[str_pos - 100:str_pos])
+            delay_hist.add_delays(delays[str_pos + 300:str_pos + 400])
+        else:
+            delay_hist.add_delays(delays[:400])
+        #end-if
+
+        hist_df,hist_mode = routine_delay_histogram.get_mode(delays[str_pos:str_pos + 400],bin_width=0.5)
+        assert delay_hist.get_mode() == hist_mode
+        assert delay_hist.get_hist_df().equals(hist_df)
+    #end-for
+#end-proc
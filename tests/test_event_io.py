@@ -0,0 +1,106 @@
+#******************************************************************************************************************************************
+# TITLE     : TEST_EVENT_IO
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : time range reads of Parquet and Arrow IPC event tables, IPC memory maps
+#******************************************************************************************************************************************
+
+#Event table I/O tests (routine_event_io; skipped without pyarrow)
+
+import gc
+import os
+
+import pandas as pd
+import pytest
+
+import routine_event_io
+import routine_synthetic_line
+
+pytest.importorskip('pyarrow')
+
+#Time ranges of the reads : within the table, before it, unbounded on either side
+TIME_RANGES = [('2019-05-01 09:00:00','2019-05-01 09:30:00'),('2019-04-30','2019-05-01'),
+               (None,'2019-05-01 08:45:00'),('2019-05-01 10:00:00',None),(None,None)]
+
+
+@pytest.mark.parametrize('str_tmstmp,end_tmstmp',TIME_RANGES)
+@pytest.mark.parametrize('extension',['.parquet','.arrow'])
+def test_read_time_range(tmp_path,extension,str_tmstmp,end_tmstmp):
+    """
+    Purpose : A time range read returns the events of the range with their row numbers (row groups / record batches of
+              50 rows, most of them outside the range)
+    """
+
+    pcb_level_dfpp1 = routine_synthetic_line.gen_synthetic_line(600,seed=4)[2]
+    path = str(tmp_path / ('pp1' + extension))
+    routine_event_io.write_event_table(pcb_level_dfpp1,path,row_group_size=50)
+
+    in_range = pd.Series(True,index=pcb_level_dfpp1.index)
+    if (str_tmstmp is not None):
+        in_range = in_range & (pcb_level_dfpp1.dptr_tmstmp >= pd.Timestamp(str_tmstmp))
+    #end-if
+    if (end_tmstmp is not None):
+        in_range = in_range & (pcb_level_dfpp1.dptr_tmstmp < pd.Timestamp(end_tmstmp))
+    #end-if
+    expected_df = pcb_level_dfpp1[in_range]
+
+    pcb_level_df = routine_event_io.read_event_table(path,str_tmstmp=str_tmstmp,end_tmstmp=end_tmstmp)
+    pd.testing.assert_frame_equal(pcb_level_df,expected_df,check_index_type=False,check_names=False)
+
+    #Columns without the time column
+    pcb_level_df = routine_event_io.read_event_table(path,columns=['weightage'],str_tmstmp=str_tmstmp,end_tmstmp=end_tmstmp)
+    assert list(pcb_level_df.columns) == ['weightage']
+    assert pcb_level_df.index.tolist() == expected_df.index.tolist()
+#end-proc
+
+
+@pytest.mark.parametrize('extension',['.parquet','.arrow'])
+def test_read_errors(tmp_path,extension):
+    """
+    Purpose : Missing columns and time columns are rejected
+    """
+
+    path = str(tmp_path / ('pp1' + extension))
+    routine_event_io.write_event_table(routine_synthetic_line.gen_synthetic_line(50,seed=4)[2],path)
+
+    with pytest.raises(ValueError,match='columns not in'):
+        routine_event_io.read_event_table(path,columns=['dptr_tmstmp','no_such_column'])
+    #end-with
+    with pytest.raises(ValueError,match='time_column'):
+        routine_event_io.read_event_table(path,str_tmstmp='2019-05-01',time_column='no_such_column')
+    #end-with
+#end-proc
+
+
+@pytest.mark.skipif(not os.path.exists('/proc/self/maps'),reason='needs /proc/self/maps')
+def test_ipc_memory_map_closed(tmp_path):
+    """
+    Purpose : Reading an Arrow IPC file (also when it fails) leaves no mapping of the file, while the dataframes read are in use
+    """
+
+    path = str(tmp_path / 'pp1.arrow')
+    routine_event_io.write_event_table(routine_synthetic_line.gen_synthetic_line(200,seed=4)[2],path,row_group_size=50)
+
+    pcb_level_dfs = []
+    for read_no in range(5):
+        pcb_level_dfs.append(routine_event_io.read_event_table(path,str_tmstmp='2019-05-01 08:10:00'))
+        pcb_level_dfs.append(routine_event_io.read_event_table(path))
+        with pytest.raises(ValueError):
+            routine_event_io.read_event_table(path,columns=['no_such_column'])
+        #end-with
+    #end-for
+    gc.collect()
+
+    with open('/proc/self/maps') as maps_file:
+        assert not any(line.rstrip().endswith(path) for line in maps_file)
+    #end-with
+#end-proc
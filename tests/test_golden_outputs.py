@@ -0,0 +1,115 @@
+#******************************************************************************************************************************************
+# TITLE     : TEST_GOLDEN_OUTPUTS
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : reference and engine outputs against the golden files
+# 2026-10-18        | CONTRIBUTORS        | Per-fixture minimum agreement rates of the engines
+#******************************************************************************************************************************************
+
+#Match-quality regression tests (see regression_support for the fixtures, cases and engines)
+#
+#    python -m pytest -q tests/test_golden_outputs.py
+
+import pandas as pd
+import pytest
+
+import regression_support
+
+GOLDEN_CASES  = [(fixture,matcher,window) for fixture in regression_support.FIXTURES
+                                          for (matcher,window) in regression_support.CASES]
+GOLDEN_IDS    = ['%s-%s' % (fixture,regression_support.get_case_name(matcher,window)) for (fixture,matcher,window) in GOLDEN_CASES]
+
+#Minimum agreement rate of the banded results with the dense ones (transit-time window of WINDOWS['band'])
+BAND_VS_DENSE_RATE = 0.99
+
+
+def get_case_output(fixture,matcher,window,run_fn):
+    """
+    Purpose : Output of run_fn on a case in the golden form (None if the engine does not apply)
+    """
+
+    stage = regression_support.MATCHERS[matcher][0]
+    pcb_level_dfa,pcb_level_dfb = regression_support.get_stage_inputs(fixture,stage)
+    matched_df = run_fn(fixture,matcher,window,pcb_level_dfa,pcb_level_dfb)
+    if (matched_df is None):
+        return None
+    #end-if
+
+    return regression_support.to_golden_df(matched_df)
+#end-proc
+
+
+@pytest.mark.parametrize('fixture,matcher,window',GOLDEN_CASES,ids=GOLDEN_IDS)
+def test_reference_output(fixture,matcher,window):
+    """
+    Purpose : The reference (dataframe) run reproduces the golden file exactly
+    """
+
+    golden_df  = regression_support.read_golden_df(fixture,regression_support.get_case_name(matcher,window))
+    matched_df = get_case_output(fixture,matcher,window,regression_support.run_reference)
+
+    pd.testing.assert_frame_equal(matched_df,golden_df,check_exact=True)
+#end-proc
+
+
+@pytest.mark.parametrize('engine',list(regression_support.ENGINES))
+@pytest.mark.parametrize('fixture,matcher,window',GOLDEN_CASES,ids=GOLDEN_IDS)
+def test_engine_output(fixture,matcher,window,engine):
+    """
+    Purpose : Every engine reproduces the golden file exactly or above its minimum agreement rate
+    """
+
+    run_fn,comparison = regression_support.ENGINES[engine]
+    matched_df = get_case_output(fixture,matcher,window,run_fn)
+    if (matched_df is None):
+        pytest.skip('%s does not apply to %s' % (engine,regression_support.get_case_name(matcher,window)))
+    #end-if
+
+    golden_df = regression_support.read_golden_df(fixture,regression_support.get_case_name(matcher,window))
+    if (comparison == 'exact'):
+        pd.testing.assert_frame_equal(matched_df,golden_df,check_exact=True)
+    else:
+        stage,direction,owner_col,partner_col = regression_support.MATCHERS[matcher]
+        rate     = regression_support.get_agreement_rate(matched_df,golden_df,owner_col,partner_col)
+        min_rate = regression_support.get_min_rate(comparison,fixture)
+        assert rate >= min_rate, '%s agreement rate %.4f below %.4f' % (engine,rate,min_rate)
+    #end-if
+#end-proc
+
+
+@pytest.mark.parametrize('fixture',list(regression_support.FIXTURES))
+@pytest.mark.parametrize('matcher',[matcher for matcher in regression_support.MATCHERS if (matcher != 'rev_ldrspr_matching_algo')])
+def test_band_vs_dense(fixture,matcher):
+    """
+    Purpose : The banded golden output agrees with the dense one (the window covers the transit times)
+    """
+
+    stage,direction,owner_col,partner_col = regression_support.MATCHERS[matcher]
+    dense_df = regression_support.read_golden_df(fixture,regression_support.get_case_name(matcher,'dense'))
+    band_df  = regression_support.read_golden_df(fixture,regression_support.get_case_name(matcher,'band'))
+
+    assert regression_support.get_agreement_rate(band_df,dense_df,owner_col,partner_col) >= BAND_VS_DENSE_RATE
+#end-proc
+
+
+def test_agreement_rate():
+    """
+    Purpose : Agreement rate over the owned events of either output
+    """
+
+    golden_df  = pd.DataFrame({'spr_indx' : [0,1,2,3],'pp1_indx' : [0,1,2,3]})
+    matched_df = pd.DataFrame({'spr_indx' : [0,1,2,4],'pp1_indx' : [0,1,3,4]})
+
+    assert regression_support.get_agreement_rate(golden_df,golden_df,'spr_indx','pp1_indx') == 1.0
+    assert regression_support.get_agreement_rate(matched_df,golden_df,'spr_indx','pp1_indx') == pytest.approx(2 / 5)
+    assert regression_support.get_agreement_rate(golden_df.iloc[:0],golden_df.iloc[:0],'spr_indx','pp1_indx') == 1.0
+#end-proc
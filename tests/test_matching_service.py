@@ -0,0 +1,260 @@
+#******************************************************************************************************************************************
+# TITLE     : TEST_MATCHING_SERVICE
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : traces of a local service against the batch matchers, malformed requests
+# 2026-10-18        | CONTRIBUTORS        | LDR-SPR trace index with loader events without a departure (NaT)
+#******************************************************************************************************************************************
+
+#Matching service tests, through a local service (routine_matching_service.start_servers on free ports) and its clients
+#(MatchingClient for the JSON lines protocol, http_request for HTTP)
+#
+#The synthetic line of regression_support.FIXTURES['nominal'] is ingested in time order, CHUNK_SECONDS of departures per
+#request and station, and the SPR -> PP1 -> PP2 traces are compared with the banded fwd_sprpp1_matching_algo and
+#fwd_pp1pp2_matching_algo golden outputs.
+
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+import pandas as pd
+
+import regression_support
+import routine_matching_service
+import routine_ldrspr_matching_algo
+import routine_station_index
+
+FIXTURE = 'nominal'
+
+
+async def start_service():
+    """
+    Purpose : Service with the banded window of the golden cases, listening on free JSON lines and HTTP ports
+    Output  : service, servers, flush_task, port, http_port
+    """
+
+    min_transit_seconds,max_transit_seconds = regression_support.WINDOWS['band']
+    service = routine_matching_service.MatchingService(max_transit_seconds,max_transit_seconds,min_transit_seconds,
+                                                       min_transit_seconds)
+    servers,flush_task = await routine_matching_service.start_servers(service,port=0,http_port=0)
+
+    return service,servers,flush_task,servers[0].sockets[0].getsockname()[1],servers[1].sockets[0].getsockname()[1]
+#end-proc
+
+
+async def ingest_line(client,fixture):
+    """
+    Purpose : Ingest the station tables of a fixture in time order (one request per station and CHUNK_SECONDS)
+    """
+
+    dfldr,dfspr,dfpp1,dfpp2,truth_df = regression_support.get_fixture(fixture)
+    station_dfs = {'ldr' : dfldr,'spr' : dfspr,'pp1' : dfpp1,'pp2' : dfpp2}
+
+    chunk_ns  = int(regression_support.CHUNK_SECONDS * 1e9)
+    batch_ids = {station : routine_station_index.get_tmstmp_ns(station_df.dptr_tmstmp) // chunk_ns
+                 for (station,station_df) in station_dfs.items()}
+
+    for batch_id in np.unique(np.concatenate(list(batch_ids.values()))):
+        for station,station_df in station_dfs.items():
+            events = routine_matching_service.get_events(station_df[batch_ids[station] == batch_id])
+            if (len(events) > 0):
+                response = await client.ingest(station,events)
+                assert response['ok'], response
+            #end-if
+        #end-for
+    #end-for
+#end-proc
+
+
+def get_golden_partners(matcher,owner_col,partner_col):
+    """
+    Purpose : Owned index -> partner index of a banded golden output
+    """
+
+    golden_df = regression_support.read_golden_df(FIXTURE,regression_support.get_case_name(matcher,'band'))
+
+    return dict(zip(golden_df[owner_col].tolist(),golden_df[partner_col].tolist()))
+#end-proc
+
+
+def test_service_traces():
+    """
+    Purpose : SPR traces of the service (JSON lines and HTTP) agree with the batch SPR-PP1 and PP1-PP2 matches
+    """
+
+    async def run():
+        service,servers,flush_task,port,http_port = await start_service()
+        try:
+            client = await routine_matching_service.MatchingClient(port=port).open()
+            try:
+                await ingest_line(client,FIXTURE)
+                assert (await client.request({'op' : 'flush'}))['ok']
+
+                traces = []
+                for spr_indx in range(len(regression_support.get_fixture(FIXTURE)[1])):
+                    response = await client.trace('spr',indx=spr_indx)
+                    assert response['ok'], response
+                    traces.append(response['trace'])
+                #end-for
+            finally:
+                await client.close()
+            #end-try
+
+            status,response = await routine_matching_service.http_request('127.0.0.1',http_port,'GET','/trace?station=spr&indx=0')
+            assert (status == 200) and (response['trace'] == traces[0])
+        finally:
+            await routine_matching_service.stop_servers(servers,flush_task)
+        #end-try
+
+        return traces
+    #end-proc
+
+    traces = asyncio.run(run())
+
+    sprpp1_partners = get_golden_partners('fwd_sprpp1_matching_algo','spr_indx','pp1_indx')
+    pp1pp2_partners = get_golden_partners('fwd_pp1pp2_matching_algo','pp1_indx','pp2_indx')
+
+    no_of_mismatches = 0
+    no_of_traced     = 0
+    for spr_indx,trace in enumerate(traces):
+        if (trace['pp1'] is None):
+            continue
+        #end-if
+        no_of_traced = no_of_traced + 1
+        pp1_indx = trace['pp1']['indx']
+        pp2_indx = None if (trace['pp2'] is None) else trace['pp2']['indx']
+        if (sprpp1_partners.get(spr_indx) != pp1_indx) or \
+           ((pp2_indx is not None) and (pp1pp2_partners.get(pp1_indx) != pp2_indx)):
+            no_of_mismatches = no_of_mismatches + 1
+        #end-if
+    #end-for
+
+    assert no_of_mismatches == 0
+    #Matches are emitted once their window has closed : only the tail of the line may be untraced
+    assert no_of_traced >= 0.95 * len(sprpp1_partners)
+#end-proc
+
+
+def test_service_rejects_bad_requests():
+    """
+    Purpose : Malformed and out of order requests are answered with an error and leave the service state unchanged
+    """
+
+    async def run():
+        service,servers,flush_task,port,http_port = await start_service()
+        try:
+            client = await routine_matching_service.MatchingClient(port=port).open()
+            try:
+                spr_events = routine_matching_service.get_events(regression_support.get_fixture(FIXTURE)[1].iloc[:10])
+                assert (await client.ingest('spr',spr_events[:8]))['ok']
+
+                bad_requests = [
+                    {'op' : 'unknown'},
+                    {'op' : 'ingest','station' : 'xyz','events' : spr_events[8:]},
+                    {'op' : 'ingest','station' : 'spr','events' : 'not a list'},
+                    {'op' : 'ingest','station' : 'pp1','events' : [{'dptr_tmstmp' : 0}]},
+                    {'op' : 'ingest','station' : 'spr','events' : spr_events[5:8]},
+                    {'op' : 'ingest','station' : 'spr','events' : spr_events[9:10] + spr_events[8:9]},
+                    {'op' : 'trace','station' : 'spr','indx' : 100},
+                    {'op' : 'trace','station' : 'spr'},
+                    ]
+                for request in bad_requests:
+                    response = await client.request(request)
+                    assert (not response['ok']) and ('error' in response), (request,response)
+                #end-for
+
+                client.writer.write(b'{not json\n')
+                await client.writer.drain()
+                assert (not json.loads(await client.reader.readline())['ok'])
+
+                assert (await client.ingest('spr',spr_events[8:]))['ok']
+                stats = (await client.request({'op' : 'stats'}))['stats']
+            finally:
+                await client.close()
+            #end-try
+
+            status,response = await routine_matching_service.http_request('127.0.0.1',http_port,'POST','/ingest',
+                                                                          {'station' : 'spr','events' : spr_events[:1]})
+            assert (status == 400) and ('time order' in response['error'])
+            status,response = await routine_matching_service.http_request('127.0.0.1',http_port,'GET','/nowhere')
+            assert (status == 400) and (not response['ok'])
+        finally:
+            await routine_matching_service.stop_servers(servers,flush_task)
+        #end-try
+
+        return stats
+    #end-proc
+
+    stats = asyncio.run(run())
+
+    assert stats['events']['spr'] + stats['pending_events'] == 10
+#end-proc
+
+
+def test_add_events_time_order():
+    """
+    Purpose : add_events rejects a batch that decreases or starts before the last queued or flushed event of the station
+    """
+
+    service = routine_matching_service.MatchingService(30.0,30.0,batch_size=4)
+    spr_events = routine_matching_service.get_events(regression_support.get_fixture(FIXTURE)[1].iloc[:10])
+
+    service.add_events('spr',spr_events[:3])
+    with pytest.raises(ValueError,match='time order'):
+        service.add_events('spr',spr_events[1:2])
+    #end-with
+
+    service.add_events('spr',spr_events[3:6])
+    assert len(service.station_logs['spr']) == 6
+    with pytest.raises(ValueError,match='time order'):
+        service.add_events('spr',spr_events[4:5])
+    #end-with
+    with pytest.raises(ValueError,match='time order'):
+        service.add_events('spr',spr_events[7:8] + spr_events[6:7])
+    #end-with
+
+    #Equal timestamps continue the stream; the other stations are checked separately
+    service.add_events('spr',spr_events[5:6])
+    service.add_events('ldr',[{'dptr_tmstmp' : spr_events[0]['dptr_tmstmp']}])
+    assert service.no_of_pending == 2
+#end-proc
+
+
+def test_ldrspr_trace_index():
+    """
+    Purpose : The LDR-SPR trace index (both directions) agrees with get_ldrspr_match_indx when some loader events have no
+              departure (NaT)
+    """
+
+    dfldr,dfspr = [station_df.iloc[:200].copy() for station_df in regression_support.get_fixture(FIXTURE)[:2]]
+    dfldr.loc[dfldr.index[[5,40,41,120]],'dptr_tmstmp'] = pd.NaT
+
+    service = routine_matching_service.MatchingService(30.0,30.0)
+    service.add_events('ldr',routine_matching_service.get_events(dfldr))
+    service.add_events('spr',routine_matching_service.get_events(dfspr))
+    service.flush()
+
+    ldr_pos,spr_indx = routine_ldrspr_matching_algo.get_ldrspr_match_indx(dfldr,dfspr)[:2]
+
+    #Only the emitted SPR events (closed loader intervals) are in the trace index
+    spr_log = service.station_logs['spr']
+    emitted = (spr_log.get_column('spr_special_entry') >= 0)
+    assert np.count_nonzero(emitted) >= 0.9 * len(dfspr)
+    np.testing.assert_array_equal(spr_log.get_column('ldr_indx')[emitted],ldr_pos[emitted])
+
+    expected_spr_indx = np.full(len(dfldr),-1,dtype=np.int64)
+    has_ldr = emitted & (ldr_pos >= 0)
+    expected_spr_indx[ldr_pos[has_ldr]] = spr_indx[has_ldr]
+    np.testing.assert_array_equal(service.station_logs['ldr'].get_column('spr_indx'),expected_spr_indx)
+#end-proc
@@ -0,0 +1,71 @@
+#******************************************************************************************************************************************
+# TITLE     : TEST_SYNTHETIC_LINE
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : drop and double load rates, ground truth positions
+#******************************************************************************************************************************************
+
+#Synthetic line tests (routine_synthetic_line)
+
+import numpy as np
+import pytest
+
+import routine_synthetic_line
+
+STATIONS = ['ldr','spr','pp1','pp2']
+
+
+def test_drop_and_double_load_rates():
+    """
+    Purpose : Observed drop and double load rates match drop_rate and double_load_rate (within 5 standard deviations)
+    """
+
+    no_of_boards = 20000
+    station_dfs  = routine_synthetic_line.gen_synthetic_line(no_of_boards,seed=11,double_load_rate=0.2,drop_rate=0.1)
+    truth_df     = station_dfs[-1]
+
+    for station,station_df in zip(STATIONS,station_dfs[:4]):
+        board_pos = truth_df[station + '_indx'].to_numpy()
+        assert np.mean(board_pos < 0) == pytest.approx(0.1,abs=5 * np.sqrt(0.1 * 0.9 / no_of_boards))
+        assert len(np.unique(board_pos[board_pos >= 0])) == np.count_nonzero(board_pos >= 0)
+        assert station_df.dptr_tmstmp.is_monotonic_increasing
+    #end-for
+
+    #Double loads : the loader events that are no board's event, among the boards with a kept loader event
+    dfldr,dfspr = station_dfs[:2]
+    ldr_pos    = truth_df.ldr_indx.to_numpy()
+    no_of_kept = np.count_nonzero(ldr_pos >= 0)
+    assert (len(dfldr) - no_of_kept) / no_of_kept == pytest.approx(0.2,abs=5 * np.sqrt(0.2 * 0.8 / no_of_kept))
+    assert len(dfspr) == np.count_nonzero(truth_df.spr_indx.to_numpy() >= 0)
+
+    #The true loader event of a board departs before its SPR event
+    true_mask = (ldr_pos >= 0) & (truth_df.spr_indx.to_numpy() >= 0)
+    true_ldr  = dfldr.dptr_tmstmp.to_numpy()[ldr_pos[true_mask]]
+    true_spr  = dfspr.dptr_tmstmp.to_numpy()[truth_df.spr_indx.to_numpy()[true_mask]]
+    assert np.all(true_ldr < true_spr)
+#end-proc
+
+
+def test_no_defects():
+    """
+    Purpose : Without drops and double loads every table has one event per board, at the board position
+    """
+
+    station_dfs = routine_synthetic_line.gen_synthetic_line(500,seed=3,double_load_rate=0.0,drop_rate=0.0)
+    truth_df    = station_dfs[-1]
+
+    for station,station_df in zip(STATIONS,station_dfs[:4]):
+        assert len(station_df) == 500
+        assert np.array_equal(truth_df[station + '_indx'].to_numpy(),np.arange(500))
+        assert station_df.dptr_tmstmp.is_monotonic_increasing
+    #end-for
+#end-proc
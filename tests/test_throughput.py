@@ -0,0 +1,103 @@
+#******************************************************************************************************************************************
+# TITLE     : TEST_THROUGHPUT
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : throughput floors and peak memory ceilings of the matchers
+#******************************************************************************************************************************************
+
+#Performance regression tests
+#
+#Each (no_of_boards, matcher) of PERF_LIMITS is run with routine_benchmark.run_benchmark (weight matrix 'auto' : dense
+#for 1000 boards, banded for 100000) and must reach the throughput floor (boards per second, best of PERF_REPEATS
+#runs) and stay under the peak memory ceiling (MiB traced by tracemalloc). The limits are about 1/10 of the
+#throughput and 2x the peak memory measured on a single core. On a slower machine the floors are scaled with
+#
+#    PCB_THROUGHPUT_SCALE=0.5 python -m pytest -q tests/test_throughput.py
+
+import functools
+import os
+
+import numpy as np
+import pytest
+
+import routine_benchmark
+
+#(no_of_boards, matcher) -> (minimum boards per second, maximum peak MiB)
+PERF_LIMITS = {
+    (1000,'rev_ldrspr_matching_algo')   : (10000,2.0),
+    (1000,'fwd_sprpp1_matching_algo')   : (2000,96.0),
+    (1000,'rev_sprpp1_matching_algo')   : (2000,96.0),
+    (1000,'fwd_pp1pp2_matching_algo')   : (1000,160.0),
+    (1000,'rev_pp1pp2_matching_algo')   : (1000,160.0),
+    (100000,'rev_ldrspr_matching_algo') : (100000,40.0),
+    (100000,'fwd_sprpp1_matching_algo') : (100000,40.0),
+    (100000,'rev_sprpp1_matching_algo') : (100000,40.0),
+    (100000,'fwd_pp1pp2_matching_algo') : (100000,48.0),
+    (100000,'rev_pp1pp2_matching_algo') : (100000,48.0),
+    }
+
+#Timed runs per matcher (best one kept)
+PERF_REPEATS = 2
+
+#Scale of the throughput floors
+THROUGHPUT_SCALE = float(os.environ.get('PCB_THROUGHPUT_SCALE','1.0'))
+
+
+@functools.lru_cache(maxsize=None)
+def get_bench_df(no_of_boards):
+    """
+    Purpose : Benchmark rows of a size (run once per session)
+    """
+    return routine_benchmark.run_benchmark(sizes=(no_of_boards,),no_of_repeats=PERF_REPEATS)
+#end-proc
+
+
+def get_bench_row(no_of_boards,matcher):
+    """
+    Purpose : Benchmark row of a (size, matcher)
+    """
+
+    bench_df = get_bench_df(no_of_boards)
+    bench_df = bench_df[bench_df.matcher == matcher]
+    assert len(bench_df) == 1
+
+    return bench_df.iloc[0]
+#end-proc
+
+
+@pytest.mark.parametrize('no_of_boards,matcher',list(PERF_LIMITS),ids=['%d-%s' % perf_key for perf_key in PERF_LIMITS])
+def test_throughput_floor(no_of_boards,matcher):
+    """
+    Purpose : Boards per second at or above the floor
+    """
+
+    bench_row  = get_bench_row(no_of_boards,matcher)
+    throughput = no_of_boards / bench_row.wall_seconds
+    floor      = PERF_LIMITS[(no_of_boards,matcher)][0] * THROUGHPUT_SCALE
+
+    assert throughput >= floor, '%s on %d boards : %.0f boards/s below %.0f' % (matcher,no_of_boards,throughput,floor)
+#end-proc
+
+
+@pytest.mark.parametrize('no_of_boards,matcher',list(PERF_LIMITS),ids=['%d-%s' % perf_key for perf_key in PERF_LIMITS])
+def test_peak_memory_ceiling(no_of_boards,matcher):
+    """
+    Purpose : Peak traced memory at or below the ceiling
+    """
+
+    bench_row = get_bench_row(no_of_boards,matcher)
+    ceiling   = PERF_LIMITS[(no_of_boards,matcher)][1]
+
+    assert np.isfinite(bench_row.peak_mbytes)
+    assert bench_row.peak_mbytes <= ceiling, '%s on %d boards : %.1f MiB above %.1f' % (matcher,no_of_boards,
+                                                                                     bench_row.peak_mbytes,ceiling)
+#end-proc
@@ -0,0 +1,177 @@
+#******************************************************************************************************************************************
+# TITLE     : TEST_WEIGHT_CACHE
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : eviction order, spill and read back, spill size bound, fingerprints
+#******************************************************************************************************************************************
+
+#Weight matrix cache tests (routine_weight_cache)
+
+import os
+
+import numpy as np
+import pytest
+from scipy import sparse
+
+import routine_weight_cache
+
+#Bytes of a DENSE_SHAPE float64 matrix
+DENSE_SHAPE  = (16,16)
+DENSE_NBYTES = 16 * 16 * 8
+
+
+def get_dense_mtrx(seed):
+    """
+    Purpose : Random dense weight matrix
+    """
+    return np.random.default_rng(seed).random(DENSE_SHAPE)
+#end-proc
+
+
+def test_eviction_order():
+    """
+    Purpose : Beyond max_bytes the least recently used matrices are evicted first (a hit makes a matrix most recent)
+    """
+
+    weight_cache = routine_weight_cache.WeightMatrixCache(max_bytes=3 * DENSE_NBYTES)
+    for key in ('a','b','c'):
+        weight_cache.put(key,get_dense_mtrx(ord(key)))
+    #end-for
+    assert weight_cache.get('a') is not None
+
+    weight_cache.put('d',get_dense_mtrx(0))
+    assert list(weight_cache.mem_entries) == ['c','a','d']
+    assert weight_cache.get('b') is None
+    assert weight_cache.mem_bytes == 3 * DENSE_NBYTES
+    assert (weight_cache.no_of_hits,weight_cache.no_of_misses) == (1,1)
+
+    built = []
+    weight_mtrx = weight_cache.get_or_build('e',lambda : built.append('e') or get_dense_mtrx(1))
+    assert weight_cache.get_or_build('e',lambda : built.append('e') or get_dense_mtrx(1)) is weight_mtrx
+    assert built == ['e']
+    assert list(weight_cache.mem_entries) == ['a','d','e']
+#end-proc
+
+
+def test_spill_and_read_back(tmp_path):
+    """
+    Purpose : Evicted dense matrices are spilled to .npy (read back memory-mapped), sparse ones to .npz
+    """
+
+    dense_mtrx  = get_dense_mtrx(2)
+    sparse_mtrx = sparse.random(40,30,density=0.1,format='csr',random_state=3)
+
+    weight_cache = routine_weight_cache.WeightMatrixCache(max_bytes=0,spill_dir=str(tmp_path))
+    weight_cache.put('dense',dense_mtrx)
+    weight_cache.put('sparse',sparse_mtrx)
+
+    assert len(weight_cache.mem_entries) == 0
+    assert sorted(os.listdir(str(tmp_path))) == ['dense.npy','sparse.npz']
+
+    spilled_dense = weight_cache.get('dense')
+    assert isinstance(spilled_dense,np.memmap)
+    np.testing.assert_array_equal(spilled_dense,dense_mtrx)
+
+    spilled_sparse = weight_cache.get('sparse')
+    assert sparse.issparse(spilled_sparse)
+    assert (spilled_sparse != sparse_mtrx).nnz == 0
+
+    #A spilled key is not cached again
+    weight_cache.put('dense',get_dense_mtrx(4))
+    np.testing.assert_array_equal(weight_cache.get('dense'),dense_mtrx)
+
+    del spilled_dense
+    weight_cache.clear()
+    assert (os.listdir(str(tmp_path)) == []) and (weight_cache.disk_bytes == 0)
+    assert weight_cache.get('dense') is None
+#end-proc
+
+
+def test_spill_size_bound(tmp_path):
+    """
+    Purpose : Beyond max_disk_bytes the least recently used spilled files are deleted
+    """
+
+    weight_cache = routine_weight_cache.WeightMatrixCache(max_bytes=0,spill_dir=str(tmp_path))
+    weight_cache.put('probe',get_dense_mtrx(0))
+    file_size = weight_cache.disk_bytes
+    weight_cache.clear()
+
+    weight_cache = routine_weight_cache.WeightMatrixCache(max_bytes=0,spill_dir=str(tmp_path),max_disk_bytes=3 * file_size)
+    for key in ('a','b','c'):
+        weight_cache.put(key,get_dense_mtrx(ord(key)))
+    #end-for
+    assert weight_cache.get('a') is not None
+
+    weight_cache.put('d',get_dense_mtrx(0))
+    assert list(weight_cache.disk_entries) == ['c','a','d']
+    assert sorted(os.listdir(str(tmp_path))) == ['a.npy','c.npy','d.npy']
+    assert weight_cache.disk_bytes == 3 * file_size
+    assert weight_cache.get('b') is None
+#end-proc
+
+
+def test_fingerprint():
+    """
+    Purpose : Fingerprints change with the values, dtype and shape of the arrays and with the scalars, not with copies
+    """
+
+    values = np.arange(12,dtype=np.int64)
+    key_parts = ('routine_weight_kernel.get_sprpp1_weights',('sprpp1','inverse_delay',()),None,30.0,'<f8',values)
+    fingerprint = routine_weight_cache.get_fingerprint(*key_parts)
+
+    assert routine_weight_cache.get_fingerprint(*key_parts[:-1],values.copy()) == fingerprint
+    assert routine_weight_cache.get_fingerprint(*key_parts[:-1],values[::-1][::-1]) == fingerprint
+
+    changed_values = values.copy()
+    changed_values[5] = changed_values[5] + 1
+    for changed_parts in [key_parts[:-1] + (changed_values,),
+                          key_parts[:-1] + (values.astype(np.float64),),
+                          key_parts[:-1] + (values.reshape(3,4),),
+                          key_parts[:2] + (0.0,30.0,'<f8',values),
+                          key_parts[:2] + (None,60.0,'<f8',values),
+                          key_parts[:4] + ('<f4',values),
+                          key_parts[:1] + (('sprpp1','gaussian_mode',(('mode_seconds',6.0),)),) + key_parts[2:],
+                          key_parts[:-1],
+                          key_parts + (values,)]:
+        assert routine_weight_cache.get_fingerprint(*changed_parts) != fingerprint
+    #end-for
+
+    #Parts are delimited : moving bytes between parts changes the fingerprint
+    assert routine_weight_cache.get_fingerprint('ab','c') != routine_weight_cache.get_fingerprint('a','bc')
+#end-proc
+
+
+def test_cache_disabled_by_default():
+    """
+    Purpose : set_weight_cache returns the previous cache; without a cache the matrices are built on every call
+    """
+
+    assert routine_weight_cache.get_weight_cache() is None
+
+    built = []
+    for call_no in range(2):
+        routine_weight_cache.get_cached_weight_mtrx(('key',),lambda : built.append(call_no) or get_dense_mtrx(0))
+    #end-for
+    assert built == [0,1]
+
+    weight_cache = routine_weight_cache.WeightMatrixCache()
+    assert routine_weight_cache.set_weight_cache(weight_cache) is None
+    try:
+        for call_no in range(2):
+            routine_weight_cache.get_cached_weight_mtrx(('key',),lambda : built.append(call_no) or get_dense_mtrx(0))
+        #end-for
+    finally:
+        assert routine_weight_cache.set_weight_cache(None) is weight_cache
+    #end-try
+    assert built == [0,1,0]
+#end-proc
@@ -0,0 +1,244 @@
+#******************************************************************************************************************************************
+# TITLE     : TEST_WEIGHTING_FUNCTIONS
+# AUTHOR    : PCB-DATA-ASSOCIATION CONTRIBUTORS
+# DATE      : OCT 2026
+# INSTITUTE : INDIAN INSTITUTE OF SCIENCE
+#******************************************************************************************************************************************
+
+
+#******************************************************************************************************************************************
+# VERSION HISTORY
+#******************************************************************************************************************************************
+# DATE (YYYY-MM-DD) | AUTHOR              | COMMENTS
+#------------------------------------------------------------------------------------------------------------------------------------------
+# 2026-10-18        | CONTRIBUTORS        | Initial version : weightings, numexpr / NumPy agreement, arguments and cache keys
+#******************************************************************************************************************************************
+
+#Weighting function tests (routine_weighting_functions)
+
+import math
+
+import numpy as np
+import pytest
+
+import routine_synthetic_line
+import routine_weight_cache
+import routine_weighting_functions
+import routine_sprpp1_matching_algo
+import routine_pp1pp2_matching_algo
+
+#Weightings of every stage checked on both evaluation paths
+WEIGHTINGS = ['inverse_delay',('gaussian_mode',{'mode_seconds' : 6.0,'scale_seconds' : 1.5}),
+              ('log_likelihood',{'mode_seconds' : 6.0})]
+WEIGHTING_IDS = ['inverse_delay','gaussian_mode','log_likelihood']
+
+
+def get_variables(stage,no_of_cells=20000,seed=0):
+    """
+    Purpose : Random variables of a stage with NaN, zero, negative and subnormal delays and zero weightages
+    """
+
+    rng = np.random.default_rng(seed)
+
+    variables = {}
+    for variable in routine_weighting_functions.STAGE_VARIABLES[stage]:
+        if variable.startswith('dt_'):
+            values = rng.normal(6.0,8.0,no_of_cells)
+            values[rng.random(no_of_cells) < 0.05] = np.nan
+            values[rng.random(no_of_cells) < 0.02] = 0.0
+            values[:3] = [5e-324,-0.0,-5e-324]
+        else:
+            values = rng.random(no_of_cells) * (rng.random(no_of_cells) > 0.1)
+        #end-if
+        variables[variable] = values
+    #end-for
+
+    return variables
+#end-proc
+
+
+def evaluate(stage,weighting,variables,use_numexpr):
+    """
+    Purpose : Weights of a weighting on the NumPy (use_numexpr False) or the numexpr path
+    """
+
+    prev_use_numexpr = routine_weighting_functions.USE_NUMEXPR
+    routine_weighting_functions.USE_NUMEXPR = use_numexpr
+    try:
+        return routine_weighting_functions.get_weighting(stage,weighting).evaluate(variables)
+    finally:
+        routine_weighting_functions.USE_NUMEXPR = prev_use_numexpr
+    #end-try
+#end-proc
+
+
+@pytest.mark.parametrize('use_numexpr',[False,True],ids=['numpy','numexpr'])
+def test_weighting_values(use_numexpr):
+    """
+    Purpose : Registered weightings against their formulas on hand-picked cells
+    """
+
+    if (use_numexpr):
+        pytest.importorskip('numexpr')
+    #end-if
+
+    dt_transit = np.array([4.0,6.0,7.5,0.0,-2.0,np.nan])
+    wght       = np.array([0.5,1.0,0.8,1.0,1.0,1.0])
+
+    weights = evaluate('sprpp1','inverse_delay',{'dt_transit' : dt_transit,'wght_pp1' : wght},use_numexpr)
+    np.testing.assert_array_equal(weights,[0.125,1 / 6.0,0.8 / 7.5,0.0,0.0,np.nan])
+
+    gaussian = ('gaussian_mode',{'mode_seconds' : 6.0,'scale_seconds' : 2.0})
+    weights  = evaluate('sprpp1',gaussian,{'dt_transit' : dt_transit,'wght_pp1' : wght},use_numexpr)
+    expected = [wght[i] * math.exp(-0.5 * ((dt_transit[i] - 6.0) / 2.0) ** 2) for i in range(3)] + [0.0,0.0,0.0]
+    np.testing.assert_allclose(weights,expected,rtol=1e-15,atol=0.0)
+
+    variables = {'dt_arvl' : dt_transit,'dt_dptr' : dt_transit,'dt_transit' : dt_transit,'wght_one' : wght,'wght_two' : wght}
+    weights   = evaluate('pp1pp2',gaussian,variables,use_numexpr)
+    np.testing.assert_allclose(weights,np.array(expected) * wght,rtol=1e-15,atol=0.0)
+
+    #Log-likelihood ratio against a uniform background of 60 s, clamped at 0
+    log_norm = math.log(60.0 / math.sqrt(2 * math.pi))
+    weights  = evaluate('sprpp1',('log_likelihood',{'mode_seconds' : 6.0}),{'dt_transit' : dt_transit,'wght_pp1' : wght},use_numexpr)
+    expected = [max(log_norm - 0.5 * (dt_transit[i] - 6.0) ** 2 + math.log(wght[i]),0.0) for i in range(3)] + [0.0,0.0,0.0]
+    np.testing.assert_allclose(weights,expected,rtol=1e-14,atol=0.0)
+    far_weights = evaluate('sprpp1',('log_likelihood',{'mode_seconds' : 6.0}),{'dt_transit' : np.array([12.0]),'wght_pp1' : np.array([1.0])},
+                           use_numexpr)
+    assert far_weights[0] == 0.0
+
+    weights = evaluate('pp1pp2',('log_likelihood',{'mode_seconds' : 6.0}),variables,use_numexpr)
+    assert weights[1] == pytest.approx(log_norm)
+    assert np.all(weights[3:] == 0.0)
+#end-proc
+
+
+@pytest.mark.parametrize('weighting',WEIGHTINGS,ids=WEIGHTING_IDS)
+@pytest.mark.parametrize('stage',['sprpp1','pp1pp2'])
+def test_numexpr_agrees_with_numpy(stage,weighting):
+    """
+    Purpose : numexpr and NumPy weights agree (inverse_delay : bit-identical), NaN delays and zero weightages included
+    """
+
+    pytest.importorskip('numexpr')
+
+    variables     = get_variables(stage)
+    numpy_weights = evaluate(stage,weighting,variables,False)
+    expr_weights  = evaluate(stage,weighting,variables,True)
+
+    if (weighting == 'inverse_delay'):
+        np.testing.assert_array_equal(expr_weights,numpy_weights)
+    else:
+        np.testing.assert_allclose(expr_weights,numpy_weights,rtol=0.0,atol=1e-15)
+    #end-if
+    assert np.array_equal(np.isnan(expr_weights),np.isnan(numpy_weights))
+#end-proc
+
+
+def test_get_weighting():
+    """
+    Purpose : Resolution of the weighting= argument and its errors
+    """
+
+    default_function = routine_weighting_functions.get_weighting('sprpp1')
+    assert default_function.name == routine_weighting_functions.DEFAULT_WEIGHTING
+    assert routine_weighting_functions.get_weighting('sprpp1',default_function) is default_function
+
+    gaussian_function = routine_weighting_functions.get_weighting('pp1pp2',('gaussian_mode',{'mode_seconds' : 6.0}))
+    assert gaussian_function.params == {'mode_seconds' : 6.0,'scale_seconds' : 1.0}
+    assert routine_weighting_functions.WEIGHT_FUNCTIONS['pp1pp2']['gaussian_mode'].params['mode_seconds'] is None
+
+    with pytest.raises(ValueError,match='must be one of'):
+        routine_weighting_functions.get_weighting('sprpp1','no_such_weighting')
+    #end-with
+    with pytest.raises(ValueError,match='has no parameter width'):
+        routine_weighting_functions.get_weighting('sprpp1',('gaussian_mode',{'mode_seconds' : 6.0,'width' : 1.0}))
+    #end-with
+    with pytest.raises(ValueError,match='requires mode_seconds'):
+        routine_weighting_functions.get_weighting('sprpp1','gaussian_mode')
+    #end-with
+    with pytest.raises(ValueError,match='is defined for pp1pp2, not sprpp1'):
+        routine_weighting_functions.get_weighting('sprpp1',gaussian_function)
+    #end-with
+    with pytest.raises(ValueError,match='stage must be one of'):
+        routine_weighting_functions.WeightFunction('ldrspr','inverse_delay',None)
+    #end-with
+    with pytest.raises(ValueError,match='already registered'):
+        routine_weighting_functions.register_weighting('sprpp1','inverse_delay',
+                                                       routine_weighting_functions.get_inverse_delay_sprpp1_weights)
+    #end-with
+#end-proc
+
+
+def test_bind_and_check_params():
+    """
+    Purpose : bind copies the weighting with parameter values; check_params rejects missing required parameters
+    """
+
+    registered = routine_weighting_functions.WEIGHT_FUNCTIONS['sprpp1']['log_likelihood']
+    with pytest.raises(ValueError,match='requires mode_seconds'):
+        registered.check_params()
+    #end-with
+
+    bound = registered.bind(mode_seconds=5.0,background_seconds=120.0)
+    bound.check_params()
+    assert bound.params == {'mode_seconds' : 5.0,'scale_seconds' : 1.0,'background_seconds' : 120.0}
+    assert registered.params['mode_seconds'] is None
+    assert bound.get_key() != registered.bind(mode_seconds=5.0).get_key()
+
+    with pytest.raises(ValueError,match=r'has no parameter \w+ \(parameters : none\)'):
+        routine_weighting_functions.WEIGHT_FUNCTIONS['sprpp1']['inverse_delay'].bind(mode_seconds=5.0)
+    #end-with
+#end-proc
+
+
+def test_get_weighting_arg():
+    """
+    Purpose : Command line option NAME [PARAM=VALUE ...] to a JSON serializable weighting= argument
+    """
+
+    assert routine_weighting_functions.get_weighting_arg('sprpp1',None) is None
+    assert routine_weighting_functions.get_weighting_arg('sprpp1',[]) is None
+    assert routine_weighting_functions.get_weighting_arg('sprpp1',['inverse_delay']) == 'inverse_delay'
+    assert routine_weighting_functions.get_weighting_arg('pp1pp2',['gaussian_mode','mode_seconds=6','scale_seconds=2.5']) == \
+           ['gaussian_mode',{'mode_seconds' : 6.0,'scale_seconds' : 2.5}]
+
+    for tokens,message in [(['gaussian_mode','mode_seconds'],'must be PARAM=VALUE'),
+                           (['gaussian_mode','mode_seconds=six'],'must be a number'),
+                           (['gaussian_mode'],'requires mode_seconds'),
+                           (['gaussian_mode','mode_seconds=6','width=1'],'has no parameter width'),
+                           (['no_such_weighting'],'must be one of')]:
+        with pytest.raises(ValueError,match=message):
+            routine_weighting_functions.get_weighting_arg('sprpp1',tokens)
+        #end-with
+    #end-for
+#end-proc
+
+
+@pytest.mark.parametrize('window',[(None,None),(0.0,30.0)],ids=['dense','band'])
+def test_weighting_in_cache_key(window):
+    """
+    Purpose : The weighting and its parameters are part of the weight matrix cache key of both stages
+    """
+
+    dfldr,dfspr,dfpp1,dfpp2,truth_df = routine_synthetic_line.gen_synthetic_line(150,seed=5)
+    prev_cache = routine_weight_cache.get_weight_cache()
+    try:
+        for gen_weight_mtrx,pcb_level_dfa,pcb_level_dfb in [(routine_sprpp1_matching_algo.gen_sprpp1_weight_mtrx,dfspr,dfpp1),
+                                                            (routine_pp1pp2_matching_algo.gen_pp1pp2_weight_mtrx,dfpp1,dfpp2)]:
+            weight_cache = routine_weight_cache.WeightMatrixCache()
+            routine_weight_cache.set_weight_cache(weight_cache)
+
+            weight_mtrxs = [gen_weight_mtrx(pcb_level_dfa,pcb_level_dfb,*window,weighting=weighting)
+                            for weighting in [None,'inverse_delay',('gaussian_mode',{'mode_seconds' : 6.0}),
+                                              ('gaussian_mode',{'mode_seconds' : 7.0}),('gaussian_mode',{'mode_seconds' : 6.0})]]
+
+            #None and 'inverse_delay' (the default) share an entry, as do equal parameters
+            assert (weight_cache.no_of_misses,weight_cache.no_of_hits) == (3,2)
+            assert weight_mtrxs[1] is weight_mtrxs[0]
+            assert weight_mtrxs[4] is weight_mtrxs[2]
+            assert (weight_mtrxs[2] is not weight_mtrxs[0]) and (weight_mtrxs[3] is not weight_mtrxs[2])
+        #end-for
+    finally:
+        routine_weight_cache.set_weight_cache(prev_cache)
+    #end-try
+#end-proc